@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+设备清单表格填充基准测试
+
+对比设备清单区域的两种实现填充 N 行设备（默认 10000 行）的耗时和内存：
+- QTableWidget：逐行 insertRow + 每个单元格一个 QTableWidgetItem（旧实现）
+- QTableView + DeviceTableModel + DeviceFilterProxyModel：模型只保存设备列表，视图只请求可见单元格
+
+每种实现都会显示窗口并处理事件，使首屏绘制也计入耗时。内存为填充前后进程 RSS 的差值
+（读取 /proc/self/statm，仅 Linux 可用；其他平台只显示耗时）。
+
+用法:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_device_list_model.py --rows 10000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from tests.support.jdy_stub_server import load_fixture
+from core.query_area.jiandaoyun_api import DEVICE_LIST_FIELD
+from ui.components.device_list_area import DeviceListArea
+from ui.components.device_table_model import DEVICE_COLUMNS
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """以录制数据中的设备行为模板生成 count 行设备"""
+    rows = [row for entry in load_fixture() for row in entry.get(DEVICE_LIST_FIELD, [])]
+    return [dict(rows[i % len(rows)]) for i in range(count)]
+
+
+def rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def populate_table_widget(app: QApplication, devices: List[Dict[str, Any]]) -> QTableWidget:
+    table = QTableWidget()
+    table.setColumnCount(len(DEVICE_COLUMNS))
+    table.setHorizontalHeaderLabels([title for title, _ in DEVICE_COLUMNS])
+    table.show()
+    for device_info in devices:
+        row = table.rowCount()
+        table.insertRow(row)
+        for col, (_, field) in enumerate(DEVICE_COLUMNS):
+            table.setItem(row, col, QTableWidgetItem(str(device_info.get(field, ''))))
+    app.processEvents()
+    return table
+
+
+def populate_model_view(app: QApplication, devices: List[Dict[str, Any]]) -> DeviceListArea:
+    area = DeviceListArea()
+    area.show()
+    area.append_devices(devices)
+    app.processEvents()
+    return area
+
+
+def measure(app: QApplication, populate, devices: List[Dict[str, Any]]):
+    gc.collect()
+    app.processEvents()
+    before = rss_bytes()
+    start = time.perf_counter()
+    widget = populate(app, devices)
+    elapsed = time.perf_counter() - start
+    after = rss_bytes()
+    memory = (after - before) if before is not None and after is not None else None
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="设备清单表格填充基准测试")
+    parser.add_argument("--rows", type=int, default=10000, help="设备行数")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = QApplication.instance() or QApplication(sys.argv)
+    devices = make_rows(args.rows)
+
+    print(f"设备行数: {args.rows}")
+    # 先运行模型视图，避免旧实现释放的内存被复用而影响 RSS 差值
+    for name, populate in (("QTableView+模型", populate_model_view), ("QTableWidget", populate_table_widget)):
+        elapsed, memory = measure(app, populate, devices)
+        memory_text = f"{memory / 1024 / 1024:8.1f} MB" if memory is not None else "     N/A"
+        print(f"{name:<16} 填充耗时 {elapsed * 1000:9.1f} ms   内存增量 {memory_text}")
+
+
+if __name__ == "__main__":
+    main()
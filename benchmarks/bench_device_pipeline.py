@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+设备处理流水线基准测试
+
+对比 IODataLoader.set_devices_data 中设备处理的两种方式：
+- 分步方式：process_raw_device_list -> filter_hollysys_devices -> enrich_device_data
+  -> SystemSetupManager.calculate_system_setup，共四次完整遍历，enrich 时还会再复制每个设备字典
+- 单次遍历：DeviceDataProcessor.process_hollysys_devices + SystemSetupFacts，
+  标准化、筛选、丰富化和机架统计在一次遍历中完成
+
+设备以录制的场站设备清单 (tests/support/fixtures/jdy_entries_sample.json) 为模板生成，包含第三方设备。
+
+用法:
+    python benchmarks/bench_device_pipeline.py --sizes 1000 10000 50000 --repeat 3
+"""
+
+import argparse
+import gc
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.support.jdy_stub_server import load_fixture
+from core.io_table.get_data import (ModuleInfoProvider, DeviceDataProcessor, SystemSetupFacts, SystemSetupManager,
+                                    PLC_SERIES_CONFIG_DEF)
+from core.query_area.jiandaoyun_api import DEVICE_LIST_FIELD
+
+KEYWORDS = ['和利时', 'HOLLYSYS'] + list(PLC_SERIES_CONFIG_DEF.keys())
+
+
+def make_devices(count: int) -> List[Dict[str, Any]]:
+    """以录制数据中的设备行为模板生成 count 个原始设备"""
+    rows = [row for entry in load_fixture() for row in entry.get(DEVICE_LIST_FIELD, [])]
+    return [dict(rows[i % len(rows)]) for i in range(count)]
+
+
+def separate_passes(processor: DeviceDataProcessor, devices: List[Dict[str, Any]]) -> SystemSetupManager:
+    processed = processor.process_raw_device_list(devices)
+    kept = processor.filter_hollysys_devices(processed, KEYWORDS)
+    enriched = processor.enrich_device_data(kept)
+    setup = SystemSetupManager()
+    setup.calculate_system_setup(enriched)
+    return setup
+
+
+def single_pass(processor: DeviceDataProcessor, devices: List[Dict[str, Any]]) -> SystemSetupManager:
+    facts = SystemSetupFacts()
+    processor.process_hollysys_devices(devices, KEYWORDS, facts)
+    setup = SystemSetupManager()
+    setup.apply_system_facts(facts)
+    return setup
+
+
+def best_time(func: Callable, processor: DeviceDataProcessor, devices: List[Dict[str, Any]], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(processor, devices)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="设备处理流水线基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="设备数量")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最好成绩）")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    processor = DeviceDataProcessor(ModuleInfoProvider(), list(PLC_SERIES_CONFIG_DEF.keys()))
+
+    print(f"{'设备数量':>8} {'分步(ms)':>10} {'单次遍历(ms)':>14} {'加速比':>8}")
+    for size in args.sizes:
+        devices = make_devices(size)
+        assert (separate_passes(processor, devices).get_rack_info_dict()
+                == single_pass(processor, devices).get_rack_info_dict())
+        legacy = best_time(separate_passes, processor, devices, args.repeat)
+        fused = best_time(single_pass, processor, devices, args.repeat)
+        print(f"{size:>8} {legacy * 1000:>10.1f} {fused * 1000:>14.1f} {legacy / fused:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+一键生成全部点表基准测试
+
+用 N 个合成点位（默认 20000 个，模拟量/数字量各半，含报警设定值）对比：
+- 串行：在当前进程中依次运行各生成器（相当于逐个点击生成按钮）
+- 进程池：generate_all 把各生成器分发到工作进程并行运行
+
+输出每个生成器的耗时以及两种方式的墙钟时间。FAT点检表需要原始 .xlsx 文件，本测试不包含。
+
+用法:
+    python benchmarks/bench_generate_all.py --points 20000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.post_upload_processor.batch_generator import BatchTaskOptions, generate_all
+from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+
+
+def make_points_by_sheet(count: int) -> Dict[str, List[UploadedIOPoint]]:
+    points = []
+    for i in range(count):
+        is_real = i % 2 == 0
+        points.append(UploadedIOPoint(
+            source_sheet_name="IO点表", source_type="main_io", site_name="测试站", site_number="S001",
+            channel_tag=f"CH{i}", hmi_variable_name=f"{'PT' if is_real else 'XS'}_{i}",
+            variable_description=f"{'压力' if is_real else '状态'}{i}",
+            data_type="REAL" if is_real else "BOOL",
+            plc_absolute_address=f"%MD{i * 4}" if is_real else f"%MX{i}.0",
+            hmi_communication_address=str((40001 if is_real else 1) + i),
+            range_low_limit="0" if is_real else None, range_high_limit="10" if is_real else None,
+            sl_set_value="1" if is_real else None, sh_set_value="9" if is_real else None))
+    return {"IO点表": points}
+
+
+def run(points_by_sheet, use_processes: bool, is_safety_system: bool):
+    with tempfile.TemporaryDirectory() as output_dir:
+        options = BatchTaskOptions(output_dir=output_dir, base_name="bench", is_safety_system=is_safety_system)
+        return generate_all(points_by_sheet, options, use_processes=use_processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="一键生成全部点表基准测试")
+    parser.add_argument("--points", type=int, default=20000, help="点位数量")
+    parser.add_argument("--safety", action="store_true", help="按安全系统生成（包含Modbus表）")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    points_by_sheet = make_points_by_sheet(args.points)
+    print(f"点位数量: {args.points}")
+
+    serial = run(points_by_sheet, use_processes=False, is_safety_system=args.safety)
+    parallel = run(points_by_sheet, use_processes=True, is_safety_system=args.safety)
+
+    print("各生成器耗时（串行）:")
+    for line in serial.timing_lines():
+        print(f"  {line}")
+    print(f"串行   墙钟时间 {serial.elapsed:7.2f} s")
+    print(f"进程池 墙钟时间 {parallel.elapsed:7.2f} s  (最慢生成器 {max(g.elapsed for g in parallel.generations):.2f} s，"
+          f"加速 {serial.elapsed / parallel.elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主IO点表解析基准测试
+
+生成一个包含 N 行（默认 30000 行）主IO点表的 .xlsx 文件，对比 _parse_io_sheet_to_uploaded_points 的几种数据来源：
+- 完整加载：openpyxl.load_workbook(data_only=True) 读入所有单元格对象后逐行取值（旧实现）
+- 共享读取：ParsedWorkbook.read 把各工作表的值元组全部读入内存（上传时校验和加载共用）
+- 流式读取：load_workbook_data(file_path)，只读模式逐行读取值元组并即时构建 UploadedIOPoint
+  （分别使用 openpyxl 和可选的 python-calamine 读取引擎，未安装 python-calamine 时跳过）
+
+每种方式在单独的子进程中运行，输出解析耗时和进程峰值RSS（ru_maxrss，仅 Linux/macOS 可用）。
+
+用法:
+    python benchmarks/bench_io_sheet_parsing.py --rows 30000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import openpyxl
+
+from core.post_upload_processor.uploaded_file_processor.excel_reader import (
+    HEADER_TO_ATTRIBUTE_MAP, MAIN_IO_SHEET_NAME, _parse_io_sheet_to_uploaded_points, load_workbook_data
+)
+from core.post_upload_processor.uploaded_file_processor import parsed_workbook
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def make_io_table(file_path: str, rows: int) -> None:
+    """生成主IO点表：三分之一为带报警设定的AI点，其余为DI点，每50行一个预留点"""
+    headers = list(HEADER_TO_ATTRIBUTE_MAP.keys())
+    column = {header: index for index, header in enumerate(headers)}
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(MAIN_IO_SHEET_NAME)
+    sheet.append(headers)
+    for i in range(rows):
+        is_ai = i % 3 == 0
+        row = [None] * len(headers)
+        values = {"序号": i + 1, "模块类型": "AI" if is_ai else "DI", "供电类型（有源/无源）": "有源",
+                  "线制": "两线制" if is_ai else "常开", "通道位号": f"1_1_{'AI' if is_ai else 'DI'}_{i}",
+                  "场站名": "测试站", "场站编号": "S001", "数据类型": "REAL" if is_ai else "BOOL",
+                  "PLC绝对地址": f"%MD{i * 4}" if is_ai else f"%MX{i}.0", "上位机通讯地址": 40001 + i}
+        if i % 50:
+            values.update({"变量名称（HMI）": f"{'PT' if is_ai else 'XS'}_{i}", "变量描述": f"点位{i}"})
+            if is_ai:
+                values.update({"量程低限": 0, "量程高限": 10, "SH设定值": 9, "SH设定点位": f"PT_{i}_SH",
+                               "SH设定点位_PLC地址": f"%MD{200000 + i * 4}", "H报警_PLC地址": f"%MX{60000 + i}.0"})
+        for header, value in values.items():
+            row[column[header]] = value
+        sheet.append(row)
+    workbook.save(file_path)
+
+
+def parse_full_load(file_path: str) -> int:
+    workbook = openpyxl.load_workbook(file_path, data_only=True)
+    sheet = workbook[MAIN_IO_SHEET_NAME]
+    header_values = [cell.value for cell in sheet[1]]
+    rows = (tuple(cell.value for cell in row) for row in sheet.iter_rows(min_row=2))
+    return len(_parse_io_sheet_to_uploaded_points(MAIN_IO_SHEET_NAME, header_values, rows))
+
+
+def parse_shared_read(file_path: str) -> int:
+    parsed_workbook.CalamineWorkbook = None
+    rows = ParsedWorkbook.read(file_path)[MAIN_IO_SHEET_NAME].rows
+    return len(_parse_io_sheet_to_uploaded_points(MAIN_IO_SHEET_NAME, rows[0], rows[1:]))
+
+
+def parse_streaming(file_path: str) -> int:
+    points_by_sheet, _ = load_workbook_data(file_path)
+    return len(points_by_sheet.get(MAIN_IO_SHEET_NAME, []))
+
+
+def parse_streaming_openpyxl(file_path: str) -> int:
+    parsed_workbook.CalamineWorkbook = None  # 子进程中强制使用 openpyxl
+    return parse_streaming(file_path)
+
+
+VARIANTS = {
+    "完整加载": parse_full_load,
+    "共享读取": parse_shared_read,
+    "流式读取 (openpyxl)": parse_streaming_openpyxl,
+    "流式读取 (calamine)": parse_streaming,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_variant(name: str, file_path: str) -> Tuple[int, float, Optional[float], Optional[float]]:
+    logging.disable(logging.CRITICAL)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    count = VARIANTS[name](file_path)
+    return count, time.perf_counter() - start, baseline, peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主IO点表解析基准测试")
+    parser.add_argument("--rows", type=int, default=30000, help="主IO点表行数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "bench_io.xlsx")
+        make_io_table(file_path, args.rows)
+        print(f"主IO点表 {args.rows} 行，文件大小 {os.path.getsize(file_path) / 1024 / 1024:.1f} MB")
+
+        context = multiprocessing.get_context("spawn")
+        for name in VARIANTS:
+            if name.endswith("(calamine)") and parsed_workbook.CalamineWorkbook is None:
+                print(f"{name}: 未安装 python-calamine，跳过")
+                continue
+            # 每种方式使用新进程，峰值RSS互不影响
+            with context.Pool(1) as pool:
+                count, elapsed, baseline, peak = pool.apply(run_variant, (name, file_path))
+            memory = f"峰值RSS {peak:7.1f} MB（解析前 {baseline:.1f} MB）" if peak is not None else "峰值RSS 不可用"
+            print(f"{name}: {elapsed:6.2f} s，{count} 个点位，{memory}")
+
+
+if __name__ == "__main__":
+    main()
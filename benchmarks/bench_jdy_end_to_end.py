@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+简道云查询 → IODataLoader.set_devices_data 端到端基准测试
+
+使用本地桩服务器 (tests/support/jdy_stub_server.py) 回放以录制数据为模板合成的项目，依次测量：
+1. 项目查询：ProjectService.get_formatted_projects
+2. 设备查询：逐个场站 DeviceService.get_formatted_devices
+3. 设备处理：用 to_plc_device_records 得到每行一条带 instance_count 的记录，调用 IODataLoader.set_devices_data（与主界面选中场站时的流程一致），
+   加 --expand 时改为旧流程，先按数量展开成逐个实例
+
+用法:
+    python benchmarks/bench_jdy_end_to_end.py --sites 10 100 1000 --latency 0.02
+    python benchmarks/bench_jdy_end_to_end.py --sites 100 --error-rate 0.05 --prefetch
+    python benchmarks/bench_jdy_end_to_end.py --sites 1000 --expand
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.support.jdy_stub_server import JianDaoYunStubServer, synthetic_entries, load_fixture, SAMPLE_FIXTURE
+from core.query_area.jiandaoyun_api import JianDaoYunAPI, SITE_NAME_FIELD
+from core.project_list_area import ProjectService
+from core.device_list_area import DeviceService, to_plc_device_records
+from core.io_table import IODataLoader, parse_device_quantity
+
+PROJECT_NO = "BENCH-001"
+QUANTITY_FIELD = "_widget_1635777485580"
+
+
+def expand_by_quantity(devices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """按数量展开设备实例（MainWindow.get_current_devices 的旧规则）"""
+    expanded = []
+    for row, device in enumerate(devices):
+        quantity = parse_device_quantity(device.get(QUANTITY_FIELD, ''))
+        for i in range(quantity):
+            instance = {k: str(v) for k, v in device.items()}
+            instance.update({'id': row + 1, 'instance_index': i + 1})
+            expanded.append(instance)
+    return expanded
+
+
+def run_once(site_count: int, template, args) -> Dict[str, float]:
+    entries = synthetic_entries(site_count, project_no=PROJECT_NO, template=template)
+    with JianDaoYunStubServer(entries, latency=args.latency, error_rate=args.error_rate,
+                              seed=args.seed) as stub:
+        api = JianDaoYunAPI(config_file=stub.write_config())
+        project_service = ProjectService(api)
+        device_service = DeviceService(api, max_workers=args.workers)
+        loader = IODataLoader()
+
+        start = time.perf_counter()
+        projects = project_service.get_formatted_projects(project_no=PROJECT_NO)
+        t_projects = time.perf_counter() - start
+
+        site_names = [p.get(SITE_NAME_FIELD, '') for p in projects]
+        if args.prefetch:
+            device_service.prefetch_devices(site_names)
+
+        t_devices = t_loader = 0.0
+        device_rows = 0
+        for site_name in site_names:
+            start = time.perf_counter()
+            devices = device_service.get_formatted_devices(site_name)
+            t_devices += time.perf_counter() - start
+
+            start = time.perf_counter()
+            devices_data = expand_by_quantity(devices) if args.expand else to_plc_device_records(devices)
+            loader.set_devices_data(devices_data, force_update=True)
+            t_loader += time.perf_counter() - start
+            device_rows += len(devices)
+
+        device_service.shutdown()
+        api.close()
+        return {
+            'sites': len(site_names),
+            'device_rows': device_rows,
+            'requests': stub.request_count,
+            'errors': stub.error_count,
+            'projects': t_projects,
+            'devices': t_devices,
+            'loader': t_loader,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="简道云查询到设备数据处理的端到端基准测试")
+    parser.add_argument("--sites", type=int, nargs="+", default=[10, 100, 1000], help="合成项目的场站数量")
+    parser.add_argument("--fixture", type=Path, default=SAMPLE_FIXTURE, help="作为模板的录制数据文件")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回503的比例 (0~1)")
+    parser.add_argument("--seed", type=int, default=42, help="错误注入的随机种子")
+    parser.add_argument("--prefetch", action="store_true", help="查询项目后并发预取所有场站的设备")
+    parser.add_argument("--workers", type=int, default=4, help="预取线程数")
+    parser.add_argument("--expand", action="store_true", help="按旧流程先把设备按数量展开成逐个实例")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    template = load_fixture(args.fixture)
+
+    print(f"模拟延迟: {args.latency * 1000:.0f} ms, 错误率: {args.error_rate:.0%}, 预取: {'是' if args.prefetch else '否'}")
+    print(f"{'场站数':>6} {'设备行':>8} {'请求数':>6} {'错误':>5} {'项目查询(s)':>11} {'设备查询(s)':>11} "
+          f"{'set_devices_data(s)':>19} {'合计(s)':>8}")
+    for site_count in args.sites:
+        r = run_once(site_count, template, args)
+        total = r['projects'] + r['devices'] + r['loader']
+        print(f"{r['sites']:>6} {r['device_rows']:>8} {r['requests']:>6} {r['errors']:>5} {r['projects']:>11.3f} "
+              f"{r['devices']:>11.3f} {r['loader']:>19.3f} {total:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
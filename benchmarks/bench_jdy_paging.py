@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+简道云分页查询基准测试
+
+在本地启动一个模拟 /app/entry/data/list 的桩服务器，对比：
+- 旧方式：每页调用一次 requests.post（每页都新建连接）
+- 新方式：JianDaoYunAPI 的共享会话（连接池 + keep-alive）
+
+桩服务器在每个新连接上额外等待 handshake_delay 秒，用来模拟真实环境中 TCP+TLS 握手的开销。
+
+用法:
+    python benchmarks/bench_jdy_paging.py --rows 5000 --handshake-delay 0.05
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.support.jdy_stub_server import JianDaoYunStubServer
+from core.query_area.jiandaoyun_api import JianDaoYunAPI, DATA_LIST_PATH, PROJECT_NO_FIELD
+
+
+def _legacy_query(base_url: str, batch_size: int = 100) -> int:
+    """旧实现：每页 requests.post，且每次重新构建 headers"""
+    count = 0
+    last_data_id = None
+    while True:
+        params = {"limit": batch_size}
+        if last_data_id:
+            params["data_id"] = last_data_id
+        headers = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+        response = requests.post(f"{base_url}{DATA_LIST_PATH}", json=params, headers=headers)
+        response.raise_for_status()
+        batch = response.json().get("data", [])
+        count += len(batch)
+        if len(batch) < batch_size:
+            return count
+        last_data_id = batch[-1]["_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="简道云分页查询基准测试")
+    parser.add_argument("--rows", type=int, default=5000, help="模拟项目的数据行数")
+    parser.add_argument("--handshake-delay", type=float, default=0.05, help="每个新连接的模拟握手耗时（秒）")
+    args = parser.parse_args()
+
+    entries = [{"_id": f"{i:08d}", PROJECT_NO_FIELD: "BENCH"} for i in range(args.rows)]
+    with JianDaoYunStubServer(entries, handshake_delay=args.handshake_delay) as stub:
+        pages = args.rows // 100 + 1
+
+        start = time.perf_counter()
+        legacy_count = _legacy_query(stub.base_url)
+        legacy_elapsed = time.perf_counter() - start
+
+        # 基准测试只关注连接开销，桩服务器生成的配置不限速
+        api = JianDaoYunAPI(config_file=stub.write_config())
+        start = time.perf_counter()
+        pooled_count = len(api.query_data(project_no="BENCH"))
+        pooled_elapsed = time.perf_counter() - start
+        api.close()
+
+        print(f"数据行数: {args.rows}, 页数: {pages}, 模拟握手: {args.handshake_delay * 1000:.0f} ms")
+        print(f"旧方式(每页新连接): {legacy_count} 行, 总耗时 {legacy_elapsed:.3f}s, 每页 {legacy_elapsed / pages * 1000:.1f} ms")
+        print(f"共享会话(连接池):   {pooled_count} 行, 总耗时 {pooled_elapsed:.3f}s, 每页 {pooled_elapsed / pages * 1000:.1f} ms")
+        if pooled_elapsed > 0:
+            print(f"加速比: {legacy_elapsed / pooled_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模块型号查找微基准测试
+
+对比 ModuleInfoProvider 的两种查找方式在设备处理流程中的耗时：
+- 旧方式：每次查找都线性扫描预定义模块列表并对每个型号做 upper()，未知型号每次重新推断
+- 新方式：按大写型号建立的字典索引 + 按型号缓存的推断结果
+
+测量内容为 DeviceDataProcessor.process_raw_device_list + enrich_device_data
+（其中 _determine_io_type_internal / _determine_channels_internal / enrich_device_data 都会查找型号）。
+
+用法:
+    python benchmarks/bench_module_lookup.py --devices 5000 --repeat 5
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.support.jdy_stub_server import load_fixture
+from core.io_table.get_data import (ModuleInfoProvider, DeviceDataProcessor, PLC_SERIES_CONFIG_DEF,
+                                    _internal_infer_module_info)
+from core.query_area.jiandaoyun_api import DEVICE_LIST_FIELD
+
+
+class LegacyModuleInfoProvider(ModuleInfoProvider):
+    """旧的查找方式：线性扫描 + 不缓存推断结果"""
+
+    def get_predefined_module_by_model(self, model_str: str) -> Optional[Dict[str, Any]]:
+        model_upper = model_str.upper()
+        for module in self.predefined_modules:
+            if module.get("model", "").upper() == model_upper:
+                return module.copy()
+        return None
+
+    def get_inferred_module_info(self, model_str: str) -> Optional[Dict[str, Any]]:
+        exact_match = self.get_predefined_module_by_model(model_str)
+        if exact_match:
+            return exact_match
+        # 模拟旧实现：先再扫描一次JSON列表，再做一次不缓存的推断
+        self.get_predefined_module_by_model(model_str)
+        return _internal_infer_module_info.__wrapped__(model_str)
+
+
+def make_devices(count: int) -> List[Dict[str, Any]]:
+    """以录制数据中的设备行为模板生成 count 个设备（含部分未录入的型号）"""
+    rows = [row for entry in load_fixture() for row in entry.get(DEVICE_LIST_FIELD, [])]
+    devices = []
+    for i in range(count):
+        device = dict(rows[i % len(rows)])
+        if i % 7 == 0:
+            device['_widget_1635777115287'] = f"LK9{i % 50:02d}"  # 推断路径
+        devices.append(device)
+    return devices
+
+
+def run(provider: ModuleInfoProvider, devices: List[Dict[str, Any]], repeat: int) -> float:
+    processor = DeviceDataProcessor(provider, list(PLC_SERIES_CONFIG_DEF.keys()))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        processed = processor.process_raw_device_list(devices)
+        processor.enrich_device_data(processed)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模块型号查找微基准测试")
+    parser.add_argument("--devices", type=int, default=5000, help="设备数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最好成绩）")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    devices = make_devices(args.devices)
+
+    legacy = run(LegacyModuleInfoProvider(), devices, args.repeat)
+    indexed = run(ModuleInfoProvider(), devices, args.repeat)
+
+    print(f"设备数量: {args.devices}, 重复 {args.repeat} 次取最好成绩")
+    print(f"线性扫描:   {legacy * 1000:8.1f} ms ({legacy / args.devices * 1e6:.1f} us/设备)")
+    print(f"字典索引:   {indexed * 1000:8.1f} ms ({indexed / args.devices * 1e6:.1f} us/设备)")
+    if indexed > 0:
+        print(f"加速比: {legacy / indexed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
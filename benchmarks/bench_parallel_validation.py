@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作表并行校验基准测试
+
+生成一个包含主IO点表和 N 个第三方设备表（默认 40 个，每个 1000 行）的 .xlsx 文件，
+对比 validate_io_table 按顺序校验 (max_workers=1) 和进程池并行校验的耗时，
+分别测试直接从文件校验和上传时的共享读取 (ParsedWorkbook.read 后传入) 两种调用方式，并检查结果一致。
+
+用法:
+    python benchmarks/bench_parallel_validation.py --sheets 40 --rows 1000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import openpyxl
+
+from core.post_upload_processor.io_validation import constants as C
+from core.post_upload_processor.io_validation.validator import validate_io_table
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+
+
+def make_workbook(file_path: str, sheets: int, rows: int) -> None:
+    workbook = openpyxl.Workbook(write_only=True)
+    main_sheet = workbook.create_sheet(C.PLC_IO_SHEET_NAME)
+    main_sheet.append([C.HMI_NAME_COL, C.DESCRIPTION_COL, C.POWER_SUPPLY_TYPE_COL, C.WIRING_SYSTEM_COL,
+                       C.MODULE_TYPE_COL, C.RANGE_LOW_LIMIT_COL, C.RANGE_HIGH_LIMIT_COL,
+                       C.SLL_SET_COL, C.SL_SET_COL, C.SH_SET_COL, C.SHH_SET_COL])
+    main_sheet.append(["PT_101", "进站压力", "有源", "两线制", "AI", 0, 10, None, None, 9, None])
+    for sheet_index in range(sheets):
+        sheet = workbook.create_sheet(f"第三方设备{sheet_index + 1}")
+        sheet.append([C.TP_INPUT_VAR_NAME_COL, "变量描述", C.TP_INPUT_DATA_TYPE_COL, "PLC地址", "MODBUS地址",
+                      C.TP_INPUT_SLL_SET_COL, C.TP_INPUT_SL_SET_COL, C.TP_INPUT_SH_SET_COL, C.TP_INPUT_SHH_SET_COL])
+        for row in range(rows):
+            is_real = row % 2 == 0
+            sheet.append([f"D{sheet_index}_{row}", f"设备{sheet_index}点位{row}", "REAL" if is_real else "BOOL",
+                          f"%MD{row * 4}" if is_real else f"%MX{row}.0", 40001 + row,
+                          1 if row % 97 == 0 else None, None, 80 if is_real else None, None])
+    workbook.save(file_path)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: {elapsed:6.2f} s，错误 {len(result[1].splitlines()) if not result[0] else 0} 行")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="工作表并行校验基准测试")
+    parser.add_argument("--sheets", type=int, default=40, help="第三方设备表数量")
+    parser.add_argument("--rows", type=int, default=1000, help="每个第三方设备表的行数")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数，默认取CPU核数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "bench_validation.xlsx")
+        make_workbook(file_path, args.sheets, args.rows)
+        print(f"{args.sheets} 个第三方设备表 x {args.rows} 行，文件大小 {os.path.getsize(file_path) / 1024 / 1024:.1f} MB，"
+              f"CPU核数 {os.cpu_count()}")
+
+        print("直接从文件校验:")
+        sequential, expected = timed("顺序", lambda: validate_io_table(file_path, max_workers=1))
+        parallel, result = timed("并行", lambda: validate_io_table(file_path, max_workers=args.workers))
+        assert result == expected, "并行校验与顺序校验的结果不一致"
+        print(f"  加速 {sequential / parallel:.2f}x")
+
+        # 每次使用新读取的工作簿，避免 ParsedSheet.dataframe() 的缓存影响计时
+        print("共享读取（上传流程，不含读取时间）:")
+        workbook = ParsedWorkbook.read(file_path)
+        sequential, _ = timed("顺序", lambda: validate_io_table(file_path, workbook, max_workers=1))
+        workbook = ParsedWorkbook.read(file_path)
+        parallel, result = timed("并行", lambda: validate_io_table(file_path, workbook, max_workers=args.workers))
+        assert result == expected, "并行校验与顺序校验的结果不一致"
+        print(f"  加速 {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+第三方设备表并行解析基准测试
+
+生成一个包含主IO点表和 N 个第三方设备表（默认 40 个，每个 1000 行）的 .xlsx 文件，
+对比 load_workbook_data 按顺序解析 (max_workers=1) 和进程池并行解析第三方表的耗时，
+分别测试上传时的共享读取 (ParsedWorkbook.read 后传入) 和直接从文件加载两种调用方式。
+
+用法:
+    python benchmarks/bench_third_party_sheets.py --sheets 40 --rows 1000 --workers 4
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import openpyxl
+
+from core.post_upload_processor.uploaded_file_processor.excel_reader import MAIN_IO_SHEET_NAME, load_workbook_data
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+
+
+def make_workbook(file_path: str, sheets: int, rows: int) -> None:
+    workbook = openpyxl.Workbook(write_only=True)
+    main_sheet = workbook.create_sheet(MAIN_IO_SHEET_NAME)
+    main_sheet.append(["变量名称（HMI）", "变量描述", "数据类型", "PLC绝对地址", "上位机通讯地址"])
+    main_sheet.append(["PT_101", "进站压力", "REAL", "%MD100", "40101"])
+    for sheet_index in range(sheets):
+        sheet = workbook.create_sheet(f"第三方设备{sheet_index + 1}")
+        sheet.append(["变量名称", "变量描述", "数据类型", "PLC地址", "MODBUS地址", "SLL设定值", "SL设定值", "SH设定值", "SHH设定值"])
+        for row in range(rows):
+            is_real = row % 2 == 0
+            sheet.append([f"D{sheet_index}_{row}", f"设备{sheet_index}点位{row}", "REAL" if is_real else "BOOL",
+                          f"%MD{row * 4}" if is_real else f"%MX{row}.0", 40001 + row,
+                          None, None, 80 if is_real else None, None])
+    workbook.save(file_path)
+
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    points_by_sheet, error = fn()
+    elapsed = time.perf_counter() - start
+    count = sum(len(points) for points in points_by_sheet.values())
+    print(f"  {label}: {elapsed:6.2f} s，{len(points_by_sheet)} 个工作表，{count} 个点位{'，错误: ' + error if error else ''}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="第三方设备表并行解析基准测试")
+    parser.add_argument("--sheets", type=int, default=40, help="第三方设备表数量")
+    parser.add_argument("--rows", type=int, default=1000, help="每个第三方设备表的行数")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数，默认取CPU核数")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "bench_third_party.xlsx")
+        make_workbook(file_path, args.sheets, args.rows)
+        print(f"{args.sheets} 个第三方设备表 x {args.rows} 行，文件大小 {os.path.getsize(file_path) / 1024 / 1024:.1f} MB，"
+              f"CPU核数 {os.cpu_count()}")
+
+        workbook = ParsedWorkbook.read(file_path)
+        print("共享读取（上传流程，不含读取时间）:")
+        sequential = timed("顺序", lambda: load_workbook_data(file_path, workbook, max_workers=1))
+        parallel = timed("并行", lambda: load_workbook_data(file_path, workbook, max_workers=args.workers))
+        print(f"  加速 {sequential / parallel:.2f}x")
+
+        print("直接从文件加载:")
+        sequential = timed("顺序", lambda: load_workbook_data(file_path, max_workers=1))
+        parallel = timed("并行", lambda: load_workbook_data(file_path, max_workers=args.workers))
+        print(f"  加速 {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
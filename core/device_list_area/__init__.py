@@ -1,9 +1,10 @@
 # core/device_list_area/__init__.py 
 
-from .device_processor import format_device_data_for_ui
+from .device_processor import format_device_data_for_ui, to_plc_device_records
 from .device_service import DeviceService
 
 __all__ = [
     'format_device_data_for_ui',
+    'to_plc_device_records',
     'DeviceService'
 ] 
\ No newline at end of file
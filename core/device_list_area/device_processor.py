@@ -1,10 +1,18 @@
 """处理从API获取的设备列表数据，为UI准备数据"""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 import logging
 
+from core.io_table.device_instances import INSTANCE_COUNT_KEY, parse_device_quantity
+
 logger = logging.getLogger(__name__)
 
+# 设备清单表格展示、并传给PLC配置的子字段：名称、品牌、规格型号、技术参数、数量、单位、技术参数(外部)
+DEVICE_ROW_FIELDS = ('_widget_1635777115211', '_widget_1635777115248', '_widget_1635777115287',
+                     '_widget_1641439264111', '_widget_1635777485580', '_widget_1654703913698',
+                     '_widget_1641439463480')
+_ROW_QUANTITY_FIELD = '_widget_1635777485580'
+
 def format_device_data_for_ui(api_data: List[Dict[str, Any]], site_name: str) -> List[Dict[str, Any]]:
     """将API返回的场站设备数据列表格式化为DeviceListArea需要的格式。
     
@@ -33,4 +41,20 @@ def format_device_data_for_ui(api_data: List[Dict[str, Any]], site_name: str) ->
         elif device_list: # 如果字段存在但不是列表
             logger.warning(f"场站 '{site_name}' 的设备列表字段 '_widget_1635777115095' 不是列表: {type(device_list)}")
             
-    return all_devices 
\ No newline at end of file
+    return all_devices
+
+
+def to_plc_device_records(devices: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """把设备清单中的行转换为 IODataLoader.set_devices_data 需要的设备记录。
+
+    与从设备清单表格逐格读取得到的结果相同：字段值转为字符串，id 为行号（从1开始），
+    数量解析后记录在 instance_count 中，不按数量展开。
+    """
+    records = []
+    for row, device in enumerate(devices):
+        record = {'id': row + 1}
+        for field in DEVICE_ROW_FIELDS:
+            record[field] = str(device.get(field, ''))
+        record[INSTANCE_COUNT_KEY] = parse_device_quantity(record[_ROW_QUANTITY_FIELD])
+        records.append(record)
+    return records
@@ -1,34 +1,188 @@
 """设备列表服务，负责获取和处理特定场站的设备数据"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future
+import threading
 import logging
 
 # 依赖 API 客户端和数据处理器
-from core.query_area import JianDaoYunAPI
+from core.query_area import JianDaoYunAPI, TTLCache
+from core.query_area.response_cache import DEFAULT_CACHE_TTL, DEFAULT_CACHE_SIZE
 from .device_processor import format_device_data_for_ui
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PREFETCH_WORKERS = 4
+
 class DeviceService:
-    def __init__(self, jdy_api: JianDaoYunAPI):
+    def __init__(self, jdy_api: JianDaoYunAPI, max_workers: int = DEFAULT_PREFETCH_WORKERS,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, cache_size: int = DEFAULT_CACHE_SIZE):
         if not jdy_api:
             logger.error("DeviceService 初始化失败: 未提供 JianDaoYunAPI 实例。")
             raise ValueError("JianDaoYunAPI 实例是必需的")
         self.jdy_api = jdy_api
+        self.max_workers = max(1, max_workers)
+
+        # 设备数据缓存（查询和预取结果）：场站名称 -> 格式化后的设备列表
+        self._device_cache = TTLCache(ttl=cache_ttl, maxsize=cache_size)
+        # 正在进行中的预取任务：场站名称 -> Future
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
         logger.info("DeviceService 初始化完成。")
 
-    def get_formatted_devices(self, site_name: str) -> List[Dict[str, Any]]:
-        """获取并格式化指定场站的设备列表数据以供UI使用。"""
+    def get_formatted_devices(self, site_name: str, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """获取并格式化指定场站的设备列表数据以供UI使用。
+
+        如果该场站已有缓存（或正在预取），直接使用缓存结果，不再重复请求API。
+        force_refresh=True 时忽略缓存，强制从API重新获取。
+        """
+        if force_refresh:
+            self.invalidate(site_name)
+        else:
+            cached = self._device_cache.get(site_name)
+            if cached is not None:
+                logger.info(f"DeviceService: 场站 '{site_name}' 命中缓存 ({len(cached)} 条设备)，缓存统计: {self._device_cache.stats()}")
+                return list(cached)
+            with self._lock:
+                pending = self._pending.get(site_name)
+            if pending is not None:
+                try:
+                    logger.info(f"DeviceService: 等待场站 '{site_name}' 的预取任务完成。")
+                    return list(pending.result())
+                except Exception as e:
+                    logger.warning(f"DeviceService: 场站 '{site_name}' 预取失败 ({e})，改为直接查询。")
+
         try:
-            logger.info(f"DeviceService: 开始查询场站 '{site_name}' 的设备数据")
-            # 1. 调用 API 获取原始数据
-            response_data = self.jdy_api.query_site_devices(site_name)
-            
-            # 2. 调用处理器提取和格式化设备数据
-            all_devices = format_device_data_for_ui(response_data, site_name)
-            logger.info(f"DeviceService: 查询并格式化了场站 '{site_name}' 的 {len(all_devices)} 条设备数据。")
-            return all_devices
+            all_devices = self._fetch_devices(site_name)
+            self._device_cache.put(site_name, all_devices)
+            return list(all_devices)
         except Exception as e:
             logger.error(f"DeviceService 获取场站 '{site_name}' 设备数据失败: {e}", exc_info=True)
             # raise # 或者根据策略返回空列表
-            return [] 
\ No newline at end of file
+            return []
+
+    def iter_formatted_devices(self, site_name: str, force_refresh: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """逐页获取并格式化指定场站的设备数据，每收到一页立即产出，便于UI增量显示。
+
+        命中缓存或预取结果时整体作为一页产出；完整读取后的结果写入缓存。
+        中途失败时不缓存已获取的部分结果，并重新抛出异常，由调用者（后台任务）报告失败。
+        """
+        if force_refresh:
+            self.invalidate(site_name)
+        else:
+            cached = self._device_cache.get(site_name)
+            if cached is not None:
+                yield list(cached)
+                return
+            with self._lock:
+                pending = self._pending.get(site_name)
+            if pending is not None:
+                try:
+                    yield list(pending.result())
+                    return
+                except Exception as e:
+                    logger.warning(f"DeviceService: 场站 '{site_name}' 预取失败 ({e})，改为直接查询。")
+
+        all_devices: List[Dict[str, Any]] = []
+        try:
+            logger.info(f"DeviceService: 开始逐页查询场站 '{site_name}' 的设备数据")
+            for page in self.jdy_api.iter_site_devices(site_name):
+                formatted_page = format_device_data_for_ui(page, site_name)
+                all_devices.extend(formatted_page)
+                yield formatted_page
+        except Exception as e:
+            logger.error(f"DeviceService 逐页获取场站 '{site_name}' 设备数据失败 (已获取 {len(all_devices)} 条): {e}", exc_info=True)
+            raise
+
+        logger.info(f"DeviceService: 场站 '{site_name}' 逐页查询完成，共 {len(all_devices)} 条设备数据。")
+        self._device_cache.put(site_name, all_devices)
+
+    def _fetch_devices(self, site_name: str) -> List[Dict[str, Any]]:
+        """从API获取并格式化场站设备数据，失败时抛出异常。"""
+        logger.info(f"DeviceService: 开始查询场站 '{site_name}' 的设备数据")
+        # 1. 调用 API 获取原始数据
+        response_data = self.jdy_api.query_site_devices(site_name)
+
+        # 2. 调用处理器提取和格式化设备数据
+        all_devices = format_device_data_for_ui(response_data, site_name)
+        logger.info(f"DeviceService: 查询并格式化了场站 '{site_name}' 的 {len(all_devices)} 条设备数据。")
+        return all_devices
+
+    def prefetch_devices(self, site_names: Iterable[str]) -> Dict[str, Future]:
+        """在后台线程池中并发预取多个场站的设备清单。
+
+        该方法立即返回，不会阻塞调用者（例如UI线程）。
+        请求速率由 JianDaoYunAPI 的共享限速器控制。
+
+        Args:
+            site_names: 需要预取的场站名称，重复和空名称会被忽略。
+
+        Returns:
+            Dict[str, Future]: 本次新提交的预取任务。
+        """
+        submitted: Dict[str, Future] = {}
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="device-prefetch")
+            for site_name in dict.fromkeys(site_names):
+                if not site_name or site_name in self._device_cache or site_name in self._pending:
+                    continue
+                future = self._executor.submit(self._fetch_devices, site_name)
+                self._pending[site_name] = future
+                submitted[site_name] = future
+
+        # 在释放锁之后注册回调：任务已完成时回调会在当前线程立即执行，而回调本身需要获取锁
+        for site_name, future in submitted.items():
+            future.add_done_callback(
+                lambda f, name=site_name: self._on_prefetch_done(name, f)
+            )
+
+        if submitted:
+            logger.info(f"DeviceService: 已提交 {len(submitted)} 个场站的设备预取任务 (线程数: {self.max_workers})。")
+        return submitted
+
+    def _on_prefetch_done(self, site_name: str, future: Future):
+        """预取任务完成回调：成功时写入缓存。"""
+        with self._lock:
+            if self._pending.get(site_name) is not future:
+                return  # 已被失效或替换
+            del self._pending[site_name]
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None:
+                self._device_cache.put(site_name, future.result())
+        if error is not None:
+            logger.warning(f"DeviceService: 场站 '{site_name}' 设备预取失败: {error}")
+
+    def invalidate(self, site_name: str):
+        """使指定场站的缓存和预取结果失效。"""
+        self._device_cache.invalidate(site_name)
+        with self._lock:
+            self._pending.pop(site_name, None)
+        # 数据源为本地镜像时，同时要求镜像在下次读取时重新同步
+        invalidate_source = getattr(self.jdy_api, 'invalidate_site', None)
+        if invalidate_source:
+            invalidate_source(site_name)
+
+    def clear_cache(self):
+        """清空设备缓存，并取消尚未开始的预取任务。"""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._device_cache.clear()
+        logger.info("DeviceService: 设备缓存已清空。")
+
+    def cache_stats(self) -> Dict[str, int]:
+        """返回缓存命中/未命中统计。"""
+        return self._device_cache.stats()
+
+    def shutdown(self):
+        """关闭预取线程池（应用退出时调用）。"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,12 @@
 """IO表格相关模块"""
 
-from .get_data import IODataLoader, ModuleInfoProvider, DeviceDataProcessor, SystemSetupManager, PLCConfigurationHandler, print_generated_channel_addresses_summary
+from .get_data import IODataLoader, ModuleInfoProvider, DeviceDataProcessor, SystemSetupManager, PLCConfigurationHandler, print_generated_channel_addresses_summary, thaw_module
+from .device_instances import DeviceInstances, INSTANCE_COUNT_KEY, parse_device_quantity
 from .excel_exporter import IOExcelExporter
 
 __all__ = [
     "IODataLoader", "ModuleInfoProvider", "DeviceDataProcessor", "SystemSetupManager", 
-    "PLCConfigurationHandler", "print_generated_channel_addresses_summary",
+    "PLCConfigurationHandler", "print_generated_channel_addresses_summary", "thaw_module",
+    "DeviceInstances", "INSTANCE_COUNT_KEY", "parse_device_quantity",
     "IOExcelExporter"
 ] 
\ No newline at end of file
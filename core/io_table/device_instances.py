@@ -0,0 +1,110 @@
+"""按数量压缩的设备实例序列
+
+设备清单中一行设备带有数量（如 200 个 DI 模块），以前会在界面层展开成 200 个字典后再逐个处理。
+这里改为"一条记录 + 实例数量"的行程编码：分类和丰富化对每条记录只做一次，
+各个实例（带 instance_index）在访问时才生成。
+"""
+
+import bisect
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+INSTANCE_COUNT_KEY = 'instance_count'
+"""原始设备记录中表示实例数量的键，缺省时视为1个实例。"""
+
+
+def parse_device_quantity(quantity_str: Any) -> int:
+    """
+    把设备清单中的数量文本解析为实例数量。
+    空值按1处理；无法解析或小于1时也按1个实例处理（与原先逐个展开实例时的规则一致）。
+    """
+    try:
+        text = str(quantity_str).strip() if quantity_str is not None else ''
+        quantity = int(text) if text else 1
+    except (ValueError, TypeError):
+        return 1
+    return quantity if quantity > 0 else 1
+
+
+def get_instance_count(device: Dict[str, Any]) -> int:
+    """返回原始设备记录代表的实例数量"""
+    try:
+        count = int(device.get(INSTANCE_COUNT_KEY, 1))
+    except (ValueError, TypeError):
+        return 1
+    return count if count > 0 else 1
+
+
+class DeviceInstances(Sequence):
+    """
+    只读的设备实例序列，内部按 (记录, 实例数量) 存储。
+
+    第 k 个实例是记录的浅拷贝，并把 'instance_index' 设置为该实例在所属记录中的序号（从1开始），
+    与按数量逐个展开后得到的列表逐项相等。每次访问都会生成新的字典，修改它不会影响序列本身。
+    """
+
+    def __init__(self, runs: List[Tuple[Dict[str, Any], int]] = ()):
+        self._runs: List[Tuple[Dict[str, Any], int]] = [(record, count) for record, count in runs if count > 0]
+        self._offsets: List[int] = []
+        total = 0
+        for _, count in self._runs:
+            self._offsets.append(total)
+            total += count
+        self._length = total
+
+    @staticmethod
+    def _instance(record: Dict[str, Any], k: int) -> Dict[str, Any]:
+        instance = record.copy()
+        instance['instance_index'] = record.get('instance_index', 1) + k
+        return instance
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("DeviceInstances index out of range")
+        run = bisect.bisect_right(self._offsets, index) - 1
+        record, _ = self._runs[run]
+        return self._instance(record, index - self._offsets[run])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for record, count in self._runs:
+            for k in range(count):
+                yield self._instance(record, k)
+
+    def __repr__(self) -> str:
+        return f"DeviceInstances({len(self._runs)} records, {self._length} instances)"
+
+    def iter_runs(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """按顺序返回 (记录, 实例数量)，不生成实例"""
+        return iter(self._runs)
+
+    def iter_run_instances(self, record: Dict[str, Any], count: int) -> Iterator[Dict[str, Any]]:
+        """生成一条记录的各个实例（与 iter_runs 配合使用，只展开需要的记录）"""
+        for k in range(count):
+            yield self._instance(record, k)
+
+    def copy(self) -> List[Dict[str, Any]]:
+        """展开为普通列表（需要逐个实例的独立字典时使用；保存时应使用 iter_runs，保持按数量压缩的形式）"""
+        return list(self)
+
+
+def group_instances_by_record(devices: Iterable[Dict[str, Any]]
+                              ) -> Iterator[Tuple[Dict[str, Any], int, Iterator[Dict[str, Any]]]]:
+    """
+    按记录分组遍历设备实例，产出 (记录, 实例数量, 该记录的实例迭代器)。
+
+    DeviceInstances 按行程分组，只在需要时才生成实例；普通列表（如旧版缓存恢复的实例列表）中每个设备自成一组。
+    按型号、类型等记录级字段筛选时，每条记录只需判断一次，被排除的记录不会生成任何实例。
+    """
+    if isinstance(devices, DeviceInstances):
+        for record, count in devices.iter_runs():
+            yield record, count, devices.iter_run_instances(record, count)
+    else:
+        for device in devices:
+            yield device, 1, iter((device,))
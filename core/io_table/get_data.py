@@ -3,9 +3,14 @@
 import logging
 import json # 新增
 import os   # 新增
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Mapping, Sequence
+from types import MappingProxyType
 from datetime import datetime
 import re
+from functools import lru_cache
+
+from .keyword_matcher import KeywordMatcher, PrefixMatcher, build_text_blob
+from .device_instances import DeviceInstances, get_instance_count, group_instances_by_record
 
 # 移除: from .plc_modules import get_module_info_by_model, get_modules_by_type, get_all_modules, PLC_SERIES, MODULE_TYPE_PREFIXES
 
@@ -17,6 +22,8 @@ _JSON_FILE_PATH_GET_DATA = os.path.join(_SCRIPT_DIR_GET_DATA, '..', '..', 'db',
 
 _cached_modules_data_get_data: Optional[Dict[str, List[Dict[str, Any]]]] = None
 _module_data_load_error_get_data: Optional[Exception] = None
+# 大写型号 -> 模块定义 的索引，在首次查找时由JSON数据构建
+_cached_model_index_get_data: Optional[Dict[str, Dict[str, Any]]] = None
 
 # 模块类型映射 (原 MODULE_TYPE_PREFIXES)
 # 注意：DeviceDataProcessor 中也有一份类似的 IO_TYPE_MAPPINGS，但用途不同，
@@ -106,25 +113,79 @@ def _internal_get_all_modules_from_json() -> List[Dict[str, Any]]:
                 logger.warning(f"在JSON数据中，键 '{modules_key}' 的值不是一个列表。")
     return [module.copy() for module in all_modules_list]
 
+def _build_model_index(modules) -> Dict[str, Mapping[str, Any]]:
+    """按大写型号建立索引；型号重复时保留先出现的定义（与逐个查找的结果一致）。"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for module_def in modules:
+        index.setdefault(module_def.get("model", "").upper(), module_def)
+    return index
+
+def _internal_get_model_index() -> Dict[str, Dict[str, Any]]:
+    """内部函数：返回JSON模块数据的大写型号索引（只构建一次）。"""
+    global _cached_model_index_get_data
+    if _cached_model_index_get_data is not None:
+        return _cached_model_index_get_data
+    all_json_data = _internal_load_json_data()
+    if not all_json_data:
+        return {}
+    modules = []
+    for series_config_info in PLC_SERIES_CONFIG_DEF.values():
+        modules_key = series_config_info.get("modules_key")
+        if modules_key and isinstance(all_json_data.get(modules_key), list):
+            modules.extend(all_json_data[modules_key])
+    _cached_model_index_get_data = _build_model_index(modules)
+    return _cached_model_index_get_data
+
 def _internal_get_module_info_by_model(model: str) -> Dict[str, Any]:
     """
     内部函数：通过型号查找模块信息。会先从加载的JSON数据中查找，
     如果未找到，则尝试根据前缀等规则推断。
     """
-    model_upper = model.upper()
-    all_json_data = _internal_load_json_data()
-
-    if all_json_data:
-        for series_config_info in PLC_SERIES_CONFIG_DEF.values():
-            modules_key = series_config_info.get("modules_key")
-            if modules_key and modules_key in all_json_data:
-                module_list = all_json_data.get(modules_key, [])
-                for module_def in module_list:
-                    if module_def.get("model", "").upper() == model_upper:
-                        return module_def.copy()
-    else:
+    model_index = _internal_get_model_index()
+    if not model_index:
         logger.warning("无法加载模块JSON数据，_internal_get_module_info_by_model 将仅依赖推断逻辑。")
+    module_def = model_index.get(model.upper())
+    if module_def is not None:
+        return thaw_module(module_def)
+    return thaw_module(_internal_infer_module_info(model))
+
+def _freeze_value(value: Any) -> Any:
+    """递归复制为只读结构：字典变为只读视图，列表变为元组"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze_value(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v) for v in value)
+    return value
+
+def _thaw_value(value: Any) -> Any:
+    """_freeze_value 的逆操作：只读视图变为字典，元组变为列表"""
+    if isinstance(value, Mapping):
+        return {k: _thaw_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw_value(v) for v in value]
+    return value
+
+def _freeze_module(module_def: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    将模块定义复制为只读视图，供多个调用方共享同一实例。
+    嵌套的值（如 sub_channels、details）同样被复制为只读结构，任何调用方都无法修改共享的数据。
+    只读视图支持 get / [] / in / items 等读取操作；需要修改或保存时调用 thaw_module 得到普通字典。
+    """
+    return _freeze_value(module_def)
 
+def thaw_module(module: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    将模块信息（包括只读视图）复制为可修改的普通字典，嵌套的只读结构也一并转换（可直接JSON序列化）。
+    只读视图的 .copy() 只复制第一层，嵌套值仍是只读结构；需要保存或修改嵌套值时使用本函数。
+    """
+    return _thaw_value(module)
+
+@lru_cache(maxsize=1024)
+def _internal_infer_module_info(model: str) -> Mapping[str, Any]:
+    """
+    内部函数：根据型号前缀推断模块信息。结果按型号字符串缓存，以只读视图返回。
+    """
+    model_upper = model.upper()
     module_type = "未录入"
     channels = 0
     description = f"未知模块 ({model})" # 使用原始 model 字符串
@@ -168,7 +229,7 @@ def _internal_get_module_info_by_model(model: str) -> Dict[str, Any]:
         "slot_required": 1 if module_type == "DP" else None
     }
     if sub_channels: result["sub_channels"] = sub_channels
-    return result
+    return _freeze_module(result)
 # --- 迁移结束 ---
 
 class ModuleInfoProvider:
@@ -178,49 +239,44 @@ class ModuleInfoProvider:
     处理所有预定义模块的缓存和按需检索，并包含型号推断逻辑。
     """
     def __init__(self):
-        """构造函数，初始化时加载所有预定义模块。"""
-        self.predefined_modules: List[Dict[str, Any]] = _internal_get_all_modules_from_json()
-        if not self.predefined_modules and _module_data_load_error_get_data is not None:
+        """构造函数，初始化时加载所有预定义模块，并建立大写型号索引。
+
+        模块定义以只读视图 (MappingProxyType，嵌套值同样只读) 保存，查询方法直接返回共享的只读实例，不再逐个复制。
+        调用方需要修改时应先调用 thaw_module 得到普通字典。
+        """
+        modules = _internal_get_all_modules_from_json()
+        if not modules and _module_data_load_error_get_data is not None:
             logger.error(f"ModuleInfoProvider 初始化失败，因为无法从JSON加载模块数据: {_module_data_load_error_get_data}")
-            # 即使加载失败，也初始化为空列表以避免后续AttributeError
-            self.predefined_modules = []
+            # 即使加载失败，也初始化为空元组以避免后续AttributeError
+            modules = []
         else:
-            logger.info(f"ModuleInfoProvider initialized with {len(self.predefined_modules)} predefined modules from JSON.")
+            logger.info(f"ModuleInfoProvider initialized with {len(modules)} predefined modules from JSON.")
+        self.predefined_modules: Tuple[Mapping[str, Any], ...] = tuple(_freeze_module(m) for m in modules)
+        # 大写型号 -> 模块定义，替代每次查找时的线性扫描
+        self._model_index: Dict[str, Mapping[str, Any]] = _build_model_index(self.predefined_modules)
 
-    def get_all_predefined_modules(self) -> List[Dict[str, Any]]:
-        """返回所有预定义模块的深拷贝列表，以防止外部直接修改缓存。"""
-        return [module.copy() for module in self.predefined_modules]
+    def get_all_predefined_modules(self) -> Tuple[Mapping[str, Any], ...]:
+        """返回所有预定义模块（共享的只读视图元组）。"""
+        return self.predefined_modules
 
-    def get_predefined_module_by_model(self, model_str: str) -> Optional[Dict[str, Any]]:
+    def get_predefined_module_by_model(self, model_str: str) -> Optional[Mapping[str, Any]]:
         """
-        根据精确的模块型号字符串从缓存的预定义模块列表中查找模块。
+        根据精确的模块型号字符串从缓存的预定义模块列表中查找模块（返回只读视图）。
         """
-        model_upper = model_str.upper()
-        for module in self.predefined_modules: # self.predefined_modules 是从JSON加载的
-            if module.get("model", "").upper() == model_upper:
-                return module.copy()
-        return None
+        return self._model_index.get(model_str.upper())
 
-    def get_inferred_module_info(self, model_str: str) -> Optional[Dict[str, Any]]:
+    def get_inferred_module_info(self, model_str: str) -> Optional[Mapping[str, Any]]:
         """
         获取模块信息，首先尝试从预定义（JSON加载）的模块中精确查找，
         如果未找到，则使用内部的推断逻辑（原 plc_modules.get_module_info_by_model 的功能）。
+        推断结果按型号字符串缓存，重复查询同一型号时不再重新推断。返回只读视图。
         """
-        # 尝试精确匹配 (已在 get_predefined_module_by_model 中实现，但这里直接用内部缓存)
         exact_match = self.get_predefined_module_by_model(model_str)
         if exact_match:
             return exact_match
         
-        # 如果精确匹配失败，则使用内部推断逻辑
-        # _internal_get_module_info_by_model 已经包含了先查JSON再推断的逻辑，
-        # 但为了明确区分 ModuleInfoProvider 的职责（提供信息，包括推断），
-        # 理想情况下，推断逻辑本身也应该封装或调用。
-        # 此处直接调用 _internal_get_module_info_by_model，它会先尝试JSON（虽然我们这里已经试过了），
-        # 然后进行推断。
-        # 为避免重复JSON查找，可以考虑_internal_get_module_info_by_model只做推断部分。
-        # 暂定：直接调用，它内部会处理。
         logger.debug(f"Model '{model_str}' not in predefined JSON list, attempting inference.")
-        return _internal_get_module_info_by_model(model_str)
+        return _internal_infer_module_info(model_str)
 
 class DeviceDataProcessor:
     """
@@ -250,6 +306,10 @@ class DeviceDataProcessor:
     }
     """不同IO类型的默认通道数，用于信息不完整时的推断。"""
 
+    _HOLLYSYS_LABEL = '__HOLLYSYS__'
+    _LE5118_LABEL = '__LE5118__'
+    """关键字匹配器中用于品牌识别的内部标签（不会与IO类型重名）。"""
+
     def __init__(self, module_info_provider: ModuleInfoProvider, hollysys_prefixes: List[str]):
         """
         构造函数。
@@ -260,6 +320,18 @@ class DeviceDataProcessor:
         """
         self.module_info_provider = module_info_provider
         self.hollysys_prefixes = hollysys_prefixes
+        self._hollysys_prefix_tuple = tuple(p.upper() for p in hollysys_prefixes)
+        # 关键字和型号前缀在构造时统一编译，避免对每个设备逐个关键字查找
+        self._io_type_matcher = KeywordMatcher({
+            **self.IO_TYPE_MAPPINGS,
+            self._HOLLYSYS_LABEL: ['和利时', 'HOLLYSYS'],
+            self._LE5118_LABEL: ['LE5118'],
+        })
+        self._type_prefix_matcher = PrefixMatcher({
+            type_key: prefixes for type_key, prefixes in MODULE_TYPE_PREFIXES_DEF.items()
+            if type_key in self.IO_TYPE_MAPPINGS
+        })
+        self._filter_matchers: Dict[Tuple[str, ...], KeywordMatcher] = {}
         logger.info("DeviceDataProcessor initialized.")
 
     def process_raw_device_list(self, raw_devices_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -274,37 +346,52 @@ class DeviceDataProcessor:
             List[Dict[str, Any]]: 处理和标准化后的设备数据列表。
         """
         processed_data = []
-        # 定义原始字段到标准字段的映射关系
-        field_mapping = {
-            '_widget_1635777115211': 'name', '_widget_1635777115248': 'brand',
-            '_widget_1635777115287': 'model', '_widget_1641439264111': 'description',
-            '_widget_1635777485580': 'quantity', '_widget_1654703913698': 'unit',
-            '_widget_1641439463480': 'ext_params'
-        }
         for i, device in enumerate(raw_devices_data):
-            try:
-                processed_device = {'id': device.get('id', i + 1), 'instance_index': device.get('instance_index', 1)}
-                for widget_field, standard_field in field_mapping.items():
-                    processed_device[standard_field] = device.get(widget_field, '').strip()
-                    # 保留原始的widget字段（如果系统的其他部分需要它们），
-                    # 但对于此处理器，标准字段是主要的。
-                    # processed_device[widget_field] = device.get(widget_field, '').strip() 
-                
-                # 如果没有明确的'type'字段，则使用'name'字段作为默认类型
-                if 'type' not in processed_device: processed_device['type'] = processed_device.get('name', '')
-                # 如果'model'为空但'brand'存在，则尝试使用'brand'作为'model' (某些情况下的兼容处理)
-                if not processed_device.get('model') and processed_device.get('brand'):
-                    processed_device['model'] = processed_device['brand']
-                
-                # 推断IO类型和通道数
-                processed_device['io_type'] = self._determine_io_type_internal(processed_device)
-                processed_device['channels'] = self._determine_channels_internal(processed_device)
+            processed_device = self._normalize_raw_device(device, i)
+            if processed_device is not None:
                 processed_data.append(processed_device)
-            except Exception as e:
-                logger.warning(f"Error processing raw device data (device #{i+1}, model: {device.get('model', 'N/A')}): {e}", exc_info=True)
         return processed_data
 
-    def _determine_io_type_internal(self, device: Dict[str, Any]) -> str:
+    # 原始字段到标准字段的映射关系
+    _FIELD_MAPPING = {
+        '_widget_1635777115211': 'name', '_widget_1635777115248': 'brand',
+        '_widget_1635777115287': 'model', '_widget_1641439264111': 'description',
+        '_widget_1635777485580': 'quantity', '_widget_1654703913698': 'unit',
+        '_widget_1641439463480': 'ext_params'
+    }
+
+    def _normalize_raw_device(self, device: Dict[str, Any], i: int) -> Optional[Dict[str, Any]]:
+        """
+        内部辅助方法：把单条原始设备数据转换为标准化格式并推断IO类型和通道数。
+        处理失败时记录警告并返回 None。
+        """
+        try:
+            processed_device = self._normalize_raw_fields(device, i)
+            # 推断IO类型和通道数
+            processed_device['io_type'] = self._determine_io_type_internal(processed_device)
+            processed_device['channels'] = self._determine_channels_internal(processed_device)
+            return processed_device
+        except Exception as e:
+            logger.warning(f"Error processing raw device data (device #{i+1}, model: {device.get('model', 'N/A')}): {e}", exc_info=True)
+            return None
+
+    def _normalize_raw_fields(self, device: Dict[str, Any], i: int) -> Dict[str, Any]:
+        """内部辅助方法：只做字段映射和默认值处理，不推断IO类型和通道数。"""
+        processed_device = {'id': device.get('id', i + 1), 'instance_index': device.get('instance_index', 1)}
+        for widget_field, standard_field in self._FIELD_MAPPING.items():
+            processed_device[standard_field] = device.get(widget_field, '').strip()
+            # 保留原始的widget字段（如果系统的其他部分需要它们），
+            # 但对于此处理器，标准字段是主要的。
+            # processed_device[widget_field] = device.get(widget_field, '').strip() 
+        
+        # 如果没有明确的'type'字段，则使用'name'字段作为默认类型
+        if 'type' not in processed_device: processed_device['type'] = processed_device.get('name', '')
+        # 如果'model'为空但'brand'存在，则尝试使用'brand'作为'model' (某些情况下的兼容处理)
+        if not processed_device.get('model') and processed_device.get('brand'):
+            processed_device['model'] = processed_device['brand']
+        return processed_device
+
+    def _determine_io_type_internal(self, device: Dict[str, Any], text_upper: Optional[str] = None) -> str:
         """
         内部辅助方法：根据设备信息推断其IO类型。
         推断顺序：
@@ -315,6 +402,7 @@ class DeviceDataProcessor:
         
         Args:
             device (Dict[str, Any]): 单个设备的标准化数据。
+            text_upper (Optional[str]): 已由 build_text_blob 拼接好的设备文本，未提供时现场拼接。
 
         Returns:
             str: 推断出的IO类型字符串，如果无法推断则为 '未录入'。
@@ -336,36 +424,31 @@ class DeviceDataProcessor:
                     return inferred_type
 
         # 如果预定义信息中没有，则回退到基于文本的推断
-        brand = device.get('brand', '').upper()
-        name = device.get('name', '').upper()
-        device_type_field = device.get('type', name).upper() # 设备自身的 'type' 字段或名称
-        description = device.get('description', '').upper()
-        ext_params = device.get('ext_params', '').upper()
-        # 组合所有相关文本内容进行关键字搜索
-        all_text_content = f"{model_str} {brand} {name} {device_type_field} {description} {ext_params}"
+        # 组合所有相关文本内容，用预编译的匹配器一次扫描得到所有命中的关键字类别
+        if text_upper is None:
+            text_upper = build_text_blob(device)
+        matched = self._io_type_matcher.matched_labels(text_upper)
 
         # 使用传入的前缀列表检查是否为和利时产品
-        is_hollysys_by_prefix = any(model_str.startswith(prefix.upper()) for prefix in self.hollysys_prefixes)
+        is_hollysys_by_prefix = model_str.startswith(self._hollysys_prefix_tuple)
         # 通过品牌或文本内容中的关键字判断是否为和利时产品
-        is_hollysys_by_keyword = '和利时' in brand or 'HOLLYSYS' in brand or \
-                               '和利时' in all_text_content or 'HOLLYSYS' in all_text_content
+        is_hollysys_by_keyword = self._HOLLYSYS_LABEL in matched
         
         if is_hollysys_by_prefix or is_hollysys_by_keyword:
             # 如果是和利时产品，尝试更具体的型号前缀匹配 (使用在 get_data.py 中定义的 MODULE_TYPE_PREFIXES_DEF)
-            for type_key, prefixes_list in MODULE_TYPE_PREFIXES_DEF.items(): # 修改这里
-                if any(model_str.startswith(p.upper()) for p in prefixes_list):
-                    if type_key in self.IO_TYPE_MAPPINGS:
-                        logger.debug(f"通过前缀匹配识别设备类型: {model_str} -> {type_key}")
-                        return type_key
+            type_key = self._type_prefix_matcher.first_label(model_str)
+            if type_key:
+                logger.debug(f"通过前缀匹配识别设备类型: {model_str} -> {type_key}")
+                return type_key
 
             # 特殊处理LE5118的识别
-            if 'LE5118' in model_str or 'LE5118' in all_text_content:
+            if self._LE5118_LABEL in matched:
                 logger.info(f"特殊识别LE5118 CPU设备: {model_str}")
                 return 'CPU'
         
-        # 通用关键字匹配
-        for io_type, keywords in self.IO_TYPE_MAPPINGS.items():
-            if any(keyword.upper() in all_text_content for keyword in keywords):
+        # 通用关键字匹配（按 IO_TYPE_MAPPINGS 的顺序取第一个命中的类型）
+        for io_type in self.IO_TYPE_MAPPINGS:
+            if io_type in matched:
                 return io_type
         
         # 特定遗留规则：如型号中包含'1616'则认为是'DI/DO'
@@ -430,54 +513,17 @@ class DeviceDataProcessor:
         """
         hollysys_devices = []
         rack_devices_lk117 = [] # 单独存放LK117机架，以便后续统一处理
+        keyword_matcher = self._get_filter_matcher(known_hollysys_keywords)
 
         for device in devices:
-            model_upper = device.get('model', '').upper() # 标准化后的型号
-            brand_upper = device.get('brand', '').upper()
-            name_upper = device.get('name', '').upper()
-            
-            # 组合所有相关文本字段用于关键字搜索
-            all_text_upper = f"{model_upper} {brand_upper} {name_upper} " \
-                             f"{device.get('type', name_upper).upper()} " \
-                             f"{device.get('description', '').upper()} " \
-                             f"{device.get('ext_params', '').upper()}"
-
-            # 通过关键字或型号前缀判断是否为和利时产品
-            is_hollysys_by_keyword = any(keyword.upper() in all_text_upper for keyword in known_hollysys_keywords)
-            is_hollysys_by_prefix = any(model_upper.startswith(prefix.upper()) for prefix in self.hollysys_prefixes)
-
-            # 特殊处理LE系列设备识别
-            is_le_series = model_upper.startswith('LE') or 'LE5118' in all_text_upper
-
-            if is_hollysys_by_keyword or is_hollysys_by_prefix or is_le_series:
-                # 记录识别到的和利时设备
-                if is_le_series:
-                    logger.info(f"识别到LE系列设备: {model_upper} (通过LE系列特殊识别)")
-                elif is_hollysys_by_prefix:
-                    logger.debug(f"识别到和利时设备: {model_upper} (通过前缀识别)")
-                elif is_hollysys_by_keyword:
-                    logger.debug(f"识别到和利时设备: {model_upper} (通过关键字识别)")
-
-                # 如果是和利时产品，再检查是否为LK117机架
-                if "LK117" == model_upper:
-                    device['model'] = 'LK117' # 标准化型号名称
-                    quantity_str = device.get('quantity', '1')
-                    # 确保数量为有效正整数，否则默认为1
-                    try:
-                        quantity_val = int(quantity_str)
-                        if quantity_val < 1: quantity_val = 1
-                    except (ValueError, TypeError):
-                        quantity_val = 1
-                    device['quantity'] = str(quantity_val) # 存回字符串形式，或统一为整数
-                    rack_devices_lk117.append(device)
-                    logger.debug(f"添加LK117机架设备: {device}")
-                else:
-                    # 其他和利时模块直接添加
-                    hollysys_devices.append(device)
-                    if is_le_series:
-                        logger.info(f"添加LE系列设备到和利时设备列表: {device}")
-                    else:
-                        logger.debug(f"添加和利时设备: {model_upper}")
+            if not self._is_hollysys_device(device, keyword_matcher):
+                continue
+            # 如果是和利时产品，再检查是否为LK117机架
+            if self._normalize_rack_device(device):
+                rack_devices_lk117.append(device)
+            else:
+                # 其他和利时模块直接添加
+                hollysys_devices.append(device)
         
         # 如果找到了LK117机架，将它们添加到结果列表的末尾（或开头，根据需求）
         if rack_devices_lk117:
@@ -487,6 +533,60 @@ class DeviceDataProcessor:
         logger.info(f"Filtered to {len(hollysys_devices)} Hollysys devices (including racks) from {len(devices)} processed devices.")
         return hollysys_devices
 
+    def _get_filter_matcher(self, known_hollysys_keywords: List[str]) -> KeywordMatcher:
+        """内部辅助方法：返回筛选用的关键字匹配器，同一组关键字只编译一次。"""
+        keywords_key = tuple(known_hollysys_keywords)
+        keyword_matcher = self._filter_matchers.get(keywords_key)
+        if keyword_matcher is None:
+            keyword_matcher = self._filter_matchers[keywords_key] = KeywordMatcher({'hollysys': keywords_key})
+        return keyword_matcher
+
+    def _is_hollysys_device(self, device: Dict[str, Any], keyword_matcher: KeywordMatcher,
+                            all_text_upper: Optional[str] = None) -> bool:
+        """内部辅助方法：通过关键字、型号前缀或LE系列特征判断单个已标准化设备是否为和利时产品。"""
+        model_upper = device.get('model', '').upper() # 标准化后的型号
+        
+        # 组合所有相关文本字段用于关键字搜索
+        if all_text_upper is None:
+            all_text_upper = build_text_blob(device)
+
+        # 通过关键字或型号前缀判断是否为和利时产品
+        is_hollysys_by_keyword = keyword_matcher.contains_any(all_text_upper)
+        is_hollysys_by_prefix = model_upper.startswith(self._hollysys_prefix_tuple)
+
+        # 特殊处理LE系列设备识别
+        is_le_series = model_upper.startswith('LE') or 'LE5118' in all_text_upper
+
+        if not (is_hollysys_by_keyword or is_hollysys_by_prefix or is_le_series):
+            return False
+
+        # 记录识别到的和利时设备
+        if is_le_series:
+            logger.info(f"识别到LE系列设备: {model_upper} (通过LE系列特殊识别)")
+        elif is_hollysys_by_prefix:
+            logger.debug(f"识别到和利时设备: {model_upper} (通过前缀识别)")
+        elif is_hollysys_by_keyword:
+            logger.debug(f"识别到和利时设备: {model_upper} (通过关键字识别)")
+        return True
+
+    def _normalize_rack_device(self, device: Dict[str, Any]) -> bool:
+        """
+        内部辅助方法：如果设备是LK117机架，则就地标准化其型号和数量并返回 True。
+        """
+        if "LK117" != device.get('model', '').upper():
+            return False
+        device['model'] = 'LK117' # 标准化型号名称
+        quantity_str = device.get('quantity', '1')
+        # 确保数量为有效正整数，否则默认为1
+        try:
+            quantity_val = int(quantity_str)
+            if quantity_val < 1: quantity_val = 1
+        except (ValueError, TypeError):
+            quantity_val = 1
+        device['quantity'] = str(quantity_val) # 存回字符串形式，或统一为整数
+        logger.debug(f"添加LK117机架设备: {device}")
+        return True
+
     def enrich_device_data(self, device_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         使用预定义的模块详细信息来丰富（补充）设备数据列表。
@@ -503,50 +603,160 @@ class DeviceDataProcessor:
         enriched_list = []
         for device in device_data_list:
             enriched_device = device.copy() # 对副本进行操作，不修改原始传入列表中的字典
-            model_str = enriched_device.get('model', '')
-            
-            if model_str:
-                # 优先使用精确匹配的预定义模块作为信息来源进行丰富
-                module_definition = self.module_info_provider.get_predefined_module_by_model(model_str)
-                if not module_definition: # 如果精确匹配未找到，尝试使用推断逻辑获取
-                    module_definition = self.module_info_provider.get_inferred_module_info(model_str)
-
-                if module_definition:
-                    # 定义需要从预定义模块更新到设备对象中的字段
-                    update_fields = {
-                        'type': module_definition.get('type'),
-                        # 假设预定义模块的'type'字段就是其IO类型，用于统一
-                        'io_type': module_definition.get('type'),
-                        'channels': module_definition.get('channels'),
-                        # 使用'predefined_description'作为键，以避免覆盖设备本身可能已有的、更具体的描述
-                        'predefined_description': module_definition.get('description')
-                    }
-                    # 复制其他重要的结构性字段（如果预定义模块中存在这些字段）
-                    for key in ['sub_channels', 'power_supply', 'is_master', 'slot_required']:
-                        if key in module_definition:
-                            update_fields[key] = module_definition[key]
-
-                    # 应用更新
-                    enriched_device.update(update_fields)
-
-                    # 如果设备原始描述为空，并且预定义模块有描述，则使用预定义的描述
-                    if not enriched_device.get('description') and update_fields.get('predefined_description'):
-                        enriched_device['description'] = update_fields['predefined_description']
-
-                # 特殊处理LE5118设备 - 确保其类型被正确设置为CPU
-                model_upper = model_str.upper()
-                if 'LE5118' in model_upper:
-                    enriched_device['type'] = 'CPU'
-                    enriched_device['io_type'] = 'CPU'
-                    if not enriched_device.get('description'):
-                        enriched_device['description'] = 'LE系列CPU模块'
-                    logger.info(f"强制设置LE5118设备类型为CPU: {model_str} -> {enriched_device}")
-
-                logger.debug(f"Device '{model_str}' enriched. Final type: {enriched_device.get('type')}, "
-                             f"Channels: {enriched_device.get('channels')}, SubChannels: {enriched_device.get('sub_channels')}")
+            self._enrich_device_in_place(enriched_device)
             enriched_list.append(enriched_device)
         return enriched_list
 
+    def _enrich_device_in_place(self, enriched_device: Dict[str, Any]) -> None:
+        """内部辅助方法：用预定义模块信息就地丰富单个设备字典。"""
+        model_str = enriched_device.get('model', '')
+        if not model_str:
+            return
+
+        # 优先使用精确匹配的预定义模块作为信息来源进行丰富
+        module_definition = self.module_info_provider.get_predefined_module_by_model(model_str)
+        if not module_definition: # 如果精确匹配未找到，尝试使用推断逻辑获取
+            module_definition = self.module_info_provider.get_inferred_module_info(model_str)
+
+        if module_definition:
+            # 定义需要从预定义模块更新到设备对象中的字段
+            update_fields = {
+                'type': module_definition.get('type'),
+                # 假设预定义模块的'type'字段就是其IO类型，用于统一
+                'io_type': module_definition.get('type'),
+                'channels': module_definition.get('channels'),
+                # 使用'predefined_description'作为键，以避免覆盖设备本身可能已有的、更具体的描述
+                'predefined_description': module_definition.get('description')
+            }
+            # 复制其他重要的结构性字段（如果预定义模块中存在这些字段）
+            for key in ['sub_channels', 'power_supply', 'is_master', 'slot_required']:
+                if key in module_definition:
+                    # 复制为普通结构：模块定义是共享的只读视图，设备数据需要可修改、可JSON序列化
+                    update_fields[key] = _thaw_value(module_definition[key])
+
+            # 应用更新
+            enriched_device.update(update_fields)
+
+            # 如果设备原始描述为空，并且预定义模块有描述，则使用预定义的描述
+            if not enriched_device.get('description') and update_fields.get('predefined_description'):
+                enriched_device['description'] = update_fields['predefined_description']
+
+        # 特殊处理LE5118设备 - 确保其类型被正确设置为CPU
+        model_upper = model_str.upper()
+        if 'LE5118' in model_upper:
+            enriched_device['type'] = 'CPU'
+            enriched_device['io_type'] = 'CPU'
+            if not enriched_device.get('description'):
+                enriched_device['description'] = 'LE系列CPU模块'
+            logger.info(f"强制设置LE5118设备类型为CPU: {model_str} -> {enriched_device}")
+
+        logger.debug(f"Device '{model_str}' enriched. Final type: {enriched_device.get('type')}, "
+                     f"Channels: {enriched_device.get('channels')}, SubChannels: {enriched_device.get('sub_channels')}")
+
+    def process_hollysys_devices(self, raw_devices_data: List[Dict[str, Any]], known_hollysys_keywords: List[str],
+                                 system_facts: Optional['SystemSetupFacts'] = None) -> DeviceInstances:
+        """
+        单次遍历完成标准化、和利时筛选和丰富化，结果与依次调用
+        `process_raw_device_list` -> `filter_hollysys_devices` -> `enrich_device_data` 相同。
+
+        每条记录只创建一个字典（标准化时新建，之后就地筛选和丰富化），非和利时设备在字段标准化后立即丢弃，
+        不再推断其IO类型和通道数。
+        原始记录可以带有 'instance_count'（见 `device_instances.INSTANCE_COUNT_KEY`）表示同一设备的实例数量，
+        此时分类和丰富化只做一次，返回的序列在访问时才生成各个实例；
+        与先按数量展开成多个记录（instance_index 依次为1..N）再处理的结果逐项相等。
+        如果传入 system_facts，会同时把每个保留的设备（按实例数量）交给它统计，
+        之后可直接用 `SystemSetupManager.apply_system_facts` 计算机架，无需再遍历一次列表。
+
+        Args:
+            raw_devices_data (List[Dict[str, Any]]): 原始设备数据列表。
+            known_hollysys_keywords (List[str]): 用于识别和利时产品的关键字列表。
+            system_facts (Optional[SystemSetupFacts]): 可选的系统设置统计对象。
+
+        Returns:
+            DeviceInstances: 丰富化后的和利时设备实例序列，LK117机架排在末尾。
+        """
+        hollysys_runs = []
+        rack_runs_lk117 = []
+        keyword_matcher = self._get_filter_matcher(known_hollysys_keywords)
+
+        for i, raw_device in enumerate(raw_devices_data):
+            try:
+                device = self._normalize_raw_fields(raw_device, i)
+                # 筛选只依赖标准化后的文本字段，先筛选再推断，第三方设备不再做IO类型和通道推断；
+                # 拼接的设备文本在筛选和IO类型推断之间共用
+                text_upper = build_text_blob(device)
+                if not self._is_hollysys_device(device, keyword_matcher, text_upper):
+                    continue
+                device['io_type'] = self._determine_io_type_internal(device, text_upper)
+                device['channels'] = self._determine_channels_internal(device)
+            except Exception as e:
+                logger.warning(f"Error processing raw device data (device #{i+1}, model: {raw_device.get('model', 'N/A')}): {e}", exc_info=True)
+                continue
+            count = get_instance_count(raw_device)
+            if self._normalize_rack_device(device):
+                rack_runs_lk117.append((device, count))
+            else:
+                hollysys_runs.append((device, count))
+            self._enrich_device_in_place(device)
+            if system_facts is not None:
+                system_facts.add_device(device, count)
+
+        if rack_runs_lk117:
+            hollysys_runs.extend(rack_runs_lk117)
+            logger.info(f"Identified {sum(count for _, count in rack_runs_lk117)} LK117 rack device(s) within Hollysys products.")
+
+        hollysys_devices = DeviceInstances(hollysys_runs)
+        logger.info(f"Processed {len(raw_devices_data)} raw device records in one pass, "
+                    f"{len(hollysys_devices)} Hollysys device instances (including racks) kept.")
+        return hollysys_devices
+
+class SystemSetupFacts:
+    """
+    计算系统设置所需的设备统计信息（LE系列CPU数量、LK117机架数量、设备总数）。
+    可以在遍历设备列表的同时逐个累加，然后交给 `SystemSetupManager.apply_system_facts` 使用。
+    """
+
+    def __init__(self):
+        self.le_cpu_count: int = 0
+        self.lk117_count: int = 0
+        self.device_count: int = 0
+
+    def add_device(self, device: Dict[str, Any], count: int = 1) -> None:
+        """统计单个已丰富化的设备，count 为该设备的实例数量"""
+        self.device_count += count
+        model = device.get('model', '').upper()
+        if model == 'LK117':
+            self.lk117_count += count
+        if self._is_le_cpu(device, model):
+            self.le_cpu_count += count
+
+    @staticmethod
+    def _is_le_cpu(device: Dict[str, Any], model: str) -> bool:
+        """多种方式检测LE系列CPU"""
+        device_type = device.get('type', '').upper()
+        if device_type != 'CPU':
+            return False
+
+        # 1. 精确匹配LE5118
+        if model == 'LE5118':
+            logger.info(f"检测到LE5118 CPU模块: {device}")
+            return True
+        # 2. 模糊匹配LE5118（处理可能的变体）
+        if 'LE5118' in model:
+            logger.info(f"检测到LE5118变体CPU模块: {device}")
+            return True
+        # 3. 检查LE系列前缀且类型为CPU
+        if model.startswith('LE51'):
+            logger.info(f"检测到LE51系列CPU模块: {device}")
+            return True
+        # 4. 检查设备名称或描述中是否包含LE5118
+        name = device.get('name', '').upper()
+        description = device.get('description', '').upper()
+        if 'LE5118' in name or 'LE5118' in description:
+            logger.info(f"通过名称/描述检测到LE5118 CPU: {device}")
+            return True
+        return False
+
 class SystemSetupManager:
     """
     系统设置管理器。
@@ -583,71 +793,45 @@ class SystemSetupManager:
             processed_enriched_devices (List[Dict[str, Any]]): 经过DeviceDataProcessor处理后的设备数据列表。
                                                                此列表应用于已包含准确的模块型号和类型信息。
         """
-        self.system_type = "LK" # 每次重新计算前，重置系统类型为默认值 "LK"
+        facts = SystemSetupFacts()
+        for device in processed_enriched_devices:
+            facts.add_device(device)
+        self.apply_system_facts(facts)
 
-        # 增强的LE系列CPU检测逻辑
-        le_cpu_devices = []
+    def apply_system_facts(self, facts: SystemSetupFacts):
+        """
+        根据已统计的设备信息确定PLC的系统类型和机架配置。
+        `DeviceDataProcessor.process_hollysys_devices` 在处理设备的同时完成统计，此时不必再遍历设备列表。
 
-        # 检查是否存在 LE5118 或其他LE系列CPU模块
-        for device in processed_enriched_devices:
-            model = device.get('model', '').upper()
-            device_type = device.get('type', '').upper()
-
-            # 多种方式检测LE系列CPU
-            is_le_cpu = False
-
-            # 1. 精确匹配LE5118
-            if model == 'LE5118' and device_type == 'CPU':
-                is_le_cpu = True
-                logger.info(f"检测到LE5118 CPU模块: {device}")
-
-            # 2. 模糊匹配LE5118（处理可能的变体）
-            elif 'LE5118' in model and device_type == 'CPU':
-                is_le_cpu = True
-                logger.info(f"检测到LE5118变体CPU模块: {device}")
-
-            # 3. 检查LE系列前缀且类型为CPU
-            elif model.startswith('LE51') and device_type == 'CPU':
-                is_le_cpu = True
-                logger.info(f"检测到LE51系列CPU模块: {device}")
-
-            # 4. 检查设备名称或描述中是否包含LE5118
-            elif device_type == 'CPU':
-                name = device.get('name', '').upper()
-                description = device.get('description', '').upper()
-                if 'LE5118' in name or 'LE5118' in description:
-                    is_le_cpu = True
-                    logger.info(f"通过名称/描述检测到LE5118 CPU: {device}")
-
-            if is_le_cpu:
-                le_cpu_devices.append(device)
-
-        if le_cpu_devices:
+        Args:
+            facts (SystemSetupFacts): 由已丰富化的和利时设备统计得到的信息。
+        """
+        self.system_type = "LK" # 每次重新计算前，重置系统类型为默认值 "LK"
+
+        if facts.le_cpu_count:
             self.system_type = "LE_CPU"
             # LE5118 CPU 系统通常只有一个主单元（即一个机架）。
             # 如果项目中列出了多个LE5118 CPU，这里仍按1个机架处理，因为它们不能组成多机架。
             self.rack_count = 1
-            logger.info(f"检测到 {len(le_cpu_devices)} 个LE系列CPU设备，系统类型设置为 '{self.system_type}'，机架数量设置为 {self.rack_count}")
+            logger.info(f"检测到 {facts.le_cpu_count} 个LE系列CPU设备，系统类型设置为 '{self.system_type}'，机架数量设置为 {self.rack_count}")
         else:
             # 对于 LK 或其他非LE_CPU系统，根据 LK117 背板模块的数量来计算实际的机架数量
-            lk117_racks_devices = [m for m in processed_enriched_devices if m.get('model', '').upper() == 'LK117']
-            
             # 机架数量直接等于LK117模块的实例数量。
             # 每个LK117对象被视为一个独立的机架。
             # 忽略LK117内部的 'quantity' 字段来计算总机架数，因为这通常表示该型号有多少个，而不是一个LK117代表多少机架。
-            calculated_rack_count = len(lk117_racks_devices)
+            calculated_rack_count = facts.lk117_count
             
             # 系统至少有1个机架，即使没有明确的LK117模块（例如，如果所有模块都直接列出而没有机架信息）
             # 但如果明确有LK117，则以LK117的数量为准。如果没有LK117但有其他模块，则认为是1个机架。
-            # 如果既没有LK117，也没有其他和利时模块，则机架数为0（由processed_enriched_devices是否为空间接判断）
+            # 如果既没有LK117，也没有其他和利时模块，则机架数为0
             if calculated_rack_count > 0:
                 self.rack_count = calculated_rack_count
-            elif processed_enriched_devices: # 有和利时模块但没有LK117，算作1个机架
+            elif facts.device_count: # 有和利时模块但没有LK117，算作1个机架
                 self.rack_count = 1
             else: # 没有任何和利时模块
                 self.rack_count = 0
                 
-            logger.info(f"System type is '{self.system_type}'. Rack count based on LK117 instances ({len(lk117_racks_devices)}) or default: {self.rack_count}.")
+            logger.info(f"System type is '{self.system_type}'. Rack count based on LK117 instances ({facts.lk117_count}) or default: {self.rack_count}.")
 
         # 基于计算出的机架数量和系统类型，初始化 self.racks_data 列表
         self.racks_data = []
@@ -730,7 +914,7 @@ class PLCConfigurationHandler:
         self.module_info_provider = module_info_provider
         logger.info("PLCConfigurationHandler initialized.")
 
-    def _get_module_details_for_config(self, model_str: str, processed_devices_context: List[Dict[str,Any]]) -> Optional[Dict[str, Any]]:
+    def _get_module_details_for_config(self, model_str: str, processed_devices_context: List[Dict[str,Any]]) -> Optional[Mapping[str, Any]]:
         """
         内部辅助方法：获取用于配置目的的模块详细信息。
         此方法特别重要，因为它决定了在验证和地址生成时模块属性的来源。
@@ -753,20 +937,21 @@ class PLCConfigurationHandler:
         # 优先级1: 在当前已处理和丰富化的设备上下文中查找
         # 这是最理想的来源，因为它应包含所有通过 enrich_device_data 添加的字段（如 sub_channels）
         if processed_devices_context:
-            for device_instance in processed_devices_context:
-                if device_instance.get('model', '').upper() == model_upper:
-                    # device_instance 应该已经包含了如 'type', 'channels', 'sub_channels' 等所有必要字段
-                    return device_instance.copy() # 返回副本以防意外修改
+            # 同一记录的各实例模块信息相同，按记录查找即可，无需逐个生成实例
+            for device_record, _, _ in group_instances_by_record(processed_devices_context):
+                if device_record.get('model', '').upper() == model_upper:
+                    # device_record 应该已经包含了如 'type', 'channels', 'sub_channels' 等所有必要字段
+                    return _freeze_module(device_record) # 复制为只读视图，不暴露设备列表中的记录
         
         # 优先级2: 从预定义模块列表中精确查找 (通过ModuleInfoProvider)
         module_def = self.module_info_provider.get_predefined_module_by_model(model_str)
         if module_def:
-            return module_def # ModuleInfoProvider 应已返回副本
+            return module_def # ModuleInfoProvider 返回共享的只读视图
 
         # 优先级3: 从 plc_modules 的推断逻辑中获取 (通过ModuleInfoProvider)
         module_def_inferred = self.module_info_provider.get_inferred_module_info(model_str)
         if module_def_inferred:
-             return module_def_inferred # ModuleInfoProvider 的这个方法也应返回安全数据
+             return module_def_inferred # 同样是只读视图
 
         logger.warning(f"Could not retrieve details for module model '{model_str}' during configuration handling.")
         return None
@@ -983,9 +1168,9 @@ class PLCConfigurationHandler:
             system_type = "LK"  # 默认值
             if processed_devices_context:
                 # 检查是否有LE5118 CPU设备来判断系统类型
-                le_cpu_devices = [d for d in processed_devices_context
-                                if d.get('model', '').upper() == 'LE5118']
-                if le_cpu_devices:
+                has_le_cpu = any(record.get('model', '').upper() == 'LE5118'
+                                 for record, _, _ in group_instances_by_record(processed_devices_context))
+                if has_le_cpu:
                     system_type = "LE_CPU"
 
             if system_type == "LE_CPU":
@@ -1126,8 +1311,9 @@ class IODataLoader:
         # 原始设备数据列表
         self.original_devices_data: List[Dict[str, Any]] = []
 
-        # 经过处理和丰富化的设备数据（仅和利时相关）
-        self.processed_enriched_devices: List[Dict[str, Any]] = []
+        # 经过处理和丰富化的设备数据（仅和利时相关），每个实例一项；
+        # 由 set_devices_data 设置时为按数量压缩存储的 DeviceInstances
+        self.processed_enriched_devices: Sequence[Dict[str, Any]] = []
         
         # 当前加载的PLC模块配置，由保存配置方法更新
         self.current_plc_config: Dict[Tuple[int, int], str] = {} # {(机架号, 槽位号): "模块型号"}
@@ -1221,7 +1407,11 @@ class IODataLoader:
                 self.current_rack_configurations = {}
             
             # 恢复处理后的设备数据
-            if 'processed_devices' in cached_data:
+            if 'processed_device_runs' in cached_data:
+                # 按数量压缩的形式：[[记录, 数量], ...]
+                self.processed_enriched_devices = DeviceInstances(cached_data['processed_device_runs'])
+            elif 'processed_devices' in cached_data:
+                # 旧版缓存：逐个实例展开的列表
                 self.processed_enriched_devices = cached_data['processed_devices']
             
             # 恢复系统信息到SystemSetupManager
@@ -1270,10 +1460,14 @@ class IODataLoader:
                 'racks_data': self.system_setup_manager.racks_data.copy() if hasattr(self.system_setup_manager, 'racks_data') else []
             }
             
+            # 处理后的设备按 [记录, 数量] 保存，不展开为逐个实例（可直接JSON序列化）
+            devices = self.processed_enriched_devices
+            device_runs = devices.iter_runs() if isinstance(devices, DeviceInstances) else ((device, 1) for device in devices)
+
             # 创建缓存数据
             cache_data = {
                 'config': self.current_plc_config.copy(),
-                'processed_devices': self.processed_enriched_devices.copy(),
+                'processed_device_runs': [[record, count] for record, count in device_runs],
                 'system_info': system_info,
                 'addresses': self.last_generated_addresses.copy(),
                 'io_count': self.last_generated_io_count
@@ -1324,6 +1518,7 @@ class IODataLoader:
         
         Args:
             devices_data (List[Dict[str, Any]]): 从外部传入的原始设备数据列表。
+                每条记录可带 'instance_count' 表示该设备的实例数量，无需按数量展开成多条记录。
             force_update (bool): 是否强制更新，忽略缓存配置。当从API获取新数据时应设为True。
         """
         self.original_devices_data = devices_data or [] # 保证列表存在
@@ -1341,25 +1536,21 @@ class IODataLoader:
         else:
             logger.info("非强制更新模式：保留现有PLC配置，仅更新可用模块列表")
 
-        # 1. 标准化原始数据
-        processed_list = self.device_processor.process_raw_device_list(self.original_devices_data)
-        
         # 定义用于筛选和利时产品的关键字 (可以考虑作为常量或配置)
         known_hollysys_filter_keywords = ['和利时', 'HOLLYSYS'] 
         
-        # 2. 筛选出和利时相关设备 (包括机架如LK117)
-        hollysys_filtered_list = self.device_processor.filter_hollysys_devices(
-            processed_list, 
+        # 1-3. 单次遍历完成标准化、和利时设备筛选 (包括机架如LK117) 和丰富化，同时统计系统设置所需的信息
+        system_facts = SystemSetupFacts()
+        self.processed_enriched_devices = self.device_processor.process_hollysys_devices(
+            self.original_devices_data,
             # 使用关键字和在初始化时从PLC_SERIES提取的前缀进行联合筛选
-            known_hollysys_filter_keywords + self.HOLLYSYS_PREFIXES 
+            known_hollysys_filter_keywords + self.HOLLYSYS_PREFIXES,
+            system_facts
         )
-        
-        # 3. 丰富化筛选后的设备数据
-        self.processed_enriched_devices = self.device_processor.enrich_device_data(hollysys_filtered_list)
         logger.info(f"Processed and enriched data for {len(self.processed_enriched_devices)} Hollysys devices.")
         
-        # 4. 根据最新的设备数据重新计算系统设置（机架、系统类型）
-        self.system_setup_manager.calculate_system_setup(self.processed_enriched_devices)
+        # 4. 根据统计信息重新计算系统设置（机架、系统类型），无需再次遍历设备列表
+        self.system_setup_manager.apply_system_facts(system_facts)
         logger.info(f"System setup updated. Current type: {self.system_setup_manager.get_system_type()}")
 
     def get_rack_info(self) -> Dict[str, Any]:
@@ -1383,7 +1574,7 @@ class IODataLoader:
         # 验证时需要传入 processed_enriched_devices 作为上下文，以便_get_module_details_for_config能获取最准确的模块信息
         return self.config_handler.validate_module_placement(system_type, rack_id, slot_id, module_model, self.processed_enriched_devices)
 
-    def load_available_modules(self, module_type_filter: str = '全部') -> Tuple[List[Dict[str, Any]], bool]:
+    def load_available_modules(self, module_type_filter: str = '全部') -> Tuple[List[Mapping[str, Any]], bool]:
         """
         加载可供用户选择配置到机架上的模块列表（用于UI穿梭框）。
         列表的来源：
@@ -1402,7 +1593,7 @@ class IODataLoader:
             
         Returns:
             Tuple[List[Dict[str, Any]], bool]: 一个元组，包含：
-                - available_for_ui (List[Dict[str, Any]]): 符合条件的可用模块列表 (副本)。
+                - available_for_ui (List[Mapping[str, Any]]): 符合条件的可用模块列表 (只读视图，需要修改时先调用 thaw_module)。
                 - has_data (bool): 表示列表是否为空的布尔值。
         """
         # 添加详细调试日志
@@ -1438,10 +1629,10 @@ class IODataLoader:
         filtered_out_by_type = 0
         filtered_out_by_filter = 0
         
-        for module_candidate in source_for_shuttle:
-            m_copy = module_candidate.copy() # 操作副本
-            m_type = m_copy.get('type', '未录入') # 使用已丰富化的 'type' 字段
-            m_model_upper = m_copy.get('model', '').upper()
+        # 类型和型号是记录级字段：每条记录只判断一次，只为通过筛选的记录生成实例
+        for module_record, module_count, module_instances in group_instances_by_record(source_for_shuttle):
+            m_type = module_record.get('type', '未录入') # 使用已丰富化的 'type' 字段
+            m_model_upper = module_record.get('model', '').upper()
 
             # 判断模块是否被允许：类型在允许列表内，或者型号在特殊允许列表内
             is_allowed_type = m_type in self.ALLOWED_MODULE_TYPES
@@ -1450,11 +1641,11 @@ class IODataLoader:
             if is_allowed_type or is_special_model:
                 # 如果模块被允许，再应用UI的类型过滤器
                 if module_type_filter == '全部' or m_type == module_type_filter:
-                    available_for_ui.append(m_copy)
+                    available_for_ui.extend(_freeze_module(m) for m in module_instances) # 复制为只读视图（包括嵌套值）
                 else:
-                    filtered_out_by_filter += 1
+                    filtered_out_by_filter += module_count
             else:
-                filtered_out_by_type += 1
+                filtered_out_by_type += module_count
         
         logger.info(f"load_available_modules 结果统计:")
         logger.info(f"  - 数据源总数: {len(source_for_shuttle)}")
@@ -1479,7 +1670,7 @@ class IODataLoader:
         
         return available_for_ui, len(available_for_ui) > 0
         
-    def get_module_by_model(self, model_str: str) -> Optional[Dict[str, Any]]:
+    def get_module_by_model(self, model_str: str) -> Optional[Mapping[str, Any]]:
         """
         根据模块型号字符串检索模块的详细信息。
         采用特定的查找顺序以获取最准确和上下文相关的模块数据：
@@ -1495,27 +1686,28 @@ class IODataLoader:
             model_str (str): 要查询的模块型号字符串。
             
         Returns:
-            Optional[Dict[str, Any]]: 如果找到模块，则返回其信息的字典拷贝；否则返回 None。
-                                      返回拷贝是为了防止外部代码意外修改内部缓存的数据。
+            Optional[Mapping[str, Any]]: 如果找到模块，则返回其信息的只读视图；否则返回 None。
+                                         只读视图可以安全地共享，调用方需要修改时应先调用 thaw_module。
         """
         model_upper = model_str.upper()
         
         # 优先级1: 在当前已处理和丰富化的设备数据中查找
-        for device in self.processed_enriched_devices:
-            if device.get('model', '').upper() == model_upper:
-                # 这个设备对象应该已经被 enrich_device_data 完全处理，包含了 sub_channels 等信息
-                return device.copy() 
-
-        # 优先级2: 在预定义模块列表中精确查找 (通过 ModuleInfoProvider)
+        # 同一记录的各实例模块信息相同，按记录查找即可，无需逐个生成实例
+        for device_record, _, _ in group_instances_by_record(self.processed_enriched_devices):
+            if device_record.get('model', '').upper() == model_upper:
+                # 这个设备记录应该已经被 enrich_device_data 完全处理，包含了 sub_channels 等信息
+                # 复制为只读视图，调用方无法修改设备列表中的记录（包括嵌套的 sub_channels）
+                return _freeze_module(device_record)
+
+        # 优先级2: 在预定义模块列表中精确查找 (通过 ModuleInfoProvider，返回共享的只读视图)
         predefined_match = self.module_info_provider.get_predefined_module_by_model(model_str)
         if predefined_match:
-            return predefined_match # ModuleInfoProvider 应确保返回的是副本
+            return predefined_match
 
-        # 优先级3: 回退到 plc_modules.py 的推断逻辑 (通过 ModuleInfoProvider)
+        # 优先级3: 回退到 plc_modules.py 的推断逻辑 (通过 ModuleInfoProvider，结果已缓存且只读)
         inferred_match = self.module_info_provider.get_inferred_module_info(model_str)
         if inferred_match: 
-            # 确保这也是一个副本，以防它来自 plc_modules 中的共享缓存
-            return inferred_match.copy() if isinstance(inferred_match, dict) else inferred_match
+            return inferred_match
         
         logger.warning(f"Module model '{model_str}' not found by any lookup method.")
         return None
@@ -1668,7 +1860,7 @@ class IODataLoader:
             'racks': [] 
         }
 
-        self.processed_enriched_devices: List[Dict[str, Any]] = [] # 已处理并丰富化的设备数据列表
+        self.processed_enriched_devices: Sequence[Dict[str, Any]] = [] # 已处理并丰富化的设备数据列表
         self.last_generated_addresses: List[Dict[str, Any]] = [] # 必须重置此属性
         self.last_generated_io_count: int = 0 # 同时重置IO计数
 
@@ -0,0 +1,115 @@
+"""预编译的关键字/型号前缀匹配器
+
+用于设备IO类型推断和和利时设备筛选：关键字在构造时统一转换为大写并编译为一个正则表达式，
+每个设备的文本只需扫描一次即可得到所有命中的关键字，不再对每个关键字分别执行 `in` 查找。
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    多关键字子串匹配器（大小写不敏感）。
+
+    groups 为有序的 {标签: 关键字列表}，标签的先后顺序即优先级。
+    语义与逐个执行 `any(keyword.upper() in text.upper() for keyword in keywords)` 完全相同，
+    包括关键字相互重叠（如 'DI' 与 'DI/DO'）的情况。
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.labels: Tuple[str, ...] = tuple(groups.keys())
+        rank = {label: i for i, label in enumerate(self.labels)}
+
+        keyword_labels: Dict[str, set] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                if keyword:
+                    keyword_labels.setdefault(keyword.upper(), set()).add(label)
+
+        # 某个关键字命中时，它包含的所有更短关键字也必然命中
+        self._labels_by_match: Dict[str, FrozenSet[str]] = {}
+        for keyword in keyword_labels:
+            labels = set()
+            for other, other_labels in keyword_labels.items():
+                if other in keyword:
+                    labels |= other_labels
+            self._labels_by_match[keyword] = frozenset(labels)
+        self._best_by_match: Dict[str, str] = {
+            keyword: min(labels, key=rank.__getitem__) for keyword, labels in self._labels_by_match.items()
+        }
+        self._rank = rank
+
+        # 按长度降序排列，保证同一位置上优先匹配最长的关键字；零宽前瞻使每个位置都被检查
+        ordered = sorted(keyword_labels, key=len, reverse=True)
+        pattern = "|".join(re.escape(k) for k in ordered)
+        self._scan = re.compile(f"(?=({pattern}))") if ordered else None
+        self._search = re.compile(pattern) if ordered else None
+
+    def matched_labels(self, text_upper: str) -> FrozenSet[str]:
+        """返回在（已转换为大写的）文本中出现了关键字的所有标签"""
+        if self._scan is None:
+            return frozenset()
+        found = set()
+        for keyword in set(m.group(1) for m in self._scan.finditer(text_upper)):
+            found |= self._labels_by_match[keyword]
+        return frozenset(found)
+
+    def first_label(self, text_upper: str) -> Optional[str]:
+        """返回优先级最高的命中标签；没有任何命中时返回 None"""
+        if self._scan is None:
+            return None
+        best = None
+        for m in self._scan.finditer(text_upper):
+            label = self._best_by_match[m.group(1)]
+            if best is None or self._rank[label] < self._rank[best]:
+                best = label
+                if self._rank[best] == 0:
+                    break
+        return best
+
+    def contains_any(self, text_upper: str) -> bool:
+        """文本中是否出现了任意关键字"""
+        return self._search is not None and self._search.search(text_upper) is not None
+
+
+class PrefixMatcher:
+    """
+    型号前缀匹配器（前缀树，大小写不敏感）。
+
+    groups 为有序的 {标签: 前缀列表}，first_label 返回优先级最高的、有前缀与型号开头匹配的标签，
+    与按顺序执行 `any(model.startswith(p.upper()) for p in prefixes)` 的结果相同。
+    """
+
+    _END = object()
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.labels: Tuple[str, ...] = tuple(groups.keys())
+        self._root: dict = {}
+        for rank, (label, prefixes) in enumerate(groups.items()):
+            for prefix in prefixes:
+                node = self._root
+                for ch in prefix.upper():
+                    node = node.setdefault(ch, {})
+                # 同一前缀出现在多个标签中时保留优先级最高的
+                node[self._END] = min(node.get(self._END, rank), rank)
+
+    def first_label(self, model_upper: str) -> Optional[str]:
+        """返回与型号开头匹配的、优先级最高的标签；没有匹配时返回 None"""
+        best = self._root.get(self._END)
+        node = self._root
+        for ch in model_upper:
+            node = node.get(ch)
+            if node is None:
+                break
+            rank = node.get(self._END)
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return self.labels[best] if best is not None else None
+
+
+def build_text_blob(device: Mapping[str, str]) -> str:
+    """拼接参与关键字匹配的设备文本字段并转换为大写（字段顺序与原有逻辑一致）"""
+    name = device.get('name', '')
+    return (f"{device.get('model', '')} {device.get('brand', '')} {name} {device.get('type', name)} "
+            f"{device.get('description', '')} {device.get('ext_params', '')}").upper()
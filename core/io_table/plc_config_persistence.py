@@ -94,7 +94,7 @@ class PLCConfigPersistence:
             config_data: 配置数据，包含：
                 - config: PLC模块配置 {(rack_id, slot_id): model_name}
                 - system_info: 系统信息
-                - processed_devices: 处理后的设备数据
+                - processed_device_runs: 处理后的设备数据，按 [记录, 实例数量] 压缩保存
                 - addresses: 地址列表
                 - io_count: IO通道数
                 - rack_configurations: 新增 - 每个机架的独立配置
@@ -114,7 +114,7 @@ class PLCConfigPersistence:
                 "system_info": config_data.get("system_info", {}),
                 "io_count": config_data.get("io_count", 0),
                 "addresses_count": len(config_data.get("addresses", [])),
-                "processed_devices_count": len(config_data.get("processed_devices", []))
+                "processed_devices_count": sum(count for _, count in config_data.get("processed_device_runs", []))
             }
             
             # 转换配置字典的键格式
@@ -165,7 +165,7 @@ class PLCConfigPersistence:
                 # 创建可序列化的完整数据副本
                 full_save_data = save_data.copy()
                 full_save_data["addresses"] = config_data.get("addresses", [])
-                full_save_data["processed_devices"] = config_data.get("processed_devices", [])
+                full_save_data["processed_device_runs"] = config_data.get("processed_device_runs", [])
                 json.dump(full_save_data, f, ensure_ascii=False, indent=2)
             
             return True
@@ -215,6 +215,9 @@ class PLCConfigPersistence:
                     "processed_devices": full_data.get("processed_devices", []),
                     "io_count": full_data.get("io_count", 0)
                 }
+                if "processed_device_runs" in full_data:
+                    # 新格式按数量压缩保存；旧文件只有逐个实例展开的 processed_devices
+                    result["processed_device_runs"] = full_data["processed_device_runs"]
                 
                 # 新增：加载机架配置（如果存在）
                 if "rack_configurations" in full_data:
@@ -0,0 +1,14 @@
+# core/jobs/__init__.py
+
+from .job_context import CancelToken, JobCancelled, JobContext
+from .generation import GenerationResult, PointProgress, count_points, run_generation_job
+
+__all__ = [
+    'CancelToken',
+    'JobCancelled',
+    'JobContext',
+    'GenerationResult',
+    'PointProgress',
+    'count_points',
+    'run_generation_job'
+]
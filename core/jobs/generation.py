@@ -0,0 +1,106 @@
+"""点表生成任务的统一接口：按点位上报进度、在行间检查取消，并记录耗时
+
+各生成器（和利时变量表/Modbus表、亚控、力控、FAT点检表）的入口方法都接受一个可选的
+context 参数，内部用 PointProgress 逐点计数；调用方用 run_generation_job 执行生成函数，
+得到包含原始返回值、已处理点数和耗时的 GenerationResult。
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .job_context import JobCancelled, JobContext
+
+logger = logging.getLogger(__name__)
+
+
+def count_points(points_by_sheet: Optional[Dict[str, List[Any]]]) -> int:
+    """统计按工作表分组的点位总数"""
+    if not points_by_sheet:
+        return 0
+    return sum(len(points) for points in points_by_sheet.values() if points)
+
+
+class PointProgress:
+    """
+    生成器内部使用的点位计数器。
+
+    每处理一个点位调用一次 advance()：先检查取消（已取消时抛出 JobCancelled），
+    再按 report_every 的间隔上报进度，避免每行都触发一次界面更新。
+    context 为 None 时只计数，生成器在脚本或测试中直接调用时不受影响。
+    """
+
+    def __init__(self, context: Optional[JobContext], total: int, message: str = "", report_every: int = 200):
+        self.context = context
+        self.total = total
+        self.message = message
+        self.report_every = max(1, report_every)
+        self.processed = 0
+        self._last_reported = 0
+        if context is not None:
+            context.check_cancelled()
+            context.report_progress(0, total, message)
+
+    def advance(self, count: int = 1) -> None:
+        self.processed += count
+        if self.context is None:
+            return
+        self.context.check_cancelled()
+        if self.processed - self._last_reported >= self.report_every:
+            self._last_reported = self.processed
+            self.context.report_progress(self.processed, self.total, self.message)
+
+    def finish(self) -> None:
+        """生成结束时上报最终进度"""
+        if self.context is not None:
+            self._last_reported = self.processed
+            self.context.report_progress(self.processed, self.total, self.message)
+
+
+@dataclass
+class GenerationResult:
+    """一次点表生成的结果"""
+    name: str
+    result: Any = None  # 生成函数的原始返回值；取消或异常时为 None
+    points_processed: int = 0
+    points_total: int = 0
+    elapsed: float = 0.0  # 秒
+    cancelled: bool = False
+    error: Optional[str] = None  # 生成函数抛出的异常信息
+
+
+def run_generation_job(name: str, fn: Callable[..., Any], *args,
+                       context: Optional[JobContext] = None, **kwargs) -> GenerationResult:
+    """
+    以统一方式执行一个生成函数：fn(*args, context=<子上下文>, **kwargs)。
+
+    子上下文与 context 共用取消标记，并把进度转发给 context，同时记录最后一次上报的
+    已处理点数和总数。生成函数被取消时返回 cancelled=True 的结果而不是抛出异常，
+    其他异常记录在 error 中，这样批量生成时一个生成器失败不影响其他生成器。
+    """
+    parent = context or JobContext()
+    progress: Dict[str, int] = {'done': 0, 'total': 0}
+
+    def on_progress(done: int, total: int, message: str):
+        progress['done'] = done
+        progress['total'] = total
+        parent.report_progress(done, total, message or name)
+
+    child = JobContext(parent.token, on_progress=on_progress, on_partial=parent.emit_partial)
+    generation = GenerationResult(name=name)
+    start = time.perf_counter()
+    try:
+        generation.result = fn(*args, context=child, **kwargs)
+    except JobCancelled:
+        generation.cancelled = True
+        logger.info(f"生成任务 '{name}' 已取消")
+    except Exception as e:
+        generation.error = str(e)
+        logger.error(f"生成任务 '{name}' 失败: {e}", exc_info=True)
+    generation.elapsed = time.perf_counter() - start
+    generation.points_processed = progress['done']
+    generation.points_total = progress['total']
+    logger.info(f"生成任务 '{name}' 结束: 处理 {generation.points_processed}/{generation.points_total} 个点位，"
+                f"耗时 {generation.elapsed:.2f}s")
+    return generation
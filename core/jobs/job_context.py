@@ -0,0 +1,67 @@
+"""后台任务的取消标记和进度上报
+
+与界面无关：任务函数只通过 JobContext 检查取消和上报进度，
+由界面层（ui/components/job_runner.py）把进度转成信号，也可以在脚本或测试中直接使用。
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class JobCancelled(Exception):
+    """任务在检查点发现已被取消时抛出"""
+
+
+class CancelToken:
+    """线程安全的取消标记"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """已取消时抛出 JobCancelled"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+ProgressCallback = Callable[[int, int, str], None]
+PartialCallback = Callable[[Any], None]
+
+
+class JobContext:
+    """
+    传给任务函数的上下文。
+
+    - report_progress(done, total, message)：上报进度，total 为 0 表示总量未知
+    - emit_partial(data)：上报阶段性结果（如分页查询的每一页），界面可以边收边显示
+    - check_cancelled()：在循环的检查点调用，已取消时抛出 JobCancelled
+    """
+
+    def __init__(self, token: Optional[CancelToken] = None,
+                 on_progress: Optional[ProgressCallback] = None,
+                 on_partial: Optional[PartialCallback] = None):
+        self.token = token or CancelToken()
+        self._on_progress = on_progress
+        self._on_partial = on_partial
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def check_cancelled(self) -> None:
+        self.token.raise_if_cancelled()
+
+    def report_progress(self, done: int, total: int = 0, message: str = "") -> None:
+        if self._on_progress is not None:
+            self._on_progress(done, total, message)
+
+    def emit_partial(self, data: Any) -> None:
+        if self._on_partial is not None:
+            self._on_partial(data)
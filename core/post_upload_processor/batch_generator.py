@@ -0,0 +1,236 @@
+"""一键生成全部点表
+
+把已加载的 UploadedIOPoint 数据一次性交给进程池，各生成器（和利时变量表/Modbus表、亚控、力控、
+FAT点检表、上下位通讯点表）在各自进程中并行运行，所有文件写入同一个输出目录，
+总耗时约等于最慢的生成器而不是各生成器耗时之和。
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.jobs import GenerationResult, JobCancelled, JobContext, run_generation_job
+from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+
+logger = logging.getLogger(__name__)
+
+# 批量任务名称
+TASK_HOLLYSYS_VARIABLES = "和利时变量表"
+TASK_HOLLYSYS_MODBUS = "和利时Modbus表"
+TASK_KINGVIEW = "亚控HMI点表"
+TASK_LIKONG = "力控HMI点表"
+TASK_FAT = "FAT点检表"
+TASK_COMMUNICATION = "上下位通讯点表"
+
+# 每个生成函数的返回值: (是否成功, 生成的文件路径列表, 错误信息)
+TaskOutcome = Tuple[bool, List[str], Optional[str]]
+
+
+@dataclass
+class BatchTaskOptions:
+    """批量生成的公共参数（会被传到每个工作进程，只包含可序列化的简单类型）"""
+    output_dir: str
+    base_name: str
+    source_path: Optional[str] = None  # 原始IO点表文件路径，FAT点检表需要基于原文件生成
+    is_safety_system: bool = False
+
+
+def _generate_hollysys_variables(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                                 context: Optional[JobContext] = None) -> TaskOutcome:
+    if options.is_safety_system:
+        from core.io_table.get_data import ModuleInfoProvider
+        from core.post_upload_processor.plc_generators.hollysys_generator.safety_generator import SafetyHollysysGenerator
+        output_path = os.path.join(options.output_dir, f"{options.base_name}_和利时安全型变量表.xls")
+        success, error = SafetyHollysysGenerator(ModuleInfoProvider()).generate_safety_hollysys_table(
+            points_by_sheet, output_path, context=context)
+    else:
+        from core.post_upload_processor.plc_generators.hollysys_generator.generator import HollysysGenerator
+        output_path = os.path.join(options.output_dir, f"{options.base_name}_和利时变量表.xls")
+        success, error = HollysysGenerator().generate_hollysys_table(points_by_sheet, output_path, context=context)
+    return success, [output_path] if success else [], error
+
+
+def _generate_hollysys_modbus(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                              context: Optional[JobContext] = None) -> TaskOutcome:
+    from core.io_table.get_data import ModuleInfoProvider
+    from core.post_upload_processor.plc_generators.hollysys_generator.safety_generator import SafetyHollysysGenerator
+    output_path = os.path.join(options.output_dir, f"{options.base_name}_和利时Modbus表.xls")
+    success, error = SafetyHollysysGenerator(ModuleInfoProvider()).generate_modbus_excel(
+        points_by_sheet, output_path, context=context)
+    return success, [output_path] if success else [], error
+
+
+def _generate_kingview(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                       context: Optional[JobContext] = None) -> TaskOutcome:
+    from core.post_upload_processor.hmi_generators.yk_generator.generator import KingViewGenerator
+    success, ioserver_path, db_path, error = KingViewGenerator().generate_kingview_files(
+        points_by_sheet, options.output_dir, options.base_name, context=context)
+    return success, [path for path in (ioserver_path, db_path) if path], error
+
+
+def _generate_likong(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                     context: Optional[JobContext] = None) -> TaskOutcome:
+    from core.post_upload_processor.hmi_generators.lk_generator.generator import LikongGenerator
+    # 力控文件名固定（Basic.csv 等），放在单独的子目录中
+    likong_dir = os.path.join(options.output_dir, "力控")
+    os.makedirs(likong_dir, exist_ok=True)
+    results = LikongGenerator().generate_all_csvs(likong_dir, points_by_sheet, context=context)
+    outputs = [file_path for _, success, file_path, _ in results if success and file_path]
+    errors = [f"{file_name}: {err_msg or '未知错误'}" for file_name, success, _, err_msg in results if not success]
+    return not errors, outputs, "; ".join(errors) or None
+
+
+def _generate_fat(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                  context: Optional[JobContext] = None) -> TaskOutcome:
+    from core.post_upload_processor.fat_generators import generate_fat_checklist_from_source
+    success, generated_path, error = generate_fat_checklist_from_source(
+        options.source_path, options.output_dir, f"{options.base_name}_FAT.xlsx", context=context)
+    return success, [generated_path] if success and generated_path else [], error
+
+
+def _generate_communication_table(points_by_sheet: Dict[str, List[UploadedIOPoint]], options: BatchTaskOptions,
+                                  context: Optional[JobContext] = None) -> TaskOutcome:
+    from core.post_upload_processor.communication_table_generator import generate_communication_table_excel
+    all_points = [point for points in points_by_sheet.values() if points for point in points]
+    if not all_points:
+        return False, [], "没有可用于生成上下位通讯点表的点位。"
+    output_path = os.path.join(options.output_dir, f"{options.base_name}_上下位通讯点表.xlsx")
+    success = generate_communication_table_excel(output_path, all_points, context=context)
+    return success, [output_path] if success else [], None if success else "生成上下位通讯点表失败，请检查日志。"
+
+
+# 任务名称 -> 生成函数。顺序即提交顺序：耗时较长的生成器先提交，尽早占用工作进程
+BATCH_TASKS: Dict[str, Callable[..., TaskOutcome]] = {
+    TASK_LIKONG: _generate_likong,
+    TASK_KINGVIEW: _generate_kingview,
+    TASK_FAT: _generate_fat,
+    TASK_HOLLYSYS_VARIABLES: _generate_hollysys_variables,
+    TASK_HOLLYSYS_MODBUS: _generate_hollysys_modbus,
+    TASK_COMMUNICATION: _generate_communication_table,
+}
+
+
+def plan_batch_tasks(options: BatchTaskOptions) -> List[str]:
+    """
+    根据参数确定要运行的任务。
+    与单独生成时一致：Modbus表只在安全系统中生成；FAT点检表需要原始 .xlsx 文件。
+    """
+    tasks = []
+    for name in BATCH_TASKS:
+        if name == TASK_HOLLYSYS_MODBUS and not options.is_safety_system:
+            continue
+        if name == TASK_FAT and not (options.source_path and options.source_path.endswith('.xlsx')):
+            logger.info("未提供原始 .xlsx IO点表文件，批量生成跳过FAT点检表。")
+            continue
+        tasks.append(name)
+    return tasks
+
+
+@dataclass
+class BatchGenerationResult:
+    """一键生成的结果：每个生成器的 GenerationResult（result 为 TaskOutcome）和总耗时"""
+    output_dir: str
+    generations: List[GenerationResult] = field(default_factory=list)
+    elapsed: float = 0.0  # 墙钟时间（秒）
+
+    @property
+    def failed(self) -> List[GenerationResult]:
+        return [g for g in self.generations if g.error is not None or not (g.result and g.result[0])]
+
+    @property
+    def output_files(self) -> List[str]:
+        return [path for g in self.generations if g.result for path in g.result[1]]
+
+    @property
+    def total_generator_time(self) -> float:
+        """各生成器耗时之和（串行执行时的大致总耗时）"""
+        return sum(g.elapsed for g in self.generations)
+
+    def timing_lines(self) -> List[str]:
+        lines = []
+        for g in sorted(self.generations, key=lambda g: g.elapsed, reverse=True):
+            if g.error is not None:
+                status = f"失败: {g.error}"
+            elif g.result and g.result[0]:
+                status = f"{len(g.result[1])} 个文件"
+            else:
+                status = f"失败: {g.result[2] if g.result else '未知错误'}"
+            lines.append(f"{g.name}: {g.elapsed:.2f} 秒，{g.points_processed} 个点位，{status}")
+        return lines
+
+
+# 工作进程中的点位数据：通过进程池的 initializer 每个进程只传递一次
+_worker_points_by_sheet: Dict[str, List[UploadedIOPoint]] = {}
+
+
+def _init_worker(points_by_sheet: Dict[str, List[UploadedIOPoint]]):
+    global _worker_points_by_sheet
+    _worker_points_by_sheet = points_by_sheet
+
+
+def _run_task_in_worker(name: str, options: BatchTaskOptions) -> GenerationResult:
+    return run_generation_job(name, BATCH_TASKS[name], _worker_points_by_sheet, options)
+
+
+def generate_all(points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                 options: BatchTaskOptions,
+                 context: Optional[JobContext] = None,
+                 max_workers: Optional[int] = None,
+                 use_processes: bool = True) -> BatchGenerationResult:
+    """
+    一键生成全部点表到 options.output_dir。
+
+    Args:
+        points_by_sheet: 已加载的点位数据（按工作表分组）。
+        options: 输出目录、文件名前缀、原始文件路径和是否安全系统。
+        context: 后台任务上下文。进度按"已完成的生成器数/生成器总数"上报；
+                 取消时不再启动尚未开始的生成器，并抛出 JobCancelled（已在运行的进程会写完当前文件）。
+        max_workers: 进程数，默认取任务数和CPU核数的较小值。
+        use_processes: 为 False 时在当前进程中依次执行（用于调试，或进程池不可用时）。
+
+    Returns:
+        BatchGenerationResult: 每个生成器的结果和耗时。
+    """
+    context = context or JobContext()
+    os.makedirs(options.output_dir, exist_ok=True)
+    task_names = plan_batch_tasks(options)
+    batch = BatchGenerationResult(output_dir=options.output_dir)
+    start = time.perf_counter()
+    context.report_progress(0, len(task_names), "一键生成")
+
+    if use_processes and len(task_names) > 1:
+        workers = max_workers or min(len(task_names), os.cpu_count() or 1)
+        logger.info(f"一键生成: {len(task_names)} 个生成器，{workers} 个进程，输出目录 {options.output_dir}")
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(points_by_sheet,))
+        try:
+            pending: Dict[Future, str] = {executor.submit(_run_task_in_worker, name, options): name for name in task_names}
+            while pending:
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                context.check_cancelled()
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        generation = future.result()
+                    except Exception as e:  # 工作进程异常退出等
+                        logger.error(f"一键生成: 生成器 '{name}' 在工作进程中失败: {e}", exc_info=True)
+                        generation = GenerationResult(name=name, error=str(e))
+                    batch.generations.append(generation)
+                    context.report_progress(len(batch.generations), len(task_names), f"{name} 已完成")
+        except JobCancelled:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("一键生成已取消，未开始的生成器不再运行。")
+            raise
+        executor.shutdown(wait=True)
+    else:
+        for name in task_names:
+            generation = run_generation_job(name, BATCH_TASKS[name], points_by_sheet, options, context=context)
+            context.check_cancelled()
+            batch.generations.append(generation)
+            context.report_progress(len(batch.generations), len(task_names), f"{name} 已完成")
+
+    batch.elapsed = time.perf_counter() - start
+    logger.info(f"一键生成完成: 总耗时 {batch.elapsed:.2f}s，各生成器耗时之和 {batch.total_generator_time:.2f}s")
+    return batch
@@ -1,16 +1,19 @@
 import os
-from typing import List
+from typing import List, Optional
 from openpyxl import Workbook
 from openpyxl.styles import Border, Side, Alignment
 from .uploaded_file_processor.io_data_model import UploadedIOPoint
+from core.jobs import JobCancelled, JobContext, PointProgress
 
 
-def generate_communication_table_excel(output_path: str, io_points: List[UploadedIOPoint]) -> bool:
+def generate_communication_table_excel(output_path: str, io_points: List[UploadedIOPoint],
+                                       context: Optional[JobContext] = None) -> bool:
     """
     生成上下位通讯点表Excel文件。
     包含所有类型的点位：IO通道点位、第三方设备点位和中间点位。
     :param output_path: 输出文件的完整路径
     :param io_points: 从所有工作表解析出的 UploadedIOPoint 对象列表（包含所有类型点位）
+    :param context: 提供时逐点上报进度，并在点位之间检查取消（取消时抛出 JobCancelled，不保存文件）
     :return: 是否生成成功
     """
     # 表头字段，按截图顺序
@@ -50,7 +53,9 @@ def generate_communication_table_excel(output_path: str, io_points: List[Uploade
         ]
 
         # 填充数据
+        progress = PointProgress(context, len(all_valid_points), "上下位通讯点表")
         for index, point in enumerate(all_valid_points):
+            progress.advance()
             serial_number = index + 1
             process_control_value = point.hmi_variable_name if point.hmi_variable_name else ""
             detection_point_name = point.variable_description if point.variable_description else ""
@@ -192,7 +197,10 @@ def generate_communication_table_excel(output_path: str, io_points: List[Uploade
             ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
 
         wb.save(output_path)
+        progress.finish()
         return True
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"生成上下位通讯点表失败: {e}")
         return False
@@ -6,6 +6,8 @@ from typing import Tuple, Optional
 import openpyxl # 导入 openpyxl
 from openpyxl.utils import get_column_letter # 用于将列号转为字母（如果需要调试）
 
+from core.jobs import JobCancelled, JobContext, PointProgress
+
 logger = logging.getLogger(__name__)
 
 # 定义用户指定的列名
@@ -65,7 +67,8 @@ def _clear_cell_value(sheet, row_idx: int, col_idx: int):
         cell = sheet.cell(row=row_idx, column=col_idx)
         cell.value = None
 
-def generate_fat_checklist_from_source(original_file_path: str, output_dir: str, output_filename: str) -> Tuple[bool, Optional[str], Optional[str]]:
+def generate_fat_checklist_from_source(original_file_path: str, output_dir: str, output_filename: str,
+                                       context: Optional[JobContext] = None) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     通过读取原始上传的IO点表文件，处理预留点位和设定值逻辑后，生成FAT点检表。
     此方法使用 openpyxl 以尽量保留原始格式和公式。
@@ -86,6 +89,8 @@ def generate_fat_checklist_from_source(original_file_path: str, output_dir: str,
         original_file_path (str): 原始已验证IO点表Excel文件的路径 (应为 .xlsx)。
         output_dir (str): FAT点检表应保存的目录。
         output_filename (str): 生成的FAT点检表的输出文件名 (应为 .xlsx)。
+        context (Optional[JobContext]): 提供时按工作表行数上报进度，并在数据行之间检查取消
+                                        （取消时抛出 JobCancelled，不保存文件）。
 
     Returns:
         Tuple[bool, Optional[str], Optional[str]]: (成功状态, 生成文件的路径, 错误消息)
@@ -115,6 +120,8 @@ def generate_fat_checklist_from_source(original_file_path: str, output_dir: str,
     try:
         # 加载工作簿
         workbook = openpyxl.load_workbook(original_file_path)
+        # 以所有工作表的行数为总量，标题行和未处理的工作表也计入，保证结束时进度为100%
+        progress = PointProgress(context, sum(workbook[name].max_row for name in workbook.sheetnames), "FAT点检表")
         
         for sheet_name in workbook.sheetnames:
             sheet = workbook[sheet_name]
@@ -184,7 +191,9 @@ def generate_fat_checklist_from_source(original_file_path: str, output_dir: str,
             
             if not header_row or not col_map:
                 logger.warning(f"工作表 '{sheet_name}' 未能找到包含所有必需列的标题行: {COL_HMI_VARIABLE_NAME}, {COL_VARIABLE_DESCRIPTION}, {COL_CHANNEL_TAG}. 该工作表将不被处理预留点位。")
+                progress.advance(sheet.max_row)
                 continue
+            progress.advance(header_row)
 
             modified_count = 0
             set_value_processed_count = 0
@@ -192,6 +201,7 @@ def generate_fat_checklist_from_source(original_file_path: str, output_dir: str,
             
             # 从标题行之后开始遍历数据行
             for row_idx in range(header_row + 1, sheet.max_row + 1):
+                progress.advance()
                 hmi_cell = sheet.cell(row=row_idx, column=col_map[COL_HMI_VARIABLE_NAME])
                 desc_cell = sheet.cell(row=row_idx, column=col_map[COL_VARIABLE_DESCRIPTION])
                 channel_cell = sheet.cell(row=row_idx, column=col_map[COL_CHANNEL_TAG])
@@ -303,10 +313,14 @@ def generate_fat_checklist_from_source(original_file_path: str, output_dir: str,
 
         # 保存修改后的工作簿
         workbook.save(destination_path)
+        progress.finish()
         
         logger.info(f"带预留点位处理的FAT点检表 (保留格式) 已成功生成于: {destination_path}")
         return True, destination_path, None
 
+    except JobCancelled:
+        logger.info("FAT点检表生成已取消，未保存文件。")
+        raise
     except FileNotFoundError:
         error_msg = f"原始文件 '{original_file_path}' 未找到。"
         logger.error(error_msg)
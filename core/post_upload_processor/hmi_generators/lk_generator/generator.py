@@ -16,6 +16,7 @@ except ImportError:
 
 # 从 Shared Models 导入 UploadedIOPoint
 from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+from core.jobs import JobContext, PointProgress, count_points
 # 导入用于获取主IO表名的常量 (如果 excel_reader 定义了这样一个可导出的常量)
 # from core.post_upload_processor.uploaded_file_processor.excel_reader import MAIN_IO_SHEET_NAME # 假设存在
 
@@ -268,7 +269,8 @@ class LikongGenerator:
 
     def generate_basic_csv(self,
                            output_dir: str,
-                           points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                           points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                           progress: Optional[PointProgress] = None
                            ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         生成力控点表的CSV文件: Basic.csv
@@ -287,6 +289,8 @@ class LikongGenerator:
         if points_by_sheet:
             for _, points_list in points_by_sheet.items():
                 for point in points_list:
+                    if progress is not None:
+                        progress.advance()
                     point_data_type_upper = str(point.data_type or "").upper().strip()
                     hmi_name_from_point = str(point.hmi_variable_name or "").strip()
 
@@ -588,7 +592,8 @@ class LikongGenerator:
 
     def generate_his_csv(self, 
                          output_dir: str, 
-                         points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                         points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                         progress: Optional[PointProgress] = None
                          ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         生成力控历史记录配置文件: His.csv
@@ -606,6 +611,8 @@ class LikongGenerator:
         if points_by_sheet:
             for _, points_list in points_by_sheet.items():
                 for point in points_list:
+                    if progress is not None:
+                        progress.advance()
                     point_data_type_upper = str(point.data_type or "").upper().strip()
                     hmi_name_from_point = str(point.hmi_variable_name or "").strip()
 
@@ -674,7 +681,8 @@ class LikongGenerator:
 
     def generate_link_csv(self,
                           output_dir: str,
-                          points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                          points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                          progress: Optional[PointProgress] = None
                           ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         生成力控链接配置文件: Link.csv
@@ -700,6 +708,8 @@ class LikongGenerator:
                 all_points.extend(points_list_val)
 
         for point in all_points:
+            if progress is not None:
+                progress.advance()
             point_data_type_upper = str(point.data_type or "").upper().strip()
             hmi_name_from_point = str(point.hmi_variable_name or "").strip()
             communication_address_str = str(point.hmi_communication_address or "").strip()
@@ -988,7 +998,8 @@ class LikongGenerator:
 
     def generate_trend_csv(self,
                           output_dir: str,
-                          points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                          points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                          progress: Optional[PointProgress] = None
                           ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         生成力控趋势配置文件: 趋势.csv (以场站名为前缀)
@@ -1008,6 +1019,8 @@ class LikongGenerator:
         if points_by_sheet:
             for _, points_list in points_by_sheet.items():
                 for point in points_list:
+                    if progress is not None:
+                        progress.advance()
                     point_data_type_upper = str(point.data_type or "").upper().strip()
                     hmi_name_from_point = str(point.hmi_variable_name or "").strip()
 
@@ -1069,7 +1082,8 @@ class LikongGenerator:
 
     def generate_alarm_settings_csv(self,
                                    output_dir: str,
-                                   points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                                   points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                                   progress: Optional[PointProgress] = None
                                    ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         生成力控报警设定表: 报警设定.csv (以场站名为前缀)
@@ -1093,6 +1107,8 @@ class LikongGenerator:
             for sheet_name, points_list in points_by_sheet.items():
                 logger.info(f"检查工作表 '{sheet_name}' 中的 {len(points_list)} 个点位")
                 for point in points_list:
+                    if progress is not None:
+                        progress.advance()
                     total_points_checked += 1
 
                     # 只处理模拟量点位
@@ -1162,40 +1178,46 @@ class LikongGenerator:
 
     def generate_all_csvs(self,
                             output_dir: str,
-                            points_by_sheet: Dict[str, List[UploadedIOPoint]]
+                            points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                            context: Optional[JobContext] = None
                             ) -> List[Tuple[str, bool, Optional[str], Optional[str]]]:
         """
         生成所有力控相关的CSV文件 (Basic.csv, His.csv, Link.csv, 趋势.csv, 报警设定.csv)。
         返回每个文件生成结果的列表。
+        提供 context 时按"文件数 × 点位数"上报进度，并在每个文件收集点位时逐点检查取消
+        （取消时抛出 JobCancelled，已生成的文件保留，正在收集的文件不会写出）。
         """
         results = []
+        # 每个文件都会遍历一次全部点位
+        progress = PointProgress(context, count_points(points_by_sheet) * 5, "力控点表")
 
         # 生成 Basic.csv
         logger.info("开始生成 Basic.csv...")
-        basic_success, basic_file_path, basic_err_msg = self.generate_basic_csv(output_dir, points_by_sheet)
+        basic_success, basic_file_path, basic_err_msg = self.generate_basic_csv(output_dir, points_by_sheet, progress)
         results.append(("Basic.csv", basic_success, basic_file_path, basic_err_msg))
         # Basic.csv 失败可能影响其他文件，但此处按顺序继续尝试生成其他文件
 
         # 生成 His.csv
         logger.info("开始生成 His.csv...")
-        his_success, his_file_path, his_err_msg = self.generate_his_csv(output_dir, points_by_sheet)
+        his_success, his_file_path, his_err_msg = self.generate_his_csv(output_dir, points_by_sheet, progress)
         results.append(("His.csv", his_success, his_file_path, his_err_msg))
 
         # 生成 Link.csv
         logger.info("开始生成 Link.csv...")
-        link_success, link_file_path, link_err_msg = self.generate_link_csv(output_dir, points_by_sheet)
+        link_success, link_file_path, link_err_msg = self.generate_link_csv(output_dir, points_by_sheet, progress)
         results.append(("Link.csv", link_success, link_file_path, link_err_msg))
 
         # 生成趋势表
         logger.info("开始生成趋势表...")
-        trend_success, trend_file_path, trend_err_msg = self.generate_trend_csv(output_dir, points_by_sheet)
+        trend_success, trend_file_path, trend_err_msg = self.generate_trend_csv(output_dir, points_by_sheet, progress)
         results.append(("趋势表", trend_success, trend_file_path, trend_err_msg))
 
         # 生成报警设定表
         logger.info("开始生成报警设定表...")
-        alarm_success, alarm_file_path, alarm_err_msg = self.generate_alarm_settings_csv(output_dir, points_by_sheet)
+        alarm_success, alarm_file_path, alarm_err_msg = self.generate_alarm_settings_csv(output_dir, points_by_sheet, progress)
         results.append(("报警设定表", alarm_success, alarm_file_path, alarm_err_msg))
 
+        progress.finish()
         return results
 
 if __name__ == '__main__':
@@ -7,6 +7,7 @@ from collections import defaultdict
 
 # 修改导入路径为绝对导入
 from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+from core.jobs import JobCancelled, JobContext, PointProgress
 
 # 假设常量C的定义保持不变，因为它可能仍用于第三方表的列名或亚控输出文件的结构定义
 class C:
@@ -486,7 +487,8 @@ class KingViewGenerator:
     def generate_kingview_files(self,
                                points_by_sheet: Dict[str, List[UploadedIOPoint]],
                                output_dir: str,
-                               base_io_filename: str
+                               base_io_filename: str,
+                               context: Optional[JobContext] = None
                               ) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
         """
         生成两个亚控点表文件，数据从传入的按工作表组织的 UploadedIOPoint 对象字典获取。
@@ -496,6 +498,7 @@ class KingViewGenerator:
             points_by_sheet: 按工作表组织的UploadedIOPoint对象字典
             output_dir: 输出目录
             base_io_filename: 基础文件名
+            context: 提供时逐点上报进度，并在点位之间检查取消（取消时抛出 JobCancelled，不写文件）
             
         Returns:
             (成功标志, IO服务器文件路径, 数据词典文件路径, 错误消息)
@@ -515,9 +518,11 @@ class KingViewGenerator:
         extracted_site_no, extracted_site_name = self._extract_site_info(all_points_list)
 
         # 处理点位数据
+        progress = PointProgress(context, len(all_points_list), "亚控点表")
         try:
             logger.info(f"开始处理 {len(all_points_list)} 个点位 (UploadedIOPoint 列表)...")
             for index, point_obj in enumerate(all_points_list):
+                progress.advance()
                 # 判断是否应用主表逻辑，基于点的来源
                 apply_main_logic = (point_obj.source_sheet_name == C.PLC_IO_SHEET_NAME or 
                                    point_obj.source_type == "main_io" or 
@@ -530,13 +535,18 @@ class KingViewGenerator:
                                           point_index_for_log=index)
             logger.info("所有点位数据处理完成。")
             
+        except JobCancelled:
+            logger.info("亚控点表生成已取消，未写入文件。")
+            raise
         except Exception as e_proc:
             error_msg = f"处理IO点数据时发生错误: {e_proc}"
             logger.error(error_msg, exc_info=True)
             return False, None, None, error_msg
 
         # 生成输出文件
-        return self._generate_output_files(output_dir, base_io_filename)
+        output_result = self._generate_output_files(output_dir, base_io_filename)
+        progress.finish()
+        return output_result
 
     def _extract_site_info(self, all_points_list: List[UploadedIOPoint]) -> Tuple[Optional[str], Optional[str]]:
         """
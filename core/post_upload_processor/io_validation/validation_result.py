@@ -0,0 +1,81 @@
+# core/post_upload_processor/io_validation/validation_result.py
+"""
+IO点表校验的结构化结果
+
+每条校验消息是一个 ValidationIssue：它本身就是原来的消息文本（str 子类，按字符串处理错误列表的代码不受影响），
+另外记录所在的工作表、Excel行号、列、产生消息的规则和严重程度，供界面按表格分页显示和筛选。
+ValidationResult 汇总一次校验的全部消息；达到 max_errors 提前结束时 truncated 为 True。
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+SEVERITY_LABELS = {SEVERITY_ERROR: "错误", SEVERITY_WARNING: "警告"}
+
+
+class ValidationIssue(str):
+    """一条校验消息（消息文本 + 位置信息）"""
+
+    def __new__(cls, message: str, sheet: str = "", row: Optional[int] = None, column: Optional[str] = None,
+                rule: Optional[str] = None, severity: str = SEVERITY_ERROR) -> "ValidationIssue":
+        issue = super().__new__(cls, message)
+        issue.sheet = sheet  # 工作表名，文件级别的消息为空字符串
+        issue.row = row  # Excel行号（表头为第1行），表级别的消息为 None 或第一个相关行
+        issue.column = column
+        issue.rule = rule  # 产生消息的规则（类名）
+        issue.severity = severity
+        return issue
+
+    def __reduce__(self):
+        return ValidationIssue, (str(self), self.sheet, self.row, self.column, self.rule, self.severity)
+
+    @property
+    def message(self) -> str:
+        return str(self)
+
+    @property
+    def description(self) -> str:
+        """去掉位置前缀后的错误描述（消息格式为 "验证失败 (位置):\\n描述"）"""
+        return self.split("\n", 1)[-1]
+
+
+@dataclass
+class ValidationResult:
+    """一次 IO 点表校验的结果"""
+    file_path: str
+    issues: List[ValidationIssue] = field(default_factory=list)
+    success_message: str = ""
+    truncated: bool = False  # 消息数达到 max_errors 后提前结束，其余内容未校验
+    max_errors: Optional[int] = None
+
+    @property
+    def is_valid(self) -> bool:
+        """没有任何消息（包括警告）时才算校验通过"""
+        return not self.issues
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == SEVERITY_ERROR)
+
+    @property
+    def warning_count(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == SEVERITY_WARNING)
+
+    @property
+    def truncation_notice(self) -> str:
+        if not self.truncated:
+            return ""
+        return f'校验消息已达到上限 {self.max_errors} 条，已提前结束校验，文件中可能还有其他错误。'
+
+    @property
+    def message(self) -> str:
+        """合并后的消息文本：校验通过时为提示信息，否则为按换行符连接的全部消息"""
+        if self.is_valid:
+            return self.success_message
+        lines = list(self.issues)
+        if self.truncated:
+            lines.append(self.truncation_notice)
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+# core/post_upload_processor/io_validation/validation_state.py
+"""
+IO点表增量校验的状态
+
+校验失败后，用户通常只修改几个单元格就重新上传同一个文件。ValidationStateCache 按文件路径保存上一次
+校验中每个工作表的状态：整张表的指纹和校验结果，以及每一行的指纹和该行行级规则的错误消息。
+再次校验同一路径的文件时：
+- 工作表内容未变：直接复用上次的结果，不再生成 DataFrame 和执行规则；
+- 工作表有改动：只对指纹变化的行重新执行行级规则，其他行复用上次的错误消息；
+  表级校验（缺少列、HMI名称唯一性）总是对整张表重新执行。
+列名或列的数据类型变化时（会改变各行单元格的取值），整张表的行重新校验。
+
+整张表的指纹按读取到的原始单元格值计算，判断表是否改动时不必生成 DataFrame；行指纹按 DataFrame 中各行的值计算
+（DataFrame 按整列推断类型，同一原始行在其他行改动后取值可能不同，例如 1 变为 True）。
+指纹是 pickle 序列化结果的 BLAKE2b 摘要：区分值的类型（1、1.0、True、"1" 的指纹各不相同），且与进程无关，
+并行校验时在工作进程中计算的指纹也可以相互比较。
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+FINGERPRINT_SIZE = 16  # 字节
+
+
+def fingerprint(value: Any) -> bytes:
+    """计算值（如整张表的原始单元格值列表）的指纹"""
+    return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), digest_size=FINGERPRINT_SIZE).digest()
+
+
+def row_fingerprints(df: pd.DataFrame) -> List[bytes]:
+    """DataFrame 每一行的指纹（按行位置）"""
+    return [fingerprint(row) for row in df.values.tolist()]
+
+
+def frame_signature(df: pd.DataFrame) -> Tuple[Tuple[Any, ...], Tuple[str, ...]]:
+    """DataFrame 的列名和各列数据类型"""
+    return tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes)
+
+
+@dataclass
+class RowValidationState:
+    """一张表行级校验的状态"""
+    signature: Optional[Tuple[Tuple[Any, ...], Tuple[str, ...]]] = None  # 见 frame_signature
+    row_fingerprints: List[bytes] = field(default_factory=list)  # 见 row_fingerprints
+    row_errors: Dict[int, List[str]] = field(default_factory=dict)  # 行位置 -> 错误消息，只保存有错误的行，按行位置排列
+
+
+@dataclass
+class SheetValidationState:
+    """一个工作表上一次的校验结果"""
+    fingerprint: bytes  # 整张表原始单元格值的指纹
+    is_main_sheet: bool  # 是否为有数据的主IO点表
+    errors: List[str]
+    rows: RowValidationState
+
+
+class ValidationStateCache:
+    """按文件路径保存最近 max_files 个文件的校验状态（内存中，线程安全）"""
+
+    def __init__(self, max_files: int = 5):
+        self.max_files = max(1, max_files)
+        self._states: "OrderedDict[str, Dict[str, SheetValidationState]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def get(self, file_path: str) -> Dict[str, SheetValidationState]:
+        """返回该文件上一次校验的各工作表状态（工作表名 -> 状态），没有时返回空字典"""
+        key = self._key(file_path)
+        with self._lock:
+            if key not in self._states:
+                return {}
+            self._states.move_to_end(key)
+            return dict(self._states[key])
+
+    def put(self, file_path: str, states: Dict[str, SheetValidationState]) -> None:
+        """保存该文件本次校验的各工作表状态，超出 max_files 时删除最久未使用的文件"""
+        key = self._key(file_path)
+        with self._lock:
+            self._states[key] = dict(states)
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_files:
+                self._states.popitem(last=False)
+
+    def discard(self, file_path: str) -> None:
+        with self._lock:
+            self._states.pop(self._key(file_path), None)
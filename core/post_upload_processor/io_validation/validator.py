@@ -1,11 +1,26 @@
 # core/post_upload_processor/io_validation/validator.py
 import os
+from concurrent.futures import Future, ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from typing import Tuple, List, Dict, Any, Optional
 from abc import ABC, abstractmethod # 导入 ABC 和 abstractmethod
 
 # 从 constants.py 导入常量
 from . import constants as C
+from .validation_result import SEVERITY_WARNING, ValidationIssue, ValidationResult
+from .validation_state import (
+    RowValidationState, SheetValidationState, ValidationStateCache, fingerprint, frame_signature, row_fingerprints
+)
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedSheet, ParsedWorkbook
+
+# 工作表并行校验的启用条件：文件小于该大小或其他工作表（主IO点表以外）少于该数量时按顺序校验，
+# 此时启动工作进程和传递数据的开销大于并行带来的收益
+PARALLEL_VALIDATION_MIN_FILE_SIZE = 1024 * 1024  # 字节
+PARALLEL_VALIDATION_MIN_SHEETS = 2
+
+# 缺少必需列的消息所对应的规则名（缺少列在各规则执行前检查，没有对应的规则类）
+REQUIRED_COLUMNS_RULE = "RequiredColumns"
 
 # 定义常量，方便维护
 # --- 主IO点表Sheet列名 ---
@@ -85,7 +100,7 @@ def _format_error_message(
         value (Optional[Any]): 相关的值（如果适用）。
 
     返回:
-        str: 格式化后的错误消息。
+        str: 格式化后的错误消息（ValidationIssue，同时记录工作表、行号和列）。
     """
     location = f'工作表:"{sheet_name}", Excel行号:{row_number}'
     if point_name:
@@ -98,7 +113,7 @@ def _format_error_message(
         display_value = value_str[:50] + '...' if len(value_str) > 50 else value_str
         location += f', 值:"{display_value}"'
 
-    return f'验证失败 ({location}):\n{message}'
+    return ValidationIssue(f'验证失败 ({location}):\n{message}', sheet_name, row_number, column_name)
 
 
 # --- 校验规则定义 --- #
@@ -120,6 +135,78 @@ class ValidationContext:
         # 主 IO 表判断是否为预留点位（基于 HMI 名称）
         self.is_main_reserved = not self.hmi_name_present
 
+
+class SheetFrame:
+    """
+    整张工作表的列式校验上下文，与逐行的 ValidationContext 对应。
+
+    各列的"是否填写"、去空格后的字符串等按列一次性计算（pandas/NumPy 掩码）并缓存，
+    供多个规则共享。所有掩码都是长度等于行数的 numpy 布尔数组。
+    """
+    def __init__(self, df: pd.DataFrame, sheet_name: str):
+        self.df = df
+        self.sheet_name = sheet_name
+        self._present_cache: Dict[str, np.ndarray] = {}
+        self._stripped_cache: Dict[str, pd.Series] = {}
+        self._non_numeric_cache: Dict[str, np.ndarray] = {}
+
+        self.hmi_name_present = self.present(C.HMI_NAME_COL)
+        self.description_present = self.present(C.DESCRIPTION_COL)
+        self.is_main_reserved = ~self.hmi_name_present
+        # 与 ValidationContext 相同：str(值).upper().strip()，缺少该列时为空字符串
+        self.module_type = self._upper_stripped(C.MODULE_TYPE_COL)
+        self.data_type = self._upper_stripped(C.TP_INPUT_DATA_TYPE_COL)
+
+    def column(self, column: str) -> pd.Series:
+        """返回列数据；缺少该列时返回全为 None 的列（与 row.get(column) 返回 None 一致）。"""
+        if column in self.df.columns:
+            return self.df[column]
+        return pd.Series([None] * len(self.df), index=self.df.index, dtype=object)
+
+    def present(self, column: str) -> np.ndarray:
+        """列中各单元格是否填写，等价于逐个调用 _is_value_present。"""
+        if column not in self._present_cache:
+            values = self.column(column)
+            mask = values.notna().to_numpy()
+            if values.dtype == object:  # 只有混合类型列中可能出现空白字符串
+                mask &= np.fromiter((not (isinstance(value, str) and not value.strip()) for value in values.to_numpy()),
+                                    dtype=bool, count=len(values))
+            self._present_cache[column] = mask
+        return self._present_cache[column]
+
+    def stripped(self, column: str) -> pd.Series:
+        """列中各单元格的 str(值).strip()。"""
+        if column not in self._stripped_cache:
+            self._stripped_cache[column] = self.column(column).astype(str).str.strip()
+        return self._stripped_cache[column]
+
+    def isin(self, column: str, allowed_values: List[str]) -> np.ndarray:
+        """列中各单元格去空格后的字符串是否在允许值中。"""
+        return self.stripped(column).isin(allowed_values).to_numpy()
+
+    def non_numeric(self, column: str) -> np.ndarray:
+        """列中已填写但不是数字的单元格，等价于 _is_value_present(值) and not _is_numeric(值)。"""
+        if column not in self._non_numeric_cache:
+            values = self.column(column)
+            present = self.present(column)
+            if values.dtype.kind in 'iuf':  # 整数/浮点数列：已填写的都是数字
+                mask = np.zeros(len(values), dtype=bool)
+            elif values.dtype == object:  # 混合类型列：只对已填写的单元格逐个判断
+                mask = np.zeros(len(values), dtype=bool)
+                positions = np.flatnonzero(present)
+                raw_values = values.to_numpy()
+                mask[positions] = [not _is_numeric(value) for value in raw_values[positions]]
+            else:  # 布尔、日期等列：已填写的都不是数字
+                mask = present.copy()
+            self._non_numeric_cache[column] = mask
+        return self._non_numeric_cache[column]
+
+    def _upper_stripped(self, column: str) -> np.ndarray:
+        if column not in self.df.columns:
+            return np.full(len(self.df), "", dtype=object)
+        return self.df[column].astype(str).str.upper().str.strip().to_numpy()
+
+
 class ValidationRule(ABC):
     """校验规则的抽象基类。"""
 
@@ -128,10 +215,22 @@ class ValidationRule(ABC):
         """执行校验逻辑，返回错误消息列表 (空列表表示无错误)。"""
         pass
 
+    def failing_rows(self, frame: SheetFrame) -> Optional[np.ndarray]:
+        """
+        列式校验：对整张表按列计算可能不通过本规则的行，返回布尔掩码。
+
+        只有掩码为 True 的行才会再调用 validate() 生成错误消息，因此掩码可以多选（多选的行
+        validate() 返回空列表），但不能漏选。返回 None 表示规则没有列式实现，逐行校验所有行。
+        """
+        return None
+
 # --- 主 IO 表规则实现 --- #
 
 class HmiDescriptionConsistencyRule(ValidationRule):
     """规则：HMI 名称和描述必须同时填写或同时为空。"""
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return frame.hmi_name_present != frame.description_present
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if context.hmi_name_present != context.description_present:
@@ -149,6 +248,9 @@ class ReservedPointEmptyRule(ValidationRule):
         self.column = column
         self.column_name_cn = column_name_cn
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return frame.is_main_reserved & frame.present(self.column)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if context.is_main_reserved:
@@ -167,6 +269,9 @@ class NonReservedRequiredRule(ValidationRule):
         self.column = column
         self.column_name_cn = column_name_cn
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return ~frame.is_main_reserved & ~frame.present(self.column)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if not context.is_main_reserved:
@@ -181,6 +286,10 @@ class NonReservedRequiredRule(ValidationRule):
 
 class PowerSupplyValueRule(ValidationRule):
     """规则：非预留点位的供电类型值必须有效。"""
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return (~frame.is_main_reserved & frame.present(C.POWER_SUPPLY_TYPE_COL)
+                & ~frame.isin(C.POWER_SUPPLY_TYPE_COL, C.ALLOWED_POWER_SUPPLY_VALUES))
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if not context.is_main_reserved:
@@ -199,6 +308,14 @@ class PowerSupplyValueRule(ValidationRule):
 
 class WiringSystemValueRule(ValidationRule):
     """规则：非预留点位的线制值必须有效，且符合其模块类型的要求。"""
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        is_ai_ao = np.isin(frame.module_type, [C.MODULE_TYPE_AI, C.MODULE_TYPE_AO])
+        is_di_do = np.isin(frame.module_type, [C.MODULE_TYPE_DI, C.MODULE_TYPE_DO])
+        invalid = ((is_ai_ao & ~frame.isin(C.WIRING_SYSTEM_COL, C.ALLOWED_WIRING_SYSTEM_VALUES_AI_AO))
+                   | (is_di_do & ~frame.isin(C.WIRING_SYSTEM_COL, C.ALLOWED_WIRING_SYSTEM_VALUES_DI_DO))
+                   | (frame.module_type == ""))
+        return ~frame.is_main_reserved & frame.present(C.WIRING_SYSTEM_COL) & invalid
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if not context.is_main_reserved:
@@ -231,6 +348,10 @@ class WiringSystemValueRule(ValidationRule):
 
 class RangeRequiredAiRule(ValidationRule):
     """规则：非预留AI模块点位，量程上下限必须填写。"""
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        missing = ~frame.present(C.RANGE_LOW_LIMIT_COL) | ~frame.present(C.RANGE_HIGH_LIMIT_COL)
+        return ~frame.is_main_reserved & (frame.module_type == C.MODULE_TYPE_AI) & missing
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if not context.is_main_reserved and context.module_type == C.MODULE_TYPE_AI:
@@ -256,6 +377,9 @@ class NumericValueRule(ValidationRule):
         self.column = column
         self.column_name_cn = column_name_cn
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return frame.non_numeric(self.column)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         value = context.row.get(self.column)
@@ -272,6 +396,9 @@ class RangeNumericAiRule(NumericValueRule):
     def __init__(self, column: str, column_name_cn: str):
         super().__init__(column, column_name_cn)
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return (frame.module_type == C.MODULE_TYPE_AI) & super().failing_rows(frame)
+
     def validate(self, context: ValidationContext) -> List[str]:
         # 对所有 AI 模块应用此规则（包括预留和非预留）
         if context.module_type == C.MODULE_TYPE_AI:
@@ -283,6 +410,9 @@ class SetpointNumericAiRule(NumericValueRule):
     def __init__(self, column: str, column_name_cn: str):
         super().__init__(column, column_name_cn)
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return ~frame.is_main_reserved & (frame.module_type == C.MODULE_TYPE_AI) & super().failing_rows(frame)
+
     def validate(self, context: ValidationContext) -> List[str]:
         # 只对非预留 AI 模块应用此规则
         if not context.is_main_reserved and context.module_type == C.MODULE_TYPE_AI:
@@ -296,6 +426,9 @@ class ReservedAiSpecificEmptyRule(ValidationRule):
         self.column = column
         self.column_name_cn = column_name_cn
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return frame.is_main_reserved & (frame.module_type == C.MODULE_TYPE_AI) & frame.present(self.column)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         # 只对预留 AI 模块应用此规则
@@ -323,6 +456,12 @@ class RealSetpointUniquenessRule(ValidationRule):
         """
         self.setpoint_col_consts = setpoint_col_consts
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        columns = self.setpoint_col_consts or [C.TP_INPUT_SLL_SET_COL, C.TP_INPUT_SL_SET_COL,
+                                               C.TP_INPUT_SH_SET_COL, C.TP_INPUT_SHH_SET_COL]
+        present_count = sum(frame.present(column).astype(int) for column in dict.fromkeys(columns))
+        return (frame.data_type == C.DATA_TYPE_REAL) & (present_count > 1)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if context.data_type == C.DATA_TYPE_REAL:
@@ -375,6 +514,12 @@ class BoolSetpointEmptyRule(ValidationRule):
         """
         self.setpoint_cols_map = setpoint_cols_map
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        columns = self.setpoint_cols_map or [C.TP_INPUT_SLL_SET_COL, C.TP_INPUT_SL_SET_COL,
+                                             C.TP_INPUT_SH_SET_COL, C.TP_INPUT_SHH_SET_COL]
+        any_present = np.logical_or.reduce([frame.present(column) for column in columns])
+        return (frame.data_type == C.DATA_TYPE_BOOL) & any_present
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         if context.data_type == C.DATA_TYPE_BOOL: # 检查是否为 BOOL 类型
@@ -411,6 +556,9 @@ class AlwaysRequiredRule(ValidationRule):
         self.column = column
         self.column_name_cn = column_name_cn
 
+    def failing_rows(self, frame: SheetFrame) -> np.ndarray:
+        return ~frame.present(self.column)
+
     def validate(self, context: ValidationContext) -> List[str]:
         errors = []
         value = context.row.get(self.column)
@@ -443,9 +591,10 @@ class HmiNameUniquenessRule:
         # 检查重复
         for name, rows in name_to_rows.items():
             if len(rows) > 1:
-                errors.append(
-                    f'验证失败 (工作表:"{sheet_name}"): "{C.HMI_NAME_COL}" 变量名 "{name}" 在以下Excel行号重复: {rows}，请确保唯一。'
-                )
+                errors.append(ValidationIssue(
+                    f'验证失败 (工作表:"{sheet_name}"): "{C.HMI_NAME_COL}" 变量名 "{name}" 在以下Excel行号重复: {rows}，请确保唯一。',
+                    sheet_name, rows[0], C.HMI_NAME_COL, type(self).__name__
+                ))
         return errors
 
 # --- 规则注册表 (更新) --- #
@@ -511,10 +660,93 @@ def _validate_row_with_rules(row: pd.Series, excel_row_number: int, sheet_name:
 
     return all_errors
 
+
+def _collect_row_errors(df: pd.DataFrame, sheet_name: str, rules: List[ValidationRule],
+                        max_errors: Optional[int] = None) -> Dict[int, List[str]]:
+    """
+    按列校验整张表，返回 行位置 -> 该行的错误消息（只包含有错误的行，按行位置排列）。
+
+    各规则先用 failing_rows 按列筛出可能出错的行，再按行的顺序只对这些行构造行数据并调用 validate() 生成消息；
+    没有列式实现的规则对所有行逐行校验。每行的错误按规则顺序排列，与逐行校验的输出顺序一致。
+    max_errors 不为 None 时，消息数达到该值后不再校验后面的行（已校验的行的结果完整）。
+    """
+    if df.empty:
+        return {}
+    frame = SheetFrame(df, sheet_name)
+    rule_masks = [(rule, rule.failing_rows(frame)) for rule in rules]
+    if any(mask is None for _, mask in rule_masks):
+        positions = range(len(df))
+    else:
+        positions = np.flatnonzero(np.logical_or.reduce([mask for _, mask in rule_masks]))
+
+    row_values = df.values  # 与 iterrows 相同的取值方式，保证行数据类型一致
+    row_errors: Dict[int, List[str]] = {}
+    error_count = 0
+    for position in positions:
+        index = df.index[position]
+        context = ValidationContext(pd.Series(row_values[position], index=df.columns, name=index), index + 2, sheet_name)
+        errors: List[str] = []
+        for rule, mask in rule_masks:
+            if mask is None or mask[position]:
+                rule_name = type(rule).__name__
+                for error in rule.validate(context):
+                    if not isinstance(error, ValidationIssue):
+                        error = ValidationIssue(error, sheet_name, context.excel_row_number)
+                    error.rule = rule_name
+                    errors.append(error)
+        if errors:
+            row_errors[int(position)] = errors
+            error_count += len(errors)
+            if max_errors is not None and error_count >= max_errors:
+                break
+    return row_errors
+
+
+def _validate_rows_with_rules(df: pd.DataFrame, sheet_name: str, rules: List[ValidationRule],
+                              state: Optional[RowValidationState] = None,
+                              previous: Optional[RowValidationState] = None,
+                              max_errors: Optional[int] = None) -> List[str]:
+    """
+    按列校验整张表的各行，结果与对每行调用 _validate_row_with_rules 完全相同（消息、行号和顺序）。
+
+    增量校验时 state 为本次的行状态（已填好 signature 和 row_fingerprints），previous 为该表上一次的行状态：
+    列名和列类型不变时只重新校验指纹变化的行，其他行复用上次的错误消息。各行的错误消息保存到 state.row_errors。
+    max_errors 不为 None 时，消息数达到该值后可提前结束，返回的消息是完整结果的前缀（至少 max_errors 条，
+    除非完整结果更少）；此时 state 不完整，不应再用于增量校验。
+    """
+    if state is None:
+        row_errors = _collect_row_errors(df, sheet_name, rules, max_errors)
+    elif previous is not None and previous.signature == state.signature:
+        fingerprints, previous_fingerprints = state.row_fingerprints, previous.row_fingerprints
+        changed = [position for position, row_fingerprint in enumerate(fingerprints)
+                   if position >= len(previous_fingerprints) or previous_fingerprints[position] != row_fingerprint]
+        changed_set = set(changed)
+        row_errors = {position: errors for position, errors in previous.row_errors.items()
+                      if position < len(fingerprints) and position not in changed_set}
+        if changed:
+            changed_errors = _collect_row_errors(df.iloc[changed], sheet_name, rules, max_errors)
+            for position, errors in changed_errors.items():
+                row_errors[changed[position]] = errors
+            if max_errors is not None and sum(len(errors) for errors in changed_errors.values()) >= max_errors:
+                # 改动的行校验到一半提前结束：只保留已校验到的位置之前的行，使结果仍是完整结果的前缀
+                last_position = changed[max(changed_errors)]
+                row_errors = {position: errors for position, errors in row_errors.items() if position <= last_position}
+            row_errors = dict(sorted(row_errors.items()))
+    else:
+        row_errors = _collect_row_errors(df, sheet_name, rules, max_errors)
+    if state is not None:
+        state.row_errors = row_errors
+    return [error for errors in row_errors.values() for error in errors]
+
 # --- Sheet 级校验函数 (需要更新以使用新行级校验) --- #
 
-def _validate_main_io_sheet(df: pd.DataFrame, sheet_name: str) -> List[str]:
-    """校验主IO点表Sheet (使用规则注册表)。"""
+def _validate_main_io_sheet(df: pd.DataFrame, sheet_name: str, row_state: Optional[RowValidationState] = None,
+                           previous_rows: Optional[RowValidationState] = None,
+                           max_errors: Optional[int] = None) -> List[str]:
+    """
+    校验主IO点表Sheet (使用规则注册表)。
+    row_state、previous_rows 用于增量校验，max_errors 用于提前结束，见 _validate_rows_with_rules。
+    """
     errors: List[str] = []
     required_cols_main = [
         C.HMI_NAME_COL, C.DESCRIPTION_COL, C.POWER_SUPPLY_TYPE_COL, C.WIRING_SYSTEM_COL,
@@ -524,22 +756,28 @@ def _validate_main_io_sheet(df: pd.DataFrame, sheet_name: str) -> List[str]:
     missing_cols_main = [col for col in required_cols_main if col not in df.columns]
     if missing_cols_main:
         for col_name in missing_cols_main:
-            errors.append(f'验证失败：主工作表"{sheet_name}"中缺少必需的列"{col_name}"。')
+            errors.append(ValidationIssue(f'验证失败：主工作表"{sheet_name}"中缺少必需的列"{col_name}"。',
+                                          sheet_name, column=col_name, rule=REQUIRED_COLUMNS_RULE))
         return errors # 缺少列则不进行行校验
 
     # 新增：HMI唯一性校验
     errors.extend(HmiNameUniquenessRule().validate_sheet(df, sheet_name))
 
-    for index, row in df.iterrows():
-        excel_row_number = index + 2 # Excel行号从1开始，Dataframe索引从0开始，表头占1行
-        # 使用新的基于规则的校验函数
-        row_errors = _validate_row_with_rules(row, excel_row_number, sheet_name, MAIN_IO_RULES)
-        errors.extend(row_errors)
+    # 按列校验各行 (Excel行号 = DataFrame索引 + 2，表头占1行)
+    remaining = None if max_errors is None else max(max_errors - len(errors), 0)
+    if remaining == 0:
+        return errors
+    errors.extend(_validate_rows_with_rules(df, sheet_name, MAIN_IO_RULES, row_state, previous_rows, remaining))
 
     return errors
 
-def _validate_third_party_sheet(df: pd.DataFrame, sheet_name: str) -> List[str]:
-    """校验第三方设备点表Sheet (使用规则注册表)。"""
+def _validate_third_party_sheet(df: pd.DataFrame, sheet_name: str, row_state: Optional[RowValidationState] = None,
+                                previous_rows: Optional[RowValidationState] = None,
+                                max_errors: Optional[int] = None) -> List[str]:
+    """
+    校验第三方设备点表Sheet (使用规则注册表)。
+    row_state、previous_rows 用于增量校验，max_errors 用于提前结束，见 _validate_rows_with_rules。
+    """
     errors: List[str] = []
     # 检查第三方表校验设定值所需的列是否存在 (这部分逻辑可以保留)
     required_tp_cols_for_setpoint_check = [
@@ -550,89 +788,245 @@ def _validate_third_party_sheet(df: pd.DataFrame, sheet_name: str) -> List[str]:
     missing_tp_cols = [col for col in required_tp_cols_for_setpoint_check if col not in df.columns]
     if missing_tp_cols:
         for col_name in missing_tp_cols:
-            errors.append(f'验证失败：工作表"{sheet_name}"中缺少校验设定值所必需的列"{col_name}"。无法对该表执行设定值唯一性校验。')
+            errors.append(ValidationIssue(
+                f'验证失败：工作表"{sheet_name}"中缺少校验设定值所必需的列"{col_name}"。无法对该表执行设定值唯一性校验。',
+                sheet_name, column=col_name, rule=REQUIRED_COLUMNS_RULE))
         # 即使缺少列，仍可以继续用规则校验其他列，所以不直接 return
 
-    for index, row in df.iterrows():
-        excel_row_number = index + 2
-        # 使用新的基于规则的校验函数
-        # 注意：RealSetpointUniquenessRule 需要的列如果缺失，它内部应该能处理或我们在调用前检查
-        row_errors = _validate_row_with_rules(row, excel_row_number, sheet_name, THIRD_PARTY_RULES)
-        errors.extend(row_errors)
+    # 注意：RealSetpointUniquenessRule 需要的列如果缺失，它内部应该能处理或我们在调用前检查
+    remaining = None if max_errors is None else max(max_errors - len(errors), 0)
+    if remaining == 0:
+        return errors
+    errors.extend(_validate_rows_with_rules(df, sheet_name, THIRD_PARTY_RULES, row_state, previous_rows, remaining))
 
     return errors
 
-# --- 主校验入口函数 (无需大改，因为它调用 Sheet 级函数) --- #
+# --- 主校验入口函数 --- #
+
+def _validate_sheet(sheet: ParsedSheet, previous: Optional[SheetValidationState] = None,
+                    track_state: bool = False,
+                    max_errors: Optional[int] = None) -> Tuple[bool, List[str], Optional[SheetValidationState]]:
+    """
+    校验一个工作表（主IO点表或第三方设备表）。
+
+    Args:
+        sheet: 要校验的工作表。
+        previous: 该表上一次的校验状态，track_state 为 True 时用于增量校验（见 validation_state）。
+        track_state: 是否计算并返回本次的校验状态。
+        max_errors: 错误消息数上限。达到上限时提前结束，返回完整结果的前 max_errors 条消息。
 
-def validate_io_table(file_path: str) -> Tuple[bool, str]:
+    Returns:
+        Tuple[bool, List[str], Optional[SheetValidationState]]:
+            (是否为有数据的主IO点表, 错误消息列表, 本次的校验状态；未要求、校验出错或达到上限时为 None)
+    """
+    sheet_name = sheet.name
+    is_main_sheet = False
+    try:
+        sheet_fingerprint = None
+        if track_state:
+            sheet_fingerprint = fingerprint(sheet.rows)
+            if previous is not None and previous.fingerprint == sheet_fingerprint:
+                return previous.is_main_sheet, previous.errors[:max_errors], previous
+
+        df = sheet.dataframe()
+
+        row_state = RowValidationState(frame_signature(df), row_fingerprints(df)) if track_state else None
+        previous_rows = previous.rows if previous is not None else None
+
+        if df.empty:
+            errors: List[str] = []
+        elif sheet_name == C.PLC_IO_SHEET_NAME:
+            is_main_sheet = True
+            errors = _validate_main_io_sheet(df, sheet_name, row_state, previous_rows, max_errors)
+        else:
+            errors = _validate_third_party_sheet(df, sheet_name, row_state, previous_rows, max_errors)
+
+        state = None
+        if max_errors is not None and len(errors) >= max_errors:
+            # 提前结束时结果不完整，不保存状态
+            errors = errors[:max_errors]
+        elif track_state:
+            state = SheetValidationState(sheet_fingerprint, is_main_sheet, errors, row_state)
+        return is_main_sheet, errors, state
+
+    except ValueError as ve: # 特定Sheet读取错误 (例如找不到名字 - 虽然我们是迭代获取的，理论上不会发生)
+        return is_main_sheet, [ValidationIssue(f'验证失败：读取工作表"{sheet_name}"时出错: {str(ve)}。', sheet_name)], None
+    except Exception as e_read_sheet: # pylint: disable=broad-except
+        return is_main_sheet, [ValidationIssue(f'验证失败：处理工作表"{sheet_name}"时发生未知错误: {str(e_read_sheet)}。', sheet_name)], None
+
+
+# 工作进程中打开的工作簿（文件路径 -> ParsedWorkbook），每个进程只打开一次文件
+_worker_workbooks: Dict[str, ParsedWorkbook] = {}
+
+
+def _validate_sheet_in_worker(file_path: str, sheet_name: str, rows: Optional[List[Tuple[Any, ...]]] = None,
+                              previous: Optional[SheetValidationState] = None,
+                              track_state: bool = False,
+                              max_errors: Optional[int] = None) -> Tuple[bool, List[str], Optional[SheetValidationState]]:
+    """
+    在工作进程中校验一个工作表，参数和返回值同 _validate_sheet。
+    rows 为该表已读取的单元格值；为 None 时由工作进程自行从文件读取这一张表。
+    """
+    if rows is None:
+        try:
+            if file_path not in _worker_workbooks:
+                _worker_workbooks[file_path] = ParsedWorkbook.open(file_path)
+            rows = list(_worker_workbooks[file_path][sheet_name].iter_rows())
+        except Exception as e_read_sheet: # pylint: disable=broad-except
+            return False, [ValidationIssue(f'验证失败：处理工作表"{sheet_name}"时发生未知错误: {str(e_read_sheet)}。', sheet_name)], None
+    return _validate_sheet(ParsedSheet(sheet_name, rows), previous, track_state, max_errors)
+
+
+def _should_validate_in_parallel(file_path: str, sheet_count: int, max_workers: Optional[int]) -> bool:
+    """判断主IO点表以外的工作表是否使用进程池并行校验"""
+    if max_workers is not None and max_workers <= 1:
+        return False
+    if max_workers is None and (os.cpu_count() or 1) <= 1:
+        return False
+    if sheet_count < PARALLEL_VALIDATION_MIN_SHEETS:
+        return False
+    try:
+        return os.path.getsize(file_path) >= PARALLEL_VALIDATION_MIN_FILE_SIZE
+    except OSError:
+        return False
+
+
+def validate_io_table_result(file_path: str, workbook: Optional[ParsedWorkbook] = None,
+                             max_workers: Optional[int] = None,
+                             validation_cache: Optional[ValidationStateCache] = None,
+                             max_errors: Optional[int] = None) -> ValidationResult:
     """
     验证上传的IO点表文件。包括主IO点表和所有其他（第三方设备）点表。
-    (文档字符串可能需要更新以反映实现方式的变化)
+
+    Args:
+        file_path: Excel文件路径。
+        workbook: 已读取的工作簿。提供时直接校验其中的数据，之后可把同一对象交给
+                  load_workbook_data 加载点位，上传过程中文件只需读取一次。
+        max_workers: 并行校验工作表的进程数，默认取待校验表数和CPU核数的较小值；为 1 时按顺序校验。
+                     文件较小或工作表较少时也按顺序校验（见 PARALLEL_VALIDATION_MIN_*）。
+                     并行时主IO点表在当前进程中校验，同时其他工作表在工作进程中校验，错误消息按工作表原始顺序合并。
+        validation_cache: 增量校验状态。提供时复用同一路径文件上一次的校验结果，只重新校验有改动的工作表和行
+                          （见 validation_state），校验后保存本次的状态。
+        max_errors: 错误消息数上限，为 None 或小于 1 时不限制。达到上限时不再校验后面的行和工作表，
+                    结果为完整结果的前 max_errors 条消息，truncated 为 True。
+
+    Returns:
+        ValidationResult: 结构化的校验结果，每条消息带有工作表、行号、列、规则和严重程度（见 validation_result）。
     """
-    error_messages: List[str] = []
+    if max_errors is not None and max_errors < 1:
+        max_errors = None
+    result = ValidationResult(file_path, max_errors=max_errors)
+
+    def fail(message: str) -> ValidationResult:
+        result.issues = [ValidationIssue(message)]
+        return result
 
     # --- 文件存在性和格式基础校验 ---
     if not file_path:
-        return False, "错误：未提供文件路径。"
+        return fail("错误：未提供文件路径。")
     if not os.path.exists(file_path):
-        return False, f"错误：文件未找到: {file_path}。"
+        return fail(f"错误：文件未找到: {file_path}。")
     _, ext = os.path.splitext(file_path)
     if ext.lower() not in ['.xlsx', '.xls']:
-        return False, f"错误：文件格式无效: {ext}。请上传有效的 Excel 文件 (.xlsx 或 .xls)。"
+        return fail(f"错误：文件格式无效: {ext}。请上传有效的 Excel 文件 (.xlsx 或 .xls)。")
 
+    issues: List[ValidationIssue] = []
+    opened_here = workbook is None
+    executor: Optional[ProcessPoolExecutor] = None
     try:
-        xls = pd.ExcelFile(file_path)
-        sheet_names = xls.sheet_names
+        if opened_here:
+            # 以只读模式打开，各工作表在校验时才读取；并行校验时由工作进程各自读取所负责的工作表
+            workbook = ParsedWorkbook.open(file_path)
+        sheet_names = workbook.sheet_names
 
         if not sheet_names:
-            return False, f'验证失败：Excel文件 "{os.path.basename(file_path)}" 中不包含任何工作表。'
+            return fail(f'验证失败：Excel文件 "{os.path.basename(file_path)}" 中不包含任何工作表。')
+
+        track_state = validation_cache is not None
+        previous_states = validation_cache.get(file_path) if track_state else {}
+        sheet_states: Dict[str, SheetValidationState] = {}
+
+        # --- 其他工作表提交到进程池，与主IO点表的校验同时进行 ---
+        futures: Dict[str, Future] = {}
+        other_sheet_names = [name for name in sheet_names if name != C.PLC_IO_SHEET_NAME]
+        if _should_validate_in_parallel(file_path, len(other_sheet_names), max_workers):
+            workers = min(len(other_sheet_names), max_workers or os.cpu_count() or 1)
+            executor = ProcessPoolExecutor(max_workers=workers)
+            for sheet_name in other_sheet_names:
+                sheet = workbook[sheet_name]
+                futures[sheet_name] = executor.submit(_validate_sheet_in_worker, file_path, sheet_name,
+                                                      sheet.rows if sheet.is_loaded else None,
+                                                      previous_states.get(sheet_name), track_state, max_errors)
 
         main_sheet_found = False
-        # --- 遍历所有Sheet进行校验 ---
+        # --- 遍历所有Sheet进行校验，按工作表顺序合并错误消息 ---
         for sheet_name in sheet_names:
-            try:
-                df = pd.read_excel(xls, sheet_name=sheet_name)
-
-                if df.empty:
-                    continue
-
-                if sheet_name == C.PLC_IO_SHEET_NAME:
-                    main_sheet_found = True
-                    # 调用更新后的 Sheet 校验函数
-                    sheet_errors = _validate_main_io_sheet(df, sheet_name)
-                    error_messages.extend(sheet_errors)
-                else:
-                    # 调用更新后的 Sheet 校验函数
-                    sheet_errors = _validate_third_party_sheet(df, sheet_name)
-                    error_messages.extend(sheet_errors)
-
-            except ValueError as ve: # 特定Sheet读取错误 (例如找不到名字 - 虽然我们是迭代获取的，理论上不会发生)
-                 error_messages.append(f'验证失败：读取工作表"{sheet_name}"时出错: {str(ve)}。')
-            except Exception as e_read_sheet: # pylint: disable=broad-except
-                 error_messages.append(f'验证失败：处理工作表"{sheet_name}"时发生未知错误: {str(e_read_sheet)}。')
-
-        # 检查主IO点表是否存在
-        if not main_sheet_found:
-             error_messages.append(f'验证警告：在Excel文件中未找到强制要求的主工作表"{C.PLC_IO_SHEET_NAME}"。已完成对其他工作表的校验（如果存在）。')
+            remaining = None if max_errors is None else max_errors - len(issues)
+            if sheet_name in futures:
+                try:
+                    is_main_sheet, sheet_errors, sheet_state = futures[sheet_name].result()
+                except Exception as e_worker: # pylint: disable=broad-except
+                    is_main_sheet, sheet_errors, sheet_state = False, [ValidationIssue(
+                        f'验证失败：处理工作表"{sheet_name}"时发生未知错误: {str(e_worker)}。', sheet_name)], None
+            else:
+                is_main_sheet, sheet_errors, sheet_state = _validate_sheet(
+                    workbook[sheet_name], previous_states.get(sheet_name), track_state, remaining)
+            main_sheet_found = main_sheet_found or is_main_sheet
+            issues.extend(error if isinstance(error, ValidationIssue) else ValidationIssue(error, sheet_name)
+                          for error in sheet_errors[:remaining])
+            if sheet_state is not None:
+                sheet_states[sheet_name] = sheet_state
+            if remaining is not None and len(sheet_errors) >= remaining:
+                # 达到上限：后面的工作表不再校验（已提交到进程池的随 executor 关闭取消）
+                result.truncated = True
+                break
+
+        if track_state:
+            if result.truncated:
+                # 未校验到的工作表保留上一次的状态
+                sheet_states = {**previous_states, **sheet_states}
+            validation_cache.put(file_path, sheet_states)
+
+        # 检查主IO点表是否存在（提前结束时可能还未校验到，不提示）
+        if not main_sheet_found and not result.truncated:
+            issues.append(ValidationIssue(
+                f'验证警告：在Excel文件中未找到强制要求的主工作表"{C.PLC_IO_SHEET_NAME}"。已完成对其他工作表的校验（如果存在）。',
+                severity=SEVERITY_WARNING))
 
 
     except pd.errors.EmptyDataError:
-        return False, f'文件"{os.path.basename(file_path)}"为空或不包含可读数据。'
+        return fail(f'文件"{os.path.basename(file_path)}"为空或不包含可读数据。')
     except FileNotFoundError: # ExcelFile 构造时可能抛出
-         return False, f"错误：文件未找到: {file_path}。"
+         return fail(f"错误：文件未找到: {file_path}。")
     except ValueError as ve_general: # 可能由 ExcelFile 引起，如文件损坏
-         return False, f'读取Excel文件时发生错误: {str(ve_general)}。文件可能已损坏或格式不兼容。'
+         return fail(f'读取Excel文件时发生错误: {str(ve_general)}。文件可能已损坏或格式不兼容。')
     except Exception as e: # pylint: disable=broad-except
         # 捕获未预料到的其他异常，例如权限问题
-        return False, f'验证过程中发生未知错误: {str(e)}。'
+        return fail(f'验证过程中发生未知错误: {str(e)}。')
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if opened_here and workbook is not None:
+            workbook.close()
 
     # --- 返回结果 ---
-    if error_messages:
-        # 使用换行符连接所有错误消息
-        return False, "\n".join(error_messages)
-    else:
-        success_msg = f'文件"{os.path.basename(file_path)}"的所有工作表数据验证通过。'
-    return True, success_msg 
+    result.issues = issues
+    result.success_message = f'文件"{os.path.basename(file_path)}"的所有工作表数据验证通过。'
+    return result
+
+
+def validate_io_table(file_path: str, workbook: Optional[ParsedWorkbook] = None,
+                      max_workers: Optional[int] = None,
+                      validation_cache: Optional[ValidationStateCache] = None,
+                      max_errors: Optional[int] = None) -> Tuple[bool, str]:
+    """
+    验证上传的IO点表文件，参数见 validate_io_table_result。
+
+    Returns:
+        Tuple[bool, str]: (是否通过, 提示信息或按换行符连接的全部错误消息)
+    """
+    result = validate_io_table_result(file_path, workbook, max_workers, validation_cache, max_errors)
+    return result.is_valid, result.message
 
 # validate_io_table 函数体较长，可拆分为多个小函数（如：主表校验、第三方表校验、单行校验等）。
 # 错误信息的拼接可用专门的格式化函数，提升一致性。
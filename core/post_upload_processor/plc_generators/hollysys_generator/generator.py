@@ -4,6 +4,7 @@ import logging
 from typing import Optional, List, Tuple, Any, Dict
 # 修改导入路径为绝对导入
 from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+from core.jobs import JobCancelled, JobContext, PointProgress, count_points
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +31,11 @@ class HollysysGenerator:
     def _write_data_to_sheet(self, 
                              sheet: xlwt.Worksheet, 
                              points_for_sheet: List[UploadedIOPoint], 
-                             sheet_title: str) -> int:
+                             sheet_title: str,
+                             progress: Optional[PointProgress] = None) -> int:
         """
         将指定点位列表的数据写入到给定的xlwt工作表中 (非安全型格式)。
-        返回写入的数据行数。
+        返回写入的数据行数。每处理一个点位调用 progress.advance()（检查取消并上报进度）。
         """
         font_style = xlwt.XFStyle()
         font = xlwt.Font()
@@ -61,6 +63,8 @@ class HollysysGenerator:
             logger.info(f"工作表 '{sheet_title}' 的IO点数据列表为空。将只包含表头。")
         else:
             for point_idx, point in enumerate(points_for_sheet):
+                if progress is not None:
+                    progress.advance()
                 # 优先使用 HMI 变量名，如果为空则尝试PLC地址，如果都为空则跳过
                 hmi_name = point.hmi_variable_name or ""
                 plc_address = point.plc_absolute_address or ""
@@ -122,12 +126,14 @@ class HollysysGenerator:
 
     def generate_hollysys_table(self, 
                                 points_by_sheet: Dict[str, List[UploadedIOPoint]], 
-                                output_path: str
+                                output_path: str,
+                                context: Optional[JobContext] = None
                                ) -> Tuple[bool, Optional[str]]:
         """
         生成和利时PLC点表 (非安全型版本)。
         会为传入字典中的每个原始工作表名创建一个对应的目标工作表，并写入其点位数据。
         这个版本只生成一张符合非安全型格式的表，其内容基于 `_write_data_to_sheet`。
+        提供 context 时逐点上报进度，并在点位之间检查取消（取消时抛出 JobCancelled，不保存文件）。
         """
         logger.info(f"--- HollysysGenerator (非安全型): generate_hollysys_table 方法开始 ---")
         logger.info(f"传入参数: output_path='{output_path}'")
@@ -138,6 +144,7 @@ class HollysysGenerator:
             return False, "没有提供任何工作表数据来生成点表。"
 
         try:
+            progress = PointProgress(context, count_points(points_by_sheet), "和利时变量表")
             workbook = xlwt.Workbook(encoding='utf-8')
             total_points_written = 0
             sheets_created_count = 0
@@ -165,13 +172,14 @@ class HollysysGenerator:
                     continue 
 
                 # 即使点位列表为空，也调用写入，_write_data_to_sheet 会处理这种情况（只写表头）
-                rows_written_for_sheet = self._write_data_to_sheet(sheet, points_list_for_this_sheet, sheet_name_raw) 
+                rows_written_for_sheet = self._write_data_to_sheet(sheet, points_list_for_this_sheet, sheet_name_raw, progress) 
                 total_points_written += rows_written_for_sheet
                 logger.info(f"工作表 '{safe_sheet_name}' (源: '{sheet_name_raw}') 处理完毕。写入了 {rows_written_for_sheet} 行数据。")
             
             if sheets_created_count > 0:
                 logger.info(f"准备保存工作簿到 '{output_path}'。总共创建 {sheets_created_count} 个工作表，写入了 {total_points_written} 个点位。")
                 workbook.save(output_path)
+                progress.finish()
                 logger.info(f"和利时PLC点表 (非安全型) 已成功生成并保存到: {output_path}")
                 logger.info(f"--- HollysysGenerator (非安全型): generate_hollysys_table 方法结束 ---")
                 return True, None
@@ -180,6 +188,9 @@ class HollysysGenerator:
                 logger.info(f"--- HollysysGenerator (非安全型): generate_hollysys_table 方法结束 (无输出) ---")
                 return False, "未能成功创建任何工作表（可能是由于工作表名称问题或所有源表都无法添加）。"
             
+        except JobCancelled:
+            logger.info(f"--- HollysysGenerator (非安全型): generate_hollysys_table 已取消，未保存文件 ---")
+            raise
         except Exception as e:
             error_msg = f"生成和利时PLC点表 (非安全型) 时发生未知错误: {e}"
             logger.error(error_msg, exc_info=True)
@@ -187,7 +198,8 @@ class HollysysGenerator:
             return False, error_msg
 
     # --- MODBUS 点表生成方法 (从 SafetyHollysysGenerator 复制而来) ---
-    def _prepare_modbus_data(self, all_points: List[UploadedIOPoint]) -> Dict[str, List[Dict[str, Any]]]:
+    def _prepare_modbus_data(self, all_points: List[UploadedIOPoint],
+                             progress: Optional[PointProgress] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         准备Modbus点表所需的数据结构。
         根据规则筛选点位并计算偏移地址。
@@ -203,6 +215,8 @@ class HollysysGenerator:
         }
 
         for point in all_points:
+            if progress is not None:
+                progress.advance()
             # 优先使用 HMI 通讯地址 (通常来自 Excel 的 "通讯地址" 列)
             comm_addr = point.hmi_communication_address
             if not comm_addr or not str(comm_addr).strip():
@@ -281,7 +295,8 @@ class HollysysGenerator:
 
     def generate_modbus_excel(self, 
                               points_by_sheet_dict: Dict[str, List[UploadedIOPoint]], 
-                              output_path: str
+                              output_path: str,
+                              context: Optional[JobContext] = None
                              ) -> Tuple[bool, Optional[str]]:
         """
         生成和利时PLC的Modbus点表 (.xls格式)。
@@ -293,6 +308,7 @@ class HollysysGenerator:
                 一个字典，键是原始工作表名，值是该工作表对应的 UploadedIOPoint 列表。
                 注意：这里我们会合并所有工作表的点位进行处理。
             output_path (str): 用户选择的 .xls 文件保存路径。
+            context (Optional[JobContext]): 提供时逐点上报进度，并在点位之间检查取消。
 
         Returns:
             Tuple[bool, Optional[str]]: (操作是否成功, 错误消息或None)
@@ -316,7 +332,8 @@ class HollysysGenerator:
         
         logger.info(f"Modbus (Non-Safety): 总共 {len(all_points_flat)} 个点位将用于Modbus数据准备。")
 
-        prepared_modbus_data = self._prepare_modbus_data(all_points_flat)
+        progress = PointProgress(context, len(all_points_flat), "和利时Modbus表")
+        prepared_modbus_data = self._prepare_modbus_data(all_points_flat, progress)
 
         try:
             workbook = xlwt.Workbook(encoding='utf-8')
@@ -379,6 +396,7 @@ class HollysysGenerator:
             if sheets_created_count > 0:
                 logger.info(f"Modbus (Non-Safety): 准备保存Modbus工作簿到 '{output_path}'。总共创建 {sheets_created_count} 个工作表。")
                 workbook.save(output_path)
+                progress.finish()
                 logger.info(f"Modbus (Non-Safety): 和利时PLC Modbus点表已成功生成并保存到: {output_path}")
                 logger.info(f"--- HollysysGenerator (Non-Safety): generate_modbus_excel 方法结束 ---")
                 return True, None
@@ -5,6 +5,7 @@ from typing import Optional, List, Tuple, Any, Dict
 # 导入数据模型和模块信息提供者
 from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
 from core.io_table.get_data import ModuleInfoProvider
+from core.jobs import JobCancelled, JobContext, PointProgress, count_points
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +35,11 @@ class SafetyHollysysGenerator:
     def _write_safety_variable_sheet_data(self, 
                                          sheet: xlwt.Worksheet, 
                                          points_for_sheet: List[UploadedIOPoint], 
-                                         sheet_title: str) -> int:
+                                         sheet_title: str,
+                                         progress: Optional[PointProgress] = None) -> int:
         """
         将指定点位列表的数据写入到给定的xlwt工作表中 (安全型变量表格式)。
-        返回写入的数据行数 (不含标题和表头)。
+        返回写入的数据行数 (不含标题和表头)。每处理一个点位调用 progress.advance()。
         """
         font_style = xlwt.XFStyle()
         font = xlwt.Font()
@@ -63,6 +65,8 @@ class SafetyHollysysGenerator:
             logger.info(f"安全型工作表 '{sheet_title}' 的IO点数据列表为空。将只包含表头。")
         else:
             for point_idx, point in enumerate(points_for_sheet):
+                if progress is not None:
+                    progress.advance()
                 # 优先使用 HMI 变量名
                 hmi_name = point.hmi_variable_name or ""
                 # 安全型变量表不直接使用PLC地址，但如果HMI名为空，可以考虑用描述或一个占位符
@@ -125,7 +129,8 @@ class SafetyHollysysGenerator:
 
     def generate_safety_hollysys_table(self, 
                                        points_by_sheet: Dict[str, List[UploadedIOPoint]], 
-                                       output_path: str
+                                       output_path: str,
+                                       context: Optional[JobContext] = None
                                       ) -> Tuple[bool, Optional[str]]:
         """
         生成安全型和利时PLC点表。
@@ -137,6 +142,7 @@ class SafetyHollysysGenerator:
                 一个字典，键是原始工作表名 (例如 "GV_Group", "DI_Group"), 
                 值是该工作表对应的 UploadedIOPoint 列表。
             output_path (str): 用户选择的 .xls 文件保存路径。
+            context (Optional[JobContext]): 提供时逐点上报进度，并在点位之间检查取消（取消时抛出 JobCancelled，不保存文件）。
 
         返回:
             Tuple[bool, Optional[str]]: (操作是否成功, 错误消息或None)
@@ -150,6 +156,7 @@ class SafetyHollysysGenerator:
             return False, "没有提供任何工作表数据来生成安全型点表。"
 
         try:
+            progress = PointProgress(context, count_points(points_by_sheet), "和利时安全型变量表")
             workbook = xlwt.Workbook(encoding='utf-8')
             total_points_written = 0
             sheets_created_count = 0
@@ -181,7 +188,8 @@ class SafetyHollysysGenerator:
                 rows_written_for_sheet = self._write_safety_variable_sheet_data(
                     sheet, 
                     points_list_for_this_sheet, 
-                    original_sheet_name # 传递原始工作表名给写入函数，用于生成 (COMMON) 标题
+                    original_sheet_name, # 传递原始工作表名给写入函数，用于生成 (COMMON) 标题
+                    progress
                 )
                 total_points_written += rows_written_for_sheet
                 logger.info(f"安全型工作表 '{safe_sheet_name}' (源: '{original_sheet_name}') 处理完毕。写入了 {rows_written_for_sheet} 行数据。")
@@ -189,6 +197,7 @@ class SafetyHollysysGenerator:
             if sheets_created_count > 0:
                 logger.info(f"准备保存安全型工作簿到 '{output_path}'。总共创建 {sheets_created_count} 个工作表，写入了 {total_points_written} 个点位。")
                 workbook.save(output_path)
+                progress.finish()
                 logger.info(f"安全型和利时PLC点表已成功生成并保存到: {output_path}")
                 logger.info(f"--- SafetyHollysysGenerator: generate_safety_hollysys_table 方法结束 ---")
                 return True, None
@@ -197,6 +206,9 @@ class SafetyHollysysGenerator:
                 logger.info(f"--- SafetyHollysysGenerator: generate_safety_hollysys_table 方法结束 (无输出) ---")
                 return False, "未能成功创建任何安全型工作表。"
             
+        except JobCancelled:
+            logger.info(f"--- SafetyHollysysGenerator: generate_safety_hollysys_table 已取消，未保存文件 ---")
+            raise
         except Exception as e:
             error_msg = f"生成安全型和利时PLC点表时发生未知错误: {e}"
             logger.error(error_msg, exc_info=True)
@@ -204,7 +216,8 @@ class SafetyHollysysGenerator:
             return False, error_msg
 
     # --- MODBUS 点表生成方法 (与 HollysysGenerator 中的逻辑相同) ---
-    def _prepare_modbus_data(self, all_points: List[UploadedIOPoint]) -> Dict[str, List[Dict[str, Any]]]:
+    def _prepare_modbus_data(self, all_points: List[UploadedIOPoint],
+                             progress: Optional[PointProgress] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         准备Modbus点表所需的数据结构。
         根据规则筛选点位并计算偏移地址。
@@ -220,6 +233,8 @@ class SafetyHollysysGenerator:
         }
 
         for point in all_points:
+            if progress is not None:
+                progress.advance()
             comm_addr = point.hmi_communication_address
             if not comm_addr or not str(comm_addr).strip():
                 logger.debug(f"Modbus (Safety): 点 '{point.hmi_variable_name}' 无通讯地址，跳过。")
@@ -256,13 +271,15 @@ class SafetyHollysysGenerator:
 
     def generate_modbus_excel(self, 
                               points_by_sheet_dict: Dict[str, List[UploadedIOPoint]], 
-                              output_path: str
+                              output_path: str,
+                              context: Optional[JobContext] = None
                              ) -> Tuple[bool, Optional[str]]:
         """
         生成和利时安全型Modbus点表 (.xls格式)。
         包含四个固定的工作表：线圈, 输入离散量, 输入寄存器, 保持寄存器。
         BOOL类型点位进入"线圈"，REAL类型点位进入"保持寄存器"。
         (此方法与非安全型生成器中的版本逻辑一致)
+        提供 context 时逐点上报进度，并在点位之间检查取消。
         """
         logger.info(f"--- SafetyHollysysGenerator: generate_modbus_excel 方法开始 ---")
         logger.info(f"安全型Modbus点表将保存到: {output_path}")
@@ -275,7 +292,8 @@ class SafetyHollysysGenerator:
             logger.warning("Modbus (Safety): 传入的总点位列表为空，无法生成Modbus点表。")
             return False, "没有提供任何点位数据来生成安全型Modbus点表。"
 
-        modbus_sheets_content = self._prepare_modbus_data(all_points_flat_list)
+        progress = PointProgress(context, len(all_points_flat_list), "和利时安全型Modbus表")
+        modbus_sheets_content = self._prepare_modbus_data(all_points_flat_list, progress)
 
         try:
             workbook = xlwt.Workbook(encoding='utf-8')
@@ -312,6 +330,7 @@ class SafetyHollysysGenerator:
             logger.info("已在Modbus安全型点表末尾添加一个空的 'Sheet1' 工作表。")
 
             workbook.save(output_path)
+            progress.finish()
             logger.info(f"安全型和利时Modbus点表已成功生成并保存到: {output_path}")
             logger.info(f"--- SafetyHollysysGenerator: generate_modbus_excel 方法结束 ---")
             return True, None
@@ -1,8 +1,11 @@
 # core/post_upload_processor/uploaded_file_processor/excel_reader.py
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
 import openpyxl
 import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
 from .io_data_model import UploadedIOPoint
+from .parsed_workbook import ParsedSheet, ParsedWorkbook, open_parsed_workbook
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +13,11 @@ logger = logging.getLogger(__name__)
 # 主IO点表在Excel中通常的名称
 MAIN_IO_SHEET_NAME = "IO点表"
 
+# 第三方表并行解析的启用条件：文件小于该大小或第三方表少于该数量时按顺序解析，
+# 此时启动工作进程和传递数据的开销大于并行带来的收益
+PARALLEL_PARSE_MIN_FILE_SIZE = 1024 * 1024  # 字节
+PARALLEL_PARSE_MIN_SHEETS = 2
+
 # 这个映射表是核心，它将Excel中的中文表头映射到UploadedIOPoint数据类的属性名
 # 我们需要确保这个映射是完整和正确的，基于 excel_exporter.py 中的 headers_plc
 HEADER_TO_ATTRIBUTE_MAP: Dict[str, str] = {
@@ -225,16 +233,20 @@ def _normalize_variable_name(value: Any) -> Optional[str]:
     return cleaned.replace('-', '_')
 
 
-def _parse_io_sheet_to_uploaded_points(sheet: openpyxl.worksheet.worksheet.Worksheet) -> List[UploadedIOPoint]:
+def _parse_io_sheet_to_uploaded_points(sheet_title: str, header_values: Sequence[Any],
+                                       data_rows: Iterable[Sequence[Any]]) -> List[UploadedIOPoint]:
     """
-    将单个符合IO点表结构的工作表 (openpyxl.worksheet) 解析为 UploadedIOPoint 对象列表。
+    将单个符合IO点表结构的工作表解析为 UploadedIOPoint 对象列表。
     现在会包含主点位及其派生的中间点位，并记录其来源信息。
+
+    Args:
+        sheet_title: 工作表名称。
+        header_values: 第一行（表头）的单元格值。
+        data_rows: 从第2行开始的各行单元格值。
     """
     all_parsed_points: List[UploadedIOPoint] = []
-    sheet_title = sheet.title # 获取工作表标题以备后用
 
-    header_row_cells = sheet[1]
-    header_row = [_clean_str(cell.value) for cell in header_row_cells if cell.value is not None]
+    header_row = [_clean_str(value) for value in header_values if value is not None]
 
     current_file_header_to_attr_map: Dict[str, str] = {}
     for excel_header, attr_name in HEADER_TO_ATTRIBUTE_MAP.items():
@@ -243,19 +255,19 @@ def _parse_io_sheet_to_uploaded_points(sheet: openpyxl.worksheet.worksheet.Works
         else:
             logger.warning(f"主IO工作表 '{sheet_title}' 中，期望的表头 '{excel_header}' 未找到。该列数据将无法解析。")
 
-    for row_idx, row_cells in enumerate(sheet.iter_rows(min_row=2), start=2):
+    for row_idx, row_values in enumerate(data_rows, start=2):
         raw_row_data: Dict[str, Any] = {}
         is_empty_row = True
-        for col_idx, cell in enumerate(row_cells):
+        for col_idx, value in enumerate(row_values):
             if col_idx < len(header_row):
                 header_name = header_row[col_idx]
                 if header_name in current_file_header_to_attr_map:
                     attribute_name = current_file_header_to_attr_map[header_name]
-                    raw_row_data[attribute_name] = cell.value
-                    if cell.value is not None and str(cell.value).strip() != "":
+                    raw_row_data[attribute_name] = value
+                    if value is not None and str(value).strip() != "":
                         is_empty_row = False
             else:
-                if cell.value is not None and str(cell.value).strip() != "":
+                if value is not None and str(value).strip() != "":
                     is_empty_row = False
 
         if is_empty_row:
@@ -488,7 +500,41 @@ def _parse_third_party_df_to_uploaded_points(df: pd.DataFrame, sheet_name: str)
     return processed_data
 
 
-def load_workbook_data(file_path: str) -> Tuple[Dict[str, List[UploadedIOPoint]], Optional[str]]:
+# 工作进程中打开的工作簿（文件路径 -> ParsedWorkbook）。每个进程只打开一次文件，
+# 避免每个工作表任务都重新解析工作簿结构和共享字符串表
+_worker_workbooks: Dict[str, ParsedWorkbook] = {}
+
+
+def _parse_third_party_sheet(file_path: str, sheet_name: str,
+                             rows: Optional[List[Tuple[Any, ...]]] = None) -> List[UploadedIOPoint]:
+    """
+    解析一个第三方工作表（在工作进程中运行）。
+    rows 为该表已读取的单元格值；为 None 时由工作进程自行从文件读取这一张表。
+    """
+    if rows is None:
+        if file_path not in _worker_workbooks:
+            _worker_workbooks[file_path] = ParsedWorkbook.open(file_path)
+        rows = list(_worker_workbooks[file_path][sheet_name].iter_rows())
+    df = ParsedSheet(sheet_name, rows).dataframe(dtype=str)
+    return _parse_third_party_df_to_uploaded_points(df, sheet_name)
+
+
+def _should_parse_in_parallel(file_path: str, sheet_count: int, max_workers: Optional[int]) -> bool:
+    """判断第三方表是否使用进程池并行解析"""
+    if max_workers is not None and max_workers <= 1:
+        return False
+    if max_workers is None and (os.cpu_count() or 1) <= 1:
+        return False
+    if sheet_count < PARALLEL_PARSE_MIN_SHEETS:
+        return False
+    try:
+        return os.path.getsize(file_path) >= PARALLEL_PARSE_MIN_FILE_SIZE
+    except OSError:
+        return False
+
+
+def load_workbook_data(file_path: str, workbook: Optional[ParsedWorkbook] = None,
+                       max_workers: Optional[int] = None) -> Tuple[Dict[str, List[UploadedIOPoint]], Optional[str]]:
     """
     加载Excel工作簿中的所有数据。
     主IO点表 (默认为 "IO点表") 被解析，其点位 (包含派生中间点) 存入字典，键为该表名。
@@ -497,6 +543,12 @@ def load_workbook_data(file_path: str) -> Tuple[Dict[str, List[UploadedIOPoint]]
 
     Args:
         file_path (str): Excel文件的路径。
+        workbook (Optional[ParsedWorkbook]): 已读取的工作簿（例如校验时读取的同一份数据）。
+            提供时不再重新打开文件；未提供时以只读模式打开文件，主IO点表逐行流式解析，
+            不在内存中保留整张表。
+        max_workers (Optional[int]): 并行解析第三方表的进程数，默认取第三方表数和CPU核数的较小值；
+            为 1 时按顺序解析。文件较小或第三方表较少时也按顺序解析（见 PARALLEL_PARSE_MIN_*）。
+            并行时主IO点表在当前进程中解析，同时各第三方表在工作进程中解析，结果按工作表原始顺序合并。
 
     Returns:
         Tuple[Dict[str, List[UploadedIOPoint]], Optional[str]]:
@@ -506,20 +558,30 @@ def load_workbook_data(file_path: str) -> Tuple[Dict[str, List[UploadedIOPoint]]
     points_by_sheet: Dict[str, List[UploadedIOPoint]] = {}
     total_points_count = 0 # 用于日志记录总点位数
 
-    try:
-        opxl_workbook = openpyxl.load_workbook(file_path, data_only=True)
+    opened_here = workbook is None
+    if opened_here:
+        workbook, error_message = open_parsed_workbook(file_path)
+        if workbook is None:
+            return {}, error_message
 
-        try:
-            pd_excel_file = pd.ExcelFile(file_path)
-            all_sheet_names_from_pandas = pd_excel_file.sheet_names
-        except Exception as e_pd:
-            logger.error(f"Pandas无法打开Excel文件以获取工作表名称列表: {file_path}, 错误: {e_pd}")
-            return {}, f"无法使用Pandas分析文件结构: {e_pd}"
-
-        if MAIN_IO_SHEET_NAME in opxl_workbook.sheetnames:
-            logger.info(f"找到主IO点表: '{MAIN_IO_SHEET_NAME}'。开始使用openpyxl解析 (包括中间点派生)...")
-            io_sheet_obj = opxl_workbook[MAIN_IO_SHEET_NAME]
-            main_and_intermediate_points = _parse_io_sheet_to_uploaded_points(io_sheet_obj)
+    executor: Optional[ProcessPoolExecutor] = None
+    try:
+        third_party_sheet_names = [name for name in workbook.sheet_names if name != MAIN_IO_SHEET_NAME]
+        futures: Dict[str, Future] = {}
+        if _should_parse_in_parallel(file_path, len(third_party_sheet_names), max_workers):
+            workers = min(len(third_party_sheet_names), max_workers or os.cpu_count() or 1)
+            logger.info(f"使用 {workers} 个进程并行解析 {len(third_party_sheet_names)} 个第三方工作表。")
+            executor = ProcessPoolExecutor(max_workers=workers)
+            for sheet_name in third_party_sheet_names:
+                sheet = workbook[sheet_name]
+                futures[sheet_name] = executor.submit(_parse_third_party_sheet, file_path, sheet_name,
+                                                      sheet.rows if sheet.is_loaded else None)
+
+        if MAIN_IO_SHEET_NAME in workbook:
+            logger.info(f"找到主IO点表: '{MAIN_IO_SHEET_NAME}'。开始解析 (包括中间点派生)...")
+            io_rows = workbook[MAIN_IO_SHEET_NAME].iter_rows()
+            header_values = next(io_rows, ())
+            main_and_intermediate_points = _parse_io_sheet_to_uploaded_points(MAIN_IO_SHEET_NAME, header_values, io_rows)
             if main_and_intermediate_points: # 只有当列表非空时才添加
                 points_by_sheet[MAIN_IO_SHEET_NAME] = main_and_intermediate_points
                 total_points_count += len(main_and_intermediate_points)
@@ -529,26 +591,21 @@ def load_workbook_data(file_path: str) -> Tuple[Dict[str, List[UploadedIOPoint]]
         else:
             logger.warning(f"在文件 '{file_path}' 中未找到预期主IO点表: '{MAIN_IO_SHEET_NAME}'。")
 
-        for sheet_name in all_sheet_names_from_pandas:
-            if sheet_name == MAIN_IO_SHEET_NAME:
-                continue
-
-            logger.info(f"尝试将工作表 '{sheet_name}' 作为第三方设备表加载 (使用pandas读取，然后转换为UploadedIOPoint)...")
+        for sheet_name in third_party_sheet_names:
+            logger.info(f"尝试将工作表 '{sheet_name}' 作为第三方设备表加载 (转换为DataFrame后生成UploadedIOPoint)...")
             try:
-                # 确保即使 df 为空，_parse_third_party_df_to_uploaded_points 也能安全处理并返回空列表
-                df = pd.read_excel(pd_excel_file, sheet_name=sheet_name, header=0, dtype=str)
-                third_party_points = _parse_third_party_df_to_uploaded_points(df, sheet_name)
+                if sheet_name in futures:
+                    third_party_points = futures[sheet_name].result()
+                else:
+                    # 确保即使 df 为空，_parse_third_party_df_to_uploaded_points 也能安全处理并返回空列表
+                    df = workbook[sheet_name].dataframe(dtype=str)
+                    third_party_points = _parse_third_party_df_to_uploaded_points(df, sheet_name)
                 if third_party_points: # 只有当列表非空时才添加
                     points_by_sheet[sheet_name] = third_party_points
                     total_points_count += len(third_party_points)
                     logger.info(f"第三方工作表 '{sheet_name}' 解析得到 {len(third_party_points)} 个点位。")
                 else:
-                    # 检查是否真的为空，还是读取问题
-                    df_check_actual_rows = pd.read_excel(pd_excel_file, sheet_name=sheet_name)
-                    if df_check_actual_rows.empty:
-                         logger.info(f"工作表 '{sheet_name}' (第三方) 为空或只有表头，已跳过。")
-                    else:
-                         logger.warning(f"工作表 '{sheet_name}' (第三方) 初始pandas读取(dtype=str)为空，但重读有内容。可能是非字符串数据导致。已作为空列表处理。")
+                    logger.info(f"工作表 '{sheet_name}' (第三方) 为空或没有有效点位，已跳过。")
 
             except Exception as e_read_tp:
                 logger.warning(f"处理第三方工作表 '{sheet_name}' 时出错: {e_read_tp}。将跳过此表。", exc_info=True)
@@ -556,12 +613,14 @@ def load_workbook_data(file_path: str) -> Tuple[Dict[str, List[UploadedIOPoint]]
         logger.info(f"Excel文件 '{file_path}' 加载完成。总共从 {len(points_by_sheet)} 个工作表解析得到 {total_points_count} 个IO点对象。")
         return points_by_sheet, None
 
-    except FileNotFoundError:
-        logger.error(f"Excel文件未找到: {file_path}")
-        return {}, f"Excel文件未找到: {file_path}"
     except Exception as e_global:
-        logger.error(f"打开或处理Excel文件 '{file_path}' 时发生全局错误: {e_global}", exc_info=True)
+        logger.error(f"处理Excel文件 '{file_path}' 时发生全局错误: {e_global}", exc_info=True)
         return {}, f"打开或处理Excel文件时发生错误: {e_global}"
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if opened_here:
+            workbook.close()
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
@@ -0,0 +1,157 @@
+# core/post_upload_processor/uploaded_file_processor/parse_cache.py
+"""
+上传IO点表的解析结果缓存
+
+同一个IO点表常常在一天内被反复上传。缓存以文件内容的 SHA-256 和解析器版本为键，保存校验结果
+(是否通过、提示消息) 和解析得到的 UploadedIOPoint 列表；再次上传内容未变的文件时直接读取缓存，
+不再解析Excel。
+
+缓存文件格式：zlib 压缩的 JSON。点位按 UploadedIOPoint 字段顺序保存为值列表（所有字段都是字符串或空），
+文件中同时记录字段名，数据模型字段变化后旧缓存自动失效。使用 JSON 而不是 pickle，读取缓存文件不会执行任何代码。
+校验失败时同时保存结构化的校验结果（每条消息的工作表、行号、列、规则和严重程度），供界面按表格显示。
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from core.post_upload_processor.io_validation.validation_result import ValidationIssue, ValidationResult
+
+from .io_data_model import UploadedIOPoint
+
+logger = logging.getLogger(__name__)
+
+# 解析器版本：修改校验规则 (io_validation) 或点位解析逻辑 (excel_reader / parsed_workbook) 后必须递增，使旧缓存失效
+PARSER_VERSION = 2
+
+CACHE_FILE_SUFFIX = ".iocache"
+
+_POINT_FIELDS = tuple(field.name for field in dataclasses.fields(UploadedIOPoint))
+
+
+def _dump_result(result: Optional[ValidationResult]) -> Optional[dict]:
+    if result is None:
+        return None
+    return {
+        'issues': [[str(issue), issue.sheet, issue.row, issue.column, issue.rule, issue.severity]
+                   for issue in result.issues],
+        'success_message': result.success_message,
+        'truncated': result.truncated,
+        'max_errors': result.max_errors,
+    }
+
+
+def _load_result(file_path: str, payload: Optional[dict]) -> Optional[ValidationResult]:
+    if payload is None:
+        return None
+    return ValidationResult(file_path, [ValidationIssue(*values) for values in payload['issues']],
+                            payload['success_message'], payload['truncated'], payload['max_errors'])
+
+
+@dataclass
+class ParseCacheEntry:
+    """一次上传的校验和加载结果"""
+    is_valid: bool
+    message: str  # 校验通过时的提示或校验失败的错误信息
+    points_by_sheet: Optional[Dict[str, List[UploadedIOPoint]]] = None  # 校验失败时为 None
+    result: Optional[ValidationResult] = None  # 结构化的校验结果（校验失败时保存，file_path 为空）
+
+
+class IOTableParseCache:
+    """以文件内容哈希为键的磁盘缓存，每个文件对应缓存目录中的一个条目，超过 max_entries 时删除最久未使用的条目"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 20):
+        self.cache_dir = cache_dir
+        self.max_entries = max(1, max_entries)
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """计算文件内容的 SHA-256"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}_v{PARSER_VERSION}{CACHE_FILE_SUFFIX}")
+
+    def load(self, content_hash: str) -> Optional[ParseCacheEntry]:
+        """读取缓存条目；不存在、版本不符或文件损坏时返回 None"""
+        path = self._entry_path(content_hash)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = json.loads(zlib.decompress(f.read()))
+            if payload.get('parser_version') != PARSER_VERSION or tuple(payload.get('fields', ())) != _POINT_FIELDS:
+                logger.info(f"IO点表解析缓存 {os.path.basename(path)} 的版本或字段与当前不一致，忽略。")
+                return None
+            points_by_sheet = None
+            if payload['points_by_sheet'] is not None:
+                points_by_sheet = {sheet_name: [UploadedIOPoint(*values) for values in rows]
+                                   for sheet_name, rows in payload['points_by_sheet']}
+            entry = ParseCacheEntry(payload['is_valid'], payload['message'], points_by_sheet,
+                                    _load_result("", payload.get('result')))
+        except Exception as e:
+            logger.warning(f"读取IO点表解析缓存 '{path}' 失败，将重新解析: {e}")
+            return None
+
+        try:
+            os.utime(path)  # 记录最近使用时间，用于淘汰
+        except OSError:
+            pass
+        return entry
+
+    def store(self, content_hash: str, entry: ParseCacheEntry) -> None:
+        """写入缓存条目（先写临时文件再替换，避免并发上传时读到不完整的文件）；失败只记录日志"""
+        points_by_sheet = None
+        if entry.points_by_sheet is not None:
+            # 用列表保存以保持工作表顺序
+            points_by_sheet = [[sheet_name, [[getattr(point, name) for name in _POINT_FIELDS] for point in points]]
+                               for sheet_name, points in entry.points_by_sheet.items()]
+        payload = {
+            'parser_version': PARSER_VERSION,
+            'fields': _POINT_FIELDS,
+            'is_valid': entry.is_valid,
+            'message': entry.message,
+            'points_by_sheet': points_by_sheet,
+            'result': _dump_result(entry.result),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, self._entry_path(content_hash))
+            except Exception:
+                os.remove(temp_path)
+                raise
+            logger.info(f"IO点表解析结果已缓存: {content_hash[:12]}... ({len(data) / 1024:.0f} KB)")
+            self._evict()
+        except Exception as e:
+            logger.warning(f"写入IO点表解析缓存失败: {e}")
+
+    def _evict(self) -> None:
+        """删除超出 max_entries 的最久未使用条目，以及其他解析器版本的条目"""
+        current_suffix = f"_v{PARSER_VERSION}{CACHE_FILE_SUFFIX}"
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(current_suffix):
+                os.remove(path)
+                continue
+            entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            os.remove(path)
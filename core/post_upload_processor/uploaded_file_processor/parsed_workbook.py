@@ -0,0 +1,231 @@
+# core/post_upload_processor/uploaded_file_processor/parsed_workbook.py
+"""
+上传的IO点表工作簿只读取一次，校验 (io_validation.validator) 和点位加载 (excel_reader) 共用同一份数据。
+
+ParsedWorkbook.read 在打开文件时把每个工作表的单元格值读成元组列表，之后：
+- 主IO点表解析直接遍历这些值元组构建 UploadedIOPoint；
+- 校验和第三方表解析需要的 DataFrame 由同一份值按 pandas.read_excel 的规则生成（按 dtype 缓存）。
+
+只加载点位、不需要校验时可以用 ParsedWorkbook.open 以只读模式打开文件：各工作表在第一次
+访问 rows 时才读入内存，iter_rows 则直接从文件流式读取，几万行的主IO点表不必整体驻留内存。
+
+单元格值默认用 openpyxl 只读模式读取；安装了可选依赖 python-calamine 时改用它读取
+（Rust 实现，大文件读取快一个数量级，也支持 .xls），读出的值按 openpyxl 的类型规则统一。
+"""
+
+import datetime
+import logging
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+try:
+    from python_calamine import CalamineWorkbook, SheetTypeEnum
+except ImportError:
+    CalamineWorkbook = None
+
+logger = logging.getLogger(__name__)
+
+RowSource = Callable[[], Iterator[Tuple[Any, ...]]]
+
+
+def _from_calamine_value(value: Any) -> Any:
+    """把 calamine 读出的值转换为 openpyxl 的表示：空单元格为None，整数为int，日期为datetime"""
+    if value == "":
+        return None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _to_pandas_cell(value: Any) -> Any:
+    """按 pandas openpyxl 读取引擎的规则转换单元格值（空单元格为""，整数值的浮点数转为int，错误值为NaN）"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        int_value = int(value) if np.isfinite(value) else None
+        return int_value if int_value == value else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    return value
+
+
+class ParsedSheet:
+    """
+    一个工作表的单元格值（第一行为表头）。
+    rows 为 None 时由 row_source（逐行返回值元组的函数）在需要时读取。
+    """
+
+    def __init__(self, name: str, rows: Optional[List[Tuple[Any, ...]]] = None, row_source: Optional[RowSource] = None):
+        self.name = name
+        self._rows = rows
+        self._row_source = row_source
+        self._dataframes: Dict[Any, pd.DataFrame] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        """单元格值是否已读入内存"""
+        return self._rows is not None
+
+    @property
+    def rows(self) -> List[Tuple[Any, ...]]:
+        if self._rows is None:
+            self._rows = list(self.iter_rows())
+        return self._rows
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        逐行返回单元格值元组（包括表头行）。
+        尚未读入内存时直接从文件读取，不保留已读过的行（openpyxl 逐行解析；calamine 先在
+        Rust 侧读完整张表，再逐行转换为 Python 值）。各行长度可能不同。
+        """
+        if self._rows is not None:
+            return iter(self._rows)
+        return self._row_source()
+
+    def dataframe(self, dtype: Any = None) -> pd.DataFrame:
+        """
+        以第一行为表头生成 DataFrame，结果与 pd.read_excel(file, sheet_name=..., header=0, dtype=dtype) 一致。
+        同一 dtype 只生成一次，返回的 DataFrame 由调用方共享，不应就地修改。
+        """
+        if dtype not in self._dataframes:
+            data = []
+            last_row_with_data = -1
+            for row in self.rows:
+                converted_row = [_to_pandas_cell(value) for value in row]
+                while converted_row and converted_row[-1] == "":
+                    converted_row.pop()
+                if converted_row:
+                    last_row_with_data = len(data)
+                data.append(converted_row)
+            data = data[:last_row_with_data + 1]
+
+            if not data:
+                df = pd.DataFrame()
+            else:
+                max_width = max(len(row) for row in data)
+                data = [row + [""] * (max_width - len(row)) for row in data]
+                df = TextParser(data, header=0, dtype=dtype).read()
+            self._dataframes[dtype] = df
+        return self._dataframes[dtype]
+
+
+class ParsedWorkbook:
+    """Excel工作簿的单元格值，按原始顺序保存各工作表（read() 全部读入内存，open() 按需读取）"""
+
+    def __init__(self, file_path: str, sheets: Dict[str, ParsedSheet], source_workbook: Any = None):
+        self.file_path = file_path
+        self.sheets = sheets
+        self._source_workbook = source_workbook  # open() 打开的 openpyxl/calamine 工作簿，close() 时关闭
+
+    def close(self) -> None:
+        if self._source_workbook is not None:
+            self._source_workbook.close()
+            self._source_workbook = None
+
+    def __enter__(self) -> "ParsedWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self.sheets.keys())
+
+    def __contains__(self, sheet_name: str) -> bool:
+        return sheet_name in self.sheets
+
+    def __getitem__(self, sheet_name: str) -> ParsedSheet:
+        return self.sheets[sheet_name]
+
+    @classmethod
+    def open(cls, file_path: str) -> "ParsedWorkbook":
+        """
+        以只读模式打开工作簿，各工作表按需读取（公式取缓存的计算结果）。
+        使用完毕后需要 close()，或在 with 语句中使用。
+
+        Raises:
+            FileNotFoundError: 文件不存在。
+            其他异常: 文件损坏或格式无法识别，由调用方转换为错误消息。
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+
+        if CalamineWorkbook is not None:
+            return cls._open_with_calamine(file_path)
+
+        if file_path.lower().endswith('.xls'):
+            # openpyxl 不支持 .xls，由 pandas 读取原始值（不把第一行当作表头）
+            sheets: Dict[str, ParsedSheet] = {}
+            for sheet_name, df in pd.read_excel(file_path, sheet_name=None, header=None, dtype=object).items():
+                rows = [tuple(None if pd.isna(value) else value for value in row)
+                        for row in df.itertuples(index=False, name=None)]
+                sheets[sheet_name] = ParsedSheet(sheet_name, rows)
+            return cls(file_path, sheets)
+
+        # 只读模式按行流式读取，不创建单元格对象，比完整加载快且省内存
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+
+        def openpyxl_rows(worksheet) -> RowSource:
+            def iter_rows() -> Iterator[Tuple[Any, ...]]:
+                # 部分软件导出的文件记录的表格尺寸不准确，按实际单元格读取（与 pandas 一致）
+                worksheet.reset_dimensions()
+                return worksheet.iter_rows(values_only=True)
+            return iter_rows
+
+        sheets = {worksheet.title: ParsedSheet(worksheet.title, row_source=openpyxl_rows(worksheet))
+                  for worksheet in workbook.worksheets}
+        return cls(file_path, sheets, source_workbook=workbook)
+
+    @classmethod
+    def _open_with_calamine(cls, file_path: str) -> "ParsedWorkbook":
+        workbook = CalamineWorkbook.from_path(file_path)
+
+        def calamine_rows(sheet_name: str) -> RowSource:
+            def iter_rows() -> Iterator[Tuple[Any, ...]]:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+                # skip_empty_area=False: 从A1开始返回，行列位置与 openpyxl 一致
+                for row in sheet.to_python(skip_empty_area=False):
+                    yield tuple(_from_calamine_value(value) for value in row)
+            return iter_rows
+
+        # 与 openpyxl 的 workbook.worksheets 一致，只包含普通工作表（不含图表工作表等）
+        sheet_names = [metadata.name for metadata in workbook.sheets_metadata
+                       if metadata.typ == SheetTypeEnum.WorkSheet]
+        sheets = {sheet_name: ParsedSheet(sheet_name, row_source=calamine_rows(sheet_name)) for sheet_name in sheet_names}
+        return cls(file_path, sheets, source_workbook=workbook)
+
+    @classmethod
+    def read(cls, file_path: str) -> "ParsedWorkbook":
+        """
+        读取工作簿中所有工作表的单元格值后关闭文件，结果可在校验和加载之间共享。
+
+        Raises:
+            同 open()。
+        """
+        with cls.open(file_path) as workbook:
+            for sheet in workbook.sheets.values():
+                sheet.rows  # 读入内存
+        logger.info(f"已读取工作簿 '{file_path}': {len(workbook.sheets)} 个工作表，"
+                    f"共 {sum(len(sheet.rows) for sheet in workbook.sheets.values())} 行。")
+        return workbook
+
+
+def open_parsed_workbook(file_path: str) -> Tuple[Optional[ParsedWorkbook], Optional[str]]:
+    """以只读模式打开工作簿（见 ParsedWorkbook.open），失败时返回 (None, 错误消息) 而不抛出异常"""
+    try:
+        return ParsedWorkbook.open(file_path), None
+    except FileNotFoundError:
+        logger.error(f"Excel文件未找到: {file_path}")
+        return None, f"Excel文件未找到: {file_path}"
+    except Exception as e:
+        logger.error(f"读取Excel文件 '{file_path}' 时出错: {e}", exc_info=True)
+        return None, f"打开或处理Excel文件时发生错误: {e}"
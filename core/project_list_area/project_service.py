@@ -1,36 +1,93 @@
 """项目列表服务，负责获取和处理项目数据"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 import logging
 
 # 依赖 API 客户端和数据处理器
-from core.query_area import JianDaoYunAPI
+from core.query_area import JianDaoYunAPI, TTLCache
+from core.query_area.response_cache import DEFAULT_CACHE_TTL, DEFAULT_CACHE_SIZE
 from .project_processor import format_project_data_for_ui
 
 logger = logging.getLogger(__name__)
 
 class ProjectService:
-    def __init__(self, jdy_api: JianDaoYunAPI):
+    def __init__(self, jdy_api: JianDaoYunAPI,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, cache_size: int = DEFAULT_CACHE_SIZE):
         if not jdy_api:
             logger.error("ProjectService 初始化失败: 未提供 JianDaoYunAPI 实例。")
             raise ValueError("JianDaoYunAPI 实例是必需的")
         self.jdy_api = jdy_api
+        # 查询结果缓存：项目编号 -> 格式化后的项目列表
+        self._cache = TTLCache(ttl=cache_ttl, maxsize=cache_size)
         logger.info("ProjectService 初始化完成。")
 
-    def get_formatted_projects(self, project_no: str = None) -> List[Dict[str, Any]]:
-        """获取并格式化项目列表数据以供UI使用。"""
+    def get_formatted_projects(self, project_no: str = None, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """获取并格式化项目列表数据以供UI使用。
+
+        结果按项目编号缓存，force_refresh=True 时忽略缓存重新查询。
+        """
+        if not force_refresh:
+            cached = self._cache.get(project_no)
+            if cached is not None:
+                logger.info(f"ProjectService: 项目 '{project_no}' 命中缓存 ({len(cached)} 条)，缓存统计: {self._cache.stats()}")
+                return list(cached)
+
         try:
             logger.info(f"ProjectService: 开始查询项目数据 (项目号: {project_no})")
             # 1. 调用 API 获取原始数据
             raw_data = self.jdy_api.query_data(project_no=project_no)
-            
+
             # 2. 调用处理器格式化数据
             formatted_data = format_project_data_for_ui(raw_data)
             logger.info(f"ProjectService: 查询并格式化了 {len(formatted_data)} 条项目数据。")
-            return formatted_data
+            if formatted_data:
+                self._cache.put(project_no, formatted_data)
+            return list(formatted_data)
         except Exception as e:
             # API 层或处理层应该已经记录了具体错误
             logger.error(f"ProjectService 获取项目数据失败: {e}", exc_info=True)
             # 向上层抛出异常或返回空列表，让调用者处理
             # raise # 或者根据策略返回空列表
-            return [] 
\ No newline at end of file
+            return []
+
+    def iter_formatted_projects(self, project_no: str = None,
+                                force_refresh: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """逐页获取并格式化项目数据，每收到一页立即产出，便于UI增量显示。
+
+        命中缓存时整体作为一页产出；完整读取后的结果写入缓存。
+        中途失败时不缓存已获取的部分结果，并重新抛出异常，由调用者（后台任务）报告失败。
+        """
+        if not force_refresh:
+            cached = self._cache.get(project_no)
+            if cached is not None:
+                logger.info(f"ProjectService: 项目 '{project_no}' 命中缓存 ({len(cached)} 条)")
+                yield list(cached)
+                return
+
+        all_projects: List[Dict[str, Any]] = []
+        try:
+            logger.info(f"ProjectService: 开始逐页查询项目数据 (项目号: {project_no})")
+            for page in self.jdy_api.iter_data(project_no=project_no):
+                formatted_page = format_project_data_for_ui(page)
+                all_projects.extend(formatted_page)
+                yield formatted_page
+        except Exception as e:
+            logger.error(f"ProjectService 逐页获取项目数据失败 (已获取 {len(all_projects)} 条): {e}", exc_info=True)
+            raise
+
+        logger.info(f"ProjectService: 逐页查询完成，共 {len(all_projects)} 条项目数据。")
+        if all_projects:
+            self._cache.put(project_no, all_projects)
+
+    def invalidate(self, project_no: str):
+        """使指定项目编号的缓存失效。"""
+        self._cache.invalidate(project_no)
+
+    def clear_cache(self):
+        """清空项目查询缓存。"""
+        self._cache.clear()
+        logger.info("ProjectService: 项目查询缓存已清空。")
+
+    def cache_stats(self) -> Dict[str, int]:
+        """返回缓存命中/未命中统计。"""
+        return self._cache.stats()
@@ -1,7 +1,11 @@
 # core/query_area/__init__.py 
 
 from .jiandaoyun_api import JianDaoYunAPI
+from .jdy_mirror import JianDaoYunMirror
+from .response_cache import TTLCache
 
 __all__ = [
-    'JianDaoYunAPI'
+    'JianDaoYunAPI',
+    'JianDaoYunMirror',
+    'TTLCache'
     ]
\ No newline at end of file
@@ -0,0 +1,345 @@
+"""简道云数据本地镜像模块
+
+将 query_data / query_site_devices 查询到的简道云数据保存到本地 SQLite 数据库中，
+按 updateTime 增量同步，并优先从本地读取：
+- 同步有效期内（与查询结果缓存的有效期一致）已同步过的项目/场站，读取只需几毫秒，
+  超过有效期后再次读取时先执行一次增量同步，远端的修改不需要强制刷新也能看到；
+- 网络不可用时（例如在调试现场），自动退回到本地已有的数据。
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator
+
+from .jiandaoyun_api import (JianDaoYunAPI, PROJECT_NO_FIELD, SITE_NAME_FIELD, DEVICE_LIST_FIELD,
+                             DEVICE_BRAND_FIELD, DEVICE_MODEL_FIELD)
+
+logger = logging.getLogger(__name__)
+
+UPDATE_TIME_FIELD = "updateTime"  # 简道云系统字段：最后更新时间
+DEFAULT_FULL_SYNC_HOURS = 24      # 超过该时长未全量同步时执行一次全量同步（用于清理已删除的数据）
+DEFAULT_SYNC_TTL_SECONDS = 300    # 同步结果的有效期，超过后读取前先增量同步（与查询结果缓存的默认有效期一致）
+
+MIRROR_SQL = {
+    'CREATE_ENTRIES_TABLE': '''
+    CREATE TABLE IF NOT EXISTS jdy_entries (
+        data_id TEXT PRIMARY KEY,      -- 简道云 _id
+        project_no TEXT,
+        site_name TEXT,
+        update_time TEXT,              -- 简道云 updateTime
+        data TEXT NOT NULL,            -- 完整数据 (JSON)
+        synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+
+    'CREATE_PROJECT_INDEX': '''
+    CREATE INDEX IF NOT EXISTS idx_jdy_entries_project_no ON jdy_entries(project_no)
+    ''',
+
+    'CREATE_SITE_INDEX': '''
+    CREATE INDEX IF NOT EXISTS idx_jdy_entries_site_name ON jdy_entries(site_name)
+    ''',
+
+    'CREATE_SYNC_STATE_TABLE': '''
+    CREATE TABLE IF NOT EXISTS jdy_sync_state (
+        scope TEXT PRIMARY KEY,        -- 同步范围，例如 "project:XXX" / "site:XXX"
+        watermark TEXT,                -- 已同步到的最大 updateTime
+        last_full_sync TEXT            -- 最近一次全量同步的本地时间 (ISO格式)
+    )
+    ''',
+
+    'UPSERT_ENTRY': '''
+    INSERT INTO jdy_entries (data_id, project_no, site_name, update_time, data, synced_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(data_id) DO UPDATE SET
+        project_no = excluded.project_no,
+        site_name = excluded.site_name,
+        update_time = excluded.update_time,
+        data = excluded.data,
+        synced_at = CURRENT_TIMESTAMP
+    ''',
+
+    'GET_ENTRIES_BY_PROJECT': '''
+    SELECT data FROM jdy_entries WHERE project_no = ? ORDER BY data_id
+    ''',
+
+    'GET_ENTRIES_BY_SITE': '''
+    SELECT data FROM jdy_entries WHERE site_name = ? ORDER BY data_id
+    ''',
+
+    'GET_IDS_BY_PROJECT': '''
+    SELECT data_id FROM jdy_entries WHERE project_no = ?
+    ''',
+
+    'GET_IDS_BY_SITE': '''
+    SELECT data_id FROM jdy_entries WHERE site_name = ?
+    ''',
+
+    'DELETE_ENTRY': '''
+    DELETE FROM jdy_entries WHERE data_id = ?
+    ''',
+
+    'GET_SYNC_STATE': '''
+    SELECT watermark, last_full_sync FROM jdy_sync_state WHERE scope = ?
+    ''',
+
+    'UPSERT_SYNC_STATE': '''
+    INSERT INTO jdy_sync_state (scope, watermark, last_full_sync)
+    VALUES (?, ?, ?)
+    ON CONFLICT(scope) DO UPDATE SET
+        watermark = excluded.watermark,
+        last_full_sync = COALESCE(excluded.last_full_sync, jdy_sync_state.last_full_sync)
+    '''
+}
+
+
+class JianDaoYunMirror:
+    """
+    简道云数据的本地 SQLite 镜像。
+
+    对外提供与 JianDaoYunAPI 相同的 query_data / query_site_devices 接口，
+    因此可以直接替换 ProjectService / DeviceService 中的 API 实例。
+    """
+
+    def __init__(self, jdy_api: JianDaoYunAPI, db_path: str,
+                 full_sync_hours: float = DEFAULT_FULL_SYNC_HOURS,
+                 sync_ttl: float = DEFAULT_SYNC_TTL_SECONDS):
+        if not jdy_api:
+            logger.error("JianDaoYunMirror 初始化失败: 未提供 JianDaoYunAPI 实例。")
+            raise ValueError("JianDaoYunAPI 实例是必需的")
+        self.jdy_api = jdy_api
+        self.db_path = Path(db_path).resolve()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.full_sync_interval = timedelta(hours=full_sync_hours)
+        self.sync_ttl = sync_ttl
+
+        # 镜像中保存的字段：项目字段 + 设备清单字段 + 更新时间
+        self.mirror_fields = list(dict.fromkeys(
+            list(jdy_api.project_fields) + [DEVICE_LIST_FIELD, UPDATE_TIME_FIELD]
+        ))
+
+        # 本次会话中已同步过的范围及同步时间（time.monotonic），有效期内再次读取时直接使用本地数据
+        self._synced_scopes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self._init_tables()
+        logger.info(f"JianDaoYunMirror 初始化完成，镜像数据库: {self.db_path}")
+
+    # --- 数据库基础操作 ---
+
+    def _connect(self) -> sqlite3.Connection:
+        # 每次操作使用独立连接，便于在预取线程中并发读取
+        return sqlite3.connect(str(self.db_path))
+
+    def _init_tables(self):
+        conn = self._connect()
+        try:
+            conn.execute(MIRROR_SQL['CREATE_ENTRIES_TABLE'])
+            conn.execute(MIRROR_SQL['CREATE_PROJECT_INDEX'])
+            conn.execute(MIRROR_SQL['CREATE_SITE_INDEX'])
+            conn.execute(MIRROR_SQL['CREATE_SYNC_STATE_TABLE'])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _read_entries(self, sql_key: str, value: str) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(MIRROR_SQL[sql_key], (value,)).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    def _get_sync_state(self, scope: str) -> Optional[tuple]:
+        conn = self._connect()
+        try:
+            return conn.execute(MIRROR_SQL['GET_SYNC_STATE'], (scope,)).fetchone()
+        finally:
+            conn.close()
+
+    # --- 同步 ---
+
+    def _needs_full_sync(self, state: Optional[tuple]) -> bool:
+        if not state or not state[0] or not state[1]:
+            return True
+        try:
+            return datetime.now() - datetime.fromisoformat(state[1]) > self.full_sync_interval
+        except ValueError:
+            return True
+
+    def _sync(self, scope: str, scope_field: str, scope_value: str, ids_sql_key: str,
+              full: bool = False) -> int:
+        """
+        同步一个范围（项目或场站）内的数据。
+
+        增量同步只请求 updateTime 不早于水位线的数据；全量同步会同时删除本地存在、
+        但远端已不存在的数据。
+
+        Returns:
+            int: 本次从远端获取的数据条数。
+        """
+        state = self._get_sync_state(scope)
+        full = full or self._needs_full_sync(state)
+
+        filter_cond = [{
+            "field": scope_field,
+            "type": "text",
+            "method": "eq",
+            "value": [scope_value]
+        }]
+        if not full:
+            # range 包含边界，水位线上的数据会被重新获取一次，upsert 保证幂等
+            filter_cond.append({
+                "field": UPDATE_TIME_FIELD,
+                "type": "datetime",
+                "method": "range",
+                "value": [state[0], None]
+            })
+
+        entries = self.jdy_api.query_entries(self.mirror_fields, filter_cond)
+
+        watermark = state[0] if state else None
+        params_list = []
+        for entry in entries:
+            update_time = entry.get(UPDATE_TIME_FIELD)
+            if update_time and (watermark is None or update_time > watermark):
+                watermark = update_time
+            params_list.append((
+                entry['_id'],
+                entry.get(PROJECT_NO_FIELD),
+                entry.get(SITE_NAME_FIELD),
+                update_time,
+                json.dumps(entry, ensure_ascii=False)
+            ))
+
+        conn = self._connect()
+        try:
+            if full:
+                remote_ids = {entry['_id'] for entry in entries}
+                local_ids = {row[0] for row in conn.execute(MIRROR_SQL[ids_sql_key], (scope_value,))}
+                stale_ids = local_ids - remote_ids
+                if stale_ids:
+                    conn.executemany(MIRROR_SQL['DELETE_ENTRY'], [(i,) for i in stale_ids])
+                    logger.info(f"镜像同步 {scope}: 删除 {len(stale_ids)} 条远端已不存在的数据。")
+            conn.executemany(MIRROR_SQL['UPSERT_ENTRY'], params_list)
+            conn.execute(MIRROR_SQL['UPSERT_SYNC_STATE'],
+                         (scope, watermark, datetime.now().isoformat() if full else None))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._synced_scopes[scope] = time.monotonic()
+        logger.info(f"镜像同步 {scope} 完成 ({'全量' if full else '增量'}): 获取 {len(entries)} 条数据。")
+        return len(entries)
+
+    def sync_project(self, project_no: str, full: bool = False) -> int:
+        """同步指定项目编号下的全部数据。"""
+        return self._sync(f"project:{project_no}", PROJECT_NO_FIELD, project_no,
+                          'GET_IDS_BY_PROJECT', full)
+
+    def sync_site(self, site_name: str, full: bool = False) -> int:
+        """同步指定场站的数据。"""
+        return self._sync(f"site:{site_name}", SITE_NAME_FIELD, site_name,
+                          'GET_IDS_BY_SITE', full)
+
+    def invalidate_site(self, site_name: str):
+        """标记场站数据需要在下次读取时重新同步。"""
+        project_nos = {entry.get(PROJECT_NO_FIELD) for entry in self._read_entries('GET_ENTRIES_BY_SITE', site_name)}
+        with self._lock:
+            self._synced_scopes.pop(f"site:{site_name}", None)
+            # 场站所属项目的同步状态也不再可信
+            for project_no in project_nos:
+                self._synced_scopes.pop(f"project:{project_no}", None)
+
+    def _is_fresh(self, scope: str) -> bool:
+        """范围是否在有效期内同步过（调用方需持有 self._lock）"""
+        synced_at = self._synced_scopes.get(scope)
+        return synced_at is not None and time.monotonic() - synced_at < self.sync_ttl
+
+    # --- 与 JianDaoYunAPI 兼容的查询接口 ---
+
+    def query_data(self, project_no: str = None) -> List[Dict[str, Any]]:
+        """
+        查询项目数据：先增量同步，再从本地读取。网络不可用时直接返回本地数据。
+        :param project_no: 项目编号
+        :return: 数据列表（仅包含项目字段）
+        """
+        if not project_no or not project_no.strip():
+            logging.info("项目编号为空，不执行简道云查询，直接返回空列表。")
+            return []
+
+        try:
+            self.sync_project(project_no)
+        except Exception as e:
+            local = self._read_entries('GET_ENTRIES_BY_PROJECT', project_no)
+            if not local:
+                raise
+            logger.warning(f"同步项目 '{project_no}' 失败 ({e})，使用本地镜像中的 {len(local)} 条数据。")
+
+        project_keys = ['_id'] + list(self.jdy_api.project_fields)
+        return [{k: entry.get(k) for k in project_keys if k in entry}
+                for entry in self._read_entries('GET_ENTRIES_BY_PROJECT', project_no)]
+
+    def query_site_devices(self, site_name: str, brands: List[str] = None,
+                           models: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取场站设备数据。
+        有效期内同步过该场站，或同步过其数据所属的全部项目时直接读取本地数据；
+        否则先执行同步（已同步过的场站按 updateTime 增量同步，只获取变化的数据）。
+        镜像中始终保存完整数据，brands/models 筛选在本地按与服务端相同的规则执行。
+        :param site_name: 场站名称
+        :param brands: 可选，只返回设备清单中包含这些品牌的数据
+        :param models: 可选，只返回设备清单中包含这些规格型号的数据
+        :return: 设备数据列表（与 JianDaoYunAPI.query_site_devices 格式相同）
+        """
+        local = self._read_entries('GET_ENTRIES_BY_SITE', site_name)
+        project_nos = {entry.get(PROJECT_NO_FIELD) for entry in local}
+        with self._lock:
+            # 场站数据可能分属多个项目，只有全部项目都在有效期内同步过，本地数据才是最新的
+            synced = self._is_fresh(f"site:{site_name}") or (
+                bool(project_nos) and all(self._is_fresh(f"project:{p}") for p in project_nos)
+            )
+
+        if not synced:
+            try:
+                self.sync_site(site_name)
+                local = self._read_entries('GET_ENTRIES_BY_SITE', site_name)
+            except Exception as e:
+                if not local:
+                    raise
+                logger.warning(f"同步场站 '{site_name}' 失败 ({e})，使用本地镜像中的数据。")
+
+        return [{'_id': entry.get('_id'), DEVICE_LIST_FIELD: entry.get(DEVICE_LIST_FIELD, [])}
+                for entry in local
+                if _entry_has_any(entry, DEVICE_BRAND_FIELD, brands)
+                and _entry_has_any(entry, DEVICE_MODEL_FIELD, models)]
+
+    def iter_data(self, project_no: str = None) -> Iterator[List[Dict[str, Any]]]:
+        """与 JianDaoYunAPI.iter_data 兼容：数据来自本地，整体作为一页产出。"""
+        data = self.query_data(project_no)
+        if data:
+            yield data
+
+    def iter_site_devices(self, site_name: str, brands: List[str] = None,
+                          models: List[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """与 JianDaoYunAPI.iter_site_devices 兼容：数据来自本地，整体作为一页产出。"""
+        data = self.query_site_devices(site_name, brands, models)
+        if data:
+            yield data
+
+
+def _entry_has_any(entry: Dict[str, Any], sub_field: str, values: Optional[List[str]]) -> bool:
+    """设备清单中是否有任一行的子字段取值在 values 中（values 为空表示不筛选），与服务端 "in" 筛选一样按取值精确匹配"""
+    if not values:
+        return True
+    rows = entry.get(DEVICE_LIST_FIELD) or []
+    return any(isinstance(row, dict) and row.get(sub_field) in values for row in rows)
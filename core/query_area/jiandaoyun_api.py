@@ -3,7 +3,53 @@
 import configparser
 import requests
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Tuple, Iterator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 默认网络参数（可在 config.ini 的 [JianDaoYun] 节中覆盖）
+DEFAULT_CONNECT_TIMEOUT = 5.0   # 建立连接超时（秒）
+DEFAULT_READ_TIMEOUT = 30.0     # 读取响应超时（秒）
+DEFAULT_MAX_RETRIES = 3         # 429/5xx 时的最大重试次数
+DEFAULT_BACKOFF_FACTOR = 0.5    # 指数退避系数：0.5s, 1s, 2s ...
+DEFAULT_POOL_MAXSIZE = 10       # 连接池大小
+DEFAULT_RATE_LIMIT = 20.0       # 每秒最多请求数（0 表示不限速）
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+DATA_LIST_PATH = "/app/entry/data/list"
+
+# 表单字段ID
+PROJECT_NO_FIELD = "_widget_1635777114935"   # 项目编号
+SITE_NAME_FIELD = "_widget_1635777114991"    # 场站
+DEVICE_LIST_FIELD = "_widget_1635777115095"  # 设备清单（子表单）
+DEVICE_BRAND_FIELD = "_widget_1635777115248"  # 设备清单子字段：品牌
+DEVICE_MODEL_FIELD = "_widget_1635777115287"  # 设备清单子字段：规格型号
+
+
+class RateLimiter:
+    """
+    线程安全的简单限速器：保证相邻两次请求的间隔不小于 1/rate 秒。
+    并发预取多个场站时，所有线程共享同一个限速器，避免触发简道云的应用级限流。
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.min_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """阻塞直到允许发出下一个请求"""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
 
 class JianDaoYunAPI:
     def __init__(self, config_file: str = 'config.ini'):
@@ -21,45 +67,96 @@ class JianDaoYunAPI:
             
             # 获取字段配置
             self.project_fields = self.jdy_config['project_fields'].split(',')
+
+            # 网络参数：超时、重试和连接池
+            self.timeout: Tuple[float, float] = (
+                self.jdy_config.getfloat('connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+                self.jdy_config.getfloat('read_timeout', DEFAULT_READ_TIMEOUT)
+            )
+            self.max_retries = self.jdy_config.getint('max_retries', DEFAULT_MAX_RETRIES)
+            self.backoff_factor = self.jdy_config.getfloat('backoff_factor', DEFAULT_BACKOFF_FACTOR)
+            self.pool_maxsize = self.jdy_config.getint('pool_maxsize', DEFAULT_POOL_MAXSIZE)
+            self.rate_limiter = RateLimiter(
+                self.jdy_config.getfloat('rate_limit_per_second', DEFAULT_RATE_LIMIT)
+            )
             
         except Exception as e:
             logging.error(f"读取配置文件失败: {str(e)}")
             raise
+
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """
+        创建带连接池和自动重试的共享会话。
+        所有分页请求复用同一个会话，避免每页都重新建立TCP/TLS连接。
+        """
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET", "POST"]),  # 查询接口是只读的，POST 重试是安全的
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=self.pool_maxsize,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """关闭共享会话，释放连接池。"""
+        if self.session is not None:
+            self.session.close()
+
+    def _post_data_list(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        请求一页 /app/entry/data/list 数据
+        :param params: 请求参数
+        :return: 当前页的数据列表
+        """
+        self.rate_limiter.acquire()
+        response = self.session.post(
+            f"{self.api_base_url}{DATA_LIST_PATH}",
+            json=params,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result.get('data', [])
         
-    def query_data(self, project_no: str = None) -> List[Dict[str, Any]]:
+    def iter_entries(self, fields: List[str], filter_cond: List[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
         """
-        查询简道云数据
-        :param project_no: 项目编号（用于过滤）
-        :return: 数据列表
+        按 data_id 分页获取满足条件的数据，每收到一页立即产出该页
+        :param fields: 需要返回的字段列表
+        :param filter_cond: 过滤条件列表（"and" 关系），为空时不过滤
+        :return: 逐页产出数据列表的生成器（空结果时不产出任何页）
         """
-        # 新增: 如果项目编号为空，则直接返回空列表，不进行查询
-        if not project_no or not project_no.strip():
-            logging.info("项目编号为空，不执行简道云查询，直接返回空列表。")
-            return []
-            
-        all_data = []
         last_data_id = None
         batch_size = 100  # API限制
 
-        # 构建过滤条件
-        filter_cond = []
-        if project_no:
-            filter_cond.append({
-                "field": "_widget_1635777114935",  # 项目编号字段
-                "type": "text",
-                "method": "eq",
-                "value": [project_no]
-            })
-
         while True:
             # 构建请求参数
             params = {
                 "app_id": self.app_id,
                 "entry_id": self.entry_id,
-                "fields": self.project_fields,  # 使用项目字段列表
+                "fields": fields,
                 "limit": batch_size
             }
-            
+
             # 添加过滤条件
             if filter_cond:
                 params["filter"] = {
@@ -71,116 +168,128 @@ class JianDaoYunAPI:
             if last_data_id:
                 params["data_id"] = last_data_id
 
-            try:
-                # 发送请求
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                response = requests.post(
-                    f"{self.api_base_url}/app/entry/data/list",
-                    json=params,
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                # 解析响应数据
-                result = response.json()
-                current_batch = result.get('data', [])
-                
-                # 添加到结果集
-                all_data.extend(current_batch)
-                
-                # 检查是否需要继续获取下一页
-                if len(current_batch) < batch_size:
-                    break
-                    
-                # 获取最后一条数据的ID
-                last_data_id = current_batch[-1]['_id']
-                
-            except Exception as e:
-                logging.error(f"获取简道云数据失败: {str(e)}")
-                raise
+            # 发送请求（复用会话连接）
+            current_batch = self._post_data_list(params)
 
-        return all_data
+            if current_batch:
+                yield current_batch
 
-    def query_site_devices(self, site_name: str) -> List[Dict[str, Any]]:
+            # 检查是否需要继续获取下一页
+            if len(current_batch) < batch_size:
+                break
+
+            # 获取最后一条数据的ID
+            last_data_id = current_batch[-1]['_id']
+
+    def query_entries(self, fields: List[str], filter_cond: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
-        获取场站的设备数据
-        :param site_name: 场站名称
-        :return: 设备数据列表
+        按 data_id 分页获取所有满足条件的数据
+        :param fields: 需要返回的字段列表
+        :param filter_cond: 过滤条件列表（"and" 关系），为空时不过滤
+        :return: 数据列表
         """
-        # print(f"\n开始查询场站 '{site_name}' 的设备数据")
         all_data = []
-        last_data_id = None
-        batch_size = 100  # API限制
+        for page in self.iter_entries(fields, filter_cond):
+            all_data.extend(page)
+        return all_data
 
-        # 构建过滤条件
+    def _project_filter(self, project_no: str) -> List[Dict[str, Any]]:
+        return [{
+            "field": PROJECT_NO_FIELD,  # 项目编号字段
+            "type": "text",
+            "method": "eq",
+            "value": [project_no]
+        }]
+
+    def _site_devices_filter(self, site_name: str, brands: List[str] = None,
+                             models: List[str] = None) -> List[Dict[str, Any]]:
         filter_cond = [{
-            "field": "_widget_1635777114991",  # 场站字段
+            "field": SITE_NAME_FIELD,  # 场站字段
             "type": "String",
             "method": "eq",
             "value": [site_name]
         }]
+        if brands:
+            filter_cond.append({
+                "field": f"{DEVICE_LIST_FIELD}.{DEVICE_BRAND_FIELD}",
+                "type": "text",
+                "method": "in",
+                "value": list(brands)
+            })
+        if models:
+            filter_cond.append({
+                "field": f"{DEVICE_LIST_FIELD}.{DEVICE_MODEL_FIELD}",
+                "type": "text",
+                "method": "in",
+                "value": list(models)
+            })
+        return filter_cond
 
-        while True:
-            # 构建请求参数
-            params = {
-                "app_id": self.app_id,
-                "entry_id": self.entry_id,
-                "fields": ["_widget_1635777115095"],  # 设备清单字段
-                "limit": batch_size,
-                "filter": {
-                    "rel": "and",
-                    "cond": filter_cond
-                }
-            }
+    def query_data(self, project_no: str = None) -> List[Dict[str, Any]]:
+        """
+        查询简道云数据
+        :param project_no: 项目编号（用于过滤）
+        :return: 数据列表
+        """
+        # 新增: 如果项目编号为空，则直接返回空列表，不进行查询
+        if not project_no or not project_no.strip():
+            logging.info("项目编号为空，不执行简道云查询，直接返回空列表。")
+            return []
 
-            # 添加分页标识
-            if last_data_id:
-                params["data_id"] = last_data_id
+        try:
+            return self.query_entries(self.project_fields, self._project_filter(project_no))  # 使用项目字段列表
+        except Exception as e:
+            logging.error(f"获取简道云数据失败: {str(e)}")
+            raise
 
-            # print("\n发送的请求参数:")
-            # print(params)
+    def iter_data(self, project_no: str = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        逐页查询简道云数据，每收到一页立即产出，便于界面边收边显示
+        :param project_no: 项目编号（用于过滤）
+        :return: 逐页产出数据列表的生成器
+        """
+        if not project_no or not project_no.strip():
+            logging.info("项目编号为空，不执行简道云查询。")
+            return
 
-            try:
-                # 发送请求
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                response = requests.post(
-                    f"{self.api_base_url}/app/entry/data/list",
-                    json=params,
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                # 解析响应数据
-                result = response.json()
-                # print("\n收到的API响应:")
-                # print(result)
-                
-                current_batch = result.get('data', [])
-                # print(f"\n当前批次数据数量: {len(current_batch)}")
-                
-                # 添加到结果集
-                all_data.extend(current_batch)
-                
-                # 检查是否需要继续获取下一页
-                if len(current_batch) < batch_size:
-                    break
-                    
-                # 获取最后一条数据的ID
-                last_data_id = current_batch[-1]['_id']
-                
-            except Exception as e:
-                # print(f"\n发生错误: {str(e)}")
-                logging.error(f"获取场站设备数据失败: {str(e)}")
-                raise
-
-        # print(f"\n总共获取到 {len(all_data)} 条设备数据")
-        return all_data
+        try:
+            yield from self.iter_entries(self.project_fields, self._project_filter(project_no))
+        except Exception as e:
+            logging.error(f"获取简道云数据失败: {str(e)}")
+            raise
+
+    def query_site_devices(self, site_name: str, brands: List[str] = None,
+                           models: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取场站的设备数据
+        :param site_name: 场站名称
+        :param brands: 可选，只返回设备清单中包含这些品牌的数据（服务端筛选）
+        :param models: 可选，只返回设备清单中包含这些规格型号的数据（服务端筛选）
+        :return: 设备数据列表
+
+        注意：简道云对子表单字段的筛选以整条数据为单位，命中的数据仍会带回完整的设备清单；
+        brands/models 按取值精确匹配，且多个条件之间为"与"关系，不能表达"品牌包含关键字或型号以 LK/LE 开头"
+        这样的和利时识别规则，因此PLC配置使用完整清单，由 DeviceDataProcessor 在客户端识别和利时设备。
+        """
+        try:
+            return self.query_entries([DEVICE_LIST_FIELD],  # 设备清单字段
+                                      self._site_devices_filter(site_name, brands, models))
+        except Exception as e:
+            logging.error(f"获取场站设备数据失败: {str(e)}")
+            raise
+
+    def iter_site_devices(self, site_name: str, brands: List[str] = None,
+                          models: List[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        逐页获取场站的设备数据，参数与 query_site_devices 相同
+        :return: 逐页产出设备数据列表的生成器
+        """
+        try:
+            yield from self.iter_entries([DEVICE_LIST_FIELD],
+                                         self._site_devices_filter(site_name, brands, models))
+        except Exception as e:
+            logging.error(f"获取场站设备数据失败: {str(e)}")
+            raise
 
     def upload_hmi_points(self, points_data: List[Dict], hmi_type: str):
         """
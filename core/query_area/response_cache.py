@@ -0,0 +1,79 @@
+"""查询结果缓存模块：带过期时间(TTL)和容量上限(LRU)的线程安全缓存"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_CACHE_TTL = 300.0    # 缓存有效期（秒）
+DEFAULT_CACHE_SIZE = 64      # 最多缓存的条目数
+
+
+class TTLCache:
+    """
+    带 TTL 和 LRU 容量上限的缓存。
+
+    - 条目超过 ttl 秒后视为过期，读取时按未命中处理并删除；
+    - 条目数超过 maxsize 时淘汰最久未使用的条目；
+    - 记录命中/未命中/淘汰次数，便于评估缓存效果。
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = max(1, maxsize)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，未命中或已过期时返回 None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        """判断是否存在未过期的条目（不影响命中统计和LRU顺序）"""
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and (self.ttl <= 0 or time.monotonic() - item[0] <= self.ttl)
+
+    def put(self, key: Hashable, value: Any):
+        """写入缓存，必要时淘汰最久未使用的条目"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """删除指定条目"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """清空所有条目（统计计数保留）"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存统计信息"""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -5,6 +5,7 @@
 import sys
 import os
 import logging
+import multiprocessing
 import configparser
 from logging.handlers import RotatingFileHandler
 # 导入 Path 对象，用于更方便的路径操作
@@ -148,4 +149,6 @@ def main():
         sys.exit(1) 
 
 if __name__ == '__main__':
+    # 一键生成全部点表使用进程池，打包为可执行文件后子进程需要通过 freeze_support 启动
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,26 @@
+# tests/core/device_list_area/test_device_processor.py
+import unittest
+
+from core.device_list_area import to_plc_device_records
+from core.device_list_area.device_processor import DEVICE_ROW_FIELDS
+from core.io_table import INSTANCE_COUNT_KEY
+
+
+class TestPLCDeviceRecords(unittest.TestCase):
+
+    def test_records_match_table_text(self):
+        devices = [
+            {'_widget_1635777115287': 'LK411', '_widget_1635777485580': 3, '_id': 'x'},
+            {'_widget_1635777115287': 'LK117', '_widget_1635777485580': '0'},
+            {'_widget_1635777115211': '电源'},
+        ]
+        records = to_plc_device_records(devices)
+        self.assertEqual([r['id'] for r in records], [1, 2, 3])
+        self.assertEqual([r[INSTANCE_COUNT_KEY] for r in records], [3, 1, 1])
+        self.assertEqual(records[0]['_widget_1635777485580'], '3')
+        self.assertEqual(records[2]['_widget_1635777115287'], '')
+        self.assertEqual(set(records[0]), {'id', INSTANCE_COUNT_KEY, *DEVICE_ROW_FIELDS})
+
+
+if __name__ == '__main__':
+    unittest.main()
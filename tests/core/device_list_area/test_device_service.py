@@ -0,0 +1,150 @@
+# tests/core/device_list_area/test_device_service.py
+import threading
+import unittest
+
+from core.device_list_area.device_service import DeviceService
+from core.query_area.jiandaoyun_api import DEVICE_LIST_FIELD
+
+BRAND = '_widget_1635777115248'
+MODEL = '_widget_1635777115287'
+
+
+class FakeJianDaoYunAPI:
+    """记录 query_site_devices 的调用，返回固定的一条场站数据。"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def query_site_devices(self, site_name):
+        self.calls.append(site_name)
+        return [{'_id': '0001', DEVICE_LIST_FIELD: self.rows}]
+
+    def iter_site_devices(self, site_name):
+        self.calls.append(site_name)
+        # 每行设备作为单独一页返回，模拟分页
+        for i, row in enumerate(self.rows):
+            yield [{'_id': f"{i:04d}", DEVICE_LIST_FIELD: [row]}]
+
+
+class BlockingJianDaoYunAPI(FakeJianDaoYunAPI):
+    """query_site_devices 在 release 被设置前阻塞，用于控制预取任务的完成时机；fail_once 时第一次查询失败。"""
+
+    def __init__(self, rows, fail_once=False):
+        super().__init__(rows)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail_once = fail_once
+
+    def query_site_devices(self, site_name):
+        self.started.set()
+        self.release.wait(5)
+        if self.fail_once:
+            self.fail_once = False
+            self.calls.append(site_name)
+            raise ConnectionError("网络中断")
+        return super().query_site_devices(site_name)
+
+
+def wait_for_prefetch(service):
+    """等待预取线程执行完全部任务（包括完成回调）"""
+    service._executor.shutdown(wait=True)
+    service._executor = None
+
+
+ROWS = [
+    {BRAND: '和利时', MODEL: 'LK411'},
+    {BRAND: '西门子', MODEL: '6ES7'},
+    {BRAND: '', MODEL: 'LE5118'},
+    {BRAND: '和利时', MODEL: 'LK117'},
+]
+
+
+class TestIterFormattedDevices(unittest.TestCase):
+
+    def test_pages_streamed_then_cached(self):
+        api = FakeJianDaoYunAPI(ROWS)
+        service = DeviceService(api)
+        pages = list(service.iter_formatted_devices("站A"))
+        self.assertEqual([len(p) for p in pages], [1, 1, 1, 1])
+        # 完整读取后写入缓存，后续读取不再请求API
+        self.assertEqual(len(service.get_formatted_devices("站A")), 4)
+        self.assertEqual(list(service.iter_formatted_devices("站A")), [ROWS])
+        self.assertEqual(len(api.calls), 1)
+
+    def test_failure_mid_stream_is_raised_and_not_cached(self):
+        api = FakeJianDaoYunAPI(ROWS)
+        pages = api.iter_site_devices
+
+        def failing_pages(site_name):
+            for i, page in enumerate(pages(site_name)):
+                if i == 2:
+                    raise ConnectionError("网络中断")
+                yield page
+
+        api.iter_site_devices = failing_pages
+        service = DeviceService(api)
+        received = []
+        with self.assertRaises(ConnectionError):
+            for page in service.iter_formatted_devices("站A"):
+                received.extend(page)
+        self.assertEqual(len(received), 2)
+        # 部分结果未写入缓存，再次读取时重新请求API
+        api.iter_site_devices = pages
+        self.assertEqual(len(list(service.iter_formatted_devices("站A"))), 4)
+
+
+class TestPrefetchDevices(unittest.TestCase):
+
+    def test_duplicate_empty_and_cached_sites_are_skipped(self):
+        api = FakeJianDaoYunAPI(ROWS)
+        service = DeviceService(api)
+        service.get_formatted_devices("站A")
+        submitted = service.prefetch_devices(["站A", "站B", "", "站B"])
+        self.assertEqual(list(submitted), ["站B"])
+        wait_for_prefetch(service)
+        # 正在预取或已缓存的场站不会重复提交
+        self.assertEqual(service.prefetch_devices(["站A", "站B"]), {})
+        self.assertEqual(api.calls, ["站A", "站B"])
+
+    def test_query_waits_for_inflight_prefetch(self):
+        api = BlockingJianDaoYunAPI(ROWS)
+        service = DeviceService(api)
+        service.prefetch_devices(["站A"])
+        self.assertTrue(api.started.wait(5))
+        threading.Timer(0.05, api.release.set).start()
+        self.assertEqual(len(service.get_formatted_devices("站A")), 4)
+        wait_for_prefetch(service)
+        self.assertEqual(api.calls, ["站A"])
+        self.assertIn("站A", service._device_cache)
+
+    def test_invalidate_during_prefetch_discards_result(self):
+        api = BlockingJianDaoYunAPI(ROWS)
+        service = DeviceService(api)
+        future = service.prefetch_devices(["站A"])["站A"]
+        self.assertTrue(api.started.wait(5))
+        service.invalidate("站A")
+        api.release.set()
+        self.assertEqual(len(future.result(5)), 4)
+        wait_for_prefetch(service)
+        # 失效后完成的预取结果不写入缓存，再次读取时重新请求API
+        self.assertNotIn("站A", service._device_cache)
+        self.assertEqual(service._pending, {})
+        service.get_formatted_devices("站A")
+        self.assertEqual(api.calls, ["站A", "站A"])
+
+    def test_prefetch_failure_is_logged_and_not_cached(self):
+        api = BlockingJianDaoYunAPI(ROWS, fail_once=True)
+        api.release.set()
+        service = DeviceService(api)
+        with self.assertLogs('core.device_list_area.device_service', 'WARNING') as logs:
+            service.prefetch_devices(["站A"])
+            wait_for_prefetch(service)
+        self.assertIn("设备预取失败", logs.output[0])
+        self.assertEqual(service._pending, {})
+        self.assertNotIn("站A", service._device_cache)
+        self.assertEqual(len(service.get_formatted_devices("站A")), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/core/io_table/test_device_instances.py
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.support.jdy_stub_server import load_fixture
+from core.io_table import IODataLoader, DeviceInstances, INSTANCE_COUNT_KEY, parse_device_quantity
+from core.io_table.plc_config_persistence import PLCConfigPersistence
+from core.query_area.jiandaoyun_api import DEVICE_LIST_FIELD
+
+QUANTITY_FIELD = "_widget_1635777485580"
+
+
+class TestDeviceInstances(unittest.TestCase):
+    """按数量压缩的设备记录与逐个展开实例的处理结果应一致。"""
+
+    def setUp(self):
+        rows = [row for entry in load_fixture() for row in entry.get(DEVICE_LIST_FIELD, [])]
+        self.records = []
+        self.expanded = []
+        for row, device in enumerate(rows):
+            quantity = parse_device_quantity(device.get(QUANTITY_FIELD, ''))
+            self.records.append({**device, 'id': row + 1, INSTANCE_COUNT_KEY: quantity})
+            for i in range(quantity):
+                self.expanded.append({**device, 'id': row + 1, 'instance_index': i + 1})
+
+    def test_records_and_expanded_instances_give_same_result(self):
+        by_record = IODataLoader()
+        by_record.set_devices_data(self.records, force_update=True)
+        by_instance = IODataLoader()
+        by_instance.set_devices_data(self.expanded, force_update=True)
+
+        self.assertIsInstance(by_record.processed_enriched_devices, DeviceInstances)
+        self.assertEqual(list(by_record.processed_enriched_devices), list(by_instance.processed_enriched_devices))
+        self.assertEqual(by_record.get_rack_info(), by_instance.get_rack_info())
+        self.assertEqual(by_record.load_available_modules()[0], by_instance.load_available_modules()[0])
+
+    def test_instances_are_generated_on_access(self):
+        instances = DeviceInstances([({'model': 'LK411', 'instance_index': 1}, 3), ({'model': 'LK117'}, 2)])
+        self.assertEqual(len(instances), 5)
+        self.assertEqual([d['instance_index'] for d in instances], [1, 2, 3, 1, 2])
+        self.assertEqual(instances[-1], {'model': 'LK117', 'instance_index': 2})
+        self.assertEqual([d['model'] for d in instances[2:4]], ['LK411', 'LK117'])
+        instances[0]['model'] = '已修改'
+        self.assertEqual(instances[0]['model'], 'LK411')
+        self.assertEqual(parse_device_quantity(' 0 '), 1)
+        self.assertEqual(parse_device_quantity('abc'), 1)
+        self.assertEqual(parse_device_quantity('12'), 12)
+
+    def test_config_cache_keeps_records_compressed(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            loader = IODataLoader()
+            loader.persistence_manager = PLCConfigPersistence(config_dir)
+            loader.set_devices_data(self.records, force_update=True)
+            loader.current_site_name = '测试场站'
+            self.assertTrue(loader.save_current_config_to_cache())
+
+            full_file = next(Path(config_dir).glob('*.full.json'))
+            saved = json.loads(full_file.read_text(encoding='utf-8'))
+            self.assertNotIn('processed_devices', saved)
+            self.assertEqual(len(saved['processed_device_runs']),
+                             len(list(loader.processed_enriched_devices.iter_runs())))
+
+            restored = IODataLoader()
+            restored.persistence_manager = PLCConfigPersistence(config_dir)
+            self.assertTrue(restored.load_cached_config_for_site('测试场站'))
+            self.assertIsInstance(restored.processed_enriched_devices, DeviceInstances)
+            self.assertEqual(list(restored.processed_enriched_devices), list(loader.processed_enriched_devices))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/core/io_table/test_device_io_type_golden.py
+import json
+import unittest
+from pathlib import Path
+
+from core.io_table.get_data import (ModuleInfoProvider, DeviceDataProcessor, SystemSetupFacts, SystemSetupManager,
+                                    PLC_SERIES_CONFIG_DEF)
+
+GOLDEN_FILE = Path(__file__).parent / "data" / "device_io_type_golden.json"
+
+
+class TestDeviceIOTypeGolden(unittest.TestCase):
+    """
+    IO类型推断和和利时筛选的黄金文件测试。
+
+    黄金文件由逐关键字匹配的原始实现生成，设备来自录制的场站设备清单
+    (tests/support/fixtures/jdy_entries_sample.json) 以及名称/品牌/型号的组合。
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(GOLDEN_FILE, "r", encoding="utf-8") as f:
+            cls.golden = json.load(f)
+        prefixes = list(PLC_SERIES_CONFIG_DEF.keys())
+        cls.processor = DeviceDataProcessor(ModuleInfoProvider(), prefixes)
+        cls.keywords = ['和利时', 'HOLLYSYS'] + prefixes
+
+    def test_io_types_and_channels_match_golden(self):
+        processed = self.processor.process_raw_device_list(self.golden["devices"])
+        self.assertEqual([d["io_type"] for d in processed], self.golden["io_types"])
+        self.assertEqual([d["channels"] for d in processed], self.golden["channels"])
+
+    def test_hollysys_filter_matches_golden(self):
+        processed = self.processor.process_raw_device_list(self.golden["devices"])
+        kept = self.processor.filter_hollysys_devices(processed, self.keywords)
+        self.assertEqual([d["id"] for d in kept], self.golden["hollysys_ids"])
+
+    def test_single_pass_pipeline_matches_separate_passes(self):
+        processed = self.processor.process_raw_device_list(self.golden["devices"])
+        kept = self.processor.filter_hollysys_devices(processed, self.keywords)
+        expected = self.processor.enrich_device_data(kept)
+        expected_setup = SystemSetupManager()
+        expected_setup.calculate_system_setup(expected)
+
+        facts = SystemSetupFacts()
+        fused = self.processor.process_hollysys_devices(self.golden["devices"], self.keywords, facts)
+        fused_setup = SystemSetupManager()
+        fused_setup.apply_system_facts(facts)
+
+        self.assertEqual(list(fused), expected)
+        self.assertEqual(fused_setup.get_rack_info_dict(), expected_setup.get_rack_info_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
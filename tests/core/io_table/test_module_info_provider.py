@@ -0,0 +1,50 @@
+# tests/core/io_table/test_module_info_provider.py
+import unittest
+
+from core.io_table import IODataLoader, INSTANCE_COUNT_KEY, thaw_module
+from core.io_table.get_data import ModuleInfoProvider
+
+
+class TestModuleInfoProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = ModuleInfoProvider()
+
+    def test_lookup_is_case_insensitive(self):
+        module = self.provider.get_predefined_module_by_model("lk411")
+        self.assertIsNotNone(module)
+        self.assertEqual(module["model"], "LK411")
+        self.assertIsNone(self.provider.get_predefined_module_by_model("不存在的型号"))
+
+    def test_records_are_shared_and_read_only(self):
+        first = self.provider.get_inferred_module_info("LK999")
+        self.assertEqual(first["model"], "LK999")
+        self.assertIs(self.provider.get_inferred_module_info("LK999"), first)
+        with self.assertRaises(TypeError):
+            first["type"] = "已修改"
+        editable = self.provider.get_predefined_module_by_model("LK411").copy()
+        editable["unique_id"] = "mod_1"
+        self.assertNotIn("unique_id", self.provider.get_predefined_module_by_model("LK411"))
+
+    def test_nested_values_are_read_only(self):
+        module = self.provider.get_predefined_module_by_model("LE5118")
+        with self.assertRaises(TypeError):
+            module["sub_channels"]["DI"] = 0
+        editable = thaw_module(module)
+        editable["sub_channels"]["DI"] = 0
+        self.assertEqual(self.provider.get_predefined_module_by_model("LE5118")["sub_channels"]["DI"], 24)
+
+    def test_loader_lookup_does_not_expose_device_records(self):
+        loader = IODataLoader()
+        loader.set_devices_data([{'id': 1, '_widget_1635777115287': 'LE5118', '_widget_1635777115248': '和利时',
+                                  INSTANCE_COUNT_KEY: 1}], force_update=True)
+        module = loader.get_module_by_model("LE5118")
+        with self.assertRaises(TypeError):
+            module["sub_channels"]["DI"] = 0
+        record, _ = next(loader.processed_enriched_devices.iter_runs())
+        self.assertIsInstance(record["sub_channels"], dict)
+        self.assertEqual(module["sub_channels"]["DI"], record["sub_channels"]["DI"])
+
+
+if __name__ == '__main__':
+    unittest.main()
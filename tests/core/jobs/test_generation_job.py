@@ -0,0 +1,52 @@
+# tests/core/jobs/test_generation_job.py
+import os
+import tempfile
+import unittest
+
+from core.jobs import CancelToken, JobContext, run_generation_job
+from core.post_upload_processor.plc_generators.hollysys_generator.generator import HollysysGenerator
+from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+
+
+def make_points_by_sheet(count):
+    points = [UploadedIOPoint(source_sheet_name="IO点表", source_type="main_io",
+                              hmi_variable_name=f"AI_{i}", plc_absolute_address=f"%MD{i * 4}",
+                              variable_description=f"模拟量{i}", data_type="REAL")
+              for i in range(count)]
+    return {"IO点表": points}
+
+
+class TestGenerationJob(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.output_dir.name, "vars.xls")
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_reports_points_and_timing(self):
+        reports = []
+        context = JobContext(on_progress=lambda done, total, message: reports.append((done, total)))
+        generation = run_generation_job("和利时变量表", HollysysGenerator().generate_hollysys_table,
+                                        make_points_by_sheet(450), self.output_path, context=context)
+        self.assertEqual(generation.result, (True, None))
+        self.assertEqual((generation.points_processed, generation.points_total), (450, 450))
+        self.assertEqual(reports[0], (0, 450))
+        self.assertGreater(generation.elapsed, 0)
+        self.assertTrue(os.path.exists(self.output_path))
+
+    def test_cancel_between_rows(self):
+        token = CancelToken()
+        # 第一次上报非零进度后取消
+        context = JobContext(token, on_progress=lambda done, total, message: done > 0 and token.cancel())
+        generation = run_generation_job("和利时变量表", HollysysGenerator().generate_hollysys_table,
+                                        make_points_by_sheet(1000), self.output_path, context=context)
+        self.assertTrue(generation.cancelled)
+        self.assertIsNone(generation.result)
+        self.assertLess(generation.points_processed, 1000)
+        self.assertFalse(os.path.exists(self.output_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
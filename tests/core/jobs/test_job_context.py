@@ -0,0 +1,37 @@
+# tests/core/jobs/test_job_context.py
+import unittest
+
+from core.jobs import CancelToken, JobCancelled, JobContext
+
+
+class TestJobContext(unittest.TestCase):
+
+    def test_progress_partial_and_cancel(self):
+        progress, partials = [], []
+        token = CancelToken()
+        context = JobContext(token, on_progress=lambda *args: progress.append(args), on_partial=partials.append)
+
+        def job(ctx, pages):
+            for i, page in enumerate(pages, 1):
+                ctx.check_cancelled()
+                ctx.emit_partial(page)
+                ctx.report_progress(i, len(pages), "page")
+                if i == 2:
+                    token.cancel()
+
+        with self.assertRaises(JobCancelled):
+            job(context, [[1], [2], [3]])
+        self.assertEqual(partials, [[1], [2]])
+        self.assertEqual(progress, [(1, 3, "page"), (2, 3, "page")])
+        self.assertTrue(context.cancelled)
+
+    def test_context_without_callbacks(self):
+        context = JobContext()
+        context.report_progress(1, 2)
+        context.emit_partial(object())
+        context.check_cancelled()
+        self.assertFalse(context.cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
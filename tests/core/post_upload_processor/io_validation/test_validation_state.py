@@ -0,0 +1,84 @@
+# tests/core/post_upload_processor/io_validation/test_validation_state.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import openpyxl
+
+from core.post_upload_processor.io_validation import constants as C
+from core.post_upload_processor.io_validation import validator
+from core.post_upload_processor.io_validation.validation_state import ValidationStateCache
+from core.post_upload_processor.io_validation.validator import validate_io_table
+
+MAIN_HEADERS = [C.HMI_NAME_COL, C.DESCRIPTION_COL, C.POWER_SUPPLY_TYPE_COL, C.WIRING_SYSTEM_COL,
+                C.MODULE_TYPE_COL, C.RANGE_LOW_LIMIT_COL, C.RANGE_HIGH_LIMIT_COL,
+                C.SLL_SET_COL, C.SL_SET_COL, C.SH_SET_COL, C.SHH_SET_COL]
+TP_HEADERS = [C.TP_INPUT_VAR_NAME_COL, C.TP_INPUT_DATA_TYPE_COL,
+              C.TP_INPUT_SLL_SET_COL, C.TP_INPUT_SL_SET_COL, C.TP_INPUT_SH_SET_COL, C.TP_INPUT_SHH_SET_COL]
+
+
+class TestIncrementalValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.test_dir, "io.xlsx")
+        self.main_rows = [[f"PT_{i}", f"压力{i}", "有源", "两线制", "AI", 0, 10, None, None, 9, None] for i in range(20)]
+        self.main_rows[3][2] = "交流"  # 供电类型无效
+        self.main_rows[7][0] = "PT_0"  # HMI名称重复
+        self.tp_rows = [[f"TP_{i}", "REAL", 1, None, 5 if i % 2 else None, None] for i in range(10)]
+        self._save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _save(self):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = C.PLC_IO_SHEET_NAME
+        ws.append(MAIN_HEADERS)
+        for row in self.main_rows:
+            ws.append(row)
+        tp = wb.create_sheet("第三方设备")
+        tp.append(TP_HEADERS)
+        for row in self.tp_rows:
+            tp.append(row)
+        wb.save(self.file_path)
+
+    def test_only_changed_rows_are_revalidated(self):
+        cache = ValidationStateCache()
+        self.assertEqual(validate_io_table(self.file_path, validation_cache=cache), validate_io_table(self.file_path))
+
+        # 修正一个单元格、改坏另一个单元格，第三方表不变
+        self.main_rows[3][2] = "无源"
+        self.main_rows[12][3] = "常开"
+        self._save()
+        with mock.patch.object(validator, "_collect_row_errors", wraps=validator._collect_row_errors) as collect, \
+                mock.patch.object(validator.HmiNameUniquenessRule, "validate_sheet",
+                                  autospec=True, side_effect=validator.HmiNameUniquenessRule.validate_sheet) as uniqueness:
+            incremental = validate_io_table(self.file_path, validation_cache=cache)
+        # 只有主IO点表中改动的两行重新执行行级规则，表级的HMI名称唯一性校验整表重新执行
+        collect.assert_called_once()
+        self.assertEqual(list(collect.call_args.args[0].index), [3, 12])
+        uniqueness.assert_called_once()
+
+        full = validate_io_table(self.file_path)
+        self.assertEqual(incremental, full)
+        self.assertNotIn("交流", full[1])
+        self.assertIn('"PT_0" 在以下Excel行号重复: [2, 9]', full[1])
+        self.assertIn('Excel行号:14, 列:"线制", 值:"常开"', full[1])
+
+    def test_cache_keeps_recent_files(self):
+        cache = ValidationStateCache(max_files=1)
+        validate_io_table(self.file_path, validation_cache=cache)
+        self.assertEqual(set(cache.get(self.file_path)), {C.PLC_IO_SHEET_NAME, "第三方设备"})
+        other_path = os.path.join(self.test_dir, "other.xlsx")
+        shutil.copy(self.file_path, other_path)
+        validate_io_table(other_path, validation_cache=cache)
+        self.assertEqual(cache.get(self.file_path), {})
+        self.assertEqual(set(cache.get(other_path)), {C.PLC_IO_SHEET_NAME, "第三方设备"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,12 @@ import numpy as np # 用于创建 NaN 值
 import os
 import tempfile
 import shutil
+from unittest import mock
 
 # 导入需要测试的模块和常量
 # 注意：根据实际项目结构调整导入路径
 from core.post_upload_processor.io_validation import constants as C
+from core.post_upload_processor.io_validation import validator
 from core.post_upload_processor.io_validation.validator import (
     ValidationContext,
     HmiDescriptionConsistencyRule,
@@ -22,9 +24,13 @@ from core.post_upload_processor.io_validation.validator import (
     ReservedAiSpecificEmptyRule,
     RealSetpointUniquenessRule,
     _validate_row_with_rules,
+    _validate_rows_with_rules,
+    MAIN_IO_RULES,
+    THIRD_PARTY_RULES,
     _validate_main_io_sheet,
     _validate_third_party_sheet,
     validate_io_table,
+    validate_io_table_result,
     BoolSetpointEmptyRule,
     AlwaysRequiredRule,
     HmiNameUniquenessRule
@@ -663,6 +669,66 @@ class TestValidateIoTableIntegration(unittest.TestCase):
         self.assertIn("TP_Invalid", message)
         self.assertIn(f'工作表:"ThirdPartyErrors", Excel行号:2', message)
 
+    def test_parallel_validation_matches_sequential(self):
+        """并行校验与顺序校验的错误消息相同，且按工作表原始顺序合并。"""
+        tp_sheet_cols = [
+            C.TP_INPUT_VAR_NAME_COL, C.TP_INPUT_DATA_TYPE_COL,
+            C.TP_INPUT_SLL_SET_COL, C.TP_INPUT_SL_SET_COL,
+            C.TP_INPUT_SH_SET_COL, C.TP_INPUT_SHH_SET_COL
+        ]
+        main_data = pd.DataFrame([{C.HMI_NAME_COL: "AI_1", C.MODULE_TYPE_COL: C.MODULE_TYPE_AI}]).reindex(
+            columns=[C.HMI_NAME_COL, C.DESCRIPTION_COL, C.POWER_SUPPLY_TYPE_COL, C.WIRING_SYSTEM_COL,
+                     C.MODULE_TYPE_COL, C.RANGE_LOW_LIMIT_COL, C.RANGE_HIGH_LIMIT_COL,
+                     C.SLL_SET_COL, C.SL_SET_COL, C.SH_SET_COL, C.SHH_SET_COL])
+        sheet_data = {}
+        for name in ["设备B", C.PLC_IO_SHEET_NAME, "设备A", "设备C"]:
+            sheet_data[name] = main_data if name == C.PLC_IO_SHEET_NAME else pd.DataFrame([{
+                C.TP_INPUT_VAR_NAME_COL: f"{name}_1", C.TP_INPUT_DATA_TYPE_COL: C.DATA_TYPE_BOOL,
+                C.TP_INPUT_SH_SET_COL: 1
+            }]).reindex(columns=tp_sheet_cols)
+        file_path = self._create_excel_file("parallel.xlsx", sheet_data)
+
+        sequential = validate_io_table(file_path, max_workers=1)
+        with mock.patch.object(validator, "PARALLEL_VALIDATION_MIN_FILE_SIZE", 0), \
+                mock.patch.object(validator, "ProcessPoolExecutor", wraps=validator.ProcessPoolExecutor) as pool:
+            parallel = validate_io_table(file_path, max_workers=2)
+        pool.assert_called_once()
+        self.assertEqual(parallel, sequential)
+        self.assertFalse(sequential[0])
+        sheet_order = [line.split('"')[1] for line in sequential[1].splitlines() if line.startswith("验证失败 (工作表")]
+        self.assertEqual(sorted(set(sheet_order), key=sheet_order.index), ["设备B", C.PLC_IO_SHEET_NAME, "设备A", "设备C"])
+
+    def test_structured_result_and_max_errors(self):
+        """结构化结果记录每条消息的位置和规则；达到 max_errors 时提前结束，结果为完整结果的前缀。"""
+        main_data = pd.DataFrame([
+            {C.HMI_NAME_COL: f"AI_{i}", C.DESCRIPTION_COL: f"压力{i}", C.POWER_SUPPLY_TYPE_COL: "交流",
+             C.WIRING_SYSTEM_COL: C.ALLOWED_WIRING_SYSTEM_VALUES_AI_AO[0], C.MODULE_TYPE_COL: C.MODULE_TYPE_AI,
+             C.RANGE_LOW_LIMIT_COL: 0, C.RANGE_HIGH_LIMIT_COL: 100}
+            for i in range(5)
+        ]).reindex(columns=[C.HMI_NAME_COL, C.DESCRIPTION_COL, C.POWER_SUPPLY_TYPE_COL, C.WIRING_SYSTEM_COL,
+                            C.MODULE_TYPE_COL, C.RANGE_LOW_LIMIT_COL, C.RANGE_HIGH_LIMIT_COL,
+                            C.SLL_SET_COL, C.SL_SET_COL, C.SH_SET_COL, C.SHH_SET_COL])
+        tp_data = pd.DataFrame([{C.TP_INPUT_VAR_NAME_COL: "TP_1", C.TP_INPUT_DATA_TYPE_COL: C.DATA_TYPE_BOOL,
+                                 C.TP_INPUT_SH_SET_COL: 1}])
+        file_path = self._create_excel_file("structured.xlsx", {C.PLC_IO_SHEET_NAME: main_data, "设备A": tp_data})
+
+        full = validate_io_table_result(file_path)
+        self.assertFalse(full.is_valid)
+        self.assertFalse(full.truncated)
+        self.assertEqual((full.is_valid, full.message), validate_io_table(file_path))
+        first = full.issues[0]
+        self.assertEqual((first.sheet, first.row, first.column, first.rule, first.severity),
+                         (C.PLC_IO_SHEET_NAME, 2, C.POWER_SUPPLY_TYPE_COL, "PowerSupplyValueRule", "error"))
+        self.assertEqual([issue.sheet for issue in full.issues][-1], "设备A")
+        self.assertEqual({issue.rule for issue in full.issues if issue.sheet == "设备A"},
+                         {"RequiredColumns", "BoolSetpointEmptyRule"})
+
+        capped = validate_io_table_result(file_path, max_errors=3)
+        self.assertTrue(capped.truncated)
+        self.assertEqual(capped.issues, full.issues[:3])
+        self.assertIn("上限 3 条", capped.message)
+        self.assertEqual(validate_io_table_result(file_path, max_errors=len(full.issues) + 1).issues, full.issues)
+
     def test_missing_main_sheet(self):
         """测试缺少主 IO 点表的情况。"""
         tp_sheet_cols = [
@@ -839,5 +905,43 @@ class TestAlwaysRequiredRule(unittest.TestCase):
         self.assertHasError(errors_wiring, "是必填项，不能为空")
         self.assertHasError(errors_wiring, f'"{C.WIRING_SYSTEM_COL}"')
 
+class TestColumnarValidation(unittest.TestCase):
+    """按列校验 (_validate_rows_with_rules) 必须与逐行校验输出完全相同的错误消息和顺序。"""
+
+    def _validate_by_rows(self, df: pd.DataFrame, rules) -> list:
+        errors = []
+        for index, row in df.iterrows():
+            errors.extend(_validate_row_with_rules(row, index + 2, TEST_SHEET_NAME, rules))
+        return errors
+
+    def test_matches_row_by_row_validation(self):
+        df = pd.DataFrame({
+            C.HMI_NAME_COL: ["PT_1", None, "PT_3", " ", "PT_5", "PT_6", "PT_7", np.nan],
+            C.DESCRIPTION_COL: ["压力", None, None, "描述", "温度", "状态", "阀门", None],
+            C.POWER_SUPPLY_TYPE_COL: ["有源", None, " 无源 ", "有源", "交流", "无源", None, "有源"],
+            C.WIRING_SYSTEM_COL: ["两线制", "两线制", "常开", None, "四线制", "常闭", "两线制", "  "],
+            C.MODULE_TYPE_COL: ["AI", "AI", "ai ", "DI", None, "DO", "AO", "AI"],
+            C.RANGE_LOW_LIMIT_COL: [0, "x", None, None, 1, None, None, True],
+            C.RANGE_HIGH_LIMIT_COL: ["10", None, "abc", None, None, None, None, None],
+            C.SLL_SET_COL: [None, 1, "低", None, None, None, None, None],
+            C.SL_SET_COL: [None] * 8,
+            C.SH_SET_COL: [9.5, None, None, None, None, None, None, "2"],
+            C.SHH_SET_COL: [None] * 8,
+            C.TP_INPUT_DATA_TYPE_COL: ["REAL", "BOOL", "REAL", "BOOL", "REAL", "BOOL", None, "REAL"],
+        })
+        # 第三方表规则同时检查 REAL 多设定值和 BOOL 设定值
+        df[C.TP_INPUT_SLL_SET_COL] = df[C.SLL_SET_COL]
+        df[C.TP_INPUT_SH_SET_COL] = df[C.SH_SET_COL]
+        for rules in (MAIN_IO_RULES, THIRD_PARTY_RULES, MAIN_IO_RULES + THIRD_PARTY_RULES):
+            expected = self._validate_by_rows(df, rules)
+            self.assertTrue(expected)
+            self.assertEqual(_validate_rows_with_rules(df, TEST_SHEET_NAME, rules), expected)
+
+    def test_missing_columns_match_row_by_row_validation(self):
+        df = pd.DataFrame({C.HMI_NAME_COL: ["PT_1", None], C.MODULE_TYPE_COL: ["AI", None]})
+        rules = MAIN_IO_RULES + [RangeRequiredAiRule()]
+        self.assertEqual(_validate_rows_with_rules(df, TEST_SHEET_NAME, rules), self._validate_by_rows(df, rules))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
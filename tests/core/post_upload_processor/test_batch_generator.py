@@ -0,0 +1,51 @@
+# tests/core/post_upload_processor/test_batch_generator.py
+import os
+import tempfile
+import unittest
+
+from core.post_upload_processor.batch_generator import (
+    BatchTaskOptions, TASK_COMMUNICATION, TASK_FAT, TASK_HOLLYSYS_MODBUS, TASK_HOLLYSYS_VARIABLES,
+    TASK_KINGVIEW, TASK_LIKONG, generate_all, plan_batch_tasks
+)
+from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+
+
+def make_points_by_sheet(count):
+    points = []
+    for i in range(count):
+        is_real = i % 2 == 0
+        points.append(UploadedIOPoint(source_sheet_name="IO点表", source_type="main_io",
+                                      site_name="测试站", site_number="S001",
+                                      hmi_variable_name=f"{'AI' if is_real else 'DI'}_{i}",
+                                      variable_description=f"点位{i}",
+                                      data_type="REAL" if is_real else "BOOL",
+                                      plc_absolute_address=f"%MD{i * 4}" if is_real else f"%MX{i}.0",
+                                      hmi_communication_address=str((40001 if is_real else 1) + i)))
+    return {"IO点表": points}
+
+
+class TestBatchGenerator(unittest.TestCase):
+
+    def test_plan_follows_single_generation_rules(self):
+        options = BatchTaskOptions(output_dir="out", base_name="站", source_path="io.xls")
+        self.assertEqual(plan_batch_tasks(options), [TASK_LIKONG, TASK_KINGVIEW, TASK_HOLLYSYS_VARIABLES, TASK_COMMUNICATION])
+        options = BatchTaskOptions(output_dir="out", base_name="站", source_path="io.xlsx", is_safety_system=True)
+        self.assertIn(TASK_FAT, plan_batch_tasks(options))
+        self.assertIn(TASK_HOLLYSYS_MODBUS, plan_batch_tasks(options))
+
+    def test_generate_all_in_process_pool(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            options = BatchTaskOptions(output_dir=output_dir, base_name="测试站")
+            batch = generate_all(make_points_by_sheet(60), options, max_workers=2)
+
+            self.assertEqual(sorted(g.name for g in batch.generations), sorted(plan_batch_tasks(options)))
+            self.assertEqual(batch.failed, [])
+            for path in batch.output_files:
+                self.assertTrue(os.path.exists(path), path)
+                self.assertTrue(os.path.abspath(path).startswith(os.path.abspath(output_dir)))
+            self.assertEqual(len(batch.timing_lines()), len(batch.generations))
+            self.assertTrue(all(g.elapsed > 0 for g in batch.generations))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/core/post_upload_processor/uploaded_file_processor/test_excel_reader.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import openpyxl
+
+from core.post_upload_processor.uploaded_file_processor import excel_reader
+from core.post_upload_processor.uploaded_file_processor.excel_reader import load_workbook_data
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+
+
+class TestParallelThirdPartyParsing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.test_dir, "io.xlsx")
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "IO点表"
+        ws.append(["变量名称（HMI）", "变量描述", "数据类型", "PLC绝对地址"])
+        ws.append(["PT_101", "进站压力", "REAL", "%MD100"])
+        # 工作表顺序故意不按名称排序，且中间夹一个空表
+        for index, sheet_name in enumerate(["流量计", "阀门", "空表", "可燃气体", "加臭机"]):
+            sheet = wb.create_sheet(sheet_name)
+            if sheet_name == "空表":
+                continue
+            sheet.append(["变量名称", "变量描述", "数据类型", "PLC地址", "MODBUS地址"])
+            for row in range(20):
+                sheet.append([f"{sheet_name}_{row}", f"描述{row}", "REAL", f"%MD{index * 100 + row * 4}", 40001 + row])
+        wb.save(self.file_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_parallel_matches_sequential_in_sheet_order(self):
+        sequential, error = load_workbook_data(self.file_path, max_workers=1)
+        self.assertIsNone(error)
+        with mock.patch.object(excel_reader, "PARALLEL_PARSE_MIN_FILE_SIZE", 0), \
+                mock.patch.object(excel_reader, "ProcessPoolExecutor", wraps=excel_reader.ProcessPoolExecutor) as pool:
+            streamed, _ = load_workbook_data(self.file_path, max_workers=2)
+            shared, _ = load_workbook_data(self.file_path, ParsedWorkbook.read(self.file_path), max_workers=2)
+        self.assertEqual(pool.call_count, 2)
+        self.assertEqual(list(sequential), ["IO点表", "流量计", "阀门", "可燃气体", "加臭机"])
+        self.assertEqual(streamed, sequential)
+        self.assertEqual(list(streamed), list(sequential))
+        self.assertEqual(shared, sequential)
+        self.assertEqual(list(shared), list(sequential))
+
+    def test_small_file_stays_sequential(self):
+        with mock.patch.object(excel_reader, "ProcessPoolExecutor") as pool:
+            points_by_sheet, error = load_workbook_data(self.file_path, max_workers=4)
+        pool.assert_not_called()
+        self.assertIsNone(error)
+        self.assertEqual(len(points_by_sheet["流量计"]), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
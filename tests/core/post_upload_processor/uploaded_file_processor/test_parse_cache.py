@@ -0,0 +1,73 @@
+# tests/core/post_upload_processor/uploaded_file_processor/test_parse_cache.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core.post_upload_processor.uploaded_file_processor import parse_cache
+from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint
+from core.post_upload_processor.io_validation.validation_result import ValidationIssue, ValidationResult
+from core.post_upload_processor.uploaded_file_processor.parse_cache import IOTableParseCache, ParseCacheEntry
+
+
+class TestIOTableParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = IOTableParseCache(self.cache_dir, max_entries=2)
+        self.points_by_sheet = {
+            "IO点表": [UploadedIOPoint(hmi_variable_name="PT_101", variable_description="进站压力", data_type="REAL",
+                                       range_low_limit="0", range_high_limit="10",
+                                       source_sheet_name="IO点表", source_type="main_io")],
+            "第三方设备": [UploadedIOPoint(hmi_variable_name="TP_1", plc_absolute_address="%MD200",
+                                        source_sheet_name="第三方设备", source_type="third_party")],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_round_trip_by_content_hash(self):
+        file_path = os.path.join(self.cache_dir, "io.xlsx")
+        with open(file_path, "wb") as f:
+            f.write(b"io table content")
+        content_hash = IOTableParseCache.hash_file(file_path)
+        self.assertIsNone(self.cache.load(content_hash))
+
+        self.cache.store(content_hash, ParseCacheEntry(True, "验证通过", self.points_by_sheet))
+        entry = self.cache.load(content_hash)
+        self.assertTrue(entry.is_valid)
+        self.assertEqual(entry.points_by_sheet, self.points_by_sheet)
+        self.assertEqual(list(entry.points_by_sheet), ["IO点表", "第三方设备"])
+
+        self.cache.store("invalid", ParseCacheEntry(False, "验证失败: 缺少列"))
+        entry = self.cache.load("invalid")
+        self.assertEqual((entry.is_valid, entry.message, entry.points_by_sheet), (False, "验证失败: 缺少列", None))
+
+        result = ValidationResult("", [ValidationIssue("验证失败: 缺少列", "IO点表", None, "线制", "RequiredColumns")],
+                                  truncated=True, max_errors=1)
+        self.cache.store("invalid", ParseCacheEntry(False, result.message, result=result))
+        issue = self.cache.load("invalid").result.issues[0]
+        self.assertEqual((issue, issue.sheet, issue.column, issue.rule), ("验证失败: 缺少列", "IO点表", "线制", "RequiredColumns"))
+        self.assertTrue(self.cache.load("invalid").result.truncated)
+
+    def test_parser_version_change_and_eviction(self):
+        self.cache.store("a", ParseCacheEntry(True, "ok", self.points_by_sheet))
+        with mock.patch.object(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1):
+            self.assertIsNone(self.cache.load("a"))
+            self.cache.store("b", ParseCacheEntry(True, "ok", {}))
+            self.cache.store("c", ParseCacheEntry(True, "ok", {}))
+            os.utime(self.cache._entry_path("b"), (1, 1))  # b 最久未使用
+            self.cache.store("d", ParseCacheEntry(True, "ok", {}))
+            # 旧版本条目和超出数量的最久未使用条目被删除
+            self.assertEqual(sorted(os.listdir(self.cache_dir)),
+                             sorted(os.path.basename(self.cache._entry_path(key)) for key in ("c", "d")))
+
+    def test_corrupt_entry_is_a_miss(self):
+        with open(self.cache._entry_path("bad"), "wb") as f:
+            f.write(b"not a cache file")
+        self.assertIsNone(self.cache.load("bad"))
+
+
+if __name__ == '__main__':
+    unittest.main()
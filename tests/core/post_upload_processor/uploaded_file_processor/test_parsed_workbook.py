@@ -0,0 +1,88 @@
+# tests/core/post_upload_processor/uploaded_file_processor/test_parsed_workbook.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import openpyxl
+import pandas as pd
+
+from core.post_upload_processor.io_validation.validator import validate_io_table
+from core.post_upload_processor.uploaded_file_processor.excel_reader import HEADER_TO_ATTRIBUTE_MAP, load_workbook_data
+from core.post_upload_processor.uploaded_file_processor import parsed_workbook
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+
+# 读取引擎：openpyxl 总是可用，python-calamine 为可选依赖
+ENGINES = ["openpyxl"] + (["calamine"] if parsed_workbook.CalamineWorkbook is not None else [])
+
+
+def use_engine(engine):
+    calamine = parsed_workbook.CalamineWorkbook if engine == "calamine" else None
+    return mock.patch.object(parsed_workbook, "CalamineWorkbook", calamine)
+
+
+class TestParsedWorkbook(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.test_dir, "io.xlsx")
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "IO点表"
+        headers = list(HEADER_TO_ATTRIBUTE_MAP.keys())
+        ws.append(headers)
+        row = [None] * len(headers)
+        for header, value in {"模块类型": "AI", "供电类型（有源/无源）": "有源", "线制": "两线制",
+                              "变量名称（HMI）": "PT_101", "变量描述": "进站压力", "数据类型": "REAL",
+                              "量程低限": 0, "量程高限": 10.5, "PLC绝对地址": "%MD100",
+                              "上位机通讯地址": 40101}.items():
+            row[headers.index(header)] = value
+        ws.append(row)
+        ws.append([None] * len(headers))
+        tp = wb.create_sheet("第三方设备")
+        tp.append(["变量名称", "变量描述", "数据类型", "PLC地址", "MODBUS地址", "SLL设定值", "SL设定值", "SH设定值", "SHH设定值"])
+        tp.append(["TP_1", "流量", "REAL", "%MD200", 40201, None, None, 5.0, None])
+        tp.append(["TP_2", "状态", "BOOL", "%MX10.0", 10, None, None, None, None])
+        wb.create_sheet("空表")
+        wb.save(self.file_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_dataframe_matches_read_excel(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine), use_engine(engine):
+                workbook = ParsedWorkbook.read(self.file_path)
+                self.assertEqual(workbook.sheet_names, ["IO点表", "第三方设备", "空表"])
+                for sheet_name in workbook.sheet_names:
+                    for dtype in (None, str):
+                        pd.testing.assert_frame_equal(workbook[sheet_name].dataframe(dtype),
+                                                      pd.read_excel(self.file_path, sheet_name=sheet_name, dtype=dtype))
+
+    def test_streaming_load_matches_shared_read(self):
+        shared_points, _ = load_workbook_data(self.file_path, ParsedWorkbook.read(self.file_path))
+        for engine in ENGINES:
+            with self.subTest(engine=engine), use_engine(engine):
+                with ParsedWorkbook.open(self.file_path) as workbook:
+                    # 主IO点表逐行读取，不保留在工作簿对象中
+                    self.assertEqual(next(workbook["IO点表"].iter_rows())[:2], ("序号", "模块名称"))
+                    self.assertFalse(workbook["IO点表"].is_loaded)
+                points_by_sheet, error = load_workbook_data(self.file_path)
+                self.assertIsNone(error)
+                self.assertEqual(points_by_sheet, shared_points)
+
+    def test_validation_and_loading_share_one_read(self):
+        workbook = ParsedWorkbook.read(self.file_path)
+        with mock.patch.object(ParsedWorkbook, "read", side_effect=AssertionError("文件被重复读取")):
+            is_valid, message = validate_io_table(self.file_path, workbook)
+            points_by_sheet, error = load_workbook_data(self.file_path, workbook)
+        self.assertTrue(is_valid, message)
+        self.assertIsNone(error)
+        self.assertEqual(points_by_sheet, load_workbook_data(self.file_path)[0])
+        self.assertEqual([p.hmi_variable_name for p in points_by_sheet["IO点表"]], ["PT_101"])
+        self.assertEqual([p.hmi_variable_name for p in points_by_sheet["第三方设备"]], ["TP_1", "TP_2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# tests/core/query_area/test_jdy_mirror.py
+import unittest
+import os
+import tempfile
+import shutil
+
+from core.query_area.jdy_mirror import JianDaoYunMirror, UPDATE_TIME_FIELD
+from core.query_area.jiandaoyun_api import PROJECT_NO_FIELD, SITE_NAME_FIELD, DEVICE_LIST_FIELD
+
+
+class FakeJianDaoYunAPI:
+    """模拟 JianDaoYunAPI.query_entries，支持 eq 和 updateTime range 过滤。"""
+
+    project_fields = ['_widget_1635777114903', PROJECT_NO_FIELD, SITE_NAME_FIELD]
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self.offline = False
+
+    def query_entries(self, fields, filter_cond=None):
+        self.calls.append(filter_cond)
+        if self.offline:
+            raise ConnectionError("网络不可用")
+        result = list(self.rows)
+        for cond in filter_cond or []:
+            if cond['method'] == 'eq':
+                result = [r for r in result if r.get(cond['field']) == cond['value'][0]]
+            elif cond['method'] == 'range':
+                result = [r for r in result if r.get(cond['field']) >= cond['value'][0]]
+        return result
+
+
+def _make_row(i, site, update_time):
+    return {
+        '_id': f"{i:04d}",
+        '_widget_1635777114903': "测试项目",
+        PROJECT_NO_FIELD: "P001",
+        SITE_NAME_FIELD: site,
+        DEVICE_LIST_FIELD: [{'_widget_1635777115287': f"LK{i}"}],
+        UPDATE_TIME_FIELD: update_time
+    }
+
+
+class TestJianDaoYunMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "jdy_mirror.db")
+        self.api = FakeJianDaoYunAPI([
+            _make_row(1, "站A", "2026-01-01T00:00:00.000Z"),
+            _make_row(2, "站A", "2026-01-02T00:00:00.000Z"),
+            _make_row(3, "站B", "2026-01-03T00:00:00.000Z"),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_query_data_returns_project_fields_only(self):
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        projects = mirror.query_data("P001")
+        self.assertEqual(len(projects), 3)
+        self.assertNotIn(DEVICE_LIST_FIELD, projects[0])
+        self.assertEqual(projects[0][SITE_NAME_FIELD], "站A")
+
+    def test_site_lookup_after_project_sync_is_local(self):
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        mirror.query_data("P001")
+        calls_before = len(self.api.calls)
+        devices = mirror.query_site_devices("站A")
+        self.assertEqual(len(self.api.calls), calls_before, "项目已同步时场站查询不应访问网络")
+        self.assertEqual([d['_id'] for d in devices], ["0001", "0002"])
+        self.assertEqual(devices[0][DEVICE_LIST_FIELD], [{'_widget_1635777115287': "LK1"}])
+
+    def test_expired_sync_fetches_remote_changes_incrementally(self):
+        mirror = JianDaoYunMirror(self.api, self.db_path, sync_ttl=0)
+        mirror.query_site_devices("站A")
+        edited = dict(self.api.rows[0], **{DEVICE_LIST_FIELD: [{'_widget_1635777115287': "LK99"}],
+                                          UPDATE_TIME_FIELD: "2026-01-05T00:00:00.000Z"})
+        self.api.rows[0] = edited
+
+        devices = mirror.query_site_devices("站A")
+        range_conds = [c for c in self.api.calls[-1] if c['method'] == 'range']
+        self.assertEqual(len(range_conds), 1, "同步过期后应执行增量同步")
+        self.assertEqual(devices[0][DEVICE_LIST_FIELD], [{'_widget_1635777115287': "LK99"}])
+
+    def test_site_in_several_projects_needs_every_project_synced(self):
+        other = dict(_make_row(5, "站A", "2026-01-05T00:00:00.000Z"), **{PROJECT_NO_FIELD: "P002"})
+        self.api.rows.append(other)
+        JianDaoYunMirror(self.api, self.db_path).sync_site("站A")
+
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        mirror.query_data("P001")
+        calls_before = len(self.api.calls)
+        mirror.query_site_devices("站A")
+        self.assertEqual(len(self.api.calls), calls_before + 1, "只同步了其中一个项目时仍需同步场站")
+
+        mirror.query_data("P002")
+        calls_before = len(self.api.calls)
+        devices = mirror.query_site_devices("站A")
+        self.assertEqual(len(self.api.calls), calls_before)
+        self.assertEqual([d['_id'] for d in devices], ["0001", "0002", "0005"])
+
+    def test_second_session_syncs_incrementally(self):
+        JianDaoYunMirror(self.api, self.db_path).query_data("P001")
+        self.api.rows.append(_make_row(4, "站B", "2026-01-04T00:00:00.000Z"))
+
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        projects = mirror.query_data("P001")
+        self.assertEqual(len(projects), 4)
+        last_filter = self.api.calls[-1]
+        range_conds = [c for c in last_filter if c['method'] == 'range']
+        self.assertEqual(range_conds[0]['value'][0], "2026-01-03T00:00:00.000Z")
+
+    def test_full_sync_removes_deleted_entries(self):
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        mirror.query_data("P001")
+        self.api.rows.pop(0)
+        mirror.sync_project("P001", full=True)
+        self.assertEqual(len(mirror.query_data("P001")), 2)
+
+    def test_offline_falls_back_to_local_data(self):
+        JianDaoYunMirror(self.api, self.db_path).query_data("P001")
+        self.api.offline = True
+
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        self.assertEqual(len(mirror.query_data("P001")), 3)
+        self.assertEqual(len(mirror.query_site_devices("站B")), 1)
+
+    def test_offline_without_local_data_raises(self):
+        self.api.offline = True
+        mirror = JianDaoYunMirror(self.api, self.db_path)
+        with self.assertRaises(ConnectionError):
+            mirror.query_site_devices("站A")
+
+
+if __name__ == '__main__':
+    unittest.main()
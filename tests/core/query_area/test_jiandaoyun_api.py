@@ -0,0 +1,75 @@
+# tests/core/query_area/test_jiandaoyun_api.py
+import threading
+import time
+import unittest
+
+from tests.support.jdy_stub_server import JianDaoYunStubServer, synthetic_entries
+from core.query_area.jiandaoyun_api import JianDaoYunAPI, RateLimiter, SITE_NAME_FIELD, DEVICE_LIST_FIELD
+
+
+class TestJianDaoYunAPIWithStub(unittest.TestCase):
+    """使用本地桩服务器测试分页、过滤下推和重试。"""
+
+    def setUp(self):
+        self.entries = synthetic_entries(250, project_no="P001")
+        self.stub = JianDaoYunStubServer(self.entries, seed=1).start()
+        self.api = JianDaoYunAPI(config_file=self.stub.write_config())
+
+    def tearDown(self):
+        self.api.close()
+        self.stub.stop()
+
+    def test_query_data_pages_through_data_id(self):
+        pages = list(self.api.iter_data("P001"))
+        self.assertEqual([len(p) for p in pages], [100, 100, 50])
+        self.assertEqual(len(self.api.query_data("P001")), 250)
+        self.assertEqual(self.api.query_data("不存在"), [])
+
+    def test_site_devices_brand_pushdown(self):
+        site = self.entries[2][SITE_NAME_FIELD]  # 模板中第3条数据只有第三方设备
+        self.assertEqual(len(self.api.query_site_devices(site)), 1)
+        self.assertEqual(self.api.query_site_devices(site, brands=['和利时']), [])
+        devices = self.api.query_site_devices(self.entries[0][SITE_NAME_FIELD], brands=['和利时'])
+        self.assertEqual(list(devices[0].keys()), ['_id', DEVICE_LIST_FIELD])
+
+    def test_injected_errors_are_retried(self):
+        self.stub.error_rate = 0.3
+        self.assertEqual(len(self.api.query_data("P001")), 250)
+        self.assertGreater(self.stub.error_count, 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_requests_from_several_threads_are_spaced(self):
+        limiter = RateLimiter(50)  # 相邻请求至少间隔 20ms
+        times = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(3):
+                limiter.acquire()
+                with lock:
+                    times.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        times.sort()
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        # 允许少量计时误差
+        self.assertGreaterEqual(min(gaps), limiter.min_interval * 0.8)
+        self.assertGreaterEqual(times[-1] - times[0], limiter.min_interval * (len(times) - 1) * 0.9)
+
+    def test_zero_rate_does_not_wait(self):
+        limiter = RateLimiter(0)
+        start = time.monotonic()
+        for _ in range(1000):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
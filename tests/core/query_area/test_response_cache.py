@@ -0,0 +1,47 @@
+# tests/core/query_area/test_response_cache.py
+import unittest
+from unittest import mock
+
+from core.query_area.response_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(ttl=60, maxsize=4)
+        self.assertIsNone(cache.get("站A"))
+        cache.put("站A", [1, 2])
+        self.assertEqual(cache.get("站A"), [1, 2])
+        self.assertEqual(cache.stats(), {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_expired_entry_is_a_miss(self):
+        cache = TTLCache(ttl=10, maxsize=4)
+        with mock.patch("core.query_area.response_cache.time.monotonic", return_value=100.0):
+            cache.put("站A", "data")
+        with mock.patch("core.query_area.response_cache.time.monotonic", return_value=111.0):
+            self.assertNotIn("站A", cache)
+            self.assertIsNone(cache.get("站A"))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.put("站A", 1)
+        cache.put("站B", 2)
+        cache.get("站A")          # 站A 变为最近使用
+        cache.put("站C", 3)       # 淘汰最久未使用的 站B
+        self.assertIn("站A", cache)
+        self.assertNotIn("站B", cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_invalidate_and_clear(self):
+        cache = TTLCache(ttl=60, maxsize=4)
+        cache.put("站A", 1)
+        cache.put("站B", 2)
+        cache.invalidate("站A")
+        self.assertIsNone(cache.get("站A"))
+        cache.clear()
+        self.assertIsNone(cache.get("站B"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1 @@
+"""单元测试和基准测试共用的测试辅助代码（简道云桩服务器、录制数据）"""
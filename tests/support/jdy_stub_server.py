@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+简道云 /app/entry/data/list 本地桩服务器
+
+回放录制（或合成）的简道云数据，用于在不访问真实云端的情况下对 JianDaoYunAPI 做测试和基准测试。
+单元测试和 benchmarks/ 下的基准测试脚本都通过 tests.support.jdy_stub_server 导入本模块。
+支持：
+- 按 data_id 分页（数据按 _id 升序，limit 最大 100）；
+- fields 字段投影；
+- filter 过滤（rel 为 and/or；方法 eq/ne/in/nin/range/like/empty/not_empty；
+  子表单字段写作 "子表单字段ID.子字段ID"，任一行满足即命中整条数据）；
+- 可注入的请求延迟、新连接握手延迟和错误率。
+
+用法:
+    # 回放录制的数据
+    python tests/support/jdy_stub_server.py --fixture tests/support/fixtures/jdy_entries_sample.json --port 8765
+    # 从真实简道云录制一个项目的数据（使用项目根目录下的 config.ini）
+    python tests/support/jdy_stub_server.py --record 项目编号 --out tests/support/fixtures/my_project.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from core.query_area.jiandaoyun_api import (DATA_LIST_PATH, PROJECT_NO_FIELD, SITE_NAME_FIELD,
+                                            DEVICE_LIST_FIELD)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SAMPLE_FIXTURE = FIXTURES_DIR / "jdy_entries_sample.json"
+MAX_LIMIT = 100  # 与简道云接口限制一致
+
+
+# --- 过滤条件求值 ---
+
+def _field_values(entry: Dict[str, Any], field: str) -> List[Any]:
+    """取出字段值；子表单字段返回所有行的子字段值"""
+    if "." in field:
+        parent, child = field.split(".", 1)
+        rows = entry.get(parent) or []
+        return [row.get(child) for row in rows if isinstance(row, dict)]
+    return [entry.get(field)]
+
+
+def _match_value(value: Any, method: str, args: List[Any]) -> bool:
+    if method == "eq":
+        return value == args[0]
+    if method == "ne":
+        return value != args[0]
+    if method == "in":
+        return value in args
+    if method == "nin":
+        return value not in args
+    if method == "range":
+        low, high = (list(args) + [None, None])[:2]
+        if value is None:
+            return False
+        return (low is None or value >= low) and (high is None or value <= high)
+    if method == "like":
+        return value is not None and str(args[0]) in str(value)
+    if method == "empty":
+        return value in (None, "", [])
+    if method == "not_empty":
+        return value not in (None, "", [])
+    raise ValueError(f"桩服务器不支持的过滤方法: {method}")
+
+
+def match_filter(entry: Dict[str, Any], data_filter: Optional[Dict[str, Any]]) -> bool:
+    """判断一条数据是否满足简道云 filter 条件"""
+    if not data_filter:
+        return True
+    results = (
+        any(_match_value(v, cond["method"], cond.get("value") or [])
+            for v in _field_values(entry, cond["field"]))
+        for cond in data_filter.get("cond", [])
+    )
+    return any(results) if data_filter.get("rel") == "or" else all(results)
+
+
+# --- 桩服务器 ---
+
+class JianDaoYunStubServer:
+    """
+    在后台线程中运行的简道云桩服务器，可作为上下文管理器使用：
+
+        with JianDaoYunStubServer(entries, latency=0.02) as stub:
+            api = JianDaoYunAPI(config_file=stub.write_config())
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], latency: float = 0.0,
+                 handshake_delay: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.entries = sorted(entries, key=lambda e: e["_id"])
+        self._ids = [e["_id"] for e in self.entries]
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self._config_paths: List[str] = []
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "JianDaoYunStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        for path in self._config_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        self._config_paths.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def write_config(self, extra: Optional[Dict[str, Any]] = None) -> str:
+        """写出一个指向本桩服务器的临时 config.ini，返回其路径（stop 时删除）"""
+        options = {
+            "api_base_url": self.base_url,
+            "api_key": "stub",
+            "app_id": "stub",
+            "entry_id": "stub",
+            "project_fields": "_widget_1635777114903,_widget_1635777114935,_widget_1636359817201,"
+                              "_widget_1635777114972,_widget_1635777114991",
+            "rate_limit_per_second": 0,
+            "backoff_factor": 0,
+        }
+        options.update(extra or {})
+        fd, path = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("[JianDaoYun]\n")
+            for key, value in options.items():
+                f.write(f"{key} = {value}\n")
+        self._config_paths.append(path)
+        return path
+
+    def query_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """按请求参数返回一页数据（与 HTTP 接口逻辑相同，便于直接调用）"""
+        limit = max(1, min(int(params.get("limit", MAX_LIMIT)), MAX_LIMIT))
+        start = bisect_right(self._ids, params["data_id"]) if params.get("data_id") else 0
+        fields = params.get("fields")
+        data_filter = params.get("filter")
+
+        page = []
+        for entry in self.entries[start:]:
+            if not match_filter(entry, data_filter):
+                continue
+            if fields:
+                entry = {"_id": entry["_id"], **{f: entry[f] for f in fields if f in entry}}
+            page.append(entry)
+            if len(page) >= limit:
+                break
+        return page
+
+    def _make_handler(self):
+        stub = self
+
+        class _StubHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 支持 keep-alive
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                if stub.handshake_delay > 0:
+                    time.sleep(stub.handshake_delay)  # 每个新连接模拟一次握手耗时
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) or b"{}"
+                with stub._lock:
+                    stub.request_count += 1
+                    fail = stub.error_rate > 0 and stub._random.random() < stub.error_rate
+                    if fail:
+                        stub.error_count += 1
+                if stub.latency > 0:
+                    time.sleep(stub.latency)
+
+                if not self.path.rstrip("/").endswith(DATA_LIST_PATH):
+                    self._send_json(404, {"code": 404, "msg": "not found"})
+                elif fail:
+                    self._send_json(stub.error_status, {"code": stub.error_status, "msg": "injected error"})
+                else:
+                    try:
+                        self._send_json(200, {"data": stub.query_page(json.loads(raw))})
+                    except (ValueError, KeyError) as e:
+                        self._send_json(400, {"code": 400, "msg": str(e)})
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return _StubHandler
+
+
+# --- 录制数据和合成数据 ---
+
+def load_fixture(path: Path = SAMPLE_FIXTURE) -> List[Dict[str, Any]]:
+    """读取录制的数据文件（简道云数据列表的 JSON 数组）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_fixture(api, project_no: str, path: Path) -> int:
+    """从真实简道云录制一个项目下的全部数据（项目字段 + 设备清单），返回条数"""
+    fields = list(dict.fromkeys(list(api.project_fields) + [DEVICE_LIST_FIELD]))
+    entries = api.query_entries(fields, [{
+        "field": PROJECT_NO_FIELD, "type": "text", "method": "eq", "value": [project_no]
+    }])
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+    return len(entries)
+
+
+def synthetic_entries(site_count: int, project_no: str = "BENCH-001",
+                      template: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    以录制数据为模板生成一个包含 site_count 个场站的合成项目。
+    每个场站对应一条数据，设备清单依次复用模板中各条数据的设备清单。
+    """
+    template = template or load_fixture()
+    device_lists = [e.get(DEVICE_LIST_FIELD) or [] for e in template] or [[]]
+    base = template[0] if template else {}
+    entries = []
+    for i in range(site_count):
+        entry = {k: v for k, v in base.items() if k != DEVICE_LIST_FIELD}
+        entry.update({
+            "_id": f"{i:024x}",
+            PROJECT_NO_FIELD: project_no,
+            SITE_NAME_FIELD: f"合成场站{i + 1:04d}",
+            DEVICE_LIST_FIELD: [dict(row) for row in device_lists[i % len(device_lists)]],
+        })
+        entries.append(entry)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="简道云本地桩服务器")
+    parser.add_argument("--fixture", type=Path, default=SAMPLE_FIXTURE, help="回放的录制数据文件")
+    parser.add_argument("--sites", type=int, default=0, help="大于0时改为回放以录制数据为模板合成的项目")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟（秒）")
+    parser.add_argument("--handshake-delay", type=float, default=0.0, help="每个新连接的模拟握手耗时（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回错误的比例 (0~1)")
+    parser.add_argument("--record", metavar="PROJECT_NO", help="从真实简道云录制指定项目的数据")
+    parser.add_argument("--out", type=Path, help="录制数据的输出文件")
+    args = parser.parse_args()
+
+    if args.record:
+        from core.query_area.jiandaoyun_api import JianDaoYunAPI
+        out = args.out or FIXTURES_DIR / f"{args.record}.json"
+        api = JianDaoYunAPI(config_file=str(project_root / "config.ini"))
+        count = record_fixture(api, args.record, out)
+        api.close()
+        print(f"已录制 {count} 条数据到 {out}")
+        return
+
+    entries = synthetic_entries(args.sites, template=load_fixture(args.fixture)) if args.sites \
+        else load_fixture(args.fixture)
+    stub = JianDaoYunStubServer(entries, latency=args.latency, handshake_delay=args.handshake_delay,
+                                error_rate=args.error_rate, port=args.port)
+    print(f"桩服务器已启动: {stub.base_url}{DATA_LIST_PATH} ({len(entries)} 条数据)，Ctrl+C 退出")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
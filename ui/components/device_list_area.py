@@ -1,9 +1,12 @@
 """设备列表区域组件"""
-from PySide6.QtWidgets import (QGroupBox, QVBoxLayout, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QMessageBox)
-from PySide6.QtCore import Signal
+from PySide6.QtWidgets import (QGroupBox, QVBoxLayout, QTableView, QLineEdit,
+                             QHeaderView, QMessageBox, QAbstractItemView)
+from PySide6.QtCore import Signal, Qt
 import logging # 新增：导入logging
 
+from core.device_list_area import to_plc_device_records
+from ui.components.device_table_model import DeviceTableModel, DeviceFilterProxyModel
+
 logger = logging.getLogger(__name__) # 新增：获取logger实例
 
 class DeviceListArea(QGroupBox):
@@ -15,18 +18,36 @@ class DeviceListArea(QGroupBox):
 
     def __init__(self, parent=None):
         super().__init__("设备清单", parent)
+        # 设备数据保存在模型中（API返回的原始行），表格视图只显示可见行，其他组件从模型取数据
+        self.device_model = DeviceTableModel(self)
+        self.proxy_model = DeviceFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.device_model)
         self.setup_ui()
         self.setup_connections()
-        
+
+    @property
+    def devices(self):
+        """当前加载的设备列表（按加载顺序，不受表格排序和筛选影响）"""
+        return self.device_model.devices
+
     def setup_ui(self):
         """设置设备清单区域UI"""
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)
-        
-        self.device_table = QTableWidget()
-        self.device_table.setColumnCount(7)
-        self.device_table.setHorizontalHeaderLabels(
-            ["设备名称", "品牌", "规格型号", "技术参数", "数量", "单位", "技术参数(外部)"])
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("筛选设备（名称/品牌/型号/参数）")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
+        self.device_table = QTableView()
+        self.device_table.setModel(self.proxy_model)
+        self.device_table.setSortingEnabled(True)
+        # 初始保持加载顺序，用户点击表头后再排序
+        self.device_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.device_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # 固定行高，视图无需逐行计算高度
+        self.device_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
         # 设置列宽和自适应
         header = self.device_table.horizontalHeader()
@@ -45,6 +66,7 @@ class DeviceListArea(QGroupBox):
         # 连接自定义信号
         self.update_finished.connect(self._on_update_finished)
         self.update_failed.connect(self._on_update_failed)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
 
     def _on_update_finished(self, count: int):
         """处理更新完成"""
@@ -54,42 +76,21 @@ class DeviceListArea(QGroupBox):
         """处理更新失败"""
         QMessageBox.critical(self, "错误", f"更新设备列表失败: {error}")
 
-    def update_device_list(self, devices):
-        """更新设备列表"""
-        try:
-            # 更新表格数据
-            self.device_table.setRowCount(0)
-            logger.info(f"[DeviceListArea] update_device_list CALLED with {len(devices) if devices else 0} devices.") # 修改日志，处理devices为None的情况
-            if not devices: # 如果传入的devices是None或空列表，则不进行后续操作
-                self.update_finished.emit(0)
-                return
-
-            for i, device_info in enumerate(devices):
-                model_no = device_info.get('_widget_1635777115287', '')
+    def append_devices(self, devices):
+        """在表格末尾追加一批设备数据（逐页加载时使用，不发出完成信号）"""
+        row = self.device_model.rowCount()
+        for offset, device_info in enumerate(devices):
+            model_no = str(device_info.get('_widget_1635777115287', ''))
+            # 筛选我们关心的模块进行日志记录
+            if 'LK117' in model_no.upper() or 'LK610S' in model_no.upper():
                 qty = device_info.get('_widget_1635777485580', '')
-                # 筛选我们关心的模块进行日志记录
-                if 'LK117' in model_no.upper():
-                    logger.info(f"[DeviceListArea] Populating UI Table row {i+1}: Model={model_no}, Qty={qty}")
-                elif 'LK610S' in model_no.upper():
-                    logger.info(f"[DeviceListArea] Populating UI Table row {i+1}: Model={model_no}, Qty={qty}")
-
-                row = self.device_table.rowCount()
-                self.device_table.insertRow(row)
-                self.device_table.setItem(row, 0, QTableWidgetItem(str(device_info.get('_widget_1635777115211', ''))))
-                self.device_table.setItem(row, 1, QTableWidgetItem(str(device_info.get('_widget_1635777115248', ''))))
-                self.device_table.setItem(row, 2, QTableWidgetItem(str(device_info.get('_widget_1635777115287', ''))))
-                self.device_table.setItem(row, 3, QTableWidgetItem(str(device_info.get('_widget_1641439264111', ''))))
-                self.device_table.setItem(row, 4, QTableWidgetItem(str(device_info.get('_widget_1635777485580', ''))))
-                self.device_table.setItem(row, 5, QTableWidgetItem(str(device_info.get('_widget_1654703913698', ''))))
-                self.device_table.setItem(row, 6, QTableWidgetItem(str(device_info.get('_widget_1641439463480', ''))))
-            
-            # 发出更新完成信号
-            self.update_finished.emit(len(devices))
-            
-        except Exception as e:
-            # 发出更新失败信号
-            self.update_failed.emit(str(e))
+                logger.info(f"[DeviceListArea] Populating UI Table row {row + offset + 1}: Model={model_no}, Qty={qty}")
+        self.device_model.append_devices(list(devices))
 
     def clear_table(self):
         """清空表格"""
-        self.device_table.setRowCount(0) 
\ No newline at end of file
+        self.device_model.clear()
+
+    def get_plc_device_records(self):
+        """返回当前设备清单对应的PLC配置设备记录（每行一条，数量记录在 instance_count 中，包含表格中的编辑）"""
+        return to_plc_device_records(self.devices)
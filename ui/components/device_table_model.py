@@ -0,0 +1,108 @@
+"""设备清单表格模型"""
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from core.io_table import parse_device_quantity
+
+# 列标题和对应的设备清单子字段
+DEVICE_COLUMNS = [
+    ("设备名称", '_widget_1635777115211'),
+    ("品牌", '_widget_1635777115248'),
+    ("规格型号", '_widget_1635777115287'),
+    ("技术参数", '_widget_1641439264111'),
+    ("数量", '_widget_1635777485580'),
+    ("单位", '_widget_1654703913698'),
+    ("技术参数(外部)", '_widget_1641439463480'),
+]
+QUANTITY_COLUMN = 4
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+"""排序使用的角色：数量列按数值排序，其他列按文本排序。"""
+
+
+class DeviceTableModel(QAbstractTableModel):
+    """
+    以设备列表（API返回的原始行）为数据源的表格模型。
+    视图只会请求可见单元格的数据，加载时不再为每个单元格创建 QTableWidgetItem。
+    单元格可以编辑，修改写回设备列表，随后生成的PLC配置设备记录使用修改后的值。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._devices: List[Dict[str, Any]] = []
+
+    @property
+    def devices(self) -> List[Dict[str, Any]]:
+        """当前的设备列表（按加载顺序，不受排序和筛选影响）"""
+        return self._devices
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._devices)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(DEVICE_COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Optional[Any]:
+        if not index.isValid():
+            return None
+        value = self._devices[index.row()].get(DEVICE_COLUMNS[index.column()][1], '')
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return str(value)
+        if role == SORT_ROLE:
+            if index.column() == QUANTITY_COLUMN:
+                return parse_device_quantity(value)
+            return str(value)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """把编辑后的文本写回设备列表"""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row = index.row()
+        field = DEVICE_COLUMNS[index.column()][1]
+        # 替换为新的字典，不修改设备服务缓存中共享的原始行
+        self._devices[row] = {**self._devices[row], field: str(value)}
+        self.dataChanged.emit(index, index)
+        return True
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return DEVICE_COLUMNS[section][0]
+        return str(section + 1)
+
+    def set_devices(self, devices: List[Dict[str, Any]]):
+        """替换全部设备数据"""
+        self.beginResetModel()
+        self._devices = list(devices)
+        self.endResetModel()
+
+    def append_devices(self, devices: List[Dict[str, Any]]):
+        """在末尾追加一批设备数据"""
+        if not devices:
+            return
+        first = len(self._devices)
+        self.beginInsertRows(QModelIndex(), first, first + len(devices) - 1)
+        self._devices.extend(devices)
+        self.endInsertRows()
+
+    def clear(self):
+        """清空设备数据"""
+        self.set_devices([])
+
+
+class DeviceFilterProxyModel(QSortFilterProxyModel):
+    """设备清单的排序/筛选代理：按任意列进行不区分大小写的包含匹配。"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(-1)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
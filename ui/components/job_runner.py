@@ -0,0 +1,205 @@
+"""后台任务运行器：在 QThreadPool 中执行耗时操作，并在状态栏显示进度和取消按钮"""
+import logging
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from PySide6.QtWidgets import QProgressBar, QPushButton, QStatusBar
+
+from core.jobs import CancelToken, JobCancelled, JobContext
+
+logger = logging.getLogger(__name__)
+
+
+class JobSignals(QObject):
+    """后台任务的信号（QRunnable 不是 QObject，信号放在这里；跨线程发射时自动排队到界面线程）"""
+    progress = Signal(int, int, str)  # 已完成数量, 总数(0表示未知), 说明
+    partial = Signal(object)  # 阶段性结果
+    succeeded = Signal(object)  # 任务函数的返回值
+    failed = Signal(str)  # 错误信息
+    cancelled = Signal()
+    finished = Signal()  # 无论成功、失败还是取消，最后都会发出
+
+
+class BackgroundJob(QRunnable):
+    """
+    在线程池中执行 fn(context, *args, **kwargs) 的任务。
+    fn 不能直接操作界面控件，只能通过 context 上报进度/阶段性结果，并在检查点调用 context.check_cancelled()。
+    """
+
+    def __init__(self, name: str, fn: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancelToken()
+        self.signals = JobSignals()
+        self.elapsed: float = 0.0
+        # 由 JobRunner 持有引用，线程池不负责删除
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.token.cancelled
+
+    @Slot()
+    def run(self):
+        context = JobContext(self.token, on_progress=self.signals.progress.emit, on_partial=self.signals.partial.emit)
+        start = time.perf_counter()
+        try:
+            result = self.fn(context, *self.args, **self.kwargs)
+            self.token.raise_if_cancelled()
+        except JobCancelled:
+            logger.info(f"后台任务 '{self.name}' 已取消")
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.error(f"后台任务 '{self.name}' 失败: {e}\n{traceback.format_exc()}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.succeeded.emit(result)
+        finally:
+            self.elapsed = time.perf_counter() - start
+            logger.info(f"后台任务 '{self.name}' 结束，耗时 {self.elapsed:.2f}s")
+            self.signals.finished.emit()
+
+
+class JobRunner(QObject):
+    """
+    管理后台任务：提交到线程池、按 key 控制同类任务只运行一个、在状态栏显示进度条和取消按钮。
+
+    回调（on_success/on_error/on_progress/on_partial/on_cancelled/on_finished）都在界面线程中执行；
+    任务被取消后，它之后到达的进度、阶段性结果和成功回调都会被丢弃。
+    """
+
+    def __init__(self, status_bar: Optional[QStatusBar] = None, parent: Optional[QObject] = None,
+                 max_threads: Optional[int] = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._jobs: Dict[str, BackgroundJob] = {}  # key -> 正在运行的任务
+        self._status_bar = status_bar
+        self._progress_bar: Optional[QProgressBar] = None
+        self._cancel_button: Optional[QPushButton] = None
+        if status_bar is not None:
+            self._progress_bar = QProgressBar()
+            self._progress_bar.setMaximumWidth(180)
+            self._progress_bar.setMaximumHeight(16)
+            self._progress_bar.setTextVisible(True)
+            self._cancel_button = QPushButton("取消")
+            self._cancel_button.setMaximumHeight(20)
+            self._cancel_button.clicked.connect(self.cancel_all)
+            status_bar.addPermanentWidget(self._progress_bar)
+            status_bar.addPermanentWidget(self._cancel_button)
+            self._update_indicator()
+
+    def is_running(self, key: str) -> bool:
+        return key in self._jobs
+
+    def submit(self, key: str, name: str, fn: Callable[..., Any], *args,
+               replace: bool = False,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[str], None]] = None,
+               on_progress: Optional[Callable[[int, int, str], None]] = None,
+               on_partial: Optional[Callable[[Any], None]] = None,
+               on_cancelled: Optional[Callable[[], None]] = None,
+               on_finished: Optional[Callable[[], None]] = None,
+               **kwargs) -> Optional[BackgroundJob]:
+        """
+        提交后台任务。
+
+        Args:
+            key: 任务分组。同一 key 同时只运行一个任务。
+            name: 任务名称，用于状态栏和日志。
+            fn: 任务函数，签名为 fn(context: JobContext, *args, **kwargs)。
+            replace: 同一 key 已有任务运行时，为 True 则取消旧任务后提交新任务；为 False 则不提交并返回 None。
+
+        Returns:
+            Optional[BackgroundJob]: 已提交的任务；因同类任务正在运行而未提交时为 None。
+        """
+        running = self._jobs.get(key)
+        if running is not None:
+            if not replace:
+                logger.info(f"任务 '{name}' 未提交：同类任务 '{running.name}' 正在运行")
+                return None
+            running.cancel()
+
+        job = BackgroundJob(name, fn, *args, **kwargs)
+        signals = job.signals
+
+        def alive() -> bool:
+            return not job.is_cancelled
+
+        if on_progress:
+            signals.progress.connect(lambda done, total, msg: alive() and on_progress(done, total, msg))
+        signals.progress.connect(lambda done, total, msg: self._on_job_progress(job, done, total, msg))
+        if on_partial:
+            signals.partial.connect(lambda data: alive() and on_partial(data))
+        if on_success:
+            signals.succeeded.connect(lambda result: alive() and on_success(result))
+        if on_error:
+            signals.failed.connect(lambda message: alive() and on_error(message))
+        if on_cancelled:
+            signals.cancelled.connect(on_cancelled)
+        signals.finished.connect(lambda: self._on_job_finished(key, job, on_finished))
+
+        self._jobs[key] = job
+        self._set_indicator(job, 0, 0, name)
+        self.pool.start(job)
+        logger.info(f"已提交后台任务 '{name}' (key={key})")
+        return job
+
+    def cancel(self, key: str):
+        job = self._jobs.get(key)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in list(self._jobs.values()):
+            job.cancel()
+        self._update_indicator()
+
+    def shutdown(self, timeout_ms: int = 3000):
+        """取消所有任务并等待线程池结束（窗口关闭时调用）"""
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
+
+    def _on_job_progress(self, job: BackgroundJob, done: int, total: int, message: str):
+        if not job.is_cancelled:
+            self._set_indicator(job, done, total, message)
+
+    def _on_job_finished(self, key: str, job: BackgroundJob, on_finished: Optional[Callable[[], None]]):
+        # 被同 key 新任务替换后，旧任务结束时不能移除新任务
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+        try:
+            if on_finished:
+                on_finished()
+        finally:
+            self._update_indicator()
+
+    def _set_indicator(self, job: BackgroundJob, done: int, total: int, message: str):
+        if self._progress_bar is None:
+            return
+        if total > 0:
+            self._progress_bar.setRange(0, total)
+            self._progress_bar.setValue(min(done, total))
+            self._progress_bar.setFormat(f"{job.name} %p%")
+        else:
+            # 总量未知时显示忙碌状态
+            self._progress_bar.setRange(0, 0)
+        if message:
+            self._progress_bar.setToolTip(message)
+        self._update_indicator()
+
+    def _update_indicator(self):
+        if self._progress_bar is None:
+            return
+        active = any(not job.is_cancelled for job in self._jobs.values())
+        self._progress_bar.setVisible(active)
+        self._cancel_button.setVisible(active)
@@ -14,6 +14,7 @@ from PySide6.QtCore import Qt, Signal
 # 尝试相对导入，失败则使用绝对导入
 try:
     from .models import PLCModule, TransferDirection
+    from core.io_table import thaw_module
     from .enhanced_transfer_widget import EnhancedTransferWidget
     from .plc_config_widget import PLCConfigWidget, SystemInfoWidget, RackDisplayWidget
 except ImportError:
@@ -24,6 +25,7 @@ except ImportError:
     sys.path.insert(0, str(project_root))
     
     from ui.components.plc_config.models import PLCModule, TransferDirection
+    from core.io_table import thaw_module
     from ui.components.plc_config.enhanced_transfer_widget import EnhancedTransferWidget
     from ui.components.plc_config.plc_config_widget import PLCConfigWidget, SystemInfoWidget, RackDisplayWidget
 
@@ -245,15 +247,17 @@ class PLCConfigAdapter(QWidget):
                 unique_id = f"{model}_{model_counters[model]}"
                 
                 # 收集详细信息
-                data = {'original': module}  # 保存原始数据
+                # 保存原始数据（复制为普通字典，get_data 返回的是共享的只读视图，嵌套值同样只读）
+                original = thaw_module(module)
+                data = {'original': original}
                 
                 # 如果模块有details字段，保存到data中
-                if 'details' in module:
-                    data['details'] = module['details']
+                if 'details' in original:
+                    data['details'] = original['details']
                 
                 # 如果有子通道信息，也保存
-                if 'sub_channels' in module:
-                    data['sub_channels'] = module['sub_channels']
+                if 'sub_channels' in original:
+                    data['sub_channels'] = original['sub_channels']
                 
                 plc_module = PLCModule(
                     key=unique_id,
@@ -458,14 +458,15 @@ class RackDisplayWidget(QWidget):
         if self.io_data_loader:
             module_info = self.io_data_loader.get_module_by_model(model_name)
             if module_info:
+                # 模块信息是只读视图，嵌套的 sub_channels/details 复制为普通字典后再保存到槽位
                 return {
                     'type': module_info.get('type', '未知'),
                     'model': model_name,
                     'channels': module_info.get('channels', 0),
                     'description': module_info.get('description', ''),
-                    'sub_channels': module_info.get('sub_channels', {}),
+                    'sub_channels': dict(module_info.get('sub_channels', {})),
                     'manufacturer': module_info.get('manufacturer', '和利时'),
-                    'details': module_info.get('details', {})
+                    'details': dict(module_info.get('details', {}))
                 }
         
         # 如果没有IODataLoader或找不到模块信息，使用原来的猜测方法
@@ -67,14 +67,7 @@ class ProjectListArea(QGroupBox):
         try:
             # 更新表格数据
             self.project_table.setRowCount(0)
-            for row_data in data:
-                row = self.project_table.rowCount()
-                self.project_table.insertRow(row)
-                self.project_table.setItem(row, 0, QTableWidgetItem(row_data.get('_widget_1635777114903', '')))
-                self.project_table.setItem(row, 1, QTableWidgetItem(row_data.get('_widget_1635777114991', '')))
-                self.project_table.setItem(row, 2, QTableWidgetItem(row_data.get('_widget_1635777114935', '')))
-                self.project_table.setItem(row, 3, QTableWidgetItem(row_data.get('_widget_1636359817201', '')))
-                self.project_table.setItem(row, 4, QTableWidgetItem(row_data.get('_widget_1635777114972', '')))
+            self.append_project_rows(data)
             
             # 发出更新完成信号
             self.update_finished.emit(len(data))
@@ -83,6 +76,17 @@ class ProjectListArea(QGroupBox):
             # 发出更新失败信号
             self.update_failed.emit(str(e))
 
+    def append_project_rows(self, data):
+        """在表格末尾追加一批项目数据（逐页加载时使用，不发出完成信号）"""
+        for row_data in data:
+            row = self.project_table.rowCount()
+            self.project_table.insertRow(row)
+            self.project_table.setItem(row, 0, QTableWidgetItem(row_data.get('_widget_1635777114903', '')))
+            self.project_table.setItem(row, 1, QTableWidgetItem(row_data.get('_widget_1635777114991', '')))
+            self.project_table.setItem(row, 2, QTableWidgetItem(row_data.get('_widget_1635777114935', '')))
+            self.project_table.setItem(row, 3, QTableWidgetItem(row_data.get('_widget_1636359817201', '')))
+            self.project_table.setItem(row, 4, QTableWidgetItem(row_data.get('_widget_1635777114972', '')))
+
     def clear_table(self):
         """清空表格"""
         self.project_table.setRowCount(0) 
\ No newline at end of file
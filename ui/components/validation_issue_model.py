@@ -0,0 +1,100 @@
+"""IO点表校验消息表格模型"""
+from typing import Any, List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from core.post_upload_processor.io_validation.validation_result import SEVERITY_LABELS, ValidationIssue
+
+ISSUE_COLUMNS = ["工作表", "行号", "列", "规则", "级别", "说明"]
+ROW_COLUMN = 1
+DESCRIPTION_COLUMN = 5
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+"""排序使用的角色：行号列按数值排序，其他列按文本排序。"""
+
+
+class ValidationIssueTableModel(QAbstractTableModel):
+    """
+    以校验消息列表为数据源的只读表格模型。
+    视图只会请求可见单元格的数据，上万条消息也不必一次性生成文本。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._issues: List[ValidationIssue] = []
+
+    @property
+    def issues(self) -> List[ValidationIssue]:
+        return self._issues
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._issues)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(ISSUE_COLUMNS)
+
+    def _display_value(self, issue: ValidationIssue, column: int) -> str:
+        if column == 0:
+            return issue.sheet
+        if column == ROW_COLUMN:
+            return "" if issue.row is None else str(issue.row)
+        if column == 2:
+            return issue.column or ""
+        if column == 3:
+            return issue.rule or ""
+        if column == 4:
+            return SEVERITY_LABELS.get(issue.severity, issue.severity)
+        return issue.description
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Optional[Any]:
+        if not index.isValid():
+            return None
+        issue = self._issues[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display_value(issue, index.column())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return str(issue)
+        if role == SORT_ROLE:
+            if index.column() == ROW_COLUMN:
+                return -1 if issue.row is None else issue.row
+            return self._display_value(issue, index.column())
+        return None
+
+    def issue(self, row: int) -> ValidationIssue:
+        """第 row 行的校验消息（经过 Qt 传递的值会变成普通 str，需要位置信息时从这里取）"""
+        return self._issues[row]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return ISSUE_COLUMNS[section]
+        return str(section + 1)
+
+    def set_issues(self, issues: List[ValidationIssue]):
+        """替换全部校验消息"""
+        self.beginResetModel()
+        self._issues = list(issues)
+        self.endResetModel()
+
+
+class ValidationIssueFilterProxyModel(QSortFilterProxyModel):
+    """校验消息的排序/筛选代理：可按工作表筛选，并按任意列进行不区分大小写的包含匹配。"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(-1)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._sheet: Optional[str] = None
+
+    def set_sheet(self, sheet: Optional[str]):
+        """只显示指定工作表的消息；为 None 时显示全部"""
+        self._sheet = sheet
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self._sheet is not None:
+            if self.sourceModel().issue(source_row).sheet != self._sheet:
+                return False
+        return super().filterAcceptsRow(source_row, source_parent)
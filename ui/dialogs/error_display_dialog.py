@@ -1,12 +1,23 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QSizePolicy, QHBoxLayout
+from typing import Union
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QTextEdit, QPushButton, QSizePolicy, QHBoxLayout,
+                               QLabel, QComboBox, QLineEdit, QTableView, QAbstractItemView, QHeaderView, QSplitter)
 from PySide6.QtCore import Qt
 
+from core.post_upload_processor.io_validation.validation_result import ValidationResult
+from ui.components.validation_issue_model import ValidationIssueFilterProxyModel, ValidationIssueTableModel
+
 class ErrorDisplayDialog(QDialog):
-    """用于显示验证错误的自定义对话框"""
-    def __init__(self, error_message: str, parent=None):
+    """
+    用于显示验证错误的自定义对话框
+
+    传入字符串时在文本框中显示全部内容；传入 ValidationResult 时按表格显示每条消息（工作表、行号、列、规则、级别），
+    表格只绘制可见行，可按工作表和关键字筛选，选中的消息在下方显示全文。
+    """
+    def __init__(self, error_message: Union[str, ValidationResult], parent=None):
         super().__init__(parent)
         self.setWindowTitle("文件验证失败")
-        
+
         # 调整对话框大小
         self.setMinimumSize(300, 300)
         self.resize(500, 400)
@@ -17,21 +28,87 @@ class ErrorDisplayDialog(QDialog):
 
         self.text_edit = QTextEdit()
         self.text_edit.setReadOnly(True)
-        self.text_edit.setText(error_message)
         self.text_edit.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        
-        main_layout.addWidget(self.text_edit)
+
+        if isinstance(error_message, ValidationResult):
+            self.resize(900, 600)
+            self._setup_issue_view(main_layout, error_message)
+        else:
+            self.text_edit.setText(error_message)
+            main_layout.addWidget(self.text_edit)
 
         button_container_layout = QHBoxLayout()
         button_container_layout.addStretch(1)
-        
+
         self.ok_button = QPushButton("确定")
         self.ok_button.clicked.connect(self.accept)
         self.ok_button.setDefault(True)
         self.ok_button.setMinimumWidth(100)
 
         button_container_layout.addWidget(self.ok_button)
-        
+
         main_layout.addLayout(button_container_layout)
 
-        self.setSizeGripEnabled(True) 
\ No newline at end of file
+        self.setSizeGripEnabled(True)
+
+    def _setup_issue_view(self, main_layout: QVBoxLayout, result: ValidationResult):
+        """按表格显示结构化的校验结果"""
+        summary = f"共 {result.error_count} 个错误，{result.warning_count} 个警告。"
+        if result.truncated:
+            summary += result.truncation_notice
+        self.summary_label = QLabel(summary)
+        self.summary_label.setWordWrap(True)
+        main_layout.addWidget(self.summary_label)
+
+        filter_layout = QHBoxLayout()
+        self.sheet_combo = QComboBox()
+        self.sheet_combo.addItem("全部工作表", None)
+        for sheet in dict.fromkeys(issue.sheet for issue in result.issues if issue.sheet):
+            self.sheet_combo.addItem(sheet, sheet)
+        filter_layout.addWidget(self.sheet_combo)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("筛选消息（点位/列/规则/说明）")
+        self.filter_edit.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.filter_edit, 1)
+        main_layout.addLayout(filter_layout)
+
+        self.issue_model = ValidationIssueTableModel(self)
+        self.issue_model.set_issues(result.issues)
+        self.proxy_model = ValidationIssueFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.issue_model)
+
+        self.issue_table = QTableView()
+        self.issue_table.setModel(self.proxy_model)
+        # 初始保持校验顺序，用户点击表头后再排序（先清除排序列，启用排序时不会立即按第一列排序整张表）
+        self.issue_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.issue_table.setSortingEnabled(True)
+        self.issue_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.issue_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.issue_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # 固定行高，视图无需逐行计算高度
+        self.issue_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.issue_table.horizontalHeader()
+        for column, width in enumerate([110, 60, 140, 160, 50]):
+            self.issue_table.setColumnWidth(column, width)
+        header.setStretchLastSection(True)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.issue_table)
+        splitter.addWidget(self.text_edit)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        main_layout.addWidget(splitter)
+
+        self.sheet_combo.currentIndexChanged.connect(
+            lambda _: self.proxy_model.set_sheet(self.sheet_combo.currentData()))
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+        self.issue_table.selectionModel().currentRowChanged.connect(self._on_current_issue_changed)
+        if self.proxy_model.rowCount() > 0:
+            self.issue_table.selectRow(0)
+
+    def _on_current_issue_changed(self, current, _previous):
+        """在文本框中显示选中消息的全文"""
+        if not current.isValid():
+            self.text_edit.clear()
+            return
+        self.text_edit.setText(self.issue_model.issue(self.proxy_model.mapToSource(current).row()))
@@ -8,7 +8,7 @@ from typing import List, Dict, Any, Optional, Tuple
 import logging
 
 # 导入IODataLoader
-from core.io_table import IODataLoader
+from core.io_table import IODataLoader, thaw_module
 
 logger = logging.getLogger(__name__)
 
@@ -409,7 +409,7 @@ class PLCConfigEmbeddedWidget(QWidget):
         
         temp_all_modules = []
         for module in raw_modules_from_loader:
-            m_copy = module.copy()
+            m_copy = thaw_module(module) # 加载器返回只读视图，复制为普通字典后写入 unique_id
             self._ensure_module_unique_id(m_copy) # 确保 unique_id
             temp_all_modules.append(m_copy)
         
@@ -426,7 +426,7 @@ class PLCConfigEmbeddedWidget(QWidget):
                 # 从 io_data_loader 的 get_module_by_model 方法获取
                 cpu_module_details = self.io_data_loader.get_module_by_model(le_cpu_model)
                 if cpu_module_details:
-                    cpu_module_copy = cpu_module_details.copy()
+                    cpu_module_copy = thaw_module(cpu_module_details)
                     self._ensure_module_unique_id(cpu_module_copy) # 确保有unique_id
                     self.all_available_modules.append(cpu_module_copy)
                     logger.info(f"{le_cpu_model} (CPU for LE_CPU) added to all_available_modules. New count: {len(self.all_available_modules)}")
@@ -507,7 +507,7 @@ class PLCConfigEmbeddedWidget(QWidget):
                 logger.warning(f"Module {model_name} for config ({r_id},{s_id}) not found in preloaded all_available_modules. Fetching from loader.")
                 module_detail_from_loader = self.io_data_loader.get_module_by_model(model_name)
                 if module_detail_from_loader:
-                    m_copy = module_detail_from_loader.copy()
+                    m_copy = thaw_module(module_detail_from_loader)
                     self._ensure_module_unique_id(m_copy)
                     self.configured_modules[(r_id, s_id)] = m_copy
                 else:
@@ -861,7 +861,9 @@ class PLCConfigEmbeddedWidget(QWidget):
                 dp_model_to_set = predefined_dp[0]['model']
             logger.info(f"为LK机架 {rack_id} 槽位1设置DP模块: {dp_model_to_set}")
             dp_module_obj = self.io_data_loader.get_module_by_model(dp_model_to_set)
-            if not dp_module_obj: 
+            if dp_module_obj:
+                dp_module_obj = thaw_module(dp_module_obj) # 返回的是只读视图，需要写入 unique_id
+            else:
                 dp_module_obj = {'model': dp_model_to_set, 'type': 'DP', 'channels': 0, 'description': 'DP通讯模块 (自动配置)'}
             # 确保 unique_id
             self._ensure_module_unique_id(dp_module_obj) 
@@ -1226,7 +1228,7 @@ class PLCConfigEmbeddedWidget(QWidget):
                     logger.warning(f"缓存恢复：模块 {model_name} 预留实例不足，从IODataLoader获取")
                     module_detail = self.io_data_loader.get_module_by_model(model_name)
                     if module_detail:
-                        found_module = module_detail.copy()
+                        found_module = thaw_module(module_detail)
                         self._ensure_module_unique_id(found_module)
                         self.configured_modules[(rack_id, slot_id)] = found_module
                     else:
@@ -9,7 +9,7 @@ import os
 import configparser  # 新增：用于读取配置文件
 
 # API and old DeviceManager (if still needed for other parts, though ideally not for third_party)
-from core.query_area import JianDaoYunAPI
+from core.query_area import JianDaoYunAPI, JianDaoYunMirror
 # from core.devices import DeviceManager # Replaced by services for third_party logic
 
 # Updated import for DatabaseService
@@ -22,14 +22,17 @@ from core.third_party_config_area.template_service import TemplateService
 from core.third_party_config_area.config_service import ConfigService
 
 # 导入新的 IO 数据加载器
-from core.io_table import IODataLoader, IOExcelExporter
+from core.io_table import IODataLoader, IOExcelExporter, INSTANCE_COUNT_KEY
 
 # 新增：导入我们统一的Excel数据加载器
 from core.post_upload_processor.uploaded_file_processor.excel_reader import load_workbook_data
+from core.post_upload_processor.uploaded_file_processor.parsed_workbook import ParsedWorkbook
+from core.post_upload_processor.uploaded_file_processor.parse_cache import IOTableParseCache, ParseCacheEntry
 from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint # 导入数据模型
 
 # 导入文件验证器
-from core.post_upload_processor.io_validation.validator import validate_io_table # 导入校验函数
+from core.post_upload_processor.io_validation.validator import validate_io_table_result # 导入校验函数
+from core.post_upload_processor.io_validation.validation_state import ValidationStateCache
 # from core.post_upload_processor.io_validation.constants import PLC_IO_SHEET_NAME # 这个常量现在主要由 excel_reader 内部使用
 
 # 导入点表生成器
@@ -38,16 +41,19 @@ from core.post_upload_processor.plc_generators.hollysys_generator.safety_generat
 from core.post_upload_processor.hmi_generators.yk_generator.generator import KingViewGenerator, C
 from core.post_upload_processor.hmi_generators.lk_generator.generator import LikongGenerator # 新增：导入力控生成器
 from core.post_upload_processor.fat_generators import generate_fat_checklist_from_source # 修改: 导入正确的函数
+from core.post_upload_processor.batch_generator import BatchGenerationResult, BatchTaskOptions, generate_all
 
 # Import new data processors
 from core.project_list_area import ProjectService
 from core.device_list_area import DeviceService
+from core.jobs import GenerationResult, JobCancelled, JobContext, run_generation_job
 
 # UI Components
 from ui.components.query_area import QueryArea
 from ui.components.project_list_area import ProjectListArea
 from ui.components.device_list_area import DeviceListArea
 from ui.components.third_party_device_area import ThirdPartyDeviceArea
+from ui.components.job_runner import JobRunner
 
 # Dialogs - 修改：导入PLC配置组件
 from ui.dialogs.plc_config_dialog import PLCConfigEmbeddedWidget
@@ -87,6 +93,8 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("准备就绪")
+        # 后台任务运行器：耗时操作在线程池中执行，状态栏显示进度和取消按钮
+        self.job_runner = JobRunner(self.status_bar, self)
 
         # 初始化当前场站名称
         self.current_site_name: Optional[str] = None
@@ -100,6 +108,23 @@ class MainWindow(QMainWindow):
         # 新增：存储数据库路径用于配置读取
         self.db_path = db_path
 
+        # 查询项目后是否在后台并发预取所有场站的设备清单
+        self.prefetch_site_devices = self._get_config_value('ui.prefetch_site_devices', False)
+
+        # 上传IO点表的解析缓存：重复上传内容未变的文件时直接使用上次的校验和解析结果
+        self.io_table_parse_cache: Optional[IOTableParseCache] = None
+        if self._get_config_value('ui.io_table_parse_cache', True):
+            self.io_table_parse_cache = IOTableParseCache(
+                os.path.join(os.path.dirname(db_path), 'io_table_cache'),
+                max_entries=self._get_config_value('ui.io_table_parse_cache_size', 20))
+
+        # 增量校验：校验失败后修改文件再上传时，只重新校验有改动的工作表和行
+        self.io_validation_state_cache: Optional[ValidationStateCache] = None
+        if self._get_config_value('ui.incremental_validation', True):
+            self.io_validation_state_cache = ValidationStateCache()
+        # 校验消息数上限：达到上限后提前结束校验，为 0 时不限制
+        self.io_validation_max_errors = self._get_config_value('ui.validation_max_errors', 1000)
+
         # 创建上传按钮成员变量 (移到这里，以便 setup_ui 和 setup_connections 都能访问)
         self.upload_io_table_btn = QPushButton("上传IO点表")
         self.upload_io_table_btn.setMinimumHeight(28)
@@ -115,6 +140,11 @@ class MainWindow(QMainWindow):
         self.generate_fat_table_btn.setMinimumHeight(28)
         self.generate_fat_table_btn.setStyleSheet("QPushButton { padding-bottom: 2px; }")
 
+        # 新增：一键生成全部点表按钮
+        self.generate_all_btn = QPushButton("一键生成全部")
+        self.generate_all_btn.setMinimumHeight(28)
+        self.generate_all_btn.setStyleSheet("QPushButton { padding-bottom: 2px; }")
+
         self.upload_hmi_btn = QPushButton("生成HMI点表")
         self.upload_hmi_btn.setMinimumHeight(28)
         self.upload_hmi_btn.setStyleSheet("QPushButton { padding-bottom: 2px; }")
@@ -137,8 +167,28 @@ class MainWindow(QMainWindow):
             # self.template_manager = TemplateManager() # Remove old one
             # self.config_service = DeviceConfigurationService() # Remove old one
 
-            self.project_service = ProjectService(self.jdy_api)
-            self.device_service = DeviceService(self.jdy_api)
+            # 查询结果缓存设置
+            cache_ttl = self.jdy_api.jdy_config.getfloat('query_cache_ttl', fallback=300)
+            cache_size = self.jdy_api.jdy_config.getint('query_cache_size', fallback=64)
+
+            # 可选：通过本地镜像访问简道云数据（增量同步，离线时使用本地数据）
+            # 镜像的同步有效期与查询缓存一致：缓存过期后重新加载时会先增量同步
+            self.jdy_data_source = self.jdy_api
+            if self.jdy_api.jdy_config.getboolean('enable_offline_mirror', fallback=False):
+                mirror_path = os.path.join(os.path.dirname(db_path), 'jdy_mirror.db')
+                self.jdy_data_source = JianDaoYunMirror(
+                    self.jdy_api, mirror_path,
+                    full_sync_hours=self.jdy_api.jdy_config.getfloat('mirror_full_sync_hours', fallback=24),
+                    sync_ttl=cache_ttl
+                )
+
+            self.project_service = ProjectService(self.jdy_data_source,
+                                                  cache_ttl=cache_ttl, cache_size=cache_size)
+            self.device_service = DeviceService(
+                self.jdy_data_source,
+                max_workers=self._get_config_value('ui.prefetch_workers', 4),
+                cache_ttl=cache_ttl, cache_size=cache_size
+            )
 
             # Instantiate new DatabaseService (singleton) with the provided db_path
             self.db_service = DatabaseService(db_path=db_path)
@@ -158,6 +208,7 @@ class MainWindow(QMainWindow):
             logger.error(f"核心服务初始化失败: {e}", exc_info=True)
             # Make sure other services are also set to None or handled
             self.jdy_api = None
+            self.jdy_data_source = None
             # self.template_manager = None
             # self.config_service = None
             self.plc_hardware_service = None
@@ -351,6 +402,7 @@ class MainWindow(QMainWindow):
         upload_buttons_layout.addWidget(self.generate_fat_table_btn)
         upload_buttons_layout.addWidget(self.upload_hmi_btn)
         upload_buttons_layout.addWidget(self.upload_plc_btn)
+        upload_buttons_layout.addWidget(self.generate_all_btn)
         upload_buttons_widget.setLayout(upload_buttons_layout) # 确保布局被设置
 
         # 将包含按钮的QWidget设置为标签栏的角部控件 (例如，右上角)
@@ -455,6 +507,9 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'generate_fat_table_btn'):
             self.generate_fat_table_btn.clicked.connect(self._handle_generate_fat_table)
 
+        # 新增：一键生成全部点表按钮信号
+        self.generate_all_btn.clicked.connect(self._handle_generate_all)
+
         # PLC配置重置信号连接
         if hasattr(self, 'embedded_plc_config_widget') and self.embedded_plc_config_widget:
             # 检查组件类型并连接相应的重置信号
@@ -474,7 +529,7 @@ class MainWindow(QMainWindow):
                 logger.info("已连接对比模式PLC配置组件的重置信号")
 
     def _handle_query(self, project_no: str):
-        """处理查询请求"""
+        """处理查询请求（在后台线程中逐页查询，每收到一页立即显示）"""
         # 新增: 校验项目编号是否为空
         if not project_no or not project_no.strip():
             QMessageBox.warning(self, "输入错误", "请输入有效的项目编号后再查询。")
@@ -482,22 +537,53 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("请输入项目编号。")
             return
 
-        try:
-            # 执行查询 (调用 ProjectService)
-            if not self.project_service:
-                raise Exception("项目服务未初始化")
-            projects = self.project_service.get_formatted_projects(project_no=project_no)
-            # 更新列表
-            self.project_list_area.update_project_list(projects)
-        except Exception as e:
-            logger.error(f"查询项目列表失败: {e}", exc_info=True)
-            QMessageBox.critical(self, "查询错误", f"查询项目列表失败: {str(e)}")
+        if not self.project_service:
+            logger.error("查询项目列表失败: 项目服务未初始化")
+            QMessageBox.critical(self, "查询错误", "查询项目列表失败: 项目服务未初始化")
+            return
+
+        # 逐页加载：每收到一页立即显示，大项目在第一次往返后即可看到数据
+        self.project_list_area.clear_table()
+        projects = []
+
+        def on_page(page):
+            projects.extend(page)
+            self.project_list_area.append_project_rows(page)
+            self.status_bar.showMessage(f"正在加载项目列表，已加载 {len(projects)} 条...")
+
+        def on_success(_):
+            # 可选：在后台并发预取所有场站的设备清单，之后点击场站时直接使用缓存
+            if self.prefetch_site_devices and self.device_service and projects:
+                site_names = [p.get('_widget_1635777114991', '') for p in projects]
+                self.device_service.prefetch_devices(site_names)
+            self.project_list_area.update_finished.emit(len(projects))
+
+        def on_error(message):
+            QMessageBox.critical(self, "查询错误", f"查询项目列表失败: {message}")
+
+        # 重新查询时取消上一次尚未完成的查询
+        self.job_runner.submit('query', "查询项目", self._query_projects_job, project_no, replace=True,
+                               on_partial=on_page, on_success=on_success, on_error=on_error)
+
+    def _query_projects_job(self, context: JobContext, project_no: str) -> int:
+        """后台任务：逐页查询项目列表，每页通过 context.emit_partial 交给界面显示"""
+        count = 0
+        for page in self.project_service.iter_formatted_projects(project_no=project_no):
+            context.check_cancelled()
+            count += len(page)
+            context.emit_partial(page)
+            context.report_progress(count, 0, f"已加载 {count} 个项目")
+        return count
 
     def _handle_clear(self):
         """处理清空按钮点击事件。"""
         self.query_area.clear_inputs()
         self.project_list_area.clear_table()
         self.device_list_area.clear_table()
+        if self.project_service:
+            self.project_service.clear_cache() # 清空项目查询缓存
+        if self.device_service:
+            self.device_service.clear_cache() # 清空设备缓存
         self.loaded_io_data_by_sheet = {} # 清空已加载的IO点表数据
         self.verified_io_table_path = None # 清空已验证的IO路径
         self.selected_plc_type_for_upload = None # 清空已选的PLC类型
@@ -613,8 +699,13 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "错误", f"生成IO点表模板失败: {str(e_outer_general)}")
             self.status_bar.showMessage("生成IO点表模板失败（常规错误）。")
 
-    def _handle_project_selected(self, site_name: str):
-        """处理项目选择事件"""
+    def _handle_project_selected(self, site_name: str, force_refresh: bool = False):
+        """处理项目选择事件（设备清单在后台线程中逐页加载）
+
+        Args:
+            site_name (str): 选中的场站名称。
+            force_refresh (bool): 为True时忽略预取缓存，强制从API重新获取设备数据。
+        """
         try:
             # 更新当前场站名称
             self.current_site_name = site_name
@@ -629,8 +720,45 @@ class MainWindow(QMainWindow):
             # 执行查询 (调用 DeviceService)
             if not self.device_service:
                 raise Exception("设备服务未初始化")
-            all_devices = self.device_service.get_formatted_devices(site_name)
+            # 逐页加载设备清单，每收到一页立即显示
+            self.device_list_area.clear_table()
+
+            def on_page(page):
+                self.device_list_area.append_devices(page)
+                self.status_bar.showMessage(f"正在加载场站 '{site_name}' 的设备清单，已加载 {len(self.device_list_area.devices)} 条...")
+
+            def on_error(message):
+                logger.error(f"处理项目选择时出错: {message}")
+                QMessageBox.critical(self, "项目选择错误", f"处理项目 '{site_name}' 选择失败: {message}")
 
+            # 加载期间切换到其他场站时，取消当前场站的加载
+            self.status_bar.showMessage(f"正在加载场站 '{site_name}' 的设备清单...")
+            self.job_runner.submit('site_devices', "加载场站设备", self._load_site_devices_job,
+                                   site_name, force_refresh, replace=True, on_partial=on_page,
+                                   on_success=lambda _: self._on_site_devices_loaded(site_name),
+                                   on_error=on_error)
+
+        except Exception as e:
+            logger.error(f"处理项目选择时出错: {e}", exc_info=True) # 更新日志信息
+            QMessageBox.critical(self, "项目选择错误", f"处理项目 '{site_name}' 选择失败: {str(e)}")
+
+    def _load_site_devices_job(self, context: JobContext, site_name: str, force_refresh: bool) -> int:
+        """后台任务：逐页获取场站设备清单，每页通过 context.emit_partial 交给界面显示"""
+        count = 0
+        for page in self.device_service.iter_formatted_devices(site_name, force_refresh=force_refresh):
+            context.check_cancelled()
+            count += len(page)
+            context.emit_partial(page)
+            context.report_progress(count, 0, f"已加载 {count} 条设备")
+        return count
+
+    def _on_site_devices_loaded(self, site_name: str):
+        """场站设备清单加载完成后（界面线程），更新第三方设备区域和PLC配置区域"""
+        if self.current_site_name != site_name:
+            logger.info(f"加载场站 '{site_name}' 设备期间已切换到场站 '{self.current_site_name}'，忽略加载结果。")
+            return
+        try:
+            all_devices = self.device_list_area.devices
             logger.info(f"原始 all_devices 列表长度: {len(all_devices) if all_devices else 0}") # 新增日志
             if all_devices: # 仅当all_devices非空时记录详情
                 raw_lk117_count = sum(1 for d in all_devices if d.get('_widget_1635777115287', '').upper() == 'LK117')
@@ -642,8 +770,8 @@ class MainWindow(QMainWindow):
                 logger.info(f"原始数据中 LK117 条目数: {raw_lk117_count}")
                 logger.info(f"原始数据中 LK610S 条目数: {raw_lk610s_entry_count}, 基于数量的实例总数: {raw_lk610s_instance_count}")
 
-            # 更新设备列表
-            self.device_list_area.update_device_list(all_devices)
+            # 设备列表已逐页填充完毕
+            self.device_list_area.update_finished.emit(len(all_devices))
 
             # 更新第三方设备区域的当前场站信息
             if hasattr(self, 'third_party_area') and self.third_party_area:
@@ -651,12 +779,12 @@ class MainWindow(QMainWindow):
 
             # 更新内嵌的PLC配置区域的设备数据
             if hasattr(self, 'embedded_plc_config_widget') and self.embedded_plc_config_widget:
-                logger.info(f"准备调用 get_current_devices，当前 device_table 行数: {self.device_list_area.device_table.rowCount() if self.device_list_area and self.device_list_area.device_table else 'N/A'}") # 新增日志
+                logger.info(f"准备调用 get_current_devices，当前设备清单行数: {len(self.device_list_area.devices) if self.device_list_area else 'N/A'}") # 新增日志
                 current_devices_for_plc_config = self.get_current_devices() # 获取最新的设备数据
                 logger.info(f"get_current_devices 返回后，列表长度: {len(current_devices_for_plc_config) if current_devices_for_plc_config else 0}") # 新增日志
                 if current_devices_for_plc_config: # 仅当列表非空时记录详情
-                    processed_lk117_count = sum(1 for d in current_devices_for_plc_config if d.get('_widget_1635777115287', '').upper() == 'LK117')
-                    processed_lk610s_count = sum(1 for d in current_devices_for_plc_config if d.get('_widget_1635777115287', '').upper() == 'LK610S')
+                    processed_lk117_count = sum(d.get(INSTANCE_COUNT_KEY, 1) for d in current_devices_for_plc_config if d.get('_widget_1635777115287', '').upper() == 'LK117')
+                    processed_lk610s_count = sum(d.get(INSTANCE_COUNT_KEY, 1) for d in current_devices_for_plc_config if d.get('_widget_1635777115287', '').upper() == 'LK610S')
                     logger.info(f"get_current_devices 返回的列表中 LK117 实例数: {processed_lk117_count}")
                     logger.info(f"get_current_devices 返回的列表中 LK610S 实例数: {processed_lk610s_count}")
                 self.embedded_plc_config_widget.set_devices_data(current_devices_for_plc_config)
@@ -668,7 +796,11 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "项目选择错误", f"处理项目 '{site_name}' 选择失败: {str(e)}")
 
     def _handle_upload_io_table(self):
-        """处理 '上传IO点表' 按钮点击或信号。"""
+        """处理 '上传IO点表' 按钮点击或信号。验证和加载在后台线程中进行。"""
+        if self.job_runner.is_running('io_table'):
+            QMessageBox.information(self, "请稍候", "IO点表相关任务正在进行，请等待当前任务完成。")
+            return
+
         if self.loaded_io_data_by_sheet:
             reply = QMessageBox.question(self, "确认覆盖",
                                          "当前已加载IO点表数据。重新上传将覆盖现有数据，确定吗？",
@@ -691,52 +823,111 @@ class MainWindow(QMainWindow):
         logger.info(f"用户选择了IO点表文件进行上传和加载: {file_path}")
         self.status_bar.showMessage(f"正在验证文件: {file_name}...")
 
-        is_valid, message = validate_io_table(file_path)
+        def on_error(message):
+            self._clear_loaded_io_data()
+            logger.error(f"从 '{file_path}' 加载数据失败: {message}")
+            QMessageBox.critical(self, "数据加载错误", f"加载IO点表数据失败: {message}")
+            self.status_bar.showMessage(f"文件 '{file_name}' 数据加载失败。")
 
+        self.job_runner.submit('io_table', "加载IO点表", self._validate_and_load_io_table_job, file_path,
+                               self.io_table_parse_cache, self.io_validation_state_cache,
+                               self.io_validation_max_errors,
+                               on_success=lambda result: self._on_io_table_loaded(file_path, result),
+                               on_error=on_error)
+
+    @staticmethod
+    def _validate_and_load_io_table_job(context: JobContext, file_path: str,
+                                        parse_cache: Optional[IOTableParseCache] = None,
+                                        validation_cache: Optional[ValidationStateCache] = None,
+                                        max_errors: Optional[int] = None) -> Dict[str, Any]:
+        """
+        后台任务：读取一次IO点表文件，校验和加载所有工作表的数据共用读取结果。
+        文件内容与缓存中的某次上传相同时直接返回缓存的结果；validation_cache 用于同一路径文件修改后的增量校验；
+        max_errors 为校验消息数上限。
+        """
+        content_hash = None
+        if parse_cache is not None:
+            try:
+                content_hash = parse_cache.hash_file(file_path)
+                cached = parse_cache.load(content_hash)
+            except OSError as e:
+                logger.warning(f"计算IO点表文件 '{file_path}' 的哈希失败，不使用缓存: {e}")
+                content_hash, cached = None, None
+            if cached is not None and cached.result is not None and cached.result.truncated \
+                    and cached.result.max_errors != max_errors:
+                cached = None  # 缓存的结果是按其他上限提前结束的，重新校验
+            if cached is not None:
+                logger.info(f"IO点表文件 '{file_path}' 内容未变化，使用缓存的校验和解析结果。")
+                context.report_progress(3, 3, "已使用缓存")
+                if not cached.is_valid:
+                    return {'valid': False, 'message': cached.message, 'result': cached.result}
+                return {'valid': True, 'data': cached.points_by_sheet, 'error': None}
+
+        context.report_progress(0, 3, "正在读取文件")
+        try:
+            workbook = ParsedWorkbook.read(file_path)
+        except Exception as e:
+            # 读取失败时交给校验函数重新打开文件，以便给出具体的错误消息
+            logger.warning(f"读取IO点表文件 '{file_path}' 失败: {e}")
+            workbook = None
+        context.check_cancelled()
+        context.report_progress(1, 3, "正在验证文件")
+        validation_result = validate_io_table_result(file_path, workbook, validation_cache=validation_cache,
+                                                     max_errors=max_errors)
+        is_valid, message = validation_result.is_valid, validation_result.message
+        # 只缓存文件成功读取后的结果，打开失败（如文件被占用）下次仍重新读取
+        cacheable = parse_cache is not None and content_hash is not None and workbook is not None
         if not is_valid:
+            if cacheable:
+                parse_cache.store(content_hash, ParseCacheEntry(False, message, result=validation_result))
+            return {'valid': False, 'message': message, 'result': validation_result}
+        context.check_cancelled()
+        context.report_progress(2, 3, "正在加载数据")
+        loaded_data_dict, error_msg_load = load_workbook_data(file_path, workbook)
+        if cacheable and not error_msg_load:
+            parse_cache.store(content_hash, ParseCacheEntry(True, message, loaded_data_dict))
+        context.report_progress(3, 3, "加载完成")
+        return {'valid': True, 'data': loaded_data_dict, 'error': error_msg_load}
+
+    def _on_io_table_loaded(self, file_path: str, result: Dict[str, Any]):
+        """IO点表验证和加载完成后（界面线程）更新状态"""
+        file_name = os.path.basename(file_path)
+        if not result['valid']:
+            message = result['message']
             self.status_bar.showMessage(f"文件验证失败: {file_name}")
-            error_dialog = ErrorDisplayDialog(message, self)
+            # 有结构化结果时按表格显示每条消息，否则显示合并后的文本
+            error_dialog = ErrorDisplayDialog(result.get('result') or message, self)
             error_dialog.exec()
             logger.warning(f"IO点表文件 '{file_path}' 验证失败: {message}")
             return
 
-        logger.info(f"IO点表文件 '{file_path}' 验证通过。准备加载数据...")
-        self.status_bar.showMessage(f"文件验证通过: {file_name}。正在加载数据...")
-
-        try:
-            loaded_data_dict, error_msg_load = load_workbook_data(file_path)
-
-            if error_msg_load:
-                self._clear_loaded_io_data()
-                logger.error(f"从 '{file_path}' 加载数据时返回错误: {error_msg_load}")
-                QMessageBox.critical(self, "数据加载错误", f"加载IO点表数据时发生错误: {error_msg_load}")
-                self.status_bar.showMessage(f"文件 '{file_name}' 数据加载失败。")
-                return
-
-            self.loaded_io_data_by_sheet = loaded_data_dict
-            self.verified_io_table_path = file_path
+        logger.info(f"IO点表文件 '{file_path}' 验证通过，数据已加载。")
+        error_msg_load = result['error']
+        if error_msg_load:
+            self._clear_loaded_io_data()
+            logger.error(f"从 '{file_path}' 加载数据时返回错误: {error_msg_load}")
+            QMessageBox.critical(self, "数据加载错误", f"加载IO点表数据时发生错误: {error_msg_load}")
+            self.status_bar.showMessage(f"文件 '{file_name}' 数据加载失败。")
+            return
 
-            if not self.loaded_io_data_by_sheet: # 检查字典是否为空
-                final_load_msg = f"文件 '{file_name}' 加载完成，但未解析到任何工作表的有效数据。"
-                logger.warning(final_load_msg)
-                QMessageBox.warning(self, "数据加载提示", final_load_msg)
-                if hasattr(self.query_area, 'update_io_table_status'):
-                    self.query_area.update_io_table_status(None, 0)
-            else:
-                num_sheets = len(self.loaded_io_data_by_sheet)
-                total_points = sum(len(points) for points in self.loaded_io_data_by_sheet.values())
-                final_load_msg = f"文件 '{file_name}' 数据已加载: 从 {num_sheets} 个工作表共解析 {total_points} 个点位。"
-                logger.info(final_load_msg)
-                if hasattr(self.query_area, 'update_io_table_status'):
-                    self.query_area.update_io_table_status(self.verified_io_table_path, total_points)
+        self.loaded_io_data_by_sheet = result['data']
+        self.verified_io_table_path = file_path
 
-            self.status_bar.showMessage(final_load_msg + " 等待后续生成操作。", 10000)
+        if not self.loaded_io_data_by_sheet: # 检查字典是否为空
+            final_load_msg = f"文件 '{file_name}' 加载完成，但未解析到任何工作表的有效数据。"
+            logger.warning(final_load_msg)
+            QMessageBox.warning(self, "数据加载提示", final_load_msg)
+            if hasattr(self.query_area, 'update_io_table_status'):
+                self.query_area.update_io_table_status(None, 0)
+        else:
+            num_sheets = len(self.loaded_io_data_by_sheet)
+            total_points = sum(len(points) for points in self.loaded_io_data_by_sheet.values())
+            final_load_msg = f"文件 '{file_name}' 数据已加载: 从 {num_sheets} 个工作表共解析 {total_points} 个点位。"
+            logger.info(final_load_msg)
+            if hasattr(self.query_area, 'update_io_table_status'):
+                self.query_area.update_io_table_status(self.verified_io_table_path, total_points)
 
-        except Exception as e_load:
-            self._clear_loaded_io_data()
-            logger.error(f"从 '{file_path}' 加载数据失败: {e_load}", exc_info=True)
-            QMessageBox.critical(self, "数据加载错误", f"加载IO点表数据失败: {str(e_load)}")
-            self.status_bar.showMessage(f"文件 '{file_name}' 数据加载失败。")
+        self.status_bar.showMessage(final_load_msg + " 等待后续生成操作。", 10000)
 
     def _handle_plc_generation_requested(self, plc_generation_type: str):
         """
@@ -755,9 +946,7 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("请先上传并加载IO点表")
             return
 
-        file_name_base_with_ext = os.path.basename(self.verified_io_table_path or "Uploaded_IO_Table.xlsx")
-        base_io_filename, _ = os.path.splitext(file_name_base_with_ext)
-        base_io_filename_cleaned = base_io_filename.replace("_(已校验)", "").replace("(已校验)","").replace("_IO_点表","", 1).replace("IO_点表","", 1).replace("_模板", "").replace("模板", "")
+        base_io_filename_cleaned = self._get_cleaned_io_base_name()
 
         self.status_bar.showMessage(f"准备为已加载数据生成 '{plc_generation_type}' 相关点表...")
 
@@ -772,8 +961,7 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage(f"不支持的PLC点表类型: {plc_generation_type}")
 
     def _generate_hollysys_all_tables(self, base_io_filename_cleaned: str):
-        """为和利时PLC生成所有相关点表（变量表和Modbus表）。"""
-        plc_manufacturer = "和利时"
+        """为和利时PLC生成所有相关点表（变量表和Modbus表）。生成在后台线程中进行。"""
         logger.info(f"准备为和利时PLC生成点表。")
 
         is_safety_system = self._is_safety_plc()
@@ -792,6 +980,25 @@ class MainWindow(QMainWindow):
             logger.info("未检测到安全PLC模块，将使用 HollysysGenerator。")
             generator = HollysysGenerator()
 
+        self._submit_io_table_job("生成和利时PLC点表", self._hollysys_tables_job,
+                                  generator, is_safety_system, self.loaded_io_data_by_sheet, base_io_filename_cleaned,
+                                  on_success=self._show_generation_messages)
+
+    @staticmethod
+    def _hollysys_tables_job(context: JobContext, generator: Any, is_safety_system: bool,
+                             points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                             base_io_filename_cleaned: str) -> List[Tuple[str, str, str, str, int]]:
+        """
+        后台任务：生成和利时PLC变量表（安全系统还生成Modbus点表）。
+
+        Returns:
+            List[Tuple[str, str, str, str, int]]: 每一步的结果消息 (级别, 标题, 内容, 状态栏消息, 状态栏显示毫秒数)，
+                                                  级别为 'info' 或 'critical'，由界面线程依次显示。
+        """
+        plc_manufacturer = "和利时"
+        safety_label = '安全型' if is_safety_system else ''
+        messages: List[Tuple[str, str, str, str, int]] = []
+
         # --- 1. 生成变量表 ---
         try:
             base_output_dir_vars = os.path.join(os.getcwd(), "PLC点表")
@@ -808,37 +1015,36 @@ class MainWindow(QMainWindow):
 
             output_filename_vars = f"{base_io_filename_cleaned}_和利时{variable_table_filename_suffix}.xls"
             save_path_vars = os.path.join(target_plc_mfg_dir_vars, output_filename_vars)
-            logger.info(f"和利时PLC{'安全型' if is_safety_system else ''}变量表将保存到: {save_path_vars}")
+            logger.info(f"和利时PLC{safety_label}变量表将保存到: {save_path_vars}")
 
             success_vars: bool
             error_message_vars: Optional[str]
 
             if is_safety_system:
                 # SafetyHollysysGenerator 调用 generate_safety_hollysys_table
-                success_vars, error_message_vars = generator.generate_safety_hollysys_table(
-                    points_by_sheet=self.loaded_io_data_by_sheet,
-                    output_path=save_path_vars
-                )
+                generation = MainWindow._run_generator(context, "和利时安全型变量表", generator.generate_safety_hollysys_table,
+                                                       points_by_sheet=points_by_sheet, output_path=save_path_vars)
             else:
                 # HollysysGenerator 调用 generate_hollysys_table
-                success_vars, error_message_vars = generator.generate_hollysys_table(
-                    points_by_sheet=self.loaded_io_data_by_sheet,
-                    output_path=save_path_vars
-                )
+                generation = MainWindow._run_generator(context, "和利时变量表", generator.generate_hollysys_table,
+                                                       points_by_sheet=points_by_sheet, output_path=save_path_vars)
+            success_vars, error_message_vars = generation.result
 
             if success_vars:
-                QMessageBox.information(self, "变量表生成成功", f"和利时PLC{'安全型' if is_safety_system else ''}变量表已成功导出到:\n{save_path_vars}")
-                self.status_bar.showMessage(f"和利时{'安全型' if is_safety_system else ''}变量表已生成: {output_filename_vars}", 7000)
+                messages.append(('info', "变量表生成成功", f"和利时PLC{safety_label}变量表已成功导出到:\n{save_path_vars}",
+                                 f"和利时{safety_label}变量表已生成: {output_filename_vars}（耗时 {generation.elapsed:.2f} 秒）", 7000))
             else:
-                detailed_error_msg_vars = error_message_vars if error_message_vars else f"生成和利时PLC{'安全型' if is_safety_system else ''}变量表失败。"
-                QMessageBox.critical(self, "变量表生成失败", detailed_error_msg_vars)
-                logger.error(f"和利时{'安全型' if is_safety_system else ''}变量表生成失败: {detailed_error_msg_vars}")
-                self.status_bar.showMessage(f"和利时{'安全型' if is_safety_system else ''}变量表生成失败。")
+                detailed_error_msg_vars = error_message_vars if error_message_vars else f"生成和利时PLC{safety_label}变量表失败。"
+                logger.error(f"和利时{safety_label}变量表生成失败: {detailed_error_msg_vars}")
+                messages.append(('critical', "变量表生成失败", detailed_error_msg_vars,
+                                 f"和利时{safety_label}变量表生成失败。", 0))
 
+        except JobCancelled:
+            raise
         except Exception as e_vars:
-            logger.error(f"生成和利时PLC{'安全型' if is_safety_system else ''}变量表时发生未知错误: {e_vars}", exc_info=True)
-            QMessageBox.critical(self, "变量表生成错误", f"生成和利时PLC{'安全型' if is_safety_system else ''}变量表时发生未知错误:\n{e_vars}")
-            self.status_bar.showMessage(f"和利时{'安全型' if is_safety_system else ''}变量表生成时发生错误。")
+            logger.error(f"生成和利时PLC{safety_label}变量表时发生未知错误: {e_vars}", exc_info=True)
+            messages.append(('critical', "变量表生成错误", f"生成和利时PLC{safety_label}变量表时发生未知错误:\n{e_vars}",
+                             f"和利时{safety_label}变量表生成时发生错误。", 0))
             # 如果变量表生成失败，对于安全系统，也应考虑是否继续生成Modbus表，目前是继续
             # 对于非安全系统，到此结束
 
@@ -846,10 +1052,10 @@ class MainWindow(QMainWindow):
         if is_safety_system:
             # 确保 generator 是 SafetyHollysysGenerator 的实例，它有 generate_modbus_excel
             if not isinstance(generator, SafetyHollysysGenerator):
-                 logger.error("逻辑错误: 尝试为安全系统生成Modbus表，但生成器不是SafetyHollysysGenerator实例。")
-                 QMessageBox.critical(self, "内部错误", "尝试为安全系统生成Modbus表时发生配置错误。")
-                 self.status_bar.showMessage("Modbus表生成失败：内部配置错误。")
-                 return # 发生此错误则不继续
+                logger.error("逻辑错误: 尝试为安全系统生成Modbus表，但生成器不是SafetyHollysysGenerator实例。")
+                messages.append(('critical', "内部错误", "尝试为安全系统生成Modbus表时发生配置错误。",
+                                 "Modbus表生成失败：内部配置错误。", 0))
+                return messages # 发生此错误则不继续
 
             logger.info("安全系统，继续生成Modbus点表...")
             try:
@@ -861,35 +1067,79 @@ class MainWindow(QMainWindow):
                 save_path_modbus = os.path.join(target_plc_mfg_dir_modbus, output_filename_modbus)
                 logger.info(f"和利时PLC安全型Modbus点表将保存到: {save_path_modbus}")
 
-                success_modbus, error_message_modbus = generator.generate_modbus_excel(
-                    points_by_sheet_dict=self.loaded_io_data_by_sheet, # 修改参数名
-                    output_path=save_path_modbus
-                )
+                generation = MainWindow._run_generator(context, "和利时安全型Modbus表", generator.generate_modbus_excel,
+                                                       points_by_sheet_dict=points_by_sheet, # 修改参数名
+                                                       output_path=save_path_modbus)
+                success_modbus, error_message_modbus = generation.result
 
                 if success_modbus:
-                    QMessageBox.information(self, "Modbus表生成成功", f"和利时PLC安全型Modbus点表已成功导出到:\n{save_path_modbus}")
-                    self.status_bar.showMessage(f"和利时安全型Modbus表已生成: {output_filename_modbus}", 7000)
+                    messages.append(('info', "Modbus表生成成功", f"和利时PLC安全型Modbus点表已成功导出到:\n{save_path_modbus}",
+                                     f"和利时安全型Modbus表已生成: {output_filename_modbus}（耗时 {generation.elapsed:.2f} 秒）", 7000))
                 else:
                     detailed_error_msg_modbus = error_message_modbus if error_message_modbus else "生成和利时PLC安全型Modbus点表失败。"
-                    QMessageBox.critical(self, "Modbus表生成失败", detailed_error_msg_modbus)
                     logger.error(f"和利时安全型Modbus表生成失败: {detailed_error_msg_modbus}")
-                    self.status_bar.showMessage("和利时安全型Modbus表生成失败。")
+                    messages.append(('critical', "Modbus表生成失败", detailed_error_msg_modbus,
+                                     "和利时安全型Modbus表生成失败。", 0))
 
+            except JobCancelled:
+                raise
             except AttributeError as e_attr_modbus:
                 logger.error(f"生成和利时PLC安全型Modbus点表时发生属性错误 (方法可能不存在): {e_attr_modbus}", exc_info=True)
-                QMessageBox.critical(self, "Modbus表生成错误", f"尝试调用Modbus生成功能时出错 (可能方法未找到):\n{e_attr_modbus}")
-                self.status_bar.showMessage("和利时安全型Modbus表生成时发生属性错误。")
+                messages.append(('critical', "Modbus表生成错误", f"尝试调用Modbus生成功能时出错 (可能方法未找到):\n{e_attr_modbus}",
+                                 "和利时安全型Modbus表生成时发生属性错误。", 0))
             except Exception as e_modbus:
                 logger.error(f"生成和利时PLC安全型Modbus点表时发生未知错误: {e_modbus}", exc_info=True)
-                QMessageBox.critical(self, "Modbus表生成错误", f"生成和利时PLC安全型Modbus点表时发生未知错误:\n{e_modbus}")
-                self.status_bar.showMessage("和利时安全型Modbus表生成时发生错误。")
+                messages.append(('critical', "Modbus表生成错误", f"生成和利时PLC安全型Modbus点表时发生未知错误:\n{e_modbus}",
+                                 "和利时安全型Modbus表生成时发生错误。", 0))
         else:
             logger.info("非安全系统，不生成Modbus点表。和利时点表生成流程结束。")
 
+        return messages
+
+    @staticmethod
+    def _run_generator(context: JobContext, name: str, fn, *args, **kwargs) -> GenerationResult:
+        """
+        在后台任务中通过统一的生成任务接口执行生成器：进度上报到 context，取消时抛出 JobCancelled，
+        生成器抛出的异常转为 RuntimeError，返回包含原始结果和耗时的 GenerationResult。
+        """
+        generation = run_generation_job(name, fn, *args, context=context, **kwargs)
+        context.check_cancelled()
+        if generation.error is not None:
+            raise RuntimeError(generation.error)
+        return generation
+
+    def _show_generation_messages(self, messages: List[Tuple[str, str, str, str, int]]):
+        """在界面线程中依次显示后台生成任务返回的结果消息"""
+        for level, title, text, status_message, timeout in messages:
+            if level == 'info':
+                QMessageBox.information(self, title, text)
+            elif level == 'warning':
+                QMessageBox.warning(self, title, text)
+            else:
+                QMessageBox.critical(self, title, text)
+            self.status_bar.showMessage(status_message, timeout)
+
+    def _submit_io_table_job(self, name: str, fn, *args, **kwargs):
+        """
+        提交读取已加载IO点表数据的后台任务（上传、各类点表生成共用一个任务分组，不会同时运行）。
+        同类任务正在运行时提示用户等待。
+        """
+        kwargs.setdefault('on_error', lambda message: self._on_io_table_job_failed(name, message))
+        job = self.job_runner.submit('io_table', name, fn, *args, **kwargs)
+        if job is None:
+            QMessageBox.information(self, "请稍候", "IO点表相关任务正在进行，请等待当前任务完成。")
+        else:
+            self.status_bar.showMessage(f"正在{name}...")
+        return job
+
+    def _on_io_table_job_failed(self, name: str, message: str):
+        QMessageBox.critical(self, "生成失败", f"{name}时发生错误: {message}")
+        self.status_bar.showMessage(f"{name}失败。")
+
     def _handle_hmi_generation_requested(self, hmi_type: str):
         """
         处理生成特定HMI类型点表的请求。
-        HMI点表将保存到应用程序工作目录下的 "HMI点表/<HMI类型>" 子文件夹中。
+        HMI点表将保存到应用程序工作目录下的 "HMI点表/<HMI类型>" 子文件夹中，生成在后台线程中进行。
 
         Args:
             hmi_type (str): 用户选择的HMI类型，如 "亚控", "力控"。
@@ -898,18 +1148,19 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "未加载数据", "请先上传并成功加载IO点表数据，然后再生成HMI点表。")
             return
 
-        # 从 self.loaded_io_data_by_sheet 中提取所有点位到一个列表中
-        all_points: List[UploadedIOPoint] = []
-        for sheet_name, points_in_sheet in self.loaded_io_data_by_sheet.items():
-            all_points.extend(points_in_sheet)
-
-        if not all_points:
+        total_points = sum(len(points_in_sheet) for points_in_sheet in self.loaded_io_data_by_sheet.values())
+        if not total_points:
             QMessageBox.warning(self, "无数据点", "加载的IO点表中未找到有效的数据点。")
             return
 
+        if hmi_type not in ("亚控", "力控"):
+            QMessageBox.warning(self, "类型不支持", f"暂不支持生成 {hmi_type} 类型的HMI点表。")
+            logger.warning(f"请求生成不受支持的HMI类型: {hmi_type}")
+            self.status_bar.showMessage(f"HMI点表生成失败: 类型不支持。")
+            return
+
         # 获取文件名基础 (不含扩展名)
         base_file_name = os.path.splitext(os.path.basename(self.verified_io_table_path))[0] if self.verified_io_table_path else "HMI_Export"
-        # default_dir = os.path.expanduser("~/Downloads") # 不再使用用户下载目录
 
         # 新增：定义固定的输出目录结构
         # 例如 D:\\project\\HMI点表\\亚控
@@ -919,158 +1170,101 @@ class MainWindow(QMainWindow):
         logger.info(f"{hmi_type} HMI点表将保存到目录: {hmi_specific_output_dir}")
 
         logger.info(f"用户选择了HMI类型进行生成: {hmi_type}")
-        self.status_bar.showMessage(f"准备生成 {hmi_type} HMI点表...")
-        QApplication.processEvents() # 允许UI更新
+        logger.info(f"来自 {len(self.loaded_io_data_by_sheet)} 个工作表的总共 {total_points} 个点位将传递给生成器。")
 
-        try:
-            if hmi_type == "亚控":
-                logger.info(f"准备根据已加载数据生成亚控HMI点表。")
-                logger.info(f"来自 {len(self.loaded_io_data_by_sheet)} 个工作表的总共 {len(all_points)} 个点位将传递给生成器。")
-
-                # KingViewGenerator.generate_kingview_files 的 output_dir 参数现在是目标文件夹
-                # 文件名由生成器内部逻辑或 base_io_filename 决定，并会被保存到 output_dir
-                success, ioserver_path, db_path, error_msg = KingViewGenerator().generate_kingview_files(
-                    points_by_sheet=self.loaded_io_data_by_sheet,
-                    output_dir=hmi_specific_output_dir, # 传递新的固定输出目录
-                    base_io_filename=base_file_name
-                )
-                if success and ioserver_path and db_path:
-                    QMessageBox.information(self, "生成成功",
-                                            f"""亚控HMI点表已成功生成:
+        if hmi_type == "亚控":
+            on_success = lambda generation: self._on_kingview_generated(generation, hmi_specific_output_dir)
+        else:
+            on_success = lambda generation: self._on_likong_generated(generation, hmi_specific_output_dir)
+
+        def on_error(message):
+            QMessageBox.critical(self, "生成失败", f"生成 {hmi_type} HMI点表时发生错误: {message}")
+            self.status_bar.showMessage(f"{hmi_type} HMI点表生成失败。")
+
+        self._submit_io_table_job(f"生成{hmi_type}HMI点表", self._hmi_generation_job,
+                                  hmi_type, self.loaded_io_data_by_sheet, hmi_specific_output_dir, base_file_name,
+                                  on_success=on_success, on_error=on_error)
+
+    @staticmethod
+    def _hmi_generation_job(context: JobContext, hmi_type: str, points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                            output_dir: str, base_file_name: str) -> GenerationResult:
+        """后台任务：调用对应的HMI生成器，返回包含生成器原始结果和耗时的 GenerationResult"""
+        if hmi_type == "亚控":
+            # KingViewGenerator.generate_kingview_files 的 output_dir 参数现在是目标文件夹
+            # 文件名由生成器内部逻辑或 base_io_filename 决定，并会被保存到 output_dir
+            return MainWindow._run_generator(context, "亚控HMI点表", KingViewGenerator().generate_kingview_files,
+                                             points_by_sheet=points_by_sheet,
+                                             output_dir=output_dir, # 传递新的固定输出目录
+                                             base_io_filename=base_file_name)
+        # 调用新的 generate_all_csvs 方法
+        return MainWindow._run_generator(context, "力控HMI点表", LikongGenerator().generate_all_csvs,
+                                         output_dir=output_dir,
+                                         points_by_sheet=points_by_sheet)
+
+    def _on_kingview_generated(self, generation: GenerationResult, hmi_specific_output_dir: str):
+        """亚控HMI点表生成完成后（界面线程）显示结果"""
+        success, ioserver_path, db_path, error_msg = generation.result
+        if success and ioserver_path and db_path:
+            QMessageBox.information(self, "生成成功",
+                                    f"""亚控HMI点表已成功生成:
  - IO Server 点表: {os.path.basename(ioserver_path)}
  - 数据词典点表: {os.path.basename(db_path)}
 文件已保存到目录: {hmi_specific_output_dir}""")
-                    logger.info(f"""亚控HMI点表已成功生成:
+            logger.info(f"""亚控HMI点表已成功生成:
  - IO Server 点表: {ioserver_path}
  - 数据词典点表: {db_path}""")
-                    self.status_bar.showMessage(f"亚控HMI点表生成成功。")
-                else:
-                    err_to_show = error_msg if error_msg else "亚控HMI点表生成失败，未知原因。"
-                    QMessageBox.critical(self, "生成失败", f"生成亚控HMI点表失败: {err_to_show}")
-                    logger.error(f"亚控HMI点表生成失败: {err_to_show}")
-                    self.status_bar.showMessage(f"亚控HMI点表生成失败。")
-
-            elif hmi_type == "力控":
-                logger.info(f"准备根据已加载数据生成力控HMI点表。")
-                logger.info(f"来自 {len(self.loaded_io_data_by_sheet)} 个工作表的总共 {len(all_points)} 个点位将传递给生成器。")
-
-                likong_gen = LikongGenerator()
-                # 调用新的 generate_all_csvs 方法
-                all_results = likong_gen.generate_all_csvs(
-                    output_dir=hmi_specific_output_dir,
-                    points_by_sheet=self.loaded_io_data_by_sheet
-                )
+            self.status_bar.showMessage(f"亚控HMI点表生成成功（耗时 {generation.elapsed:.2f} 秒）。")
+        else:
+            err_to_show = error_msg if error_msg else "亚控HMI点表生成失败，未知原因。"
+            QMessageBox.critical(self, "生成失败", f"生成亚控HMI点表失败: {err_to_show}")
+            logger.error(f"亚控HMI点表生成失败: {err_to_show}")
+            self.status_bar.showMessage(f"亚控HMI点表生成失败。")
+
+    def _on_likong_generated(self, generation: GenerationResult, hmi_specific_output_dir: str):
+        """力控HMI点表生成完成后（界面线程）汇总并显示结果"""
+        all_results: List[Tuple[str, bool, Optional[str], Optional[str]]] = generation.result
+        files_generated_successfully = []
+        errors_occurred = []
+        any_success = False
+
+        for file_name, success, file_path, err_msg in all_results:
+            if success and file_path:
+                files_generated_successfully.append(f"{os.path.basename(file_path)}")
+                logger.info(f"力控HMI文件 '{os.path.basename(file_path)}' 已成功生成在: {hmi_specific_output_dir}")
+                any_success = True
+            else:
+                errors_occurred.append(f"生成 '{file_name}' 失败: {err_msg if err_msg else '未知错误'}")
+                logger.error(f"生成力控HMI文件 '{file_name}' 失败: {err_msg if err_msg else '未知错误'}")
 
-                files_generated_successfully = []
-                errors_occurred = []
-                any_success = False
-
-                for file_name, success, file_path, err_msg in all_results:
-                    if success and file_path:
-                        files_generated_successfully.append(f"{os.path.basename(file_path)}")
-                        logger.info(f"力控HMI文件 '{os.path.basename(file_path)}' 已成功生成在: {hmi_specific_output_dir}")
-                        any_success = True
-                    else:
-                        errors_occurred.append(f"生成 '{file_name}' 失败: {err_msg if err_msg else '未知错误'}")
-                        logger.error(f"生成力控HMI文件 '{file_name}' 失败: {err_msg if err_msg else '未知错误'}")
-
-                if any_success and not errors_occurred:
-                    QMessageBox.information(self, "生成成功",
-                                            f"""所有力控HMI相关文件已成功生成:
+        if any_success and not errors_occurred:
+            QMessageBox.information(self, "生成成功",
+                                    f"""所有力控HMI相关文件已成功生成:
 {', '.join(files_generated_successfully)}
 已保存到目录: {hmi_specific_output_dir}""")
-                    self.status_bar.showMessage(f"力控HMI点表生成成功。")
-                elif any_success and errors_occurred:
-                    QMessageBox.warning(self, "部分成功",
-                                        f"""力控HMI点表生成部分成功:
+            self.status_bar.showMessage(f"力控HMI点表生成成功（耗时 {generation.elapsed:.2f} 秒）。")
+        elif any_success and errors_occurred:
+            QMessageBox.warning(self, "部分成功",
+                                f"""力控HMI点表生成部分成功:
 成功: {', '.join(files_generated_successfully)}
 失败: {'; '.join(errors_occurred)}
 文件保存在: {hmi_specific_output_dir}""")
-                    self.status_bar.showMessage(f"力控HMI点表部分生成成功。")
-                else: # 全都失败
-                    error_summary = "; ".join(errors_occurred) if errors_occurred else "未知原因导致所有文件生成失败。"
-                    QMessageBox.critical(self, "生成失败", f"生成所有力控HMI点表文件失败: {error_summary}")
-                    logger.error(f"生成所有力控HMI点表文件失败: {error_summary}")
-                    self.status_bar.showMessage(f"力控HMI点表生成失败。")
-
-            else:
-                QMessageBox.warning(self, "类型不支持", f"暂不支持生成 {hmi_type} 类型的HMI点表。")
-                logger.warning(f"请求生成不受支持的HMI类型: {hmi_type}")
-                self.status_bar.showMessage(f"HMI点表生成失败: 类型不支持。")
-                return
-
-        except Exception as e:
-            logger.error(f"生成 {hmi_type} HMI点表失败: {e}", exc_info=True)
-            QMessageBox.critical(self, "生成失败", f"生成 {hmi_type} HMI点表时发生错误: {str(e)}")
-            self.status_bar.showMessage(f"{hmi_type} HMI点表生成失败。")
+            self.status_bar.showMessage(f"力控HMI点表部分生成成功。")
+        else: # 全都失败
+            error_summary = "; ".join(errors_occurred) if errors_occurred else "未知原因导致所有文件生成失败。"
+            QMessageBox.critical(self, "生成失败", f"生成所有力控HMI点表文件失败: {error_summary}")
+            logger.error(f"生成所有力控HMI点表文件失败: {error_summary}")
+            self.status_bar.showMessage(f"力控HMI点表生成失败。")
 
     def get_current_devices(self) -> List[Dict[str, Any]]:
-        """获取当前加载的设备数据，用于传递给其他对话框"""
+        """
+        获取当前加载的设备数据，用于传递给其他对话框。
+        数据来自设备清单区域保存的设备列表（不再逐格读取表格），
+        每行设备对应一条记录，数量记录在 'instance_count' 中，不按数量展开。
+        """
         try:
-            # 从设备列表区域获取当前加载的设备数据
             if hasattr(self, 'device_list_area') and self.device_list_area:
-                # 获取表格中的数据
-                devices_data = []
-                table = self.device_list_area.device_table
-
-                if table:
-                    for row in range(table.rowCount()):
-                        try:
-                            # 从表格中提取设备信息（使用原始的_widget_*字段名）
-                            device = {
-                                'id': row + 1,  # 生成ID
-                                '_widget_1635777115211': table.item(row, 0).text() if table.item(row, 0) else "",  # 设备名称
-                                '_widget_1635777115248': table.item(row, 1).text() if table.item(row, 1) else "",  # 品牌
-                                '_widget_1635777115287': table.item(row, 2).text() if table.item(row, 2) else "",  # 规格型号
-                                '_widget_1641439264111': table.item(row, 3).text() if table.item(row, 3) else "",  # 技术参数
-                                '_widget_1635777485580': table.item(row, 4).text() if table.item(row, 4) else "1",  # 数量
-                                '_widget_1654703913698': table.item(row, 5).text() if table.item(row, 5) else "",  # 单位
-                                '_widget_1641439463480': table.item(row, 6).text() if table.item(row, 6) else ""   # 技术参数(外部)
-                            }
-
-                            # 记录原始数据，方便调试
-                            logger.debug(f"设备 #{row+1}:")
-                            logger.debug(f"  名称: {device['_widget_1635777115211']}")
-                            logger.debug(f"  品牌: {device['_widget_1635777115248']}")
-                            logger.debug(f"  型号: {device['_widget_1635777115287']}")
-                            logger.debug(f"  数量: {device['_widget_1635777485580']}")
-
-                            # 根据数量创建多个设备实例
-                            try:
-                                quantity_str = device['_widget_1635777485580']
-                                # 如果数量为空字符串或仅含空白，则默认为1；否则尝试转换为整数
-                                quantity = int(quantity_str) if quantity_str and quantity_str.strip() else 1
-
-                                if quantity <= 0: # 处理数量为0或负数的情况
-                                    logger.warning(f"设备 #{row+1} 型号 {device['_widget_1635777115287']} 原始数量为 '{quantity_str}'，被修正为1个实例")
-                                    quantity = 1
-
-                                # 为所有设备（包括LK117）都根据其数量创建实例
-                                for i in range(quantity):
-                                    device_copy = device.copy()
-                                    device_copy['instance_index'] = i + 1  # 实例索引
-                                    # 特殊记录LK117或LK610S的创建，便于追踪
-                                    model_upper = device_copy['_widget_1635777115287'].upper()
-                                    if "LK117" in model_upper:
-                                        logger.info(f"创建LK117实例 (源行: {row+1}, 型号: {device_copy['_widget_1635777115287']}, 解析数量: {quantity}, 当前实例号: {i+1}), devices_data已有 {len(devices_data)} 条")
-                                    elif "LK610S" in model_upper:
-                                        logger.info(f"创建LK610S实例 (源行: {row+1}, 型号: {device_copy['_widget_1635777115287']}, 解析数量: {quantity}, 当前实例号: {i+1}), devices_data已有 {len(devices_data)} 条")
-                                    devices_data.append(device_copy)
-
-                                # 避免为单个非LK117/非LK610S设备或数量为1的设备重复记录下面的debug日志
-                                if not ("LK117" in device['_widget_1635777115287'].upper() or "LK610S" in device['_widget_1635777115287'].upper()) and quantity > 1:
-                                    logger.debug(f"  已为设备 #{row+1} 型号 {device['_widget_1635777115287']} (原始数量: {quantity_str}) 创建 {quantity} 个实例")
-
-                            except (ValueError, TypeError) as e_qty:
-                                logger.warning(f"设备 #{row+1} 型号 {device['_widget_1635777115287']} 数量 '{device['_widget_1635777485580']}' 解析失败 ({e_qty})，默认为1个实例. devices_data已有 {len(devices_data)} 条")
-                                device['instance_index'] = 1 # 确保原始device也有instance_index
-                                devices_data.append(device) # 添加原始device作为单个实例
-
-                        except Exception as row_e:
-                            logger.warning(f"处理设备表格第 {row+1} 行数据时出错: {row_e}")
-                            continue
-
-                logger.info(f"获取到 {len(devices_data)} 个设备实例（考虑数量后）")
+                devices_data = self.device_list_area.get_plc_device_records()
+                logger.info(f"获取到 {len(devices_data)} 条设备记录，共 {sum(d[INSTANCE_COUNT_KEY] for d in devices_data)} 个设备实例（考虑数量后）")
                 return devices_data
             else:
                 logger.warning("设备列表区域未初始化，无法获取设备数据")
@@ -1148,7 +1342,7 @@ class MainWindow(QMainWindow):
             return False # 出错时，按非安全处理
 
     def _handle_generate_fat_table(self):
-        """处理点击"生成FAT点表"按钮的事件。"""
+        """处理点击"生成FAT点表"按钮的事件。FAT点表在后台线程中生成。"""
         if not self.verified_io_table_path:
             QMessageBox.warning(self, "操作无效", "请先上传并验证IO点表文件。")
             logger.warning("FAT表生成尝试失败：未找到已验证的IO点表路径。")
@@ -1173,39 +1367,42 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("FAT点表目录创建失败。", 5000)
             return
 
-        self.status_bar.showMessage("正在生成FAT点表...")
-        QApplication.processEvents() # 确保UI更新
-
         # 构造最终的完整输出路径
         final_output_path = os.path.join(output_dir, fat_output_filename)
+        logger.info(f"开始生成FAT点表，输入文件: {self.verified_io_table_path}, 输出文件: {final_output_path}")
 
-        # 调用FAT生成函数
-        try:
-            logger.info(f"开始生成FAT点表，输入文件: {self.verified_io_table_path}, 输出文件: {final_output_path}")
-
-            success, generated_file_path, error_message = generate_fat_checklist_from_source(
-                original_file_path=self.verified_io_table_path,
-                output_dir=output_dir,
-                output_filename=fat_output_filename
-            )
-
-            if success and generated_file_path:
-                QMessageBox.information(self, "生成成功", f"FAT点表已生成，文件路径：\n{generated_file_path}")
-                self.status_bar.showMessage("FAT点表生成成功！", 5000)
-                logger.info(f"FAT点表生成成功: {generated_file_path}")
-            else:
-                error_msg = error_message or "未知错误"
-                QMessageBox.critical(self, "生成失败", f"生成FAT点表失败：\n{error_msg}")
-                self.status_bar.showMessage("FAT点表生成失败。", 5000)
-                logger.error(f"FAT点表生成失败: {error_msg}")
-
-        except Exception as e:
-            QMessageBox.critical(self, "生成失败", f"生成FAT点表时发生异常：\n{str(e)}")
+        def on_error(message):
+            QMessageBox.critical(self, "生成失败", f"生成FAT点表时发生异常：\n{message}")
             self.status_bar.showMessage("FAT点表生成异常。", 5000)
-            logger.error(f"FAT点表生成异常: {e}", exc_info=True)
+
+        self._submit_io_table_job("生成FAT点表", self._fat_table_job,
+                                  self.verified_io_table_path, output_dir, fat_output_filename,
+                                  on_success=self._on_fat_table_generated, on_error=on_error)
+
+    @staticmethod
+    def _fat_table_job(context: JobContext, source_path: str, output_dir: str,
+                       output_filename: str) -> GenerationResult:
+        """后台任务：调用FAT生成函数"""
+        return MainWindow._run_generator(context, "FAT点检表", generate_fat_checklist_from_source,
+                                         original_file_path=source_path,
+                                         output_dir=output_dir,
+                                         output_filename=output_filename)
+
+    def _on_fat_table_generated(self, generation: GenerationResult):
+        """FAT点表生成完成后（界面线程）显示结果"""
+        success, generated_file_path, error_message = generation.result
+        if success and generated_file_path:
+            QMessageBox.information(self, "生成成功", f"FAT点表已生成，文件路径：\n{generated_file_path}")
+            self.status_bar.showMessage(f"FAT点表生成成功！（耗时 {generation.elapsed:.2f} 秒）", 5000)
+            logger.info(f"FAT点表生成成功: {generated_file_path}")
+        else:
+            error_msg = error_message or "未知错误"
+            QMessageBox.critical(self, "生成失败", f"生成FAT点表失败：\n{error_msg}")
+            self.status_bar.showMessage("FAT点表生成失败。", 5000)
+            logger.error(f"FAT点表生成失败: {error_msg}")
 
     def _handle_generate_communication_table(self):
-        """处理点击"生成上下位通讯点表"按钮的事件。"""
+        """处理点击"生成上下位通讯点表"按钮的事件。通讯点表在后台线程中生成。"""
         if not self.verified_io_table_path:
             QMessageBox.warning(self, "操作无效", "请先上传并验证IO点表文件。")
             logger.warning("上下位通讯点表生成尝试失败：未找到已验证的IO点表路径。")
@@ -1230,54 +1427,118 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("上下位通讯点表目录创建失败。", 5000)
             return
 
-        self.status_bar.showMessage("正在生成上下位通讯点表...")
-        QApplication.processEvents() # 确保UI更新
-
         # 构造最终的完整输出路径
         final_output_path = os.path.join(output_dir, communication_output_filename)
 
-        # 调用生成表头的函数
-        try:
-            # Import necessary functions and types
-            from core.post_upload_processor.communication_table_generator import generate_communication_table_excel
-            from core.post_upload_processor.uploaded_file_processor.excel_reader import load_workbook_data
-            from core.post_upload_processor.uploaded_file_processor.io_data_model import UploadedIOPoint # Ensure this import is present or added if not already
-            from typing import List # Ensure List is imported
-
-            # 1. Load IO data from the verified Excel file
-            points_by_sheet, error_message = load_workbook_data(self.verified_io_table_path)
-
-            if error_message:
-                QMessageBox.critical(self, "数据加载失败", f"加载IO点表数据时发生错误: {error_message}")
-                logger.error(f"上下位通讯点表生成失败: 无法加载IO数据从 {self.verified_io_table_path} - {error_message}")
-                self.status_bar.showMessage("上下位通讯点表生成失败: IO数据加载错误。", 5000)
-                return
+        def on_error(message):
+            QMessageBox.critical(self, "生成失败", f"生成上下位通讯点表时发生异常：{message}")
+            self.status_bar.showMessage("上下位通讯点表生成异常。", 5000)
 
-            # 2. Consolidate all points from all sheets into a single list
-            all_points: List[UploadedIOPoint] = []
-            if points_by_sheet:
-                for sheet_name, points_in_sheet in points_by_sheet.items():
-                    if points_in_sheet: # Ensure there are points in the sheet
-                        all_points.extend(points_in_sheet)
-                logger.info(f"为上下位通讯点表加载了 {len(all_points)} 个点位，来源: {list(points_by_sheet.keys())}")
-
-            if not all_points:
-                QMessageBox.warning(self, "无数据点", "从IO点表中未提取到有效数据点，无法生成上下位通讯点表。")
-                logger.warning(f"上下位通讯点表生成失败: 从 {self.verified_io_table_path} 未提取到数据点。")
-                self.status_bar.showMessage("上下位通讯点表生成失败: 无数据点。", 5000)
-                return
+        self._submit_io_table_job("生成上下位通讯点表", self._communication_table_job,
+                                  self.verified_io_table_path, final_output_path,
+                                  on_success=lambda result: self._on_communication_table_generated(result, final_output_path),
+                                  on_error=on_error)
 
-            # 3. Call the generation function with the loaded io_points
-            success = generate_communication_table_excel(final_output_path, all_points) # Pass all_points
-            if success:
-                QMessageBox.information(self, "生成成功", f"上下位通讯点表已生成，文件路径：\n{final_output_path}")
-                self.status_bar.showMessage("上下位通讯点表生成成功！", 5000)
-            else:
-                QMessageBox.critical(self, "生成失败", "生成上下位通讯点表失败，请检查日志或联系开发者。")
-                self.status_bar.showMessage("上下位通讯点表生成失败。", 5000)
-        except Exception as e:
-            QMessageBox.critical(self, "生成失败", f"生成上下位通讯点表时发生异常：{e}")
-            self.status_bar.showMessage("上下位通讯点表生成异常。", 5000)
+    @staticmethod
+    def _communication_table_job(context: JobContext, source_path: str, output_path: str) -> Dict[str, Any]:
+        """
+        后台任务：加载IO点表数据并生成上下位通讯点表。
+
+        Returns:
+            Dict[str, Any]: {'status': 'load_error' | 'no_points' | 'done', 'error': 加载错误信息, 'success': 是否生成成功}
+        """
+        from core.post_upload_processor.communication_table_generator import generate_communication_table_excel
+
+        # 1. Load IO data from the verified Excel file
+        context.report_progress(0, 2, "正在加载IO点表数据")
+        points_by_sheet, error_message = load_workbook_data(source_path)
+
+        if error_message:
+            logger.error(f"上下位通讯点表生成失败: 无法加载IO数据从 {source_path} - {error_message}")
+            return {'status': 'load_error', 'error': error_message}
+
+        # 2. Consolidate all points from all sheets into a single list
+        all_points: List[UploadedIOPoint] = []
+        if points_by_sheet:
+            for sheet_name, points_in_sheet in points_by_sheet.items():
+                if points_in_sheet: # Ensure there are points in the sheet
+                    all_points.extend(points_in_sheet)
+            logger.info(f"为上下位通讯点表加载了 {len(all_points)} 个点位，来源: {list(points_by_sheet.keys())}")
+
+        if not all_points:
+            logger.warning(f"上下位通讯点表生成失败: 从 {source_path} 未提取到数据点。")
+            return {'status': 'no_points'}
+
+        # 3. Call the generation function with the loaded io_points
+        context.check_cancelled()
+        context.report_progress(1, 2, "正在生成上下位通讯点表")
+        success = generate_communication_table_excel(output_path, all_points) # Pass all_points
+        context.report_progress(2, 2, "上下位通讯点表生成完成")
+        return {'status': 'done', 'success': success}
+
+    def _on_communication_table_generated(self, result: Dict[str, Any], final_output_path: str):
+        """上下位通讯点表生成完成后（界面线程）显示结果"""
+        if result['status'] == 'load_error':
+            QMessageBox.critical(self, "数据加载失败", f"加载IO点表数据时发生错误: {result['error']}")
+            self.status_bar.showMessage("上下位通讯点表生成失败: IO数据加载错误。", 5000)
+        elif result['status'] == 'no_points':
+            QMessageBox.warning(self, "无数据点", "从IO点表中未提取到有效数据点，无法生成上下位通讯点表。")
+            self.status_bar.showMessage("上下位通讯点表生成失败: 无数据点。", 5000)
+        elif result['success']:
+            QMessageBox.information(self, "生成成功", f"上下位通讯点表已生成，文件路径：\n{final_output_path}")
+            self.status_bar.showMessage("上下位通讯点表生成成功！", 5000)
+        else:
+            QMessageBox.critical(self, "生成失败", "生成上下位通讯点表失败，请检查日志或联系开发者。")
+            self.status_bar.showMessage("上下位通讯点表生成失败。", 5000)
+
+    def _get_cleaned_io_base_name(self) -> str:
+        """由已加载的IO点表文件名得到输出文件名前缀（去掉"已校验"、"IO_点表"、"模板"等字样）"""
+        file_name_base_with_ext = os.path.basename(self.verified_io_table_path or "Uploaded_IO_Table.xlsx")
+        base_io_filename, _ = os.path.splitext(file_name_base_with_ext)
+        return base_io_filename.replace("_(已校验)", "").replace("(已校验)","").replace("_IO_点表","", 1).replace("IO_点表","", 1).replace("_模板", "").replace("模板", "")
+
+    def _handle_generate_all(self):
+        """
+        处理"一键生成全部"按钮：在进程池中并行生成和利时PLC点表、亚控/力控HMI点表、FAT点检表和上下位通讯点表，
+        所有文件保存到应用程序工作目录下的 "全部点表/<IO点表名>" 文件夹中。
+        """
+        if not self.loaded_io_data_by_sheet:
+            QMessageBox.warning(self, "操作无效", "请先上传、验证并成功加载一个IO点表文件。")
+            logger.warning("用户在未成功加载IO数据的情况下尝试一键生成全部点表。")
+            self.status_bar.showMessage("请先上传并加载IO点表")
+            return
+
+        base_name = self._get_cleaned_io_base_name()
+        output_dir = os.path.join(os.getcwd(), "全部点表", base_name)
+        options = BatchTaskOptions(output_dir=output_dir, base_name=base_name,
+                                   source_path=self.verified_io_table_path,
+                                   is_safety_system=self._is_safety_plc())
+        logger.info(f"一键生成全部点表，输出目录: {output_dir}，安全系统: {options.is_safety_system}")
+
+        def on_error(message):
+            QMessageBox.critical(self, "生成失败", f"一键生成全部点表时发生错误: {message}")
+            self.status_bar.showMessage("一键生成全部点表失败。")
+
+        self._submit_io_table_job("一键生成全部点表", self._generate_all_job, self.loaded_io_data_by_sheet, options,
+                                  on_success=self._on_generate_all_finished, on_error=on_error)
+
+    @staticmethod
+    def _generate_all_job(context: JobContext, points_by_sheet: Dict[str, List[UploadedIOPoint]],
+                          options: BatchTaskOptions) -> BatchGenerationResult:
+        """后台任务：把点位数据交给进程池并行运行所有生成器"""
+        return generate_all(points_by_sheet, options, context=context)
+
+    def _on_generate_all_finished(self, batch: BatchGenerationResult):
+        """一键生成完成后（界面线程）显示每个生成器的耗时和结果"""
+        report = "\n".join(f" - {line}" for line in batch.timing_lines())
+        summary = (f"总耗时 {batch.elapsed:.2f} 秒（各生成器耗时之和 {batch.total_generator_time:.2f} 秒）\n"
+                   f"文件已保存到目录: {batch.output_dir}")
+        if batch.failed:
+            QMessageBox.warning(self, "部分生成失败", f"一键生成完成，{len(batch.failed)} 个生成器失败:\n{report}\n{summary}")
+            self.status_bar.showMessage(f"一键生成完成，{len(batch.failed)} 个生成器失败。")
+        else:
+            QMessageBox.information(self, "生成成功", f"全部点表已生成:\n{report}\n{summary}")
+            self.status_bar.showMessage(f"全部点表已生成（{batch.elapsed:.2f} 秒）: {batch.output_dir}", 10000)
 
     def _handle_plc_config_reset(self):
         """
@@ -1297,16 +1558,22 @@ class MainWindow(QMainWindow):
             # 显示加载状态
             self.status_bar.showMessage(f"正在重新加载场站 '{site_name}' 的最新数据...")
 
-            # 重新调用项目选择处理逻辑，这会触发API查询获取最新数据
-            self._handle_project_selected(site_name)
-
-            # 显示完成状态
-            self.status_bar.showMessage(f"场站 '{site_name}' 的数据已重新加载", 3000)
+            # 重新调用项目选择处理逻辑，强制跳过缓存以触发API查询获取最新数据
+            # 设备数据在后台加载，加载完成后状态栏会显示"设备列表已更新"
+            self._handle_project_selected(site_name, force_refresh=True)
 
-            logger.info(f"PLC配置重置处理完成，场站 '{site_name}' 的数据已更新")
+            logger.info(f"PLC配置重置处理完成，已开始重新加载场站 '{site_name}' 的数据")
 
         except Exception as e:
             logger.error(f"处理PLC配置重置失败: {e}", exc_info=True)
             QMessageBox.critical(self, "重置处理失败", f"重新加载数据时发生错误：\n{str(e)}")
             self.status_bar.showMessage("数据重新加载失败")
 
+    def closeEvent(self, event):
+        """窗口关闭时取消后台任务，释放后台预取线程和网络连接。"""
+        self.job_runner.shutdown()
+        if self.device_service:
+            self.device_service.shutdown()
+        if self.jdy_api:
+            self.jdy_api.close()
+        super().closeEvent(event)